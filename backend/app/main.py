@@ -1,5 +1,8 @@
 import logging
+import os
 import sys
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,8 +11,13 @@ from app.modules.analysis.application.services import AnalysisOrchestratorServic
 from app.modules.analysis.infrastructure.adapters.websocket_notifier import (
     WebSocketNotifier,
 )
+from app.modules.analysis.infrastructure.metrics_store import (
+    DEFAULT_METRICS_DB_PATH,
+    MetricsStore,
+)
 from app.modules.analysis.infrastructure.web.router import (
     get_analysis_service,
+    get_metrics_store,
     get_notifier,
 )
 
@@ -40,7 +48,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Quality Gate Tool (Modular Monolith)")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
+    yield
+    # The metrics store's read connection lives as long as the app
+    await metrics_store_instance.close()
+
+
+app = FastAPI(title="Quality Gate Tool (Modular Monolith)", lifespan=lifespan)
 
 
 # Force reload trigger 2
@@ -67,8 +83,10 @@ app.dependency_overrides[get_filesystem_service] = lambda: fs_service_instance
 
 # Analysis Module
 ws_notifier_instance = WebSocketNotifier()
-analysis_service_instance = AnalysisOrchestratorService(ws_notifier_instance)
+metrics_store_instance = MetricsStore(os.environ.get("METRICS_DB_PATH", DEFAULT_METRICS_DB_PATH))
+analysis_service_instance = AnalysisOrchestratorService(ws_notifier_instance, metrics_store_instance)
 app.dependency_overrides[get_notifier] = lambda: ws_notifier_instance
+app.dependency_overrides[get_metrics_store] = lambda: metrics_store_instance
 app.dependency_overrides[get_analysis_service] = lambda: analysis_service_instance
 
 # --- Include Routers ---
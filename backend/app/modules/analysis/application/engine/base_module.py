@@ -4,20 +4,38 @@ All analysis modules must implement this interface
 """
 
 import asyncio
-import base64
 import contextlib
-import gzip
+import hashlib
+import json
 import logging
 import time
 from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import replace
 from pathlib import Path
-from typing import Literal
+from typing import Any, ClassVar, Literal
 
+from ...domain.entities import Finding
 from ...domain.ports import AnalysisNotifierPort
-from ...infrastructure.log_parser import QualityLogParser
+from ...infrastructure.log_parser import LogStream, StreamingLogParser, extract_findings, parse_tool_output
+from ...infrastructure.result_cache import CachedResult, ResultCache
+from ...infrastructure.tool_parsers import build_report
+from .findings_store import ProjectFindingsStore
+from .log_queue import create_log_queue
+from .offload import get_offload_executor
+from .output_capture import OutputCapture, create_output_captures
+from .project_files import LOCK_FILES, balance_shards, is_ignored_directory, iter_project_files
+from .scheduler import DEFAULT_JOB_MEMORY_MB, AnalysisScheduler, ScheduledJob, get_scheduler
+from .sessions import ToolOutput, ToolSession
 
 logger = logging.getLogger(__name__)
 
+# Seconds between partial METRICS updates while a tool is still producing output
+PARTIAL_METRICS_INTERVAL = 1.0
+# Pipe reads are coalesced only briefly here; each WebSocket subscriber batches to its own latency budget
+STREAM_BATCH_SECONDS = 0.01
+STREAM_BATCH_BYTES = 32768
+
 
 class AnalysisModule(ABC):
     """
@@ -25,20 +43,52 @@ class AnalysisModule(ABC):
     Provides subprocess execution with real-time streaming
     """
 
+    # Source files the tool reads; an empty tuple disables result caching for the module
+    input_extensions: ClassVar[tuple[str, ...]] = ()
+    # Config file names (anywhere in the project) that influence the result
+    config_files: ClassVar[tuple[str, ...]] = ()
+    # True when the tool checks the whole project even if given a file list (e.g. tsc)
+    reports_whole_project: ClassVar[bool] = False
+    # Incremental file lists longer than this are split into concurrent shards (0 disables)
+    max_shard_files: ClassVar[int] = 250
+    # Full scans are split by top-level directory of the scan target
+    shard_full_scan: ClassVar[bool] = False
+    # Tool versions resolved once per process: (project, lockfile digest, *version command) -> version string
+    _tool_versions: ClassVar[dict[tuple[str, ...], str | None]] = {}
+
     def __init__(
         self,
         module_id: str,
         name: str,
         project_path: str,
         ws_manager: AnalysisNotifierPort,
+        result_cache: ResultCache | None = None,
+        findings_store: ProjectFindingsStore | None = None,
+        session: ToolSession | None = None,
+        scheduler: AnalysisScheduler | None = None,
+        memory_mb: int = DEFAULT_JOB_MEMORY_MB,
     ) -> None:
         self.module_id = module_id
         self.name = name
         self.project_path = Path(project_path)
         self.ws_manager = ws_manager
+        self.result_cache = result_cache
+        self.findings_store = findings_store
+        self.session = session
+        # Extra shards borrow free slots from the host-wide scheduler
+        self.scheduler = scheduler or get_scheduler()
+        self.memory_mb = memory_mb
         self.status: Literal["PENDING", "RUNNING", "PASS", "FAIL", "SKIPPED"] = "PENDING"
         self.exit_code: int | None = None
         self.config_warning: str | None = None
+        # Parse CLI output as it streams in, one per pipe of each command run; empty when the output came from elsewhere
+        self.stream_parsers: list[StreamingLogParser] = []
+        # Set by the orchestrator before it cancels a run to restart it on a newer file set
+        self.restarting = False
+        # True when the captured output of the current run lost bytes to the capture budget
+        self.output_truncated = False
+        # True when the current run's result came from the tool itself (not skipped, not a cache replay)
+        self.ran_tool = False
 
     @abstractmethod
     def get_command(self, files: list[str] | None = None) -> list[str]:
@@ -53,13 +103,381 @@ class AnalysisModule(ABC):
         """Parse command output and return summary string"""
         pass
 
+    def get_version_command(self) -> list[str] | None:
+        """Command printing the tool version (part of the result cache key)"""
+        return None
+
+    async def get_tool_version(self, lockfiles: str = "") -> str | None:
+        """
+        Resolve the tool version once per project and lockfile state; None when it cannot be determined
+        Version commands such as npx resolve the project's own install, which a lockfile change may upgrade.
+        """
+        version_cmd = self.get_version_command()
+        if not version_cmd:
+            return None
+        key = (str(self.project_path), lockfiles, *version_cmd)
+        if key not in self._tool_versions:
+            version: str | None = None
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *version_cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    cwd=str(self.project_path),
+                )
+                stdout, _ = await asyncio.wait_for(process.communicate(), timeout=30.0)
+                if process.returncode == 0 and stdout.strip():
+                    version = stdout.decode("utf-8", errors="replace").strip()
+            except (OSError, TimeoutError) as e:
+                logger.warning(f"[{self.module_id}] Could not determine tool version: {e}")
+            self._tool_versions[key] = version
+        return self._tool_versions[key]
+
+    def is_tool_excluded(self, name: str) -> bool:
+        """
+        True for directories the tool itself never analyses
+        The cache key hashes every other directory: a superset of the tool's files only costs hits.
+        """
+        return is_ignored_directory(name)
+
+    def _hash_inputs(self) -> list[tuple[str, str]]:
+        """(relative path, content digest) for every input, config and lock file of the module"""
+        assert self.result_cache is not None
+        hasher = self.result_cache.hasher
+        files = iter_project_files(
+            self.project_path, self.input_extensions, self.config_files + LOCK_FILES, self.is_tool_excluded
+        )
+        return [(str(path.relative_to(self.project_path)), hasher.digest(path)) for path in files]
+
+    async def get_cache_key(self, cmd: list[str]) -> str | None:
+        """
+        Content-addressed key for a full-mode run
+        Covers input/config/lock file contents, tool version and the exact command line
+        """
+        if self.result_cache is None or not self.input_extensions:
+            return None
+        try:
+            inputs = await asyncio.to_thread(self._hash_inputs)
+        except OSError as e:
+            logger.warning(f"[{self.module_id}] Input hashing failed, cache disabled for this run: {e}")
+            return None
+        lockfiles = json.dumps([item for item in inputs if Path(item[0]).name in LOCK_FILES], separators=(",", ":"))
+        version = await self.get_tool_version(hashlib.sha256(lockfiles.encode("utf-8")).hexdigest())
+        if version is None:
+            return None
+        material = json.dumps(
+            {"module": self.module_id, "cmd": cmd, "version": version, "inputs": inputs},
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get_analysed_files(self, files: list[str] | None) -> list[str] | None:
+        """Files whose findings a run replaces; None means the run covered the whole project"""
+        if files is None or self.reports_whole_project:
+            return None
+        if not self.input_extensions:
+            return list(files)
+        return [f for f in files if f.endswith(self.input_extensions)]
+
+    def is_affected_by(self, files: list[str]) -> bool:
+        """True if a change to any of the files can alter this module's result"""
+        if not self.input_extensions:
+            return True
+        return any(f.endswith(self.input_extensions) or Path(f).name in self.config_files for f in files)
+
+    async def publish_metrics(
+        self, report: dict[str, Any], files: list[str] | None, partial: bool = False
+    ) -> dict[str, Any] | None:
+        """
+        Send a run's report as METRICS, merged into the project-wide findings store
+        Partial snapshots are sent as they are: merging one would replace the module's findings
+        for files the tool has not reached yet, and a run that never completes would leave them so.
+        An incremental run returns the merged report's changes, which delta-aware clients get
+        through FINDINGS_DELTA instead of this METRICS.
+        """
+        changes: dict[str, Any] | None = None
+        if partial:
+            report = {**report, "partial": True}
+        elif self.findings_store is not None:
+            analysed_files = self.get_analysed_files(files)
+            report, changes = await self.findings_store.merge_changes(self.module_id, report, analysed_files)
+            if analysed_files is None:
+                changes = None
+        await self.ws_manager.send_metrics(self.module_id, report, incremental=changes is not None)
+        return changes
+
+    async def publish_partial_metrics(self, files: list[str] | None) -> None:
+        """Send what the stream parsers have found so far, whenever they found something new"""
+        published = 0
+        while True:
+            await asyncio.sleep(PARTIAL_METRICS_INTERVAL)
+            found = sum(parser.finding_count for parser in self.stream_parsers)
+            if found == published:
+                continue
+            published = found
+            try:
+                await self.publish_metrics(build_report(self.parsed_findings()), files, partial=True)
+            except Exception as e:
+                logger.warning(f"[{self.module_id}] Partial metrics failed: {e}")
+
+    async def send_stream_batch(self, raw_text: str) -> None:
+        """Send a batch of output; the notifier compresses it per connection"""
+        await self.ws_manager.send_stream(self.module_id, raw_text)
+
+    async def stream_text(self, text: str) -> None:
+        """Stream already-captured output in 32KB batches"""
+        for start in range(0, len(text), 32768):
+            await self.send_stream_batch(text[start : start + 32768])
+
+    def parsed_findings(self) -> list[Finding]:
+        """Findings parsed so far, in the order the commands and their pipes were started"""
+        return [finding for parser in self.stream_parsers for finding in parser.findings]
+
+    def parsed_severity_counts(self) -> Counter[str] | None:
+        """Findings per severity parsed while the output streamed in; complete even if the capture was truncated"""
+        if not self.stream_parsers:
+            return None
+        return Counter(finding.severity for finding in self.parsed_findings())
+
+    def structured_findings(self) -> list[Finding] | None:
+        """Findings the tool reported as data rather than text; modules with structured results override this"""
+        return None
+
+    def build_findings(self, stdout: str, stderr: str) -> list[Finding]:
+        """Individual findings of a run: structured results, else the parsed output"""
+        structured = self.structured_findings()
+        if structured is not None:
+            return structured
+        if self.stream_parsers:
+            # Already parsed while the output streamed in
+            for parser in self.stream_parsers:
+                parser.close()
+            return self.parsed_findings()
+        return extract_findings(stdout + "\n" + stderr, self.module_id)
+
+    def build_results(self, stdout: str, stderr: str) -> tuple[dict[str, Any], list[Finding]]:
+        """METRICS report and findings of a run; the report is derived from the findings"""
+        findings = self.build_findings(stdout, stderr)
+        return build_report(findings), findings
+
+    async def collect_results(self, stdout: str, stderr: str) -> tuple[dict[str, Any], list[Finding]]:
+        """build_results() off the event loop; plain log parsing of large outputs runs in a worker process"""
+        size = len(stdout) + len(stderr)
+        offload = get_offload_executor()
+        if not self.stream_parsers and self.structured_findings() is None:
+            return await offload.run_cpu("parse", parse_tool_output, stdout + "\n" + stderr, self.module_id, size=size)
+        return await offload.run("metrics", self.build_results, stdout, stderr, size=size)
+
+    async def publish_findings(
+        self, findings: list[Finding], files: list[str] | None, metrics_changes: dict[str, Any] | None = None
+    ) -> None:
+        """
+        Hand a run's findings (project-relative paths) to the findings index, and what changed to clients
+        metrics_changes (from publish_metrics) goes along, so delta-aware clients can patch their report.
+        """
+        analysed_files = self.get_analysed_files(files)
+        if self.findings_store is None:
+            await self.ws_manager.send_findings(self.module_id, findings, analysed_files)
+            return
+        normalize = self.findings_store.normalize
+        findings = [finding.with_file(normalize(finding.file)) for finding in findings]
+        analysed_files = None if analysed_files is None else [normalize(file) for file in analysed_files]
+        await self.ws_manager.send_findings(self.module_id, findings, analysed_files)
+        delta = await self.findings_store.diff(self.module_id, findings, analysed_files)
+        delta = replace(delta, metrics=metrics_changes)
+        if not delta.is_empty:
+            await self.ws_manager.send_findings_delta(self.module_id, delta)
+
+    async def complete_run(
+        self,
+        stdout_str: str,
+        stderr_str: str,
+        exit_code: int | None,
+        files: list[str] | None,
+        cache_key: str | None = None,
+    ) -> Literal["PASS", "FAIL"]:
+        """Derive status, summary and METRICS from captured output, then send END"""
+        self.ran_tool = True
+        self.exit_code = exit_code
+        self.status = "PASS" if exit_code == 0 else "FAIL"
+        # Summary regexes scan the whole output: large outputs are scanned on a worker thread
+        summary = await get_offload_executor().run(
+            "summary",
+            self.get_summary,
+            stdout_str,
+            stderr_str,
+            exit_code if exit_code is not None else 1,
+            size=len(stdout_str) + len(stderr_str),
+        )
+
+        # Parse logs and send metrics
+        metrics_report: dict[str, Any] | None = None
+        try:
+            metrics_report, findings = await self.collect_results(stdout_str, stderr_str)
+
+            # Send project-wide metrics (incremental results merged into the findings store)
+            metrics_changes = await self.publish_metrics(metrics_report, files)
+            await self.publish_findings(findings, files, metrics_changes)
+        except Exception as e:
+            logger.error(f"Failed to parse logs for {self.module_id}: {e}")
+
+        # A truncated capture cannot be replayed: the findings would be parsed from the kept part only
+        if cache_key and self.result_cache and metrics_report is not None and not self.output_truncated:
+            cached_result = CachedResult(
+                exit_code=exit_code if exit_code is not None else 1,
+                summary=summary,
+                metrics=metrics_report,
+                stdout=stdout_str,
+                stderr=stderr_str,
+            )
+            await asyncio.to_thread(self.result_cache.put, cache_key, cached_result)
+
+        # Send END message
+        await self.ws_manager.send_end(self.module_id, self.status, summary)
+        return self.status
+
+    async def replay_cached(self, cached: CachedResult) -> Literal["PASS", "FAIL"]:
+        """Replay a stored result exactly as a live run would have reported it"""
+        await self.ws_manager.send_log(self.module_id, "♻️ Inputs unchanged, replaying cached result")
+        await self.stream_text(cached.stdout + cached.stderr)
+
+        self.exit_code = cached.exit_code
+        self.status = "PASS" if cached.exit_code == 0 else "FAIL"
+        if cached.metrics is not None:
+            await self.publish_metrics(cached.metrics, None)
+            # The cached output is exactly what the tool printed: parse it rather than stale module state
+            findings = await get_offload_executor().run_cpu(
+                "parse",
+                extract_findings,
+                cached.stdout + "\n" + cached.stderr,
+                self.module_id,
+                size=len(cached.stdout) + len(cached.stderr),
+            )
+            await self.publish_findings(findings, None)
+        await self.ws_manager.send_end(self.module_id, self.status, cached.summary)
+        return self.status
+
+    def prepare_command(self, cmd: list[str]) -> list[str]:
+        # CRITICAL: Add unbuffered flag for Python commands
+        if cmd[0] in ["python", "python3"]:
+            cmd.insert(1, "-u")  # Unbuffered output
+        return cmd
+
+    def get_scan_root(self, cmd: list[str]) -> tuple[Path, str] | None:
+        """(directory the command runs in, scan target) of a full-scan command"""
+        return self.project_path, cmd[-1]
+
+    async def plan_shards(self, cmd: list[str], files: list[str] | None) -> list[list[str]]:
+        """Commands to run for this invocation; a single entry means no sharding"""
+        if files is not None:
+            return self._plan_file_shards(cmd, files)
+        if self.shard_full_scan:
+            return await asyncio.to_thread(self._plan_directory_shards, cmd)
+        return [cmd]
+
+    def _plan_file_shards(self, cmd: list[str], files: list[str]) -> list[list[str]]:
+        if not self.max_shard_files or self.reports_whole_project:
+            return [cmd]
+        targets = [f for f in files if f.endswith(self.input_extensions)] if self.input_extensions else files
+        if len(targets) <= self.max_shard_files:
+            return [cmd]
+        chunks = [targets[i : i + self.max_shard_files] for i in range(0, len(targets), self.max_shard_files)]
+        commands = [self.get_command(chunk) for chunk in chunks]
+        return [self.prepare_command(command) for command in commands if command]
+
+    def _plan_directory_shards(self, cmd: list[str]) -> list[list[str]]:
+        scan_root = self.get_scan_root(cmd)
+        if scan_root is None:
+            return [cmd]
+        base_dir, target = scan_root
+        weighted: list[tuple[int, str]] = []
+        try:
+            entries = sorted((base_dir / target).iterdir())
+        except OSError:
+            return [cmd]
+        for entry in entries:
+            path = (Path(target) / entry.name).as_posix()
+            if entry.is_dir() and not is_ignored_directory(entry.name):
+                count = sum(1 for _ in iter_project_files(entry, self.input_extensions))
+                if count:
+                    weighted.append((count, path))
+            elif entry.is_file() and entry.name.endswith(self.input_extensions):
+                weighted.append((1, path))
+        shards = balance_shards(weighted, self.scheduler.max_slots)
+        if len(shards) < 2:
+            return [cmd]
+        return [cmd[:-1] + sorted(shard) for shard in shards]
+
+    def acquire_extra_slots(self, count: int) -> list[ScheduledJob]:
+        """Take up to count scheduler slots that are free right now (release each with scheduler.release)"""
+        jobs: list[ScheduledJob] = []
+        for _ in range(count):
+            job = self.scheduler.try_acquire(str(self.project_path), f"{self.module_id}#shard", self.memory_mb)
+            if job is None:
+                break
+            jobs.append(job)
+        return jobs
+
+    async def run_shards(self, commands: list[list[str]]) -> tuple[str, str, int | None]:
+        """
+        Run shard commands concurrently: the module's own slot plus any slots that are free
+        right now, then merge their output as if one command had run
+        """
+        extra_jobs = self.acquire_extra_slots(len(commands) - 1)
+        lanes = 1 + len(extra_jobs)
+        await self.ws_manager.send_log(self.module_id, f"🧩 Split into {len(commands)} shards on {lanes} slot(s)")
+
+        pending = list(enumerate(commands))
+        results: dict[int, tuple[str, str, int | None]] = {}
+
+        async def lane(job: ScheduledJob | None) -> None:
+            try:
+                while pending:
+                    index, command = pending.pop(0)
+                    results[index] = await self.execute_command(command)
+            finally:
+                if job is not None:
+                    self.scheduler.release(job)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for job in [None, *extra_jobs]:
+                    group.create_task(lane(job))
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0] from None
+
+        ordered = [results[index] for index in range(len(commands))]
+        exit_codes = [code for _, _, code in ordered]
+        exit_code = None if None in exit_codes else max(code for code in exit_codes if code is not None)
+        stdout = self.merge_shard_outputs([out for out, _, _ in ordered])
+        return stdout, "".join(err for _, err, _ in ordered), exit_code
+
+    def merge_shard_outputs(self, outputs: list[str]) -> str:
+        """Combine shard stdouts into what a single run over all targets would print"""
+        return "".join(out if not out or out.endswith("\n") else out + "\n" for out in outputs)
+
+    async def run_persistent(self, files: list[str] | None) -> ToolOutput | None:
+        """Result from an already running tool process, or None to spawn the CLI command"""
+        # Incremental runs in Live Watch are served by the warm session when one is attached
+        if files is None or self.session is None:
+            return None
+        output = await self.session.check(files)
+        if output is None:
+            await self.ws_manager.send_log(self.module_id, f"⚠️ {self.session.name} unavailable, spawning CLI")
+            return None
+        await self.ws_manager.send_log(self.module_id, f"⚡ Served by persistent {self.session.name}")
+        return output
+
     async def run(self, files: list[str] | None = None) -> Literal["PASS", "FAIL", "SKIPPED"]:
         """
         Execute module with real-time log streaming and RESOURCE CLEANUP
         CRITICAL: Ensures immediate flushing and proper process termination
         Returns PASS if exit_code == 0, FAIL otherwise, SKIPPED if filtered
         """
-        process = None
+        self.stream_parsers = []
+        self.output_truncated = False
+        self.ran_tool = False
         try:
             # Get command first to check for filtering
             cmd = self.get_command(files)
@@ -77,18 +495,76 @@ class AnalysisModule(ABC):
             if self.config_warning:
                 await self.ws_manager.send_log(self.module_id, f"⚠️ {self.config_warning}")
 
-            # CRITICAL: Add unbuffered flag for Python commands
-            if cmd[0] in ["python", "python3"]:
-                cmd.insert(1, "-u")  # Unbuffered output
+            cmd = self.prepare_command(cmd)
 
             # Log command execution
             cmd_str = " ".join(cmd)
             await self.ws_manager.send_log(self.module_id, f"$ {cmd_str}")
 
+            # Full-mode runs on an unchanged tree are served from the result cache
+            cache_key = await self.get_cache_key(cmd) if files is None else None
+            if cache_key and self.result_cache:
+                cached = await asyncio.to_thread(self.result_cache.get, cache_key)
+                if cached is not None:
+                    logger.info(f"[{self.module_id}] Result cache hit ({cache_key[:12]})")
+                    return await self.replay_cached(cached)
+
+            # Warm processes (Live Watch sessions, pooled workers) answer without a cold start
+            output = await self.run_persistent(files)
+            if output is not None:
+                await self.stream_text(output.stdout + output.stderr)
+                return await self.complete_run(output.stdout, output.stderr, output.exit_code, files, cache_key)
+
+            stdout_str, stderr_str, exit_code = await self.run_command(cmd, files)
+            return await self.complete_run(stdout_str, stderr_str, exit_code, files, cache_key)
+
+        except asyncio.CancelledError:
+            if self.restarting:
+                # Superseded, not stopped: the restarted run sends the END
+                raise
+            logger.warning(f"🛑 Module {self.module_id} execution cancelled")
+            self.status = "FAIL"
+            await self.ws_manager.send_end(self.module_id, "FAIL", "🛑 Execution cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Module {self.module_id} failed: {e}", exc_info=True)
+            self.status = "FAIL"
+            await self.ws_manager.send_error(self.module_id, f"Exception: {str(e)}")
+            await self.ws_manager.send_end(self.module_id, "FAIL", f"Exception: {str(e)}")
+            return "FAIL"
+
+    async def run_command(self, cmd: list[str], files: list[str] | None) -> tuple[str, str, int | None]:
+        """Spawn the CLI (sharded when worthwhile), parsing its output and sending partial METRICS"""
+        partial_task = asyncio.create_task(self.publish_partial_metrics(files))
+        try:
+            # Large file sets and shardable full scans run as several concurrent commands
+            commands = await self.plan_shards(cmd, files)
+            if len(commands) > 1:
+                return await self.run_shards(commands)
+            return await self.execute_command(cmd)
+        finally:
+            partial_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await partial_task
+
+    async def execute_command(self, cmd: list[str]) -> tuple[str, str, int | None]:
+        """
+        Run one command with real-time log streaming; returns (stdout, stderr, exit code)
+        CRITICAL: The process is always terminated, also on cancellation and errors
+        """
+        process: asyncio.subprocess.Process | None = None
+        # Parsers attach continuation lines to the last finding: concurrent shards and the two
+        # pipes of a process must not share one. Registered before the first await, so in start order.
+        stdout_parser = StreamingLogParser(self.module_id)
+        stderr_parser = StreamingLogParser(self.module_id)
+        self.stream_parsers += [stdout_parser, stderr_parser]
+        # Capture output for summary and cache with bounded memory (spooled to disk, tail past budget)
+        stdout_capture, stderr_capture = create_output_captures()
+        try:
             # Execute subprocess with real-time streaming and proper limits
             # Start process with decoupled I/O
             # Use DEVNULL for stdin to prevent hanging on interactive prompts
-            logger.info(f"[{self.module_id}] Starting subprocess: {cmd_str}")
+            logger.info(f"[{self.module_id}] Starting subprocess: {' '.join(cmd)}")
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
@@ -99,29 +575,34 @@ class AnalysisModule(ABC):
             )
             logger.info(f"[{self.module_id}] Subprocess started with PID: {process.pid}")
 
-            # Capture output for summary
-            stdout_chunks: list[str] = []
-            stderr_chunks: list[str] = []
-
             # Decoupled I/O: Queue for log streaming
-            # Unbounded (or large) queue to prevent reader from blocking on network
-            log_queue: asyncio.Queue[str | None] = asyncio.Queue()
-
-            async def stream_reader(stream: asyncio.StreamReader, chunks_list: list[str]) -> None:
-                """Reads from pipe and puts into queue immediately"""
+            # Bounded: a slow client costs elided live output (or backpressure), never backend memory
+            log_queue = create_log_queue(f"{self.project_path}:{self.module_id}")
+            dropped_before = log_queue.stats.dropped_bytes
+
+            async def stream_reader(
+                stream: asyncio.StreamReader, capture: OutputCapture, parser: StreamingLogParser
+            ) -> None:
+                """Reads from pipe, feeds the parser and puts into queue immediately"""
                 if not stream:
                     return
+                log_stream: LogStream = parser.open_stream()
                 while True:
                     chunk = await stream.read(8192)
                     if not chunk:
                         break
                     logger.debug(f"[{self.module_id}] Read {len(chunk)} bytes from pipe")
-                    decoded = chunk.decode("utf-8", errors="replace")
-                    chunks_list.append(decoded)
-                    await log_queue.put(decoded)
+                    decoded = log_stream.feed(chunk)
+                    if decoded:
+                        capture.write(decoded)
+                        await log_queue.put(decoded)
+                tail = log_stream.close()
+                if tail:
+                    capture.write(tail)
+                    await log_queue.put(tail)
 
             async def stream_sender() -> None:
-                """Consumes from queue and sends via WebSocket with throttling and compression"""
+                """Consumes from queue and hands coalesced output to the notifier"""
                 buffer: list[str] = []
                 buffer_size = 0
                 batch_start_time = 0.0
@@ -133,18 +614,7 @@ class AnalysisModule(ABC):
 
                     raw_text = "".join(buffer)
                     logger.debug(f"[{self.module_id}] Sending batch of {len(raw_text)} bytes. Trigger: {trigger}")
-
-                    # Compress if larger than 1KB
-                    if len(raw_text) > 1024:
-                        try:
-                            compressed = gzip.compress(raw_text.encode("utf-8"))
-                            b64_encoded = base64.b64encode(compressed).decode("ascii")
-                            await self.ws_manager.send_stream(self.module_id, b64_encoded, encoding="gzip_base64")
-                        except Exception as e:
-                            logger.error(f"Compression failed: {e}, sending raw")
-                            await self.ws_manager.send_stream(self.module_id, raw_text)
-                    else:
-                        await self.ws_manager.send_stream(self.module_id, raw_text)
+                    await self.send_stream_batch(raw_text)
 
                     buffer = []
                     buffer_size = 0
@@ -158,27 +628,24 @@ class AnalysisModule(ABC):
                             chunk = await log_queue.get()
                             batch_start_time = time.time()
                         else:
-                            # If buffer has data, enforce 100ms max latency
+                            # If buffer has data, hold it at most STREAM_BATCH_SECONDS
                             elapsed = time.time() - batch_start_time
-                            timeout = max(0.1 - elapsed, 0.01)
+                            timeout = max(STREAM_BATCH_SECONDS - elapsed, 0.001)
                             chunk = await asyncio.wait_for(log_queue.get(), timeout=timeout)
 
                         if chunk is None:
                             if buffer:
                                 await send_buffer("Final Flush")
-                            log_queue.task_done()
                             break
 
                         buffer.append(chunk)
                         buffer_size += len(chunk)
 
-                        if buffer_size > 32768:
+                        if buffer_size > STREAM_BATCH_BYTES:
                             await send_buffer("Size Limit")
 
-                        log_queue.task_done()
-
                     except TimeoutError:
-                        # Timeout reached (100ms since first chunk in batch), flush
+                        # Timeout reached (STREAM_BATCH_SECONDS since first chunk in batch), flush
                         if buffer:
                             await send_buffer("Time Limit")
 
@@ -190,10 +657,10 @@ class AnalysisModule(ABC):
             stderr_reader: asyncio.Task[None] | None = None
             tasks_to_wait: list[asyncio.Task[int] | asyncio.Task[None]] = [asyncio.create_task(process.wait())]
             if process.stdout:
-                stdout_reader = asyncio.create_task(stream_reader(process.stdout, stdout_chunks))
+                stdout_reader = asyncio.create_task(stream_reader(process.stdout, stdout_capture, stdout_parser))
                 tasks_to_wait.append(stdout_reader)
             if process.stderr:
-                stderr_reader = asyncio.create_task(stream_reader(process.stderr, stderr_chunks))
+                stderr_reader = asyncio.create_task(stream_reader(process.stderr, stderr_capture, stderr_parser))
                 tasks_to_wait.append(stderr_reader)
 
             try:
@@ -264,49 +731,28 @@ class AnalysisModule(ABC):
                 raise
 
             # Signal sender to stop and wait for it
-            await log_queue.put(None)
+            log_queue.close()
             await sender_task
+            if log_queue.stats.dropped_bytes > dropped_before:
+                await self.ws_manager.send_log(
+                    self.module_id,
+                    f"✂️ Live log elided {log_queue.stats.dropped_bytes - dropped_before} bytes for a slow client "
+                    "(full output kept for the report)",
+                )
 
-            self.exit_code = process.returncode
-            logger.info(f"[{self.module_id}] Process finished with exit code {self.exit_code}")
-
-            # Determine status
-            self.status = "PASS" if self.exit_code == 0 else "FAIL"
-
-            # Generate summary
-            stdout_str = "".join(stdout_chunks)
-            stderr_str = "".join(stderr_chunks)
-            summary = self.get_summary(stdout_str, stderr_str, self.exit_code or 1)
-
-            # Parse logs and send metrics
-            try:
-                parser = QualityLogParser()
-                # Combine stdout and stderr for parsing
-                full_log = stdout_str + "\n" + stderr_str
-                metrics_report = parser.parse_content(full_log, self.module_id)
-
-                # Send metrics
-                await self.ws_manager.send_metrics(self.module_id, metrics_report)
-            except Exception as e:
-                logger.error(f"Failed to parse logs for {self.module_id}: {e}")
-
-            # Send END message
-            await self.ws_manager.send_end(self.module_id, self.status, summary)
-
-            return self.status
-
-        except asyncio.CancelledError:
-            logger.warning(f"🛑 Module {self.module_id} execution cancelled")
-            self.status = "FAIL"
-            await self.ws_manager.send_end(self.module_id, "FAIL", "🛑 Execution cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Module {self.module_id} failed: {e}", exc_info=True)
-            self.status = "FAIL"
-            await self.ws_manager.send_error(self.module_id, f"Exception: {str(e)}")
-            await self.ws_manager.send_end(self.module_id, "FAIL", f"Exception: {str(e)}")
-            return "FAIL"
+            logger.info(f"[{self.module_id}] Process finished with exit code {process.returncode}")
+            for label, capture in (("stdout", stdout_capture), ("stderr", stderr_capture)):
+                if capture.truncated:
+                    self.output_truncated = True
+                    await self.ws_manager.send_log(
+                        self.module_id,
+                        f"✂️ {label} truncated: kept {capture.total_bytes - capture.truncated_bytes} of "
+                        f"{capture.total_bytes} bytes (metrics still cover the full output)",
+                    )
+            return stdout_capture.getvalue(), stderr_capture.getvalue(), process.returncode
         finally:
+            stdout_capture.close()
+            stderr_capture.close()
             # CRITICAL: Ensure process is properly terminated and cleaned up
             if process and process.returncode is None:
                 logger.info(f"🛑 Terminating process for {self.module_id} (in finally block)...")
@@ -0,0 +1,169 @@
+"""
+In-Process Complexity Analysis
+Runs the lizard library directly in a process pool: files are sharded across cores by size
+and every worker returns structured per-function results, so no lizard CLI is spawned and no
+text output has to be scraped.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+try:
+    import lizard
+except ImportError:  # pragma: no cover - optional: LizardModule falls back to its CLI
+    lizard = None
+
+from .project_files import balance_shards, iter_project_files
+from .scheduler import get_scheduler
+
+logger = logging.getLogger(__name__)
+
+LIZARD_EXTENSIONS = (".py", ".ts", ".tsx", ".js", ".jsx")
+DEFAULT_CCN_THRESHOLD = 15
+
+
+@dataclass(frozen=True)
+class FunctionComplexity:
+    """One function measured by lizard"""
+
+    name: str
+    file: str
+    line: int
+    ccn: int
+    nloc: int
+    token_count: int
+    parameter_count: int
+    length: int
+
+    def to_warning(self) -> str:
+        """The line `lizard --warnings_only` prints for this function"""
+        return (
+            f"{self.file}:{self.line}: warning: {self.name} has {self.nloc} NLOC, {self.ccn} CCN, "
+            f"{self.token_count} token, {self.parameter_count} PARAM, {self.length} length"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def analyze_shard(root: str, files: list[str], ccn_threshold: int | None) -> list[FunctionComplexity]:
+    """
+    Worker entry point: measure every function of the given project-relative files
+    ccn_threshold keeps only functions above it (like --warnings_only); None keeps all.
+    """
+    assert lizard is not None, "analyze_shard needs the lizard library"
+    results: list[FunctionComplexity] = []
+    for file in files:
+        try:
+            info = lizard.analyze_file(os.path.join(root, file))
+        except Exception as e:  # lizard raises on undecodable or exotic sources
+            logger.debug(f"lizard skipped {file}: {e}")
+            continue
+        for function in info.function_list:
+            if ccn_threshold is not None and function.cyclomatic_complexity <= ccn_threshold:
+                continue
+            results.append(
+                FunctionComplexity(
+                    name=function.name,
+                    file=file,
+                    line=function.start_line,
+                    ccn=function.cyclomatic_complexity,
+                    nloc=function.nloc,
+                    token_count=function.token_count,
+                    parameter_count=function.parameter_count,
+                    length=function.length,
+                )
+            )
+    return results
+
+
+def shard_by_size(root: Path, files: list[str], shard_count: int) -> list[list[str]]:
+    """Balance files over shards by byte size"""
+    sizes: list[tuple[int, str]] = []
+    for file in files:
+        try:
+            sizes.append((os.path.getsize(root / file), file))
+        except OSError:
+            continue
+    return balance_shards(sizes, shard_count)
+
+
+class ComplexityAnalyzer:
+    """Shards lizard analysis of a project across a shared process pool"""
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+
+    @staticmethod
+    def is_available() -> bool:
+        return lizard is not None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: the backend runs watchdog and asyncio threads that must not be forked
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def analyze(
+        self,
+        root: Path,
+        files: list[str] | None = None,
+        ccn_threshold: int | None = DEFAULT_CCN_THRESHOLD,
+        lanes: int | None = None,
+    ) -> list[FunctionComplexity]:
+        """
+        Measure the given files (or every source file of the project) and return sorted results
+        lanes bounds how many workers run at once (the scheduler slots held by the caller).
+        """
+        if files is None:
+            files = await asyncio.to_thread(
+                lambda: [p.relative_to(root).as_posix() for p in iter_project_files(root, LIZARD_EXTENSIONS)]
+            )
+        else:
+            files = [f for f in files if f.endswith(LIZARD_EXTENSIONS)]
+        lanes = max(1, min(lanes or self.max_workers, self.max_workers))
+        # A few shards per lane keeps the workers busy when file costs are uneven
+        shards = shard_by_size(root, files, lanes * 4)
+        if not shards:
+            return []
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        running = asyncio.Semaphore(lanes)
+
+        async def measure(shard: list[str]) -> list[FunctionComplexity]:
+            async with running:
+                return await loop.run_in_executor(executor, analyze_shard, str(root), shard, ccn_threshold)
+
+        shard_results = await asyncio.gather(*(measure(shard) for shard in shards))
+        results = [function for shard in shard_results for function in shard]
+        return sorted(results, key=lambda f: (f.file, f.line))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_analyzer: ComplexityAnalyzer | None = None
+
+
+def get_complexity_analyzer() -> ComplexityAnalyzer:
+    """
+    Return the process-wide analyzer, sized from LIZARD_WORKERS (default: all cores)
+    Never larger than the scheduler's slot count: every busy worker must hold a slot.
+    """
+    global _analyzer
+    if _analyzer is None:
+        workers = int(os.environ.get("LIZARD_WORKERS", 0)) or os.cpu_count() or 1
+        _analyzer = ComplexityAnalyzer(max_workers=min(workers, get_scheduler().max_slots))
+    return _analyzer
@@ -0,0 +1,187 @@
+"""
+Per-File Findings Store
+Keeps the latest per-file METRICS entries of every module, keyed by (module_id, file content
+hash), so an incremental run over a handful of files still reports the whole project.
+Also keeps each module's fingerprinted findings, so a run can be reported as a delta.
+"""
+
+import asyncio
+import copy
+import logging
+from pathlib import Path
+from typing import Any
+
+from ...domain.entities import Finding, FindingsDelta
+from .fingerprints import fingerprint_findings
+from .project_files import FileHasher, get_file_hasher
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectFindingsStore:
+    """
+    Merges module reports into a project-wide picture
+    - Full runs (analysed_files=None) replace everything known about the module
+    - Incremental runs replace only the analysed files; untouched files keep their entries
+    Entries whose file content changed without being re-analysed, or whose file was
+    deleted, no longer match their content hash and are dropped on the next merge.
+    """
+
+    def __init__(self, project_path: str | Path, hasher: FileHasher | None = None) -> None:
+        self.project_path = Path(project_path)
+        self.hasher = hasher or get_file_hasher()
+        # module_id -> file -> (content digest or None if the file cannot be located, report entry)
+        self._entries: dict[str, dict[str, tuple[str | None, dict[str, Any]]]] = {}
+        # module_id -> file -> fingerprint -> finding
+        self._fingerprints: dict[str, dict[str, dict[str, Finding]]] = {}
+        self._lock = asyncio.Lock()
+
+    async def merge(
+        self,
+        module_id: str,
+        report: dict[str, Any],
+        analysed_files: list[str] | None,
+    ) -> dict[str, Any]:
+        """Fold a module report into the store and return the merged project-wide report"""
+        merged, _ = await self.merge_changes(module_id, report, analysed_files)
+        return merged
+
+    async def merge_changes(
+        self,
+        module_id: str,
+        report: dict[str, Any],
+        analysed_files: list[str] | None,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """
+        merge(), also returning how the merged report differs from the module's previous one:
+        {"total_issues": new totals, "modules": changed or new file entries, "removed": dropped files}
+        """
+        async with self._lock:
+            return await asyncio.to_thread(self._merge_sync, module_id, report, analysed_files)
+
+    async def diff(
+        self,
+        module_id: str,
+        findings: list[Finding],
+        analysed_files: list[str] | None,
+    ) -> FindingsDelta:
+        """Fold a run's findings (project-relative paths) into the store and return what changed"""
+        async with self._lock:
+            return await asyncio.to_thread(self._diff_sync, module_id, findings, analysed_files)
+
+    def forget(self, module_id: str | None = None) -> None:
+        """Drop stored entries for one module (or all modules)"""
+        if module_id is None:
+            self._entries.clear()
+            self._fingerprints.clear()
+        else:
+            self._entries.pop(module_id, None)
+            self._fingerprints.pop(module_id, None)
+
+    def _merge_sync(
+        self,
+        module_id: str,
+        report: dict[str, Any],
+        analysed_files: list[str] | None,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        previous = self._entries.get(module_id, {})
+        if analysed_files is None:
+            known: dict[str, tuple[str | None, dict[str, Any]]] = {}
+        else:
+            analysed = {self.normalize(file) for file in analysed_files}
+            known = {
+                file: item
+                for file, item in previous.items()
+                if file not in analysed and self._still_current(file, item[0])
+            }
+
+        for entry in report.get("modules", []):
+            file = self.normalize(str(entry.get("file", "")))
+            normalized_entry = {**copy.deepcopy(entry), "file": file}
+            known[file] = (self._digest(file), normalized_entry)
+
+        self._entries[module_id] = known
+        merged = self._build_report(known)
+        changes = {
+            "total_issues": merged["total_issues"],
+            "modules": [entry for entry in merged["modules"] if previous.get(entry["file"], (None, None))[1] != entry],
+            "removed": sorted(previous.keys() - known.keys()),
+        }
+        return merged, changes
+
+    def _diff_sync(
+        self,
+        module_id: str,
+        findings: list[Finding],
+        analysed_files: list[str] | None,
+    ) -> FindingsDelta:
+        previous = self._fingerprints.get(module_id, {})
+        current = fingerprint_findings(module_id, findings, self._read_lines)
+        by_file: dict[str, dict[str, Finding]] = {}
+        for fingerprint, finding in current.items():
+            by_file.setdefault(finding.file, {})[fingerprint] = finding
+
+        # Same scope as merge(): a full run replaces every file, an incremental one the analysed files
+        replaced = set(previous if analysed_files is None else analysed_files) | by_file.keys()
+        known = {file: entries for file, entries in previous.items() if file not in replaced}
+        known.update(by_file)
+        self._fingerprints[module_id] = known
+
+        before = {fingerprint for file in replaced for fingerprint in previous.get(file, {})}
+        return FindingsDelta(
+            added={fingerprint: finding for fingerprint, finding in current.items() if fingerprint not in before},
+            resolved=sorted(before - current.keys()),
+            total=sum(len(entries) for entries in known.values()),
+        )
+
+    def _read_lines(self, file: str) -> list[str] | None:
+        try:
+            return (self.project_path / file).read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            return None
+
+    def normalize(self, file: str) -> str:
+        """Project-relative POSIX path for tool output that may be absolute or ./-prefixed"""
+        path = Path(file)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.project_path)
+            except ValueError:
+                return path.as_posix()
+        text = path.as_posix()
+        return text[2:] if text.startswith("./") else text
+
+    def _digest(self, file: str) -> str | None:
+        try:
+            return self.hasher.digest(self.project_path / file)
+        except OSError:
+            return None
+
+    def _still_current(self, file: str, digest: str | None) -> bool:
+        if digest is None:
+            # Could not be located when stored (tool-relative path); keep until re-analysed
+            return True
+        return self._digest(file) == digest
+
+    @staticmethod
+    def _build_report(entries: dict[str, tuple[str | None, dict[str, Any]]]) -> dict[str, Any]:
+        totals = {"ERROR": 0, "WARNING": 0, "INFO": 0, "COMPLEXITY": 0}
+        modules: list[dict[str, Any]] = []
+        for file in sorted(entries):
+            entry = entries[file][1]
+            for key in ("ERROR", "WARNING", "INFO"):
+                totals[key] += entry.get("metrics", {}).get(key, 0)
+            totals["COMPLEXITY"] += entry.get("complexity_metrics", {}).get("COMPLEXITY", 0)
+            modules.append(copy.deepcopy(entry))
+        return {"total_issues": totals, "modules": modules}
+
+
+_stores: dict[str, ProjectFindingsStore] = {}
+
+
+def get_findings_store(project_path: str | Path) -> ProjectFindingsStore:
+    """Return the process-wide findings store of a project (shared by ad-hoc and watch runs)"""
+    key = str(Path(project_path).resolve())
+    if key not in _stores:
+        _stores[key] = ProjectFindingsStore(key)
+    return _stores[key]
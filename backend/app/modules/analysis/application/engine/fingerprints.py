@@ -0,0 +1,53 @@
+"""
+Finding Fingerprints
+Identity of a finding that survives unrelated edits: tool, rule, file, the message with its
+numbers masked, and a hash of the source line it points at rather than the line number, so
+inserting code above a diagnostic does not make it look resolved and re-added.
+Identical findings in one file are told apart by their order of appearance.
+"""
+
+import hashlib
+import re
+from collections.abc import Callable, Iterable
+
+from ...domain.entities import Finding
+
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def normalize_message(message: str) -> str:
+    """Message without counts, positions or whitespace differences"""
+    return " ".join(NUMBER_PATTERN.sub("#", message).split())
+
+
+def context_hash(lines: list[str] | None, line: int | None) -> str:
+    """Hash of the (whitespace-normalized) source line a finding points at; empty when unknown"""
+    if lines is None or not line or line > len(lines):
+        return ""
+    return hashlib.sha1(" ".join(lines[line - 1].split()).encode()).hexdigest()[:12]
+
+
+def fingerprint_findings(
+    module_id: str, findings: Iterable[Finding], read_lines: Callable[[str], list[str] | None]
+) -> dict[str, Finding]:
+    """Findings keyed by fingerprint; read_lines returns a file's source lines (None if unreadable)"""
+    sources: dict[str, list[str] | None] = {}
+    occurrences: dict[str, int] = {}
+    fingerprinted: dict[str, Finding] = {}
+    for finding in findings:
+        if finding.file not in sources:
+            sources[finding.file] = read_lines(finding.file)
+        key = "\0".join(
+            (
+                module_id,
+                finding.rule or "",
+                finding.file,
+                normalize_message(finding.message),
+                context_hash(sources[finding.file], finding.line),
+            )
+        )
+        digest = hashlib.sha1(key.encode()).hexdigest()[:20]
+        seen = occurrences.get(digest, 0)
+        occurrences[digest] = seen + 1
+        fingerprinted[f"{digest}:{seen}" if seen else digest] = finding
+    return fingerprinted
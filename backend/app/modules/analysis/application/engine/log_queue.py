@@ -0,0 +1,154 @@
+"""
+Bounded Log Queue
+Hands streamed output from the pipe readers to the WebSocket sender with a fixed memory
+ceiling. What happens when a slow client lets the queue fill up is a per-queue policy:
+- coalesce: merge adjacent chunks into fewer messages, then wait for room (nothing is lost)
+- drop_middle: keep the oldest and newest output, replace the middle with an elision marker
+- block: wait for room, pushing back on the tool through its pipe
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_MAX_ITEMS = 64
+
+
+class OverflowPolicy(StrEnum):
+    COALESCE = "coalesce"
+    DROP_MIDDLE = "drop_middle"
+    BLOCK = "block"
+
+
+@dataclass
+class LogQueueStats:
+    """Lifetime counters of one project module's live log stream"""
+
+    queued_bytes: int = 0
+    peak_bytes: int = 0
+    coalesced_bytes: int = 0
+    dropped_bytes: int = 0
+    blocked_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "blocked_seconds": round(self.blocked_seconds, 3)}
+
+
+class BoundedLogQueue:
+    """Single-consumer text queue holding at most max_bytes (sizes in characters, as sent)"""
+
+    def __init__(
+        self,
+        policy: OverflowPolicy = OverflowPolicy.DROP_MIDDLE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        stats: LogQueueStats | None = None,
+    ) -> None:
+        self.policy = policy
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.stats = stats or LogQueueStats()
+        self._items: deque[str] = deque()
+        self._size = 0
+        # Characters dropped between the head item and the next one (drop_middle)
+        self._elided = 0
+        self._closed = False
+        self._available = asyncio.Event()
+        self._space = asyncio.Event()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    async def put(self, text: str) -> None:
+        if self.policy is OverflowPolicy.DROP_MIDDLE:
+            self._append(text)
+            self._drop_middle()
+        else:
+            await self._wait_for_room(len(text))
+            if self.policy is OverflowPolicy.COALESCE and len(self._items) >= self.max_items:
+                self._items[-1] += text
+                self._grow(len(text))
+                self.stats.coalesced_bytes += len(text)
+            else:
+                self._append(text)
+        self._available.set()
+
+    async def get(self) -> str | None:
+        """Next chunk, or None once the queue is closed and drained"""
+        while not self._items:
+            if self._closed:
+                return None
+            self._available.clear()
+            await self._available.wait()
+        text = self._items.popleft()
+        self._grow(-len(text))
+        if self._elided:
+            text += f"\n… [{self._elided} bytes elided for a slow client] …\n"
+            self._elided = 0
+        self._space.set()
+        return text
+
+    def close(self) -> None:
+        """No more puts; get() returns None after the remaining chunks"""
+        self._closed = True
+        self._available.set()
+
+    def _append(self, text: str) -> None:
+        self._items.append(text)
+        self._grow(len(text))
+
+    def _grow(self, delta: int) -> None:
+        self._size += delta
+        self.stats.queued_bytes += delta
+        self.stats.peak_bytes = max(self.stats.peak_bytes, self.stats.queued_bytes)
+
+    def _drop_middle(self) -> None:
+        # The head is next to be sent and the newest item is the live edge; drop what lies between
+        while self._size > self.max_bytes and len(self._items) > 2:
+            dropped = self._items[1]
+            del self._items[1]
+            self._grow(-len(dropped))
+            self._elided += len(dropped)
+            self.stats.dropped_bytes += len(dropped)
+
+    async def _wait_for_room(self, incoming: int) -> None:
+        started = None
+        while self._items and self._size + incoming > self.max_bytes:
+            started = started or time.monotonic()
+            self._space.clear()
+            await self._space.wait()
+        if started is not None:
+            self.stats.blocked_seconds += time.monotonic() - started
+
+
+_stats: dict[str, LogQueueStats] = {}
+
+
+def create_log_queue(key: str) -> BoundedLogQueue:
+    """Queue for one command's live log, configured by LOG_QUEUE_POLICY / LOG_QUEUE_MAX_KB"""
+    policy_env = os.environ.get("LOG_QUEUE_POLICY")
+    max_kb = os.environ.get("LOG_QUEUE_MAX_KB")
+    try:
+        policy = OverflowPolicy(policy_env) if policy_env else OverflowPolicy.DROP_MIDDLE
+    except ValueError:
+        logger.warning(f"Unknown LOG_QUEUE_POLICY {policy_env!r}, using drop_middle")
+        policy = OverflowPolicy.DROP_MIDDLE
+    return BoundedLogQueue(
+        policy=policy,
+        max_bytes=int(max_kb) * 1024 if max_kb else DEFAULT_MAX_BYTES,
+        stats=_stats.setdefault(key, LogQueueStats()),
+    )
+
+
+def get_log_queue_stats() -> dict[str, dict[str, Any]]:
+    """Counters per "project:module" since the process started"""
+    return {key: stats.to_dict() for key, stats in sorted(_stats.items())}
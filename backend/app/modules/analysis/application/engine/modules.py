@@ -6,12 +6,61 @@ Modules: F_TypeScript, F_ESLint, F_Complexity, B_Ruff, B_Pyright, B_Lizard
 import json
 import logging
 import re
+import shutil
+from collections import Counter
 from pathlib import Path
+from typing import Any, cast
 
+from ...domain.entities import Finding
 from .base_module import AnalysisModule
+from .complexity import DEFAULT_CCN_THRESHOLD, LIZARD_EXTENSIONS, FunctionComplexity, get_complexity_analyzer
+from .pyright_session import PyrightLanguageServerSession
+from .sessions import ToolOutput, ToolSession
+from .tsc_watch_session import TscWatchSession, find_tsconfig_project
+from .workers import WorkerModule
 
 logger = logging.getLogger(__name__)
 
+ESLINT_WORKER_SHIM = Path(__file__).parent / "shims" / "eslint_worker.js"
+
+RUFF_FOUND_PATTERN = re.compile(r"^Found (\d+) errors?\.")
+RUFF_FIXABLE_PATTERN = re.compile(r"^\[\*\] (\d+) fixable")
+PYRIGHT_TOTALS_PATTERN = re.compile(r"^(\d+) errors?, (\d+) warnings?, (\d+) informations?")
+
+# Directories each tool skips by default (its own exclude rules, not the watcher's ignore list)
+TSC_EXCLUDED_DIRECTORIES = frozenset({"node_modules", "bower_components", "jspm_packages"})
+ESLINT_EXCLUDED_DIRECTORIES = frozenset({"node_modules", ".git"})
+RUFF_EXCLUDED_DIRECTORIES = frozenset(
+    {
+        ".bzr",
+        ".direnv",
+        ".eggs",
+        ".git",
+        ".git-rewrite",
+        ".hg",
+        ".ipynb_checkpoints",
+        ".mypy_cache",
+        ".nox",
+        ".pants.d",
+        ".pyenv",
+        ".pytest_cache",
+        ".pytype",
+        ".ruff_cache",
+        ".svn",
+        ".tox",
+        ".venv",
+        ".vscode",
+        "__pypackages__",
+        "_build",
+        "buck-out",
+        "dist",
+        "node_modules",
+        "site-packages",
+        "venv",
+    }
+)
+PYRIGHT_EXCLUDED_DIRECTORIES = frozenset({"node_modules", "__pycache__"})
+
 
 # ============================================================================
 # ANALYSIS MODULES
@@ -21,6 +70,17 @@ logger = logging.getLogger(__name__)
 class TypeScriptModule(AnalysisModule):
     """F_TypeScript: TypeScript Type Checking"""
 
+    input_extensions = (".ts", ".tsx", ".js", ".jsx")
+    config_files = ("tsconfig.json", "package.json")
+    reports_whole_project = True
+
+    def get_version_command(self) -> list[str] | None:
+        return ["npx", "tsc", "--version"]
+
+    def is_tool_excluded(self, name: str) -> bool:
+        # tsc wildcards never match dot-directories
+        return name in TSC_EXCLUDED_DIRECTORIES or name.startswith(".")
+
     def get_command(self, files: list[str] | None = None) -> list[str]:
         # Filter for incremental mode
         if files is not None:
@@ -42,17 +102,11 @@ class TypeScriptModule(AnalysisModule):
         ]
 
         # Agnostic check: if tsconfig.json is not in root, check immediate subdirectories
-        if not (self.project_path / "tsconfig.json").exists():
-            found = False
-            # Find first subdirectory containing tsconfig.json
-            for path in self.project_path.iterdir():
-                if path.is_dir() and (path / "tsconfig.json").exists():
-                    cmd.extend(["-p", path.name])
-                    found = True
-                    break
-
-            if not found:
-                self.config_warning = "tsconfig.json not found. Using default configuration."
+        tsconfig_project = find_tsconfig_project(self.project_path)
+        if tsconfig_project is None:
+            self.config_warning = "tsconfig.json not found. Using default configuration."
+        elif tsconfig_project != ".":
+            cmd.extend(["-p", tsconfig_project])
 
         return cmd
 
@@ -60,21 +114,54 @@ class TypeScriptModule(AnalysisModule):
         if exit_code == 0:
             return "✅ No type errors found"
 
-        # Count error lines
-        error_lines = [line for line in stdout.split("\n") if "error TS" in line]
-        error_count = len(error_lines)
+        # Count error lines (the streamed parse also covers bytes a truncated capture dropped)
+        counts = self.parsed_severity_counts() if self.output_truncated else None
+        if counts is not None:
+            error_count = counts["ERROR"]
+        else:
+            error_count = sum(1 for line in stdout.split("\n") if "error TS" in line)
 
         if error_count > 0:
             return f"❌ {error_count} type error(s) found"
         return "❌ Type checking failed"
 
 
-class ESLintModule(AnalysisModule):
-    """F_ESLint: Linting and Quality Check"""
+class ESLintModule(WorkerModule):
+    """F_ESLint: Linting and Quality Check (served by a warm ESLint worker when Node is available)"""
+
+    shard_full_scan = True
+    # (config directory, lint patterns) of the run prepared by get_command()
+    lint_target: tuple[Path, list[str]] | None = None
+
+    input_extensions = (".js", ".ts", ".tsx", ".jsx")
+    config_files = (
+        ".eslintrc",
+        ".eslintrc.js",
+        ".eslintrc.cjs",
+        ".eslintrc.yaml",
+        ".eslintrc.yml",
+        ".eslintrc.json",
+        "eslint.config.js",
+        "eslint.config.mjs",
+        "eslint.config.cjs",
+        ".eslintignore",
+        "package.json",
+        "tsconfig.json",
+    )
+
+    def get_version_command(self) -> list[str] | None:
+        if Path("/usr/local/lib/node_modules").exists():
+            return ["eslint", "--version"]
+        return ["npx", "eslint", "--version"]
+
+    def is_tool_excluded(self, name: str) -> bool:
+        return name in ESLINT_EXCLUDED_DIRECTORIES
 
     def get_command(self, files: list[str] | None = None) -> list[str]:
+        self.lint_target = None
+
         # 1. Filter files first (Incremental Mode)
-        cmd_args = []
+        cmd_args: list[str] = []
         if files is not None:
             js_ts_files = [f for f in files if f.endswith((".js", ".ts", ".tsx", ".jsx"))]
             logger.info(f"[ESLintModule] Filtering files: {files} -> {js_ts_files}")
@@ -146,7 +233,7 @@ class ESLintModule(AnalysisModule):
             return ["node", "-e", ""]
 
         # 3. Build command
-        cmd = []
+        cmd: list[str] = []
 
         # Handle Monorepo/Subdirectory Config
         if config_dir != self.project_path:
@@ -156,7 +243,7 @@ class ESLintModule(AnalysisModule):
 
             # Adjust files for subdirectory context
             if files is not None:
-                rel_files = []
+                rel_files: list[str] = []
                 for f in cmd_args:
                     if f.startswith(f"{rel_dir}/"):
                         rel_files.append(f[len(rel_dir) + 1 :])
@@ -220,31 +307,81 @@ class ESLintModule(AnalysisModule):
         else:
             cmd.append(target_dir)
 
+        self.lint_target = (config_dir, cmd_args if files is not None else [target_dir])
         return cmd
 
+    def get_scan_root(self, cmd: list[str]) -> tuple[Path, str] | None:
+        # Targets are relative to the config directory (the command runs there via env -C)
+        if self.lint_target is None or len(self.lint_target[1]) != 1:
+            return None
+        config_dir, patterns = self.lint_target
+        return config_dir, patterns[0]
+
+    def merge_shard_outputs(self, outputs: list[str]) -> str:
+        # Each shard prints one JSON array; a single run would print their concatenation
+        results: list[Any] = []
+        for output in outputs:
+            try:
+                results.extend(json.loads(output) if output.strip() else [])
+            except json.JSONDecodeError:
+                return super().merge_shard_outputs(outputs)
+        return json.dumps(results)
+
+    def get_worker_command(self) -> list[str] | None:
+        if shutil.which("node") is None:
+            return None
+        return ["node", str(ESLINT_WORKER_SHIM)]
+
+    def get_worker_request(self, files: list[str] | None) -> tuple[str, dict[str, Any]] | None:
+        if self.lint_target is None:
+            return None
+        config_dir, patterns = self.lint_target
+        global_node_modules = Path("/usr/local/lib/node_modules")
+        # Config edits change the stamp, so the worker builds a fresh ESLint instance for them
+        config_stamp = [
+            (name, (config_dir / name).stat().st_mtime_ns) for name in self.config_files if (config_dir / name).exists()
+        ]
+        return (
+            "lint",
+            {
+                "cwd": str(config_dir.resolve()),
+                "patterns": patterns,
+                "extensions": [".js", ".jsx", ".ts", ".tsx"],
+                "resolvePluginsRelativeTo": str(global_node_modules) if global_node_modules.exists() else None,
+                "configStamp": json.dumps(config_stamp),
+            },
+        )
+
+    def render_worker_result(self, result: Any) -> ToolOutput:  # noqa: ANN401
+        # Same document `eslint --format json` prints
+        results = cast(list[dict[str, Any]], result) if isinstance(result, list) else []
+        has_errors = any(r.get("errorCount", 0) for r in results)
+        return ToolOutput(json.dumps(results), "", 1 if has_errors else 0)
+
     def get_summary(self, stdout: str, stderr: str, exit_code: int) -> str:
         if self.config_warning and "No ESLint configuration found" in self.config_warning:
             return "⚠️ Skipped (No Config)"
 
-        try:
-            if stdout.strip():
-                results = json.loads(stdout)
-
-                error_count = 0
-                warning_count = 0
-
-                for result in results:
-                    error_count += result.get("errorCount", 0)
-                    warning_count += result.get("warningCount", 0)
+        # A truncated capture lost part of the JSON document; the streamed parse saw all of it
+        counts = self.parsed_severity_counts() if self.output_truncated else None
+        if counts is None and stdout.strip():
+            try:
+                results: list[dict[str, Any]] = json.loads(stdout)
+                counts = Counter(
+                    ERROR=sum(result.get("errorCount", 0) for result in results),
+                    WARNING=sum(result.get("warningCount", 0) for result in results),
+                )
+            except (json.JSONDecodeError, KeyError):
+                pass
 
-                if error_count == 0 and warning_count == 0:
-                    return "✅ No linting issues"
-                elif error_count == 0:
-                    return f"⚠️ {warning_count} warning(s)"
-                else:
-                    return f"❌ {error_count} error(s), {warning_count} warning(s)"
-        except (json.JSONDecodeError, KeyError):
-            pass
+        if counts is not None:
+            error_count, warning_count = counts["ERROR"], counts["WARNING"]
+            if error_count == 0 and warning_count == 0:
+                return "✅ No linting issues"
+            elif error_count == 0:
+                return f"⚠️ {warning_count} warning(s)"
+            else:
+                return f"❌ {error_count} error(s), {warning_count} warning(s)"
 
         if exit_code == 0:
             return "✅ No linting issues"
@@ -254,9 +391,21 @@ class ESLintModule(AnalysisModule):
 class RuffModule(AnalysisModule):
     """B_Ruff: Python Linting and Formatting"""
 
+    input_extensions = (".py", ".pyi")
+    config_files = ("pyproject.toml", "ruff.toml", ".ruff.toml")
+    shard_full_scan = True
+
+    def get_version_command(self) -> list[str] | None:
+        return ["ruff", "--version"]
+
+    def is_tool_excluded(self, name: str) -> bool:
+        return name in RUFF_EXCLUDED_DIRECTORIES
+
     def get_command(self, files: list[str] | None = None) -> list[str]:
-        # Use text output for streaming
-        cmd = ["ruff", "check"]
+        # Concise text: one `file:line:col: CODE message` line per finding, still streamable
+        # --force-exclude: shards and incremental runs pass paths explicitly, which Ruff would otherwise
+        # check even when the project config excludes them
+        cmd = ["ruff", "check", "--force-exclude", "--output-format", "concise"]
 
         target_dir = "."
         # Agnostic check: if pyproject.toml is not in root, check immediate subdirectories
@@ -272,7 +421,7 @@ class RuffModule(AnalysisModule):
                 self.config_warning = "Configuration file 'pyproject.toml' not found. Using default settings."
 
         if files is not None:
-            py_files = [f for f in files if f.endswith(".py")]
+            py_files = [f for f in files if f.endswith(self.input_extensions)]
             if py_files:
                 cmd.extend(py_files)
             else:
@@ -300,10 +449,40 @@ class RuffModule(AnalysisModule):
 
         return "❌ Ruff check failed"
 
+    def merge_shard_outputs(self, outputs: list[str]) -> str:
+        # One "Found N errors." footer for all shards, as a single run prints
+        lines: list[str] = []
+        found = 0
+        fixable = 0
+        for output in outputs:
+            for line in output.splitlines():
+                if match := RUFF_FOUND_PATTERN.match(line):
+                    found += int(match.group(1))
+                elif match := RUFF_FIXABLE_PATTERN.match(line):
+                    fixable += int(match.group(1))
+                elif line != "All checks passed!":
+                    lines.append(line)
+        if found:
+            lines.append(f"Found {found} error{'' if found == 1 else 's'}.")
+            if fixable:
+                lines.append(f"[*] {fixable} fixable with the `--fix` option.")
+        else:
+            lines.append("All checks passed!")
+        return "\n".join(lines) + "\n"
+
 
 class PyrightModule(AnalysisModule):
     """B_Pyright: Python Strict Type Checking"""
 
+    input_extensions = (".py", ".pyi")
+    config_files = ("pyproject.toml", "pyrightconfig.json")
+
+    def get_version_command(self) -> list[str] | None:
+        return ["python3", "-m", "pyright", "--version"]
+
+    def is_tool_excluded(self, name: str) -> bool:
+        return name in PYRIGHT_EXCLUDED_DIRECTORIES or name.startswith(".")
+
     def get_command(self, files: list[str] | None = None) -> list[str]:
         # Use python3 -m pyright
         # Remove --outputjson to get text output for streaming
@@ -327,7 +506,7 @@ class PyrightModule(AnalysisModule):
                 self.config_warning = "Configuration file 'pyproject.toml' not found. Using default settings."
 
         if files is not None:
-            py_files = [f for f in files if f.endswith(".py")]
+            py_files = [f for f in files if f.endswith(self.input_extensions)]
             if py_files:
                 cmd.extend(py_files)
             else:
@@ -351,10 +530,31 @@ class PyrightModule(AnalysisModule):
 
         return "❌ Pyright check failed"
 
+    def merge_shard_outputs(self, outputs: list[str]) -> str:
+        # Sum the per-shard "N errors, N warnings, N informations" footers into one
+        lines: list[str] = []
+        totals = [0, 0, 0]
+        for output in outputs:
+            for line in output.splitlines():
+                if match := PYRIGHT_TOTALS_PATTERN.match(line.strip()):
+                    totals = [total + int(count) for total, count in zip(totals, match.groups(), strict=True)]
+                elif line.strip() != "No configuration file found.":
+                    lines.append(line)
+        lines.append(f"{totals[0]} errors, {totals[1]} warnings, {totals[2]} informations ")
+        return "\n".join(lines) + "\n"
+
 
 class LizardModule(AnalysisModule):
     """B_Lizard: Cyclomatic Complexity (Max 15) - Python & TypeScript/JavaScript"""
 
+    input_extensions = LIZARD_EXTENSIONS
+    shard_full_scan = True
+    # Structured results of the last in-process run (None when the CLI was used)
+    functions: list[FunctionComplexity] | None = None
+
+    def get_version_command(self) -> list[str] | None:
+        return ["python3", "-m", "lizard", "--version"]
+
     def get_command(self, files: list[str] | None = None) -> list[str]:
         # Use python3 -m lizard
         cmd = [
@@ -413,6 +613,37 @@ class LizardModule(AnalysisModule):
 
         return f"❌ {len(warning_lines)} function(s) exceed complexity 15"
 
+    async def run_persistent(self, files: list[str] | None) -> ToolOutput | None:
+        # lizard is a Python library: measure in the shared process pool instead of spawning the CLI
+        self.functions = None
+        analyzer = get_complexity_analyzer()
+        if not analyzer.is_available():
+            return None
+        # One worker per scheduler slot: the module's own plus any that are free right now
+        extra_jobs = self.acquire_extra_slots(analyzer.max_workers - 1)
+        lanes = 1 + len(extra_jobs)
+        try:
+            functions = await analyzer.analyze(self.project_path, files, DEFAULT_CCN_THRESHOLD, lanes)
+        except Exception as e:  # broken pool or unexpected lizard failure
+            logger.warning(f"[LizardModule] In-process analysis failed, spawning CLI: {e}")
+            return None
+        finally:
+            for job in extra_jobs:
+                self.scheduler.release(job)
+
+        self.functions = functions
+        await self.ws_manager.send_log(self.module_id, f"⚡ Analysed in-process on {lanes} worker(s)")
+        stdout = "".join(f"{function.to_warning()}\n" for function in functions)
+        return ToolOutput(stdout, "", 1 if functions else 0)
+
+    def structured_findings(self) -> list[Finding] | None:
+        if self.functions is None:
+            return None
+        return [
+            Finding(f.file, f.line, None, "COMPLEXITY", "CCN", f"{f.name} has {f.ccn} CCN", f.ccn)
+            for f in self.functions
+        ]
+
 
 # ============================================================================
 # MODULE REGISTRY
@@ -426,6 +657,24 @@ MODULE_CLASSES = {
     "B_Lizard": LizardModule,
 }
 
+# Modules that can be served by a persistent process while a project is watched
+SESSION_CLASSES: dict[str, type[ToolSession]] = {
+    "F_TypeScript": TscWatchSession,
+    "B_Pyright": PyrightLanguageServerSession,
+}
+
+
+def create_watch_sessions(project_path: str | Path, selected_tools: list[str] | None = None) -> dict[str, ToolSession]:
+    """Instantiate (without starting) the persistent sessions available for a watched project"""
+    sessions: dict[str, ToolSession] = {}
+    for module_id, session_class in SESSION_CLASSES.items():
+        if selected_tools and module_id not in selected_tools:
+            continue
+        if session_class.is_available(Path(project_path)):
+            sessions[module_id] = session_class(project_path)
+    return sessions
+
+
 MODULE_METADATA = [
     {
         "id": "F_TypeScript",
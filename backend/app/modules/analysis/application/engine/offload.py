@@ -0,0 +1,171 @@
+"""
+Off-Loop Executor
+Runs CPU-bound post-processing (stream compression, summary regex scans, log parsing) away
+from the event loop so one module finishing with a large log does not stall WebSocket sends
+and HTTP requests for every other project.
+- small inputs run inline: handing them to a pool costs more than the work
+- threads for zlib (it releases the GIL) and for callables bound to module state
+- a spawned process pool for pure parsing functions above a size threshold
+Each pool admits only as many jobs as it has workers; the rest wait on the loop, where the
+wait is measured per stage.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Below this many characters a stage runs inline on the loop
+DEFAULT_INLINE_BYTES = 16 * 1024
+# Above this many characters pure parsing goes to a worker process
+DEFAULT_PROCESS_BYTES = 4 * 1024 * 1024
+
+
+@dataclass
+class StageStats:
+    """Lifetime counters of one post-processing stage"""
+
+    inline: int = 0
+    threaded: int = 0
+    processed: int = 0
+    queued: int = 0
+    peak_queued: int = 0
+    wait_seconds: float = 0.0
+    run_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "wait_seconds": round(self.wait_seconds, 3),
+            "run_seconds": round(self.run_seconds, 3),
+            "max_latency_seconds": round(self.max_latency_seconds, 3),
+        }
+
+
+class OffloadExecutor:
+    """Bounded thread and process pools shared by every module and WebSocket connection"""
+
+    def __init__(
+        self,
+        max_threads: int | None = None,
+        max_processes: int | None = None,
+        inline_bytes: int = DEFAULT_INLINE_BYTES,
+        process_bytes: int = DEFAULT_PROCESS_BYTES,
+    ) -> None:
+        cpus = os.cpu_count() or 1
+        self.max_threads = max_threads or min(4, cpus)
+        self.max_processes = max_processes or max(1, min(4, cpus // 2))
+        self.inline_bytes = inline_bytes
+        self.process_bytes = process_bytes
+        self.stages: dict[str, StageStats] = {}
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+        self._thread_slots = asyncio.Semaphore(self.max_threads)
+        self._process_slots = asyncio.Semaphore(self.max_processes)
+
+    def _get_threads(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="qg-offload")
+        return self._threads
+
+    def _get_processes(self) -> ProcessPoolExecutor:
+        if self._processes is None:
+            # spawn: the backend runs watchdog and asyncio threads that must not be forked
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.max_processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._processes
+
+    async def run(self, stage: str, fn: Callable[..., T], *args: Any, size: int = 0) -> T:  # noqa: ANN401
+        """Run fn(*args) on a thread, or inline when the input is small"""
+        stats = self.stages.setdefault(stage, StageStats())
+        if size < self.inline_bytes:
+            stats.inline += 1
+            return fn(*args)
+        stats.threaded += 1
+        return await self._dispatch(stats, self._thread_slots, self._get_threads(), fn, args)
+
+    async def run_cpu(self, stage: str, fn: Callable[..., T], *args: Any, size: int = 0) -> T:  # noqa: ANN401
+        """Like run(), but large inputs go to a worker process (fn and args must be picklable)"""
+        if size < self.process_bytes:
+            return await self.run(stage, fn, *args, size=size)
+        stats = self.stages.setdefault(stage, StageStats())
+        stats.processed += 1
+        try:
+            return await self._dispatch(stats, self._process_slots, self._get_processes(), fn, args)
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Offload process pool unavailable for {stage}, using a thread: {e}")
+            self._processes = None
+            stats.processed -= 1
+            stats.threaded += 1
+            return await self._dispatch(stats, self._thread_slots, self._get_threads(), fn, args)
+
+    async def _dispatch(
+        self,
+        stats: StageStats,
+        slots: asyncio.Semaphore,
+        executor: Executor,
+        fn: Callable[..., T],
+        args: tuple[Any, ...],
+    ) -> T:
+        queued_at = time.monotonic()
+        stats.queued += 1
+        stats.peak_queued = max(stats.peak_queued, stats.queued)
+        waiting = True
+        try:
+            async with slots:
+                started = time.monotonic()
+                waiting = False
+                stats.queued -= 1
+                stats.wait_seconds += started - queued_at
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+                finally:
+                    finished = time.monotonic()
+                    stats.run_seconds += finished - started
+                    stats.max_latency_seconds = max(stats.max_latency_seconds, finished - queued_at)
+        finally:
+            # Cancelled while still waiting for a slot
+            if waiting:
+                stats.queued -= 1
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "max_threads": self.max_threads,
+            "max_processes": self.max_processes,
+            "stages": {stage: stats.to_dict() for stage, stats in sorted(self.stages.items())},
+        }
+
+    def shutdown(self) -> None:
+        for executor in (self._threads, self._processes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._threads = None
+        self._processes = None
+
+
+_executor: OffloadExecutor | None = None
+
+
+def get_offload_executor() -> OffloadExecutor:
+    """Return the process-wide executor, sized from OFFLOAD_THREADS / OFFLOAD_PROCESSES"""
+    global _executor
+    if _executor is None:
+        threads = os.environ.get("OFFLOAD_THREADS")
+        processes = os.environ.get("OFFLOAD_PROCESSES")
+        _executor = OffloadExecutor(
+            max_threads=int(threads) if threads else None,
+            max_processes=int(processes) if processes else None,
+        )
+    return _executor
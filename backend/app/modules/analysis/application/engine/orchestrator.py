@@ -1,22 +1,26 @@
 """
 Analysis Orchestrator V5.0 - Live Watch Exclusive
-Implements strict resource control with Semaphore for stability
+Implements strict resource control through the host-wide AnalysisScheduler
 """
 
 import asyncio
 import logging
+import time
+from collections.abc import Callable, Coroutine
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, ClassVar, Literal
 
 from ...domain.ports import AnalysisNotifierPort
+from ...infrastructure.duration_history import DurationHistory, estimate_makespan, get_duration_history
+from ...infrastructure.result_cache import ResultCache, get_result_cache
 from .base_module import AnalysisModule
+from .findings_store import ProjectFindingsStore, get_findings_store
 from .modules import MODULE_CLASSES
+from .scheduler import AnalysisScheduler, get_scheduler
+from .sessions import ToolSession
 
 logger = logging.getLogger(__name__)
 
-# CRITICAL: Resource protection semaphore to prevent RAM exhaustion
-MAX_CONCURRENT_ANALYSIS = 3  # Conservative limit for local machine stability
-
 
 class AnalysisOrchestrator:
     """
@@ -24,20 +28,51 @@ class AnalysisOrchestrator:
     MISSION: Guarantee local machine stability during continuous Live Watch
     """
 
+    # Define 8 core modules (static analysis only)
+    # memory_mb: rough peak RSS of the tool, used by the scheduler's admission control
+    # expected_seconds: ordering hint until the project has a duration history
+    MODULE_CONFIGS: ClassVar[list[dict[str, Any]]] = [
+        {"id": "F_TypeScript", "name": "TypeScript Type Check", "memory_mb": 1024, "expected_seconds": 60.0},
+        {"id": "F_ESLint", "name": "ESLint Quality", "memory_mb": 512, "expected_seconds": 30.0},
+        {"id": "B_Ruff", "name": "Ruff Lint & Format", "memory_mb": 128, "expected_seconds": 2.0},
+        {"id": "B_Pyright", "name": "Pyright Strict Types", "memory_mb": 768, "expected_seconds": 40.0},
+        {"id": "B_Lizard", "name": "Lizard Complexity", "memory_mb": 256, "expected_seconds": 10.0},
+    ]
+
     def __init__(
         self,
         project_path: str,
         mode: Literal["full", "incremental"],
         ws_manager: AnalysisNotifierPort,
         selected_tools: list[str] | None = None,
+        scheduler: AnalysisScheduler | None = None,
+        result_cache: ResultCache | None = None,
+        findings_store: ProjectFindingsStore | None = None,
+        sessions: dict[str, ToolSession] | None = None,
+        duration_history: DurationHistory | None = None,
     ) -> None:
         self.project_path = Path(project_path)
         self.mode = mode
         self.ws_manager = ws_manager
         self.selected_tools = selected_tools
-        # Semaphore for resource control
-        self.analysis_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANALYSIS)
+        # CRITICAL: Shared host-wide scheduler for resource control (one budget for all projects)
+        self.scheduler = scheduler or get_scheduler()
+        # Content-addressed cache for full-mode module results (shared across runs)
+        self.result_cache = result_cache or get_result_cache()
+        # Per-file findings of this project, so incremental runs still report the whole project
+        self.findings_store = findings_store or get_findings_store(project_path)
+        # Persistent tool sessions owned by the watcher (module_id -> session), used for incremental runs
+        self.sessions = sessions or {}
+        # Past module wall times of this project, for longest-first ordering and the ETA
+        self.duration_history = duration_history or get_duration_history()
         self.results: dict[str, str] = {}  # module_id -> PASS/FAIL
+        # State of the run in progress, used by supersede() (active_files is None for full runs)
+        self.active_files: list[str] | None = None
+        self.active_modules: list[AnalysisModule] = []
+        self.module_tasks: dict[str, asyncio.Task[str]] = {}
+        self.finished_modules: set[str] = set()
+        self.stale_modules: set[str] = set()
+        self.superseded_modules: set[str] = set()
 
     async def get_modified_files(self) -> list[str]:
         """
@@ -76,29 +111,42 @@ class AnalysisOrchestrator:
             logger.error(f"Failed to get modified files: {e}")
             return []
 
+    def get_module_configs(self) -> list[dict[str, Any]]:
+        """Configs of the selected modules (all modules if no selection was given)"""
+        if self.selected_tools:
+            return [m for m in self.MODULE_CONFIGS if m["id"] in self.selected_tools]
+        return self.MODULE_CONFIGS
+
+    def expected_durations(self, files: list[str] | None) -> dict[str, tuple[float, bool]]:
+        """module_id -> (expected seconds, whether it comes from this project's history)"""
+        kind = "full" if files is None else "incremental"
+        durations: dict[str, tuple[float, bool]] = {}
+        for config in self.get_module_configs():
+            known = self.duration_history.expected(str(self.project_path), config["id"], kind)
+            durations[config["id"]] = (known, True) if known is not None else (config["expected_seconds"], False)
+        return durations
+
+    def estimate_eta(self, files: list[str] | None) -> float | None:
+        """Expected wall time of the run, or None until every module has a history"""
+        durations = self.expected_durations(files)
+        if not durations or not all(known for _, known in durations.values()):
+            return None
+        return estimate_makespan([seconds for seconds, _ in durations.values()], self.scheduler.max_slots)
+
     async def run_parallel_modules(self, files: list[str] | None = None) -> dict[str, str]:
         """
         Execute all modules with STRICT CONCURRENCY CONTROL (Mission Critical)
-        Uses Semaphore to prevent RAM exhaustion on local machine
+        Every module is a job on the host-wide scheduler to prevent RAM exhaustion
+        Longest-expected modules are admitted first (LPT) to shorten the critical path
         Returns dict of module_id -> status (PASS/FAIL)
         """
-        # Define 8 core modules (static analysis only)
-        all_module_configs = [
-            {"id": "F_TypeScript", "name": "TypeScript Type Check"},
-            {"id": "F_ESLint", "name": "ESLint Quality"},
-            {"id": "B_Ruff", "name": "Ruff Lint & Format"},
-            {"id": "B_Pyright", "name": "Pyright Strict Types"},
-            {"id": "B_Lizard", "name": "Lizard Complexity"},
-        ]
-
-        # Filter modules if selected_tools is provided
-        if self.selected_tools:
-            module_configs = [m for m in all_module_configs if m["id"] in self.selected_tools]
-        else:
-            module_configs = all_module_configs
+        expected = self.expected_durations(files)
+        module_configs = sorted(self.get_module_configs(), key=lambda m: -expected[m["id"]][0])
+        kind = "full" if files is None else "incremental"
 
         # Create all module instances
         modules: list[AnalysisModule] = []
+        memory_estimates: dict[str, int] = {}
         for config in module_configs:
             module_class = MODULE_CLASSES.get(config["id"])
             if module_class:
@@ -107,35 +155,69 @@ class AnalysisOrchestrator:
                     name=config["name"],
                     project_path=str(self.project_path),
                     ws_manager=self.ws_manager,
+                    result_cache=self.result_cache,
+                    findings_store=self.findings_store,
+                    session=self.sessions.get(config["id"]),
+                    scheduler=self.scheduler,
+                    memory_mb=config["memory_mb"],
                 )
                 modules.append(module)
+                memory_estimates[config["id"]] = config["memory_mb"]
 
-        async def run_module_with_semaphore(
+        async def run_module_with_slot(
             module: AnalysisModule,
         ) -> str | Literal["FAIL"]:
-            """Wrapper to enforce semaphore limit - CRITICAL FOR STABILITY"""
-            async with self.analysis_semaphore:
-                logger.info(
-                    f"🔓 Semaphore acquired for {module.module_id} (available: {self.analysis_semaphore._value})"
-                )
+            """Wrapper to enforce the scheduler's admission control - CRITICAL FOR STABILITY"""
+            async with self.scheduler.slot(
+                project=str(self.project_path),
+                module_id=module.module_id,
+                memory_mb=memory_estimates.get(module.module_id, 256),
+                priority=expected[module.module_id][0],
+            ):
                 try:
-                    result = await module.run(files)
-                    return result
+                    result, elapsed = await self._run_until_current(module)
                 except Exception as e:
                     logger.error(f"Module {module.module_id} failed: {e}")
                     return "FAIL"
                 finally:
-                    logger.info(f"🔒 Semaphore released for {module.module_id}")
-
-        # Launch all modules with semaphore protection
-        logger.info(f"🚀 Launching {len(modules)} modules (max {MAX_CONCURRENT_ANALYSIS} concurrent)")
-        tasks: list[asyncio.Task[str | Literal["FAIL"]]] = [
-            asyncio.create_task(run_module_with_semaphore(module)) for module in modules
-        ]
+                    self.finished_modules.add(module.module_id)
+                # Skipped runs and cache replays take next to no time and say nothing about the tool
+                if module.ran_tool and result != "SKIPPED":
+                    await asyncio.to_thread(
+                        self.duration_history.record, str(self.project_path), module.module_id, kind, elapsed
+                    )
+                return result
+
+        self.active_files = list(files) if files is not None else None
+        self.active_modules = modules
+        self.module_tasks.clear()
+        self.finished_modules.clear()
+        self.stale_modules.clear()
+
+        # Launch all modules through the shared scheduler
+        logger.info(f"🚀 Submitting {len(modules)} modules (max {self.scheduler.max_slots} concurrent host-wide)")
+        status_map = await self._gather_modules(modules, run_module_with_slot)
+
+        # Modules that finished before one of their inputs changed again run once more
+        while self.stale_modules:
+            stale = [module for module in modules if module.module_id in self.stale_modules]
+            self.stale_modules.clear()
+            self.finished_modules.difference_update(module.module_id for module in stale)
+            status_map.update(await self._gather_modules(stale, run_module_with_slot))
+
+        self.active_files = None
+        return {module.module_id: status_map[module.module_id] for module in modules}
+
+    async def _gather_modules(
+        self,
+        modules: list[AnalysisModule],
+        runner: Callable[[AnalysisModule], Coroutine[Any, Any, str]],
+    ) -> dict[str, str]:
+        tasks: list[asyncio.Task[str]] = [asyncio.create_task(runner(module)) for module in modules]
 
         try:
             # Wait for all tasks to complete
-            results: list[str | BaseException | Literal["FAIL"]] = await asyncio.gather(*tasks, return_exceptions=True)
+            results: list[str | BaseException] = await asyncio.gather(*tasks, return_exceptions=True)
         except asyncio.CancelledError:
             logger.info("🛑 Orchestrator cancelled, cancelling child modules...")
             for task in tasks:
@@ -146,7 +228,7 @@ class AnalysisOrchestrator:
             raise
 
         # Collect results
-        status_map: dict[str, str | Literal["FAIL"]] = {}
+        status_map: dict[str, str] = {}
         for module, result in zip(modules, results, strict=False):
             if isinstance(result, BaseException):
                 logger.error(f"Module {module.module_id} raised exception: {result}")
@@ -157,6 +239,62 @@ class AnalysisOrchestrator:
 
         return status_map
 
+    async def _run_until_current(self, module: AnalysisModule) -> tuple[str, float]:
+        """
+        Run the module on the current file set, restarting it whenever supersede() cancels it
+        Returns (status, seconds taken by the run that completed)
+        """
+        while True:
+            started = time.monotonic()
+            task = asyncio.create_task(module.run(self.active_files))
+            self.module_tasks[module.module_id] = task
+            try:
+                await asyncio.wait([task])
+            except asyncio.CancelledError:
+                # Stopped while restarting: the module still reports its cancellation
+                self.superseded_modules.discard(module.module_id)
+                module.restarting = False
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                raise
+            if task.cancelled() and module.module_id in self.superseded_modules:
+                self.superseded_modules.discard(module.module_id)
+                module.restarting = False
+                await self.ws_manager.send_log(
+                    module.module_id, f"♻️ Inputs changed, restarting on {len(self.active_files or [])} file(s)"
+                )
+                continue
+            return task.result(), time.monotonic() - started
+
+    def supersede(self, files: list[str]) -> list[str]:
+        """
+        Fold files that changed again during an incremental run into that run
+        Only applies when one of them is being analysed right now. Affected modules that are
+        running restart on the merged file set, finished ones run again at the end, queued ones
+        simply pick the merged set up; untouched modules keep running.
+        Returns the files the run absorbed (empty if they must be analysed by a later run).
+        """
+        if self.active_files is None or not set(files) & set(self.active_files):
+            return []
+        # A new list: runs still in flight keep the file set they were started with
+        self.active_files = [*self.active_files, *(f for f in files if f not in self.active_files)]
+
+        for module in self.active_modules:
+            if not module.is_affected_by(files):
+                continue
+            task = self.module_tasks.get(module.module_id)
+            if task is not None and not task.done():
+                self.superseded_modules.add(module.module_id)
+                module.restarting = True
+                task.cancel()
+            elif module.module_id in self.finished_modules or (
+                task is not None and module.module_id not in self.superseded_modules
+            ):
+                # Finished, or done and about to be marked finished: run again at the end
+                self.stale_modules.add(module.module_id)
+        logger.info(f"♻️ Superseding stale analysis of {len(files)} file(s)")
+        return list(files)
+
     def calculate_final_status(self, module_results: dict[str, str]) -> Literal["PASS", "FAIL"]:
         """
         Calculate overall status based on module results
@@ -178,9 +316,6 @@ class AnalysisOrchestrator:
         """
         logger.info("Orchestrator execution started")
         try:
-            # Send global INIT
-            await self.ws_manager.send_global_init()
-
             # Step 1: Determine files to analyze
             modified_files: list[str] | None = None
 
@@ -197,6 +332,15 @@ class AnalysisOrchestrator:
                             f"🔍 Incremental analysis on {len(modified_files)} git-detected file(s): {modified_files}"
                         )
 
+            if self.mode == "incremental" and not modified_files:
+                modified_files = None
+
+            # Send global INIT with the expected wall time of this run
+            eta_seconds = self.estimate_eta(modified_files)
+            await self.ws_manager.send_global_init(eta_seconds)
+            if eta_seconds is not None:
+                await self.ws_manager.broadcast_raw({"type": "LOG", "message": f"⏱️ Estimated time: {eta_seconds:.0f}s"})
+
             if self.mode == "incremental" and modified_files:
                 await self.ws_manager.broadcast_raw(
                     {
@@ -212,11 +356,9 @@ class AnalysisOrchestrator:
                         "message": "✨ No modified files detected, running full analysis",
                     }
                 )
-                modified_files = None
             else:
                 logger.info("🔍 Full analysis mode")
                 await self.ws_manager.broadcast_raw({"type": "LOG", "message": "🔍 Full analysis mode"})
-                modified_files = None
 
             # Step 2: Run all modules in parallel
             module_results = await self.run_parallel_modules(modified_files)
@@ -0,0 +1,131 @@
+"""
+Bounded Output Capture
+Keeps what a tool prints with a fixed memory footprint: the head stays in memory, the rest
+is spooled to an anonymous temp file, and once the per-module byte budget is spent only a
+rolling tail is kept, so summary footers survive while the middle is dropped and reported.
+"""
+
+import codecs
+import mmap
+import os
+import tempfile
+from collections import deque
+from collections.abc import Iterator
+from typing import IO
+
+# Bytes kept in memory before spooling to disk
+DEFAULT_MEMORY_BYTES = 256 * 1024
+# Hard cap on bytes kept per module run (stdout and stderr share it)
+DEFAULT_BUDGET_BYTES = 64 * 1024 * 1024
+# Bytes of the latest output always kept once over budget (tool summaries are printed last)
+TAIL_BYTES = 64 * 1024
+READ_BLOCK_BYTES = 1024 * 1024
+
+
+class OutputCapture:
+    """Captured output of one pipe: memory head, disk spool, then a rolling tail past the budget"""
+
+    def __init__(
+        self,
+        memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        tail_bytes: int = TAIL_BYTES,
+    ) -> None:
+        self.memory_bytes = memory_bytes
+        self.tail_bytes = min(tail_bytes, budget_bytes)
+        # Head and spool together stop where the tail's share of the budget begins
+        self.body_bytes = max(0, budget_bytes - self.tail_bytes)
+        self.total_bytes = 0
+        self.truncated_bytes = 0
+        self._head: list[bytes] = []
+        self._head_size = 0
+        self._spool: IO[bytes] | None = None
+        self._spool_size = 0
+        self._tail: deque[bytes] = deque()
+        self._tail_size = 0
+
+    @property
+    def truncated(self) -> bool:
+        return self.truncated_bytes > 0
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self.total_bytes += len(data)
+        kept = self._head_size + self._spool_size
+        if kept < self.body_bytes:
+            body, data = data[: self.body_bytes - kept], data[self.body_bytes - kept :]
+            self._write_body(body)
+        if data:
+            self._write_tail(data)
+
+    def _write_body(self, data: bytes) -> None:
+        room = self.memory_bytes - self._head_size
+        if room > 0:
+            self._head.append(data[:room])
+            self._head_size += len(data[:room])
+            data = data[room:]
+        if data:
+            if self._spool is None:
+                self._spool = tempfile.TemporaryFile(prefix="qg-output-")
+            self._spool.write(data)
+            self._spool_size += len(data)
+
+    def _write_tail(self, data: bytes) -> None:
+        self._tail.append(data)
+        self._tail_size += len(data)
+        excess = self._tail_size - self.tail_bytes
+        while excess > 0:
+            first = self._tail[0]
+            if len(first) <= excess:
+                self._tail.popleft()
+                dropped = len(first)
+            else:
+                # Cut on a character boundary (skip UTF-8 continuation bytes)
+                cut = excess
+                while cut < len(first) and first[cut] & 0xC0 == 0x80:
+                    cut += 1
+                self._tail[0] = first[cut:]
+                dropped = cut
+            self._tail_size -= dropped
+            self.truncated_bytes += dropped
+            excess -= dropped
+
+    def iter_chunks(self) -> Iterator[str]:
+        """Decoded output in order, reading the spool through mmap one block at a time"""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for data in self._head:
+            yield decoder.decode(data)
+        if self._spool is not None and self._spool_size:
+            self._spool.flush()
+            with mmap.mmap(self._spool.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                for start in range(0, self._spool_size, READ_BLOCK_BYTES):
+                    yield decoder.decode(view[start : start + READ_BLOCK_BYTES])
+        if self.truncated:
+            yield decoder.decode(b"", final=True)
+            yield f"\n… [{self.truncated_bytes} bytes truncated] …\n"
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for data in self._tail:
+            yield decoder.decode(data)
+        yield decoder.decode(b"", final=True)
+
+    def getvalue(self) -> str:
+        return "".join(self.iter_chunks())
+
+    def close(self) -> None:
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+
+def create_output_captures() -> tuple[OutputCapture, OutputCapture]:
+    """(stdout, stderr) captures of one command, sized from OUTPUT_CAPTURE_MEMORY_KB / OUTPUT_CAPTURE_BUDGET_MB"""
+    memory_env = os.environ.get("OUTPUT_CAPTURE_MEMORY_KB")
+    budget_env = os.environ.get("OUTPUT_CAPTURE_BUDGET_MB")
+    memory_bytes = int(memory_env) * 1024 if memory_env else DEFAULT_MEMORY_BYTES
+    budget_bytes = int(budget_env) * 1024 * 1024 if budget_env else DEFAULT_BUDGET_BYTES
+    # Reports go to stdout; stderr only carries diagnostics, so it gets a quarter
+    stderr_budget = budget_bytes // 4
+    return (
+        OutputCapture(memory_bytes, budget_bytes - stderr_budget),
+        OutputCapture(memory_bytes // 4, stderr_budget),
+    )
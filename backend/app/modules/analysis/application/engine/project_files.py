@@ -0,0 +1,115 @@
+"""
+Project File Discovery
+Shared walk over a project tree that prunes dependency, cache and build folders
+before descending into them.
+"""
+
+import hashlib
+import os
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+# Directories that never contain first-party sources
+IGNORED_DIRECTORIES = frozenset(
+    {
+        "node_modules",
+        ".git",
+        "__pycache__",
+        ".venv",
+        "venv",
+        "env",
+        "dist",
+        "build",
+        ".next",
+        ".cache",
+        "coverage",
+        ".pytest_cache",
+        ".mypy_cache",
+        ".ruff_cache",
+        ".tox",
+        "htmlcov",
+        "eggs",
+        ".eggs",
+        "tmp",
+        "temp",
+        ".tmp",
+    }
+)
+
+# Hidden directories that still hold relevant sources/config
+ALLOWED_HIDDEN_DIRECTORIES = frozenset({".github", ".gitlab"})
+
+# Dependency lockfiles: installed plugins, type stubs and packages change tool results
+LOCK_FILES = ("package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "uv.lock")
+
+
+def is_ignored_directory(name: str) -> bool:
+    """True for folders the analysis never descends into"""
+    if name in IGNORED_DIRECTORIES:
+        return True
+    return name.startswith(".") and name not in ALLOWED_HIDDEN_DIRECTORIES
+
+
+def iter_project_files(
+    root: Path,
+    extensions: Iterable[str] = (),
+    names: Iterable[str] = (),
+    is_ignored: Callable[[str], bool] = is_ignored_directory,
+) -> Iterator[Path]:
+    """
+    Yield files under root whose suffix is in extensions or whose name is in names
+    Ignored directories are pruned before descending, so dependency trees cost nothing
+    """
+    suffixes = tuple(extensions)
+    file_names = frozenset(names)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not is_ignored(d))
+        for filename in sorted(filenames):
+            if filename in file_names or (suffixes and filename.endswith(suffixes)):
+                yield Path(dirpath) / filename
+
+
+def balance_shards(weighted: Iterable[tuple[int, str]], shard_count: int) -> list[list[str]]:
+    """Spread weighted items over shards, heaviest first onto the lightest shard"""
+    items = sorted(weighted, key=lambda item: item[0], reverse=True)
+    shards: list[list[str]] = [[] for _ in range(max(1, min(shard_count, len(items))))]
+    loads = [0] * len(shards)
+    for weight, item in items:
+        lightest = loads.index(min(loads))
+        shards[lightest].append(item)
+        loads[lightest] += weight
+    return [shard for shard in shards if shard]
+
+
+class FileHasher:
+    """Content digests memoised on (mtime, size), so unchanged files are read only once"""
+
+    def __init__(self) -> None:
+        self._digests: dict[str, tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def digest(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path)
+        with self._lock:
+            known = self._digests.get(key)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2]
+
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "blake2b").hexdigest()
+        with self._lock:
+            self._digests[key] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+
+_file_hasher: FileHasher | None = None
+
+
+def get_file_hasher() -> FileHasher:
+    """Process-wide hasher shared by the result cache and the findings store"""
+    global _file_hasher
+    if _file_hasher is None:
+        _file_hasher = FileHasher()
+    return _file_hasher
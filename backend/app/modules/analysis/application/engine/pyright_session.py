@@ -0,0 +1,343 @@
+"""
+Persistent Pyright Session
+Drives one `pyright-langserver --stdio` per watched project over LSP. Saved files are
+pushed as didOpen/didChange/didSave notifications and the published diagnostics are
+rendered in pyright's CLI text format, so summaries and METRICS work unchanged.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import shutil
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any, cast
+
+from .sessions import ToolOutput, ToolSession
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_NAMES = {1: "error", 2: "warning", 3: "information"}
+# Quiet period after the last publish before diagnostics are considered final
+DIAGNOSTICS_SETTLE_SECONDS = 0.15
+CHECK_TIMEOUT_SECONDS = 20.0
+INITIALIZE_TIMEOUT_SECONDS = 60.0
+
+
+class JsonRpcStdioClient:
+    """Minimal JSON-RPC 2.0 client using LSP Content-Length framing over a child's stdio"""
+
+    def __init__(
+        self,
+        cmd: list[str],
+        cwd: Path,
+        on_notification: Callable[[str, Any], None],
+        on_request: Callable[[str, Any], Awaitable[Any]],
+    ) -> None:
+        self.cmd = cmd
+        self.cwd = cwd
+        self.on_notification = on_notification
+        self.on_request = on_request
+        self.process: asyncio.subprocess.Process | None = None
+        self._pending: dict[int, asyncio.Future[Any]] = {}
+        self._next_id = 0
+        self._reader_task: asyncio.Task[None] | None = None
+        self._stderr_task: asyncio.Task[None] | None = None
+        self._write_lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            *self.cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=str(self.cwd),
+        )
+        self._reader_task = asyncio.create_task(self._read_loop())
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+
+    async def request(self, method: str, params: Any, timeout: float) -> Any:  # noqa: ANN401
+        self._next_id += 1
+        request_id = self._next_id
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._write({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def notify(self, method: str, params: Any) -> None:  # noqa: ANN401
+        await self._write({"jsonrpc": "2.0", "method": method, "params": params})
+
+    async def close(self) -> None:
+        if self.process and self.process.returncode is None:
+            with contextlib.suppress(Exception):
+                await self.request("shutdown", None, timeout=2.0)
+                await self.notify("exit", None)
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=2.0)
+            except TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        for task in (self._reader_task, self._stderr_task):
+            if task and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._fail_pending(ConnectionError("language server closed"))
+
+    async def _write(self, message: dict[str, Any]) -> None:
+        if not self.process or not self.process.stdin:
+            raise ConnectionError("language server not running")
+        body = json.dumps(message).encode("utf-8")
+        async with self._write_lock:
+            self.process.stdin.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+            await self.process.stdin.drain()
+
+    async def _read_loop(self) -> None:
+        assert self.process and self.process.stdout
+        stdout = self.process.stdout
+        try:
+            while True:
+                length = 0
+                while True:
+                    header = await stdout.readline()
+                    if not header:
+                        return
+                    header = header.strip()
+                    if not header:
+                        break
+                    name, _, value = header.decode("ascii").partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value.strip())
+                message = json.loads(await stdout.readexactly(length))
+                await self._dispatch(message)
+        except (asyncio.IncompleteReadError, ValueError) as e:
+            logger.warning(f"Language server stream ended: {e}")
+        finally:
+            self._fail_pending(ConnectionError("language server exited"))
+
+    async def _dispatch(self, message: dict[str, Any]) -> None:
+        if "id" in message and ("result" in message or "error" in message):
+            future = self._pending.get(message["id"])
+            if future and not future.done():
+                if "error" in message:
+                    future.set_exception(RuntimeError(str(message["error"])))
+                else:
+                    future.set_result(message.get("result"))
+        elif "id" in message:
+            result = await self.on_request(message["method"], message.get("params"))
+            await self._write({"jsonrpc": "2.0", "id": message["id"], "result": result})
+        elif "method" in message:
+            self.on_notification(message["method"], message.get("params"))
+
+    async def _drain_stderr(self) -> None:
+        assert self.process and self.process.stderr
+        while line := await self.process.stderr.readline():
+            logger.debug(f"[langserver] {line.decode('utf-8', errors='replace').rstrip()}")
+
+    def _fail_pending(self, error: Exception) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+
+class PyrightLanguageServerSession(ToolSession):
+    """B_Pyright served by a long-lived pyright-langserver"""
+
+    name = "Pyright language server"
+
+    def __init__(self, project_path: str | Path, command: list[str] | None = None) -> None:
+        super().__init__(project_path)
+        self.command = command or ["pyright-langserver", "--stdio"]
+        self.client: JsonRpcStdioClient | None = None
+        self._start_lock = asyncio.Lock()
+        self._published = asyncio.Condition()
+        self._notify_tasks: set[asyncio.Task[None]] = set()
+        self._publish_count = 0
+        self._diagnostics: dict[str, list[dict[str, Any]]] = {}
+        self._published_at: dict[str, int] = {}  # uri -> publish counter of the latest publish
+        self._published_versions: dict[str, int | None] = {}  # uri -> document version of the latest publish
+        self._synced_at: dict[str, int] = {}  # uri -> publish counter when its content was last sent
+        self._versions: dict[str, int] = {}
+        self._content_hashes: dict[str, str] = {}
+        self._paths: dict[str, Path] = {}
+
+    @classmethod
+    def is_available(cls, project_path: Path) -> bool:
+        return shutil.which("pyright-langserver") is not None
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self.client and self.client.is_running:
+                return
+            self._reset_documents()
+            client = JsonRpcStdioClient(self.command, self.project_path, self._on_notification, self._on_request)
+            await client.start()
+            root_uri = self.project_path.resolve().as_uri()
+            try:
+                await client.request(
+                    "initialize",
+                    {
+                        "processId": None,
+                        "rootUri": root_uri,
+                        "workspaceFolders": [{"uri": root_uri, "name": self.project_path.name}],
+                        "capabilities": {"textDocument": {"publishDiagnostics": {"versionSupport": True}}},
+                    },
+                    timeout=INITIALIZE_TIMEOUT_SECONDS,
+                )
+                await client.notify("initialized", {})
+            except BaseException:
+                # Failed or cancelled handshake: the server is not reachable through self.client yet
+                await client.close()
+                raise
+            self.client = client
+            logger.info(f"⚡ Pyright language server ready for {self.project_path}")
+
+    async def stop(self) -> None:
+        async with self._start_lock:
+            if self.client:
+                await self.client.close()
+                self.client = None
+
+    async def notify_changed(self, files: list[str]) -> None:
+        if self.client and self.client.is_running:
+            try:
+                await self._sync(self._python_files(files))
+            except (OSError, ConnectionError) as e:
+                logger.warning(f"Pyright session sync failed: {e}")
+
+    async def check(self, files: list[str]) -> ToolOutput | None:
+        py_files = self._python_files(files)
+        try:
+            await self.start()
+            uris = await self._sync(py_files)
+            await asyncio.wait_for(self._wait_for_diagnostics(uris), timeout=CHECK_TIMEOUT_SECONDS)
+        except (OSError, ConnectionError, RuntimeError, TimeoutError) as e:
+            logger.warning(f"Pyright session check failed, falling back to CLI: {e}")
+            await self.stop()
+            return None
+        return self._render(uris)
+
+    def _python_files(self, files: list[str]) -> list[str]:
+        return [f for f in files if f.endswith((".py", ".pyi"))]
+
+    def _reset_documents(self) -> None:
+        self._diagnostics.clear()
+        self._published_at.clear()
+        self._published_versions.clear()
+        self._synced_at.clear()
+        self._versions.clear()
+        self._content_hashes.clear()
+        self._paths.clear()
+
+    async def _sync(self, files: list[str]) -> list[str]:
+        """Push current file contents to the server; returns the URIs that exist on disk"""
+        assert self.client is not None
+        uris: list[str] = []
+        for file in files:
+            path = (self.project_path / file).resolve()
+            uri = path.as_uri()
+            try:
+                text = path.read_text(encoding="utf-8")
+            except OSError:
+                if uri in self._versions:
+                    await self.client.notify("textDocument/didClose", {"textDocument": {"uri": uri}})
+                    self._versions.pop(uri, None)
+                    self._content_hashes.pop(uri, None)
+                continue
+
+            uris.append(uri)
+            self._paths[uri] = path
+            content_hash = hashlib.blake2b(text.encode("utf-8")).hexdigest()
+            if self._content_hashes.get(uri) == content_hash:
+                continue
+            self._content_hashes[uri] = content_hash
+            self._synced_at[uri] = self._publish_count
+            if uri not in self._versions:
+                self._versions[uri] = 1
+                await self.client.notify(
+                    "textDocument/didOpen",
+                    {"textDocument": {"uri": uri, "languageId": "python", "version": 1, "text": text}},
+                )
+            else:
+                self._versions[uri] += 1
+                await self.client.notify(
+                    "textDocument/didChange",
+                    {
+                        "textDocument": {"uri": uri, "version": self._versions[uri]},
+                        "contentChanges": [{"text": text}],
+                    },
+                )
+            await self.client.notify("textDocument/didSave", {"textDocument": {"uri": uri}})
+        return uris
+
+    def _is_fresh(self, uri: str) -> bool:
+        version = self._published_versions.get(uri)
+        if version is not None:
+            return version == self._versions.get(uri)
+        return self._published_at.get(uri, -1) >= self._synced_at.get(uri, 0)
+
+    async def _wait_for_diagnostics(self, uris: list[str]) -> None:
+        async with self._published:
+            await self._published.wait_for(lambda: all(self._is_fresh(uri) for uri in uris))
+            # Pyright may publish in several passes; wait until it goes quiet
+            while True:
+                seen = self._publish_count
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._published.wait(), timeout=DIAGNOSTICS_SETTLE_SECONDS)
+                if self._publish_count == seen:
+                    return
+
+    def _on_notification(self, method: str, params: Any) -> None:  # noqa: ANN401
+        if method != "textDocument/publishDiagnostics" or not isinstance(params, dict):
+            return
+        publish = cast(dict[str, Any], params)
+        uri: str = publish["uri"]
+        self._publish_count += 1
+        self._diagnostics[uri] = publish.get("diagnostics", [])
+        self._published_at[uri] = self._publish_count
+        self._published_versions[uri] = publish.get("version")
+        task = asyncio.create_task(self._notify_waiters())
+        self._notify_tasks.add(task)
+        task.add_done_callback(self._notify_tasks.discard)
+
+    async def _notify_waiters(self) -> None:
+        async with self._published:
+            self._published.notify_all()
+
+    async def _on_request(self, method: str, params: Any) -> Any:  # noqa: ANN401
+        if method == "workspace/configuration" and isinstance(params, dict):
+            configuration = cast(dict[str, Any], params)
+            items: list[Any] = configuration.get("items", [])
+            return [{} for _ in items]
+        return None
+
+    def _render(self, uris: list[str]) -> ToolOutput:
+        """Diagnostics rendered exactly like `pyright` CLI text output"""
+        counts = {"error": 0, "warning": 0, "information": 0}
+        lines: list[str] = []
+        for uri in uris:
+            diagnostics = [d for d in self._diagnostics.get(uri, []) if d.get("severity", 1) in SEVERITY_NAMES]
+            if not diagnostics:
+                continue
+            file_path = self._paths[uri]
+            lines.append(str(file_path))
+            for diagnostic in diagnostics:
+                severity = SEVERITY_NAMES[diagnostic.get("severity", 1)]
+                counts[severity] += 1
+                start = diagnostic["range"]["start"]
+                position = f"{start['line'] + 1}:{start['character'] + 1}"
+                message = str(diagnostic.get("message", "")).replace("\n", "\n    ")
+                rule = f" ({diagnostic['code']})" if diagnostic.get("code") else ""
+                lines.append(f"  {file_path}:{position} - {severity}: {message}{rule}")
+        lines.append(f"{counts['error']} errors, {counts['warning']} warnings, {counts['information']} informations ")
+        return ToolOutput("\n".join(lines) + "\n", "", 1 if counts["error"] else 0)
@@ -0,0 +1,250 @@
+"""
+Host-wide Analysis Scheduler
+Every orchestrator (ad-hoc runs and Live Watch) submits its module jobs here, so the
+number of concurrent tool processes is bounded per backend process instead of per run.
+Admission control checks free CPU cores and free memory before a job may start.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Global slot count (overridable per deployment)
+DEFAULT_MAX_SLOTS = 3
+# Memory kept free for the backend itself and the browser-facing side
+DEFAULT_MEMORY_RESERVE_MB = 256
+# Assumed footprint of a tool process when the caller gives no estimate
+DEFAULT_JOB_MEMORY_MB = 256
+# Tool processes take a while to reach their peak RSS; until then their
+# reservation is subtracted from the measured free memory
+RAMP_UP_SECONDS = 10.0
+# Re-check interval while jobs wait on resources rather than on slots
+RESOURCE_POLL_INTERVAL = 0.5
+
+
+class ResourceProbe:
+    """Reads free CPU and memory, honouring cgroup v2 limits inside containers"""
+
+    def cpu_count(self) -> int:
+        try:
+            return len(os.sched_getaffinity(0))
+        except (AttributeError, OSError):
+            return os.cpu_count() or 1
+
+    def load_average(self) -> float:
+        try:
+            return os.getloadavg()[0]
+        except OSError:
+            return 0.0
+
+    def available_memory_mb(self) -> int | None:
+        cgroup_free = self._cgroup_available_mb()
+        host_free = self._meminfo_available_mb()
+        candidates = [value for value in (cgroup_free, host_free) if value is not None]
+        return min(candidates) if candidates else None
+
+    def _cgroup_available_mb(self) -> int | None:
+        try:
+            limit = Path("/sys/fs/cgroup/memory.max").read_text().strip()
+            current = Path("/sys/fs/cgroup/memory.current").read_text().strip()
+        except OSError:
+            return None
+        if limit == "max":
+            return None
+        return max(int(limit) - int(current), 0) // (1024 * 1024)
+
+    def _meminfo_available_mb(self) -> int | None:
+        try:
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) // 1024
+        except (OSError, ValueError, IndexError):
+            return None
+        return None
+
+
+@dataclass
+class ScheduledJob:
+    job_id: int
+    project: str
+    module_id: str
+    memory_mb: int
+    priority: float = 0.0
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    future: "asyncio.Future[None] | None" = None
+
+    def to_dict(self, now: float) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "job_id": self.job_id,
+            "project": self.project,
+            "module": self.module_id,
+            "memory_mb": self.memory_mb,
+            "priority": self.priority,
+        }
+        if self.started_at is None:
+            data["waiting_s"] = round(now - self.submitted_at, 3)
+        else:
+            data["waited_s"] = round(self.started_at - self.submitted_at, 3)
+            data["running_s"] = round(now - self.started_at, 3)
+        return data
+
+
+class AnalysisScheduler:
+    """
+    Process-wide admission controller for tool subprocesses
+    A job is admitted when a global slot is free AND the host has a spare core and
+    enough memory for the job's estimate. With nothing running, the head job is
+    always admitted so a busy host can never starve analysis completely.
+    """
+
+    def __init__(
+        self,
+        max_slots: int = DEFAULT_MAX_SLOTS,
+        memory_reserve_mb: int = DEFAULT_MEMORY_RESERVE_MB,
+        probe: ResourceProbe | None = None,
+    ) -> None:
+        self.max_slots = max(1, max_slots)
+        self.memory_reserve_mb = memory_reserve_mb
+        self.probe = probe or ResourceProbe()
+        self.queued: list[ScheduledJob] = []
+        self.running: dict[int, ScheduledJob] = {}
+        self._ids = itertools.count(1)
+        self._recheck_handle: asyncio.TimerHandle | None = None
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        project: str,
+        module_id: str,
+        memory_mb: int = DEFAULT_JOB_MEMORY_MB,
+        priority: float = 0.0,
+    ) -> AsyncGenerator[ScheduledJob, None]:
+        """Wait for admission, hold the slot for the duration of the block"""
+        job = ScheduledJob(
+            job_id=next(self._ids),
+            project=project,
+            module_id=module_id,
+            memory_mb=memory_mb,
+            priority=priority,
+        )
+        job.future = asyncio.get_running_loop().create_future()
+        self.queued.append(job)
+        self.queued.sort(key=lambda j: (-j.priority, j.job_id))
+        self._dispatch()
+
+        try:
+            await job.future
+        except asyncio.CancelledError:
+            if job in self.queued:
+                self.queued.remove(job)
+            self.running.pop(job.job_id, None)
+            self._dispatch()
+            raise
+
+        logger.info(
+            f"🔓 Slot granted to {project}:{module_id} "
+            f"({len(self.running)}/{self.max_slots} running, {len(self.queued)} queued)"
+        )
+        try:
+            yield job
+        finally:
+            self.running.pop(job.job_id, None)
+            logger.info(f"🔒 Slot released by {project}:{module_id}")
+            self._dispatch()
+
+    def try_acquire(
+        self,
+        project: str,
+        module_id: str,
+        memory_mb: int = DEFAULT_JOB_MEMORY_MB,
+    ) -> ScheduledJob | None:
+        """Take a slot only if one is free right now without overtaking queued jobs; never waits"""
+        if self.queued or len(self.running) >= self.max_slots:
+            return None
+        job = ScheduledJob(job_id=next(self._ids), project=project, module_id=module_id, memory_mb=memory_mb)
+        if self.running and not self._has_resources_for(job):
+            return None
+        job.started_at = time.time()
+        self.running[job.job_id] = job
+        return job
+
+    def release(self, job: ScheduledJob) -> None:
+        """Return a slot taken with try_acquire()"""
+        if self.running.pop(job.job_id, None) is not None:
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit queued jobs in priority order while slots and resources allow"""
+        while self.queued and len(self.running) < self.max_slots:
+            head = self.queued[0]
+            if self.running and not self._has_resources_for(head):
+                self._schedule_recheck()
+                return
+            self.queued.pop(0)
+            head.started_at = time.time()
+            self.running[head.job_id] = head
+            if head.future and not head.future.done():
+                head.future.set_result(None)
+
+    def _has_resources_for(self, job: ScheduledJob) -> bool:
+        busy_cores = max(self.probe.load_average(), float(len(self.running)))
+        if self.probe.cpu_count() - busy_cores < 1:
+            return False
+
+        available_mb = self.probe.available_memory_mb()
+        if available_mb is None:
+            return True
+        now = time.time()
+        ramping_mb = sum(
+            j.memory_mb for j in self.running.values() if j.started_at and now - j.started_at < RAMP_UP_SECONDS
+        )
+        return available_mb - ramping_mb - self.memory_reserve_mb >= job.memory_mb
+
+    def _schedule_recheck(self) -> None:
+        if self._recheck_handle and not self._recheck_handle.cancelled():
+            self._recheck_handle.cancel()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._recheck_handle = loop.call_later(RESOURCE_POLL_INTERVAL, self._dispatch)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Queued and running jobs plus the resource view used for admission"""
+        now = time.time()
+        return {
+            "max_slots": self.max_slots,
+            "memory_reserve_mb": self.memory_reserve_mb,
+            "running": [job.to_dict(now) for job in self.running.values()],
+            "queued": [job.to_dict(now) for job in self.queued],
+            "resources": {
+                "cpu_count": self.probe.cpu_count(),
+                "load_average": round(self.probe.load_average(), 2),
+                "available_memory_mb": self.probe.available_memory_mb(),
+            },
+        }
+
+
+_scheduler: AnalysisScheduler | None = None
+
+
+def get_scheduler() -> AnalysisScheduler:
+    """Return the process-wide scheduler, configured from the environment on first use"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = AnalysisScheduler(
+            max_slots=int(os.environ.get("ANALYSIS_MAX_SLOTS", DEFAULT_MAX_SLOTS)),
+            memory_reserve_mb=int(os.environ.get("ANALYSIS_MEMORY_RESERVE_MB", DEFAULT_MEMORY_RESERVE_MB)),
+        )
+    return _scheduler
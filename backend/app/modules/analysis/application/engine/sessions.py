@@ -0,0 +1,58 @@
+"""
+Persistent Tool Sessions
+Long-lived tool processes that serve incremental checks for one watched project,
+so a save does not pay the tool's cold start again.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ToolOutput:
+    """Output of a check, shaped like a finished CLI run"""
+
+    stdout: str
+    stderr: str
+    exit_code: int
+
+
+class ToolSession(ABC):
+    """
+    A warm tool process bound to one project
+    check() returns None whenever the session cannot answer, and the module then
+    falls back to spawning its regular CLI command.
+    """
+
+    name = "tool session"
+
+    def __init__(self, project_path: str | Path) -> None:
+        self.project_path = Path(project_path)
+
+    @classmethod
+    def is_available(cls, project_path: Path) -> bool:
+        """Whether the tool can run as a session for this project at all"""
+        return True
+
+    @abstractmethod
+    async def start(self) -> None:
+        """Spawn and initialise the process (idempotent)"""
+        pass
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Terminate the process and release its resources"""
+        pass
+
+    async def notify_changed(self, files: list[str]) -> None:
+        """Tell the session about saved files (project-relative paths)"""
+        return None
+
+    @abstractmethod
+    async def check(self, files: list[str]) -> ToolOutput | None:
+        """Result for the given changed files, or None to fall back to the CLI"""
+        pass
@@ -0,0 +1,115 @@
+#!/usr/bin/env node
+/**
+ * Warm ESLint worker for the Quality Gate backend.
+ * Speaks JSON lines on stdin/stdout (see application/engine/workers.py) and keeps one
+ * ESLint instance per config directory, so plugins and configs are loaded only once.
+ */
+"use strict";
+
+const path = require("path");
+const readline = require("readline");
+
+const GLOBAL_MODULES = [
+  "/usr/local/lib/node_modules",
+  ...(process.env.NODE_PATH || "").split(path.delimiter).filter(Boolean),
+];
+
+// key (config dir + options) -> Promise<ESLint>
+const instances = new Map();
+
+function loadESLint(cwd) {
+  // Prefer the project's own eslint, like `npx eslint` does; fall back to the global install
+  const resolved = require.resolve("eslint", { paths: [cwd, ...GLOBAL_MODULES] });
+  return require(resolved).ESLint;
+}
+
+async function createInstance(params) {
+  const ESLint = loadESLint(params.cwd);
+  const options = { cwd: params.cwd, errorOnUnmatchedPattern: false };
+  try {
+    // eslintrc mode (ESLint <= 8), mirroring the CLI flags used by ESLintModule
+    const legacy = { ...options, extensions: params.extensions };
+    if (params.resolvePluginsRelativeTo) {
+      legacy.resolvePluginsRelativeTo = params.resolvePluginsRelativeTo;
+    }
+    return new ESLint(legacy);
+  } catch (error) {
+    // Flat config (ESLint >= 9) rejects eslintrc-only options
+    return new ESLint(options);
+  }
+}
+
+function getInstance(params) {
+  const key = JSON.stringify([params.cwd, params.resolvePluginsRelativeTo || null, params.configStamp || null]);
+  if (!instances.has(key)) {
+    for (const existing of instances.keys()) {
+      // A newer config stamp for the same directory replaces the stale instance
+      if (JSON.parse(existing)[0] === params.cwd) {
+        instances.delete(existing);
+      }
+    }
+    const instance = createInstance(params).catch((error) => {
+      instances.delete(key);
+      throw error;
+    });
+    instances.set(key, instance);
+  }
+  return instances.get(key);
+}
+
+async function handle(method, params) {
+  switch (method) {
+    case "ping":
+      return "pong";
+    case "lint": {
+      const eslint = await getInstance(params);
+      // Same objects `eslint --format json` serialises
+      return eslint.lintFiles(params.patterns);
+    }
+    case "reset":
+      instances.clear();
+      return true;
+    default:
+      throw new Error(`Unknown method: ${method}`);
+  }
+}
+
+function reply(message) {
+  process.stdout.write(JSON.stringify(message) + "\n");
+}
+
+const input = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+let inFlight = 0;
+let closing = false;
+
+input.on("line", async (line) => {
+  if (!line.trim()) {
+    return;
+  }
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (error) {
+    process.stderr.write(`Invalid request: ${error}\n`);
+    return;
+  }
+  inFlight += 1;
+  try {
+    reply({ id: request.id, result: await handle(request.method, request.params || {}) });
+  } catch (error) {
+    reply({ id: request.id, error: String((error && error.message) || error) });
+  } finally {
+    inFlight -= 1;
+    if (closing && inFlight === 0) {
+      process.exit(0);
+    }
+  }
+});
+
+// The backend going away closes stdin; finish in-flight requests, never outlive it
+input.on("close", () => {
+  closing = true;
+  if (inFlight === 0) {
+    process.exit(0);
+  }
+});
@@ -0,0 +1,217 @@
+"""
+Persistent tsc --watch Session
+Keeps one `tsc --watch --noEmit --incremental` alive per watched project and turns each
+"Found N errors. Watching for file changes." cycle into a module result, so a save costs
+tsc's incremental recheck instead of a cold compile.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .sessions import ToolOutput, ToolSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUILDINFO_DIR = "data/tsc-buildinfo"
+# tsc must start a recheck within this window, otherwise the change is outside its program
+CYCLE_START_TIMEOUT_SECONDS = 5.0
+CYCLE_FINISH_TIMEOUT_SECONDS = 300.0
+STARTUP_TIMEOUT_SECONDS = 600.0
+
+CYCLE_START_PATTERN = re.compile(
+    r" - (Starting compilation in watch mode|File change detected\. Starting incremental compilation)\.\.\.\s*$"
+)
+CYCLE_END_PATTERN = re.compile(r" - Found (\d+) errors?\. Watching for file changes\.\s*$")
+
+
+def find_tsconfig_project(project_path: Path) -> str | None:
+    """Argument for `tsc -p`: "." for a root tsconfig.json, else the first subdirectory holding one"""
+    if (project_path / "tsconfig.json").exists():
+        return "."
+    for path in sorted(project_path.iterdir()):
+        if path.is_dir() and (path / "tsconfig.json").exists():
+            return path.name
+    return None
+
+
+@dataclass
+class TscCycle:
+    """One compilation pass reported by tsc --watch"""
+
+    started_at: float
+    lines: list[str] = field(default_factory=list[str])
+    error_count: int | None = None  # None while the pass is still running
+
+    @property
+    def finished(self) -> bool:
+        return self.error_count is not None
+
+
+class TscWatchSession(ToolSession):
+    """F_TypeScript served by a long-lived tsc --watch"""
+
+    name = "tsc --watch"
+
+    def __init__(self, project_path: str | Path, command: list[str] | None = None) -> None:
+        super().__init__(project_path)
+        self.command = command or self._default_command()
+        self.process: asyncio.subprocess.Process | None = None
+        self.cycles: list[TscCycle] = []
+        self._reader_task: asyncio.Task[None] | None = None
+        self._start_lock = asyncio.Lock()
+        self._changed = asyncio.Condition()
+
+    @classmethod
+    def is_available(cls, project_path: Path) -> bool:
+        return shutil.which("npx") is not None and find_tsconfig_project(project_path) is not None
+
+    def _default_command(self) -> list[str]:
+        # Build info lives outside the watched project so tsc does not write into it
+        buildinfo_dir = Path(os.environ.get("TSC_BUILDINFO_DIR", DEFAULT_BUILDINFO_DIR)).resolve()
+        digest = hashlib.sha256(str(self.project_path.resolve()).encode("utf-8")).hexdigest()[:16]
+        return [
+            "env",
+            "NODE_OPTIONS=--max-old-space-size=4096",
+            "npx",
+            "tsc",
+            "--watch",
+            "--noEmit",
+            "--incremental",
+            "--tsBuildInfoFile",
+            str(buildinfo_dir / f"{digest}.tsbuildinfo"),
+            "--preserveWatchOutput",
+            "--pretty",
+            "false",
+            "-p",
+            find_tsconfig_project(self.project_path) or ".",
+        ]
+
+    @property
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self.is_running:
+                return
+            await self._close_process()
+            if "--tsBuildInfoFile" in self.command:
+                Path(self.command[self.command.index("--tsBuildInfoFile") + 1]).parent.mkdir(
+                    parents=True, exist_ok=True
+                )
+            self.cycles = []
+            self.process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                stdin=asyncio.subprocess.DEVNULL,
+                cwd=str(self.project_path),
+                limit=1024 * 1024,
+            )
+            self._reader_task = asyncio.create_task(self._read_cycles())
+            logger.info(f"⚡ tsc --watch started for {self.project_path}")
+
+    async def stop(self) -> None:
+        async with self._start_lock:
+            await self._close_process()
+
+    async def _close_process(self) -> None:
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=5.0)
+            except TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        if self._reader_task and not self._reader_task.done():
+            self._reader_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader_task
+        self.process = None
+        self._reader_task = None
+
+    async def check(self, files: list[str]) -> ToolOutput | None:
+        try:
+            await self.start()
+            cycle = await self._wait_for_cycle(self._changed_at(files))
+        except (OSError, ConnectionError, TimeoutError) as e:
+            logger.warning(f"tsc --watch could not serve the change, falling back to CLI: {e}")
+            return None
+        if cycle is None:
+            return None
+        stdout = "\n".join(cycle.lines) + "\n" if cycle.lines else ""
+        return ToolOutput(stdout, "", 1 if cycle.error_count else 0)
+
+    def _changed_at(self, files: list[str]) -> float:
+        """Latest mtime of the changed files; 0 when they are all gone (any finished pass will do)"""
+        mtimes: list[float] = []
+        for file in files:
+            with contextlib.suppress(OSError):
+                mtimes.append((self.project_path / file).stat().st_mtime)
+        return max(mtimes, default=0.0)
+
+    def _accepting_cycle(self, changed_at: float) -> TscCycle | None:
+        """First pass that started after the change, i.e. one that saw the saved content"""
+        for cycle in self.cycles:
+            if cycle.started_at >= changed_at:
+                return cycle
+        return None
+
+    async def _wait_for_cycle(self, changed_at: float) -> TscCycle | None:
+        # The very first pass is a cold compile; give it the startup budget
+        start_timeout = STARTUP_TIMEOUT_SECONDS if not self.cycles else CYCLE_START_TIMEOUT_SECONDS
+        async with self._changed:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait_for(
+                            lambda: not self.is_running or self._accepting_cycle(changed_at) is not None
+                        ),
+                        timeout=start_timeout,
+                    )
+                    break
+                except TimeoutError:
+                    # tsc queues the change behind a pass that is still running; keep waiting for it
+                    if not self.cycles or self.cycles[-1].finished:
+                        raise
+            cycle = self._accepting_cycle(changed_at)
+            if cycle is None:
+                return None
+            await asyncio.wait_for(
+                self._changed.wait_for(lambda: not self.is_running or cycle.finished),
+                timeout=CYCLE_FINISH_TIMEOUT_SECONDS,
+            )
+            return cycle if cycle.finished else None
+
+    async def _read_cycles(self) -> None:
+        assert self.process and self.process.stdout
+        current: TscCycle | None = None
+        try:
+            while raw := await self.process.stdout.readline():
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                if CYCLE_START_PATTERN.search(line):
+                    current = TscCycle(started_at=time.time())
+                    self.cycles = [*self.cycles[-3:], current]
+                elif (match := CYCLE_END_PATTERN.search(line)) and current is not None:
+                    current.error_count = int(match.group(1))
+                    current = None
+                elif current is not None and line.strip():
+                    current.lines.append(line)
+                else:
+                    continue
+                async with self._changed:
+                    self._changed.notify_all()
+        finally:
+            if self.process:
+                with contextlib.suppress(Exception):
+                    await self.process.wait()
+            async with self._changed:
+                self._changed.notify_all()
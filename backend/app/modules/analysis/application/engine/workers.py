@@ -0,0 +1,364 @@
+"""
+Persistent Worker Framework
+Long-lived tool processes speaking JSON lines over stdin/stdout, pooled per project.
+Request:  {"id": 1, "method": "lint", "params": {...}}
+Response: {"id": 1, "result": ...} or {"id": 1, "error": "..."}
+Every worker answers "ping" with "pong" (health check).
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from abc import abstractmethod
+from pathlib import Path
+from typing import Any
+
+from ...domain.ports import AnalysisNotifierPort
+from ...infrastructure.result_cache import ResultCache
+from .base_module import AnalysisModule
+from .findings_store import ProjectFindingsStore
+from .scheduler import DEFAULT_JOB_MEMORY_MB, AnalysisScheduler
+from .sessions import ToolOutput, ToolSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_SECONDS = 600
+# Workers idle longer than this are pinged before being handed out again
+HEALTH_CHECK_AFTER_SECONDS = 30.0
+HEALTH_CHECK_TIMEOUT_SECONDS = 5.0
+STARTUP_TIMEOUT_SECONDS = 30.0
+# A worker that crashes this often within the window is not restarted until the window passes
+MAX_RESTARTS = 3
+RESTART_WINDOW_SECONDS = 300.0
+
+
+class WorkerError(Exception):
+    """A worker could not serve a request (crashed, timed out or reported an error)"""
+
+
+class WorkerTimeoutError(WorkerError):
+    """A request outlived its timeout; the worker may still be busy with it and cannot be trusted"""
+
+
+class PersistentWorker:
+    """One long-lived worker process"""
+
+    def __init__(self, command: list[str], cwd: Path) -> None:
+        self.command = command
+        self.cwd = cwd
+        self.process: asyncio.subprocess.Process | None = None
+        self.last_used = time.monotonic()
+        self.in_flight = 0
+        self._next_id = 0
+        self._pending: dict[int, asyncio.Future[Any]] = {}
+        self._reader_task: asyncio.Task[None] | None = None
+        self._stderr_task: asyncio.Task[None] | None = None
+        self._stdout_closed = False
+
+    @property
+    def is_alive(self) -> bool:
+        # stdout EOF means the worker is gone even before its exit status has been reaped
+        return self.process is not None and self.process.returncode is None and not self._stdout_closed
+
+    @property
+    def pid(self) -> int | None:
+        return self.process.pid if self.process else None
+
+    async def start(self) -> None:
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(self.cwd),
+                limit=128 * 1024 * 1024,  # one response is one line; whole-project results can be large
+            )
+        except OSError as e:
+            raise WorkerError(f"cannot start {self.command[0]}: {e}") from e
+        self._reader_task = asyncio.create_task(self._read_responses())
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+        await self.ping(timeout=STARTUP_TIMEOUT_SECONDS)
+        logger.info(f"🔥 Worker started (pid {self.pid}): {' '.join(self.command)}")
+
+    async def request(self, method: str, params: dict[str, Any], timeout: float) -> Any:  # noqa: ANN401
+        if not self.is_alive or not self.process or not self.process.stdin:
+            raise WorkerError("worker is not running")
+        self._next_id += 1
+        request_id = self._next_id
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.in_flight += 1
+        try:
+            line = json.dumps({"id": request_id, "method": method, "params": params}) + "\n"
+            self.process.stdin.write(line.encode("utf-8"))
+            await self.process.stdin.drain()
+            return await asyncio.wait_for(future, timeout=timeout)
+        except TimeoutError as e:
+            raise WorkerTimeoutError(f"{method} timed out after {timeout:g}s") from e
+        except ConnectionError as e:
+            raise WorkerError(f"{method} failed: {e or type(e).__name__}") from e
+        finally:
+            self._pending.pop(request_id, None)
+            self.in_flight -= 1
+            self.last_used = time.monotonic()
+
+    async def ping(self, timeout: float = HEALTH_CHECK_TIMEOUT_SECONDS) -> None:
+        if await self.request("ping", {}, timeout=timeout) != "pong":
+            raise WorkerError("unexpected ping response")
+
+    async def stop(self) -> None:
+        if self.process and self.process.returncode is None:
+            if self.process.stdin:
+                self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=2.0)
+            except TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        for task in (self._reader_task, self._stderr_task):
+            if task and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._fail_pending(WorkerError("worker stopped"))
+
+    async def _read_responses(self) -> None:
+        assert self.process and self.process.stdout
+        try:
+            while line := await self.process.stdout.readline():
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.debug(f"[worker {self.pid}] {line.decode('utf-8', errors='replace').rstrip()}")
+                    continue
+                future = self._pending.get(message.get("id"))
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(WorkerError(str(message["error"])))
+                else:
+                    future.set_result(message.get("result"))
+        except ValueError as e:
+            # Line above the stream limit: the protocol is out of sync, treat as a crash
+            logger.warning(f"Worker {self.pid} sent an oversized response: {e}")
+            if self.process.returncode is None:
+                self.process.kill()
+        finally:
+            self._stdout_closed = True
+            self._fail_pending(WorkerError("worker exited"))
+
+    async def _drain_stderr(self) -> None:
+        assert self.process and self.process.stderr
+        while line := await self.process.stderr.readline():
+            logger.debug(f"[worker {self.pid}] {line.decode('utf-8', errors='replace').rstrip()}")
+
+    def _fail_pending(self, error: Exception) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+
+class WorkerPool:
+    """
+    Per-project pool of persistent workers (one per project and tool)
+    - Health check: workers idle for a while are pinged before reuse
+    - Restart on crash, with a restart budget so a broken tool falls back to its CLI
+    - Idle shutdown: a background reaper stops workers unused for idle_seconds
+    """
+
+    def __init__(self, idle_seconds: float = DEFAULT_IDLE_SECONDS) -> None:
+        self.idle_seconds = idle_seconds
+        self._workers: dict[tuple[str, str], PersistentWorker] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self._restarts: dict[tuple[str, str], list[float]] = {}
+        self._reaper_task: asyncio.Task[None] | None = None
+
+    async def acquire(self, project: str | Path, tool: str, command: list[str]) -> PersistentWorker:
+        """Return a healthy worker for (project, tool), starting or restarting it as needed"""
+        key = (str(project), tool)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            worker = self._workers.get(key)
+            if worker is not None and worker.command != command:
+                await self._discard(key)
+                worker = None
+            if worker is not None and not await self._is_healthy(worker):
+                logger.warning(f"♻️ Restarting unhealthy {tool} worker for {project}")
+                await self._discard(key)
+                self._record_restart(key)
+                worker = None
+            if worker is None:
+                worker = await self._spawn(key, command, Path(project))
+            self._ensure_reaper()
+            return worker
+
+    async def retire(self, project: str | Path, tool: str, worker: PersistentWorker) -> None:
+        """Stop a worker that stopped answering, counting it against the restart budget"""
+        key = (str(project), tool)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            if self._workers.get(key) is worker:
+                logger.warning(f"♻️ Retiring stuck {tool} worker for {project}")
+                await self._discard(key)
+                self._record_restart(key)
+
+    async def shutdown(self, project: str | Path | None = None) -> None:
+        """Stop every worker (of one project, or all)"""
+        for key in [k for k in self._workers if project is None or k[0] == str(project)]:
+            await self._discard(key)
+
+    async def shutdown_idle(self) -> int:
+        """Stop workers unused for longer than idle_seconds; returns how many were stopped"""
+        now = time.monotonic()
+        idle = [
+            key
+            for key, worker in self._workers.items()
+            if worker.in_flight == 0 and now - worker.last_used > self.idle_seconds
+        ]
+        for key in idle:
+            logger.info(f"💤 Stopping idle {key[1]} worker for {key[0]}")
+            await self._discard(key)
+        return len(idle)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "project": project,
+                "tool": tool,
+                "pid": worker.pid,
+                "alive": worker.is_alive,
+                "in_flight": worker.in_flight,
+                "idle_seconds": round(now - worker.last_used, 1),
+            }
+            for (project, tool), worker in self._workers.items()
+        ]
+
+    async def _spawn(self, key: tuple[str, str], command: list[str], cwd: Path) -> PersistentWorker:
+        now = time.monotonic()
+        recent = [t for t in self._restarts.get(key, []) if now - t < RESTART_WINDOW_SECONDS]
+        self._restarts[key] = recent
+        if len(recent) >= MAX_RESTARTS:
+            raise WorkerError(f"{key[1]} worker restarted {len(recent)} times recently; not restarting")
+        worker = PersistentWorker(command, cwd)
+        try:
+            await worker.start()
+        except WorkerError:
+            await worker.stop()
+            self._record_restart(key)
+            raise
+        self._workers[key] = worker
+        return worker
+
+    async def _is_healthy(self, worker: PersistentWorker) -> bool:
+        if not worker.is_alive:
+            return False
+        if worker.in_flight or time.monotonic() - worker.last_used < HEALTH_CHECK_AFTER_SECONDS:
+            return True
+        try:
+            await worker.ping()
+            return True
+        except WorkerError:
+            return False
+
+    def _record_restart(self, key: tuple[str, str]) -> None:
+        self._restarts.setdefault(key, []).append(time.monotonic())
+
+    async def _discard(self, key: tuple[str, str]) -> None:
+        worker = self._workers.pop(key, None)
+        if worker is not None:
+            await worker.stop()
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap())
+
+    async def _reap(self) -> None:
+        interval = max(1.0, min(60.0, self.idle_seconds / 4))
+        while self._workers:
+            await asyncio.sleep(interval)
+            await self.shutdown_idle()
+
+
+_worker_pool: WorkerPool | None = None
+
+
+def get_worker_pool() -> WorkerPool:
+    """Return the process-wide worker pool, configured from the environment on first use"""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = WorkerPool(idle_seconds=float(os.environ.get("WORKER_IDLE_SECONDS", DEFAULT_IDLE_SECONDS)))
+    return _worker_pool
+
+
+class WorkerModule(AnalysisModule):
+    """
+    AnalysisModule served by a warm worker from the shared pool
+    Falls back to the regular CLI command whenever the worker cannot answer.
+    """
+
+    # Seconds a single worker request may take before the CLI takes over
+    worker_timeout = 300.0
+
+    def __init__(
+        self,
+        module_id: str,
+        name: str,
+        project_path: str,
+        ws_manager: AnalysisNotifierPort,
+        result_cache: ResultCache | None = None,
+        findings_store: ProjectFindingsStore | None = None,
+        session: ToolSession | None = None,
+        scheduler: AnalysisScheduler | None = None,
+        memory_mb: int = DEFAULT_JOB_MEMORY_MB,
+        worker_pool: WorkerPool | None = None,
+    ) -> None:
+        super().__init__(
+            module_id, name, project_path, ws_manager, result_cache, findings_store, session, scheduler, memory_mb
+        )
+        self.worker_pool = worker_pool or get_worker_pool()
+
+    @abstractmethod
+    def get_worker_command(self) -> list[str] | None:
+        """Command that starts the worker; None when no worker can run here"""
+        pass
+
+    @abstractmethod
+    def get_worker_request(self, files: list[str] | None) -> tuple[str, dict[str, Any]] | None:
+        """(method, params) for the run prepared by get_command(); None to use the CLI"""
+        pass
+
+    @abstractmethod
+    def render_worker_result(self, result: Any) -> ToolOutput:  # noqa: ANN401
+        """Turn the worker's result into what the CLI would have printed"""
+        pass
+
+    async def run_persistent(self, files: list[str] | None) -> ToolOutput | None:
+        output = await super().run_persistent(files)
+        if output is not None:
+            return output
+
+        command = self.get_worker_command()
+        request = self.get_worker_request(files)
+        if not command or request is None:
+            return None
+
+        method, params = request
+        try:
+            worker = await self.worker_pool.acquire(self.project_path, self.module_id, command)
+            try:
+                result = await worker.request(method, params, timeout=self.worker_timeout)
+            except WorkerTimeoutError:
+                # Still chewing on the old request: restart it next run instead of queueing behind it
+                await self.worker_pool.retire(self.project_path, self.module_id, worker)
+                raise
+        except WorkerError as e:
+            logger.warning(f"[{self.module_id}] Worker unavailable, spawning CLI: {e}")
+            await self.ws_manager.send_log(self.module_id, f"⚠️ Warm worker unavailable ({e}), spawning CLI")
+            return None
+
+        await self.ws_manager.send_log(self.module_id, f"⚡ Served by warm worker (pid {worker.pid})")
+        return self.render_worker_result(result)
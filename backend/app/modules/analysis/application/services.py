@@ -1,24 +1,43 @@
 import logging
-from typing import Literal
+from typing import Any, Literal
 
 from ..infrastructure.adapters.file_watcher import WatchManager
 from ..infrastructure.adapters.scoped_notifier import ScopedAnalysisNotifier
 from ..infrastructure.adapters.websocket_notifier import WebSocketNotifier
+from ..infrastructure.metrics_store import MetricsStore
+from .engine.log_queue import get_log_queue_stats
 from .engine.modules import MODULE_METADATA
+from .engine.offload import get_offload_executor
 from .engine.orchestrator import AnalysisOrchestrator
+from .engine.scheduler import get_scheduler
+from .engine.workers import get_worker_pool
 
 logger = logging.getLogger(__name__)
 
 
 class AnalysisOrchestratorService:
-    def __init__(self, notifier: WebSocketNotifier) -> None:
+    def __init__(self, notifier: WebSocketNotifier, metrics_store: MetricsStore | None = None) -> None:
         self.notifier = notifier
+        self.metrics_store = metrics_store
         self.active_watchers: dict[str, WatchManager] = {}
         self.active_analyses: set[str] = set()
+        self.scheduler = get_scheduler()
 
     def get_available_tools(self) -> list[dict[str, str]]:
         return MODULE_METADATA
 
+    def get_scheduler_status(self) -> dict[str, Any]:
+        return {**self.scheduler.snapshot(), "workers": get_worker_pool().snapshot()}
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        return {
+            "log_queues": get_log_queue_stats(),
+            "offload": get_offload_executor().snapshot(),
+            "subscribers": self.notifier.snapshot(),
+            "metrics_store": None if self.metrics_store is None else self.metrics_store.snapshot(),
+            "watchers": {project_id: watcher.snapshot() for project_id, watcher in self.active_watchers.items()},
+        }
+
     async def start_analysis(
         self,
         project_id: str,
@@ -37,7 +56,7 @@ class AnalysisOrchestratorService:
                 raise RuntimeError("Analysis already running")
 
         # Create a scoped notifier for this specific analysis run
-        scoped_notifier = ScopedAnalysisNotifier(self.notifier, project_id)
+        scoped_notifier = ScopedAnalysisNotifier(self.notifier, project_id, self.metrics_store)
 
         import asyncio
 
@@ -0,0 +1,90 @@
+import sys
+from dataclasses import dataclass
+from typing import Any, Literal
+
+Severity = Literal["ERROR", "WARNING", "INFO", "COMPLEXITY"]
+
+
+class Finding:
+    """
+    One diagnostic reported by a tool
+    Slotted and with interned file paths: a project can have hundreds of thousands of these,
+    most of them sharing a few thousand paths.
+    """
+
+    __slots__ = ("file", "line", "column", "severity", "rule", "message", "ccn")
+
+    def __init__(
+        self,
+        file: str,
+        line: int | None,
+        column: int | None,
+        severity: Severity,
+        rule: str | None,
+        message: str,
+        ccn: int = 0,
+    ) -> None:
+        self.file = sys.intern(file)
+        self.line = line
+        self.column = column
+        self.severity: Severity = severity
+        self.rule = rule
+        self.message = message
+        # Cyclomatic complexity of COMPLEXITY findings
+        self.ccn = ccn
+
+    def with_file(self, file: str) -> "Finding":
+        return Finding(file, self.line, self.column, self.severity, self.rule, self.message, self.ccn)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Rebuilt through __init__ so paths are interned again after a trip to a worker process
+        return Finding, (self.file, self.line, self.column, self.severity, self.rule, self.message, self.ccn)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "file": self.file,
+            "line": self.line,
+            "column": self.column,
+            "severity": self.severity,
+            "rule": self.rule,
+            "message": self.message,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash((self.file, self.line, self.column, self.rule, self.message))
+
+    def __repr__(self) -> str:
+        return f"Finding({self.file}:{self.line}:{self.column} {self.severity} {self.rule} {self.message!r})"
+
+
+@dataclass(frozen=True)
+class FindingsDelta:
+    """Change in a module's findings since its previous run, keyed by fingerprint"""
+
+    added: dict[str, Finding]
+    resolved: list[str]
+    # Findings of the module once the change is applied
+    total: int
+    # Changed rows of the module's METRICS report for an incremental run:
+    # {"total_issues": ..., "modules": [changed or new file entries], "removed": [files]}
+    metrics: dict[str, Any] | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        report_changed = self.metrics is not None and bool(self.metrics["modules"] or self.metrics["removed"])
+        return not self.added and not self.resolved and not report_changed
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "added": [{**finding.to_dict(), "fingerprint": fingerprint} for fingerprint, finding in self.added.items()],
+            "resolved": self.resolved,
+            "total": self.total,
+        }
+        if self.metrics is not None:
+            data["metrics"] = self.metrics
+        return data
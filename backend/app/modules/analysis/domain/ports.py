@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from .entities import Finding, FindingsDelta
+
 
 class AnalysisNotifierPort(ABC):
     @abstractmethod
@@ -8,7 +10,7 @@ class AnalysisNotifierPort(ABC):
         pass  # pragma: no cover
 
     @abstractmethod
-    async def send_global_init(self) -> None:
+    async def send_global_init(self, eta_seconds: float | None = None) -> None:
         pass  # pragma: no cover
 
     @abstractmethod
@@ -36,7 +38,16 @@ class AnalysisNotifierPort(ABC):
         pass  # pragma: no cover
 
     @abstractmethod
-    async def send_metrics(self, module_id: str, metrics: dict[str, Any]) -> None:
+    async def send_metrics(self, module_id: str, metrics: dict[str, Any], incremental: bool = False) -> None:
+        # incremental: clients that take FINDINGS_DELTA get this run's change through it instead
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def send_findings(self, module_id: str, findings: list[Finding], analysed_files: list[str] | None) -> None:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def send_findings_delta(self, module_id: str, delta: FindingsDelta) -> None:
         pass  # pragma: no cover
 
     @abstractmethod
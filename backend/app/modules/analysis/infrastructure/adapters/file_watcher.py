@@ -6,20 +6,112 @@ Prevents resource exhaustion through controlled event handling
 
 import asyncio
 import logging
+import os
+import re
 import threading
 from collections.abc import Callable, Coroutine
 from concurrent.futures import Future
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
-from watchdog.observers.polling import PollingObserver
+from watchdog.observers import Observer, polling
+from watchdog.observers.api import BaseObserver
 
+from ...application.engine.modules import create_watch_sessions
 from ...application.engine.orchestrator import AnalysisOrchestrator
+from ...application.engine.sessions import ToolSession
 from ...domain.ports import AnalysisNotifierPort
+from .pruned_polling import PrunedPollingObserver
 
 logger = logging.getLogger(__name__)
 
+# Filesystems that accept inotify watches but only report changes made through this kernel:
+# edits by other hosts, the VM/container host or a FUSE daemon never arrive, so they are polled
+POLLING_FILESYSTEMS = frozenset(
+    {
+        "nfs",
+        "nfs4",
+        "cifs",
+        "smb3",
+        "smbfs",
+        "9p",
+        "virtiofs",
+        "vboxsf",
+        "vmhgfs",
+        "afs",
+        "ceph",
+        "glusterfs",
+        "lustre",
+        "gpfs",
+        "fuse",
+    }
+)
+PROC_MOUNTS = Path("/proc/mounts")
+
+ObserverBackend = Literal["native", "polling"]
+
+
+def _unescape_mount_field(field: str) -> str:
+    # /proc/mounts writes space, tab, newline and backslash as octal escapes
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+
+def mount_fstype(path: str | Path, mounts: Path = PROC_MOUNTS) -> str | None:
+    """Filesystem type of the mount holding path; None when the mount table cannot be read"""
+    try:
+        table = mounts.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None  # No /proc (macOS, Windows): the platform observer decides
+    target = os.path.realpath(path)
+    best: tuple[int, str] | None = None
+    for line in table.splitlines():
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        mount_point = _unescape_mount_field(fields[1])
+        if target != mount_point and not target.startswith(mount_point.rstrip("/") + "/"):
+            continue
+        # Longest mount point wins; of mounts stacked on the same point, the last one
+        if best is None or len(mount_point) >= best[0]:
+            best = (len(mount_point), fields[2])
+    return None if best is None else best[1]
+
+
+def needs_polling(fstype: str) -> bool:
+    return fstype in POLLING_FILESYSTEMS or fstype.startswith("fuse.")
+
+
+def start_native_observer(path: Path, handler: FileSystemEventHandler) -> BaseObserver | None:
+    """
+    Start a native (inotify) observer for handler, or return None when the path must be polled
+    The filesystem type comes from /proc/mounts: network and host-shared mounts (NFS, SMB, FUSE,
+    9p, virtiofs...) never report changes made elsewhere. WATCH_OBSERVER=native|polling skips
+    the detection; so does a failure to add the watches (e.g. the inotify watch limit).
+    """
+    backend = os.environ.get("WATCH_OBSERVER", "auto").strip().lower()
+    if backend == "polling":
+        return None
+    if backend != "native":
+        fstype = mount_fstype(path)
+        if fstype is not None and needs_polling(fstype):
+            logger.info(f"{path} is on {fstype}: changes made elsewhere never reach inotify, polling instead")
+            return None
+    observer = Observer()
+    if isinstance(observer, polling.PollingObserver):
+        return None  # No native API on this platform
+    try:
+        observer.schedule(handler, str(path), recursive=True)
+        observer.start()
+    except OSError as e:
+        # Missing path or inotify watch limit reached
+        logger.info(f"Native file events unavailable for {path}: {e}")
+        if observer.is_alive():
+            observer.stop()
+            observer.join(timeout=2.0)
+        return None
+    return observer
+
 
 class CodeChangeHandler(FileSystemEventHandler):
     """
@@ -33,9 +125,12 @@ class CodeChangeHandler(FileSystemEventHandler):
         callback: Callable[[list[str]], Coroutine[Any, Any, None]],
         loop: asyncio.AbstractEventLoop,
         notifier: AnalysisNotifierPort | None = None,
+        supersede: Callable[[list[str]], Coroutine[Any, Any, list[str]]] | None = None,
     ) -> None:
         self.project_path = Path(project_path)
         self.callback = callback
+        # Offers changes made during a run to that run; returns the files it absorbed
+        self.supersede = supersede
         self.loop = loop  # Store event loop reference from main thread
         self.notifier = notifier
         self.modified_files: set[str] = set()
@@ -44,6 +139,8 @@ class CodeChangeHandler(FileSystemEventHandler):
         # CRITICAL: Debounce delay to ensure file write completion
         self.debounce_delay = 0.1  # 100ms debounce as per briefing
         self.is_analyzing = False  # Prevent overlapping analysis runs
+        self.supersede_task: Future[Any] | None = None
+        self._change_count = 0  # Bumped on every change, so absorbed files are only dropped if not touched since
 
     def on_modified(self, event: FileSystemEvent) -> None:
         logger.info(f"🔍 Watchdog detected modification: {event.src_path} (is_dir: {event.is_directory})")
@@ -72,6 +169,7 @@ class CodeChangeHandler(FileSystemEventHandler):
 
                 with self._lock:
                     self.modified_files.add(rel_path)
+                    self._change_count += 1
                     logger.info(f"📝 File changed: {rel_path}")
 
                     if self.notifier:
@@ -89,6 +187,12 @@ class CodeChangeHandler(FileSystemEventHandler):
                     # The running _debounced_analysis loop will pick it up.
                     if self.is_analyzing:
                         logger.debug(f"⏳ Analysis in progress, queuing change for: {rel_path}")
+                        if self.supersede:
+                            if self.supersede_task and not self.supersede_task.done():
+                                self.supersede_task.cancel()
+                            self.supersede_task = asyncio.run_coroutine_threadsafe(
+                                self._debounced_supersede(), self.loop
+                            )
                         return
 
                     # Cancel previous debounce task if it's just waiting
@@ -166,6 +270,27 @@ class CodeChangeHandler(FileSystemEventHandler):
 
         return path.suffix in relevant_extensions
 
+    async def _debounced_supersede(self) -> None:
+        """Offer the queued changes to the running analysis once the burst of saves settles"""
+        if self.supersede is None:
+            return
+        try:
+            await asyncio.sleep(self.debounce_delay)
+            with self._lock:
+                if not self.is_analyzing or not self.modified_files:
+                    return
+                files = sorted(self.modified_files)
+                change_count = self._change_count
+            absorbed = await self.supersede(files)
+            with self._lock:
+                # A change that arrived meanwhile may be newer than what the run picked up
+                if absorbed and self._change_count == change_count:
+                    self.modified_files.difference_update(absorbed)
+        except asyncio.CancelledError:
+            logger.debug("Supersede debounce cancelled, new change detected")
+        except Exception as e:
+            logger.error(f"Supersede failed: {e}")
+
     async def _debounced_analysis(self) -> None:
         """
         CRITICAL: Wait for debounce delay before triggering analysis
@@ -229,10 +354,15 @@ class WatchManager:
         self.project_path = Path(project_path)
         self.ws_manager = ws_manager
         self.selected_tools = selected_tools
-        self.observer: PollingObserver | None = None
+        self.observer: BaseObserver | None = None
+        self.observer_backend: ObserverBackend | None = None
         self.is_running = False
         self.stop_event = asyncio.Event()
         self.active_analysis_task: asyncio.Task[Any] | None = None
+        self.active_orchestrator: AnalysisOrchestrator | None = None
+        # Persistent tool processes kept warm for the lifetime of the watch
+        self.sessions: dict[str, ToolSession] = {}
+        self.warmup_task: asyncio.Task[None] | None = None
 
     async def start_watching(self) -> None:
         """Start live watch mode"""
@@ -244,12 +374,6 @@ class WatchManager:
         self.stop_event.clear()
 
         logger.info(f"👁️  Starting live watch on: {self.project_path}")
-        await self.ws_manager.broadcast_raw(
-            {
-                "type": "LOG",
-                "message": f"👁️  Live Watch Mode ACTIVATED on {self.project_path}",
-            }
-        )
 
         # CRITICAL: Pass event loop to handler for thread-safe task scheduling
         loop = asyncio.get_running_loop()
@@ -258,14 +382,25 @@ class WatchManager:
             callback=self._run_analysis,
             loop=loop,
             notifier=self.ws_manager,
+            supersede=self._supersede,
         )
 
-        # Create and start observer (using PollingObserver for Docker volumes)
-        self.observer = PollingObserver()
-        self.observer.schedule(handler, str(self.project_path), recursive=True)
-        self.observer.start()
+        # Probing and the first polling snapshot both touch the disk: keep them off the event loop
+        await asyncio.to_thread(self._start_observer, handler)
+        if not self.is_running:
+            # Stopped while the observer was starting
+            self._stop_observer()
+            return
+
+        logger.info(f"✅ Watch mode started successfully (using {self.observer_backend} observer)")
+        await self.ws_manager.broadcast_raw(
+            {
+                "type": "LOG",
+                "message": f"👁️  Live Watch Mode ACTIVATED on {self.project_path} ({self.observer_backend} observer)",
+            }
+        )
 
-        logger.info("✅ Watch mode started successfully (using polling observer)")
+        self.sessions = create_watch_sessions(self.project_path, self.selected_tools)
 
         # CRITICAL: Run initial full analysis on watch start
         logger.info("🚀 Running initial full analysis...")
@@ -295,12 +430,43 @@ class WatchManager:
         finally:
             self.active_analysis_task = None
 
+        # Start persistent sessions now so the first save does not pay their cold start
+        if self.sessions:
+            self.warmup_task = asyncio.create_task(self._warm_up_sessions())
+
         # Keep running until stopped
         try:
             await self.stop_event.wait()
         finally:
             await self.stop_watching()
 
+    def _start_observer(self, handler: CodeChangeHandler) -> None:
+        """Native file events when the project path delivers them, polling (e.g. Docker volumes) otherwise"""
+        observer = start_native_observer(self.project_path, handler)
+        if observer is not None:
+            self.observer, self.observer_backend = observer, "native"
+            return
+        observer = PrunedPollingObserver()
+        observer.schedule(handler, str(self.project_path), recursive=True)
+        observer.start()
+        self.observer, self.observer_backend = observer, "polling"
+
+    def _stop_observer(self) -> None:
+        if self.observer:
+            self.observer.stop()
+            try:
+                if self.observer.is_alive():
+                    self.observer.join(timeout=2.0)
+            except RuntimeError:
+                pass
+            except Exception as e:
+                logger.error(f"Error stopping observer: {e}")
+            self.observer = None
+            self.observer_backend = None
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"path": str(self.project_path), "running": self.is_running, "observer": self.observer_backend}
+
     async def stop(self) -> None:
         """Stop live watch mode"""
         await self.stop_watching()
@@ -327,16 +493,19 @@ class WatchManager:
 
             await self.ws_manager.broadcast_raw({"type": "LOG", "message": "🛑 Live Watch Mode DEACTIVATED"})
 
-            if self.observer:
-                self.observer.stop()
+            self._stop_observer()
+
+            if self.warmup_task and not self.warmup_task.done():
+                self.warmup_task.cancel()
+                # Let a session that is still starting close its process before the sessions are stopped
+                await asyncio.wait([self.warmup_task])
+            self.warmup_task = None
+            for session in self.sessions.values():
                 try:
-                    if self.observer.is_alive():
-                        self.observer.join(timeout=2.0)
-                except RuntimeError:
-                    pass
+                    await session.stop()
                 except Exception as e:
-                    logger.error(f"Error stopping observer: {e}")
-                self.observer = None
+                    logger.error(f"Error stopping {session.name}: {e}")
+            self.sessions = {}
 
         finally:
             self.is_running = False
@@ -354,13 +523,18 @@ class WatchManager:
                 }
             )
 
+            # Push the saved files to the persistent sessions before their modules ask for results
+            await asyncio.gather(*(session.notify_changed(files) for session in self.sessions.values()))
+
             # Create orchestrator in incremental mode
             orchestrator = AnalysisOrchestrator(
                 project_path=str(self.project_path),
                 mode="incremental",
                 ws_manager=self.ws_manager,
                 selected_tools=self.selected_tools,
+                sessions=self.sessions,
             )
+            self.active_orchestrator = orchestrator
 
             # Execute analysis with explicit file list
             result = await orchestrator.execute(files=files)
@@ -375,6 +549,37 @@ class WatchManager:
             await self.ws_manager.broadcast_raw({"type": "ERROR", "message": f"Auto-analysis failed: {str(e)}"})
         finally:
             self.active_analysis_task = None
+            self.active_orchestrator = None
+
+    async def _supersede(self, files: list[str]) -> list[str]:
+        """Restart the running analysis' modules whose inputs changed again"""
+        orchestrator = self.active_orchestrator
+        if orchestrator is None:
+            return []
+        # Sessions must see the new content before a restarted module asks them for results
+        await asyncio.gather(*(session.notify_changed(files) for session in self.sessions.values()))
+        if orchestrator is not self.active_orchestrator:
+            return []
+        absorbed = orchestrator.supersede(files)
+        if absorbed:
+            await self.ws_manager.broadcast_raw(
+                {
+                    "type": "LOG",
+                    "message": f"♻️ {len(absorbed)} file(s) changed during analysis, restarting affected modules",
+                }
+            )
+        return absorbed
+
+    async def _warm_up_sessions(self) -> None:
+        for session in list(self.sessions.values()):
+            try:
+                await session.start()
+                await self.ws_manager.broadcast_raw({"type": "LOG", "message": f"⚡ {session.name} ready"})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Not fatal: the module lazily retries, then falls back to its CLI
+                logger.warning(f"⚠️ Could not start {session.name}: {e}")
 
     def request_stop(self) -> None:
         """Request watch mode to stop (non-blocking)"""
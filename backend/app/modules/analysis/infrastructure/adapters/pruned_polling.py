@@ -0,0 +1,122 @@
+"""
+Pruned Polling Observer
+PollingObserver for mounts that deliver no native file events (e.g. Docker bind mounts),
+without walking dependency trees: ignored directories (node_modules, .venv, dist, ...) are
+never listed or stat'ed, and a directory whose mtime is unchanged reuses its last listing.
+Each poll then costs one stat per source file and directory instead of one per file of the
+whole tree; file modifications are still caught because every listed file is stat'ed.
+"""
+
+import os
+import stat
+import time
+from collections.abc import Callable, Iterator
+
+from watchdog.events import FileSystemEvent
+from watchdog.observers.api import (
+    DEFAULT_EMITTER_TIMEOUT,
+    DEFAULT_OBSERVER_TIMEOUT,
+    BaseObserver,
+    EventQueue,
+    ObservedWatch,
+)
+from watchdog.observers.polling import PollingEmitter
+
+from ...application.engine.project_files import is_ignored_directory
+
+# Listings of directories modified this recently are not reused: a second change within the
+# filesystem's mtime granularity would leave the mtime as it was
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class PrunedListing:
+    """
+    stat/listdir pair for watchdog's DirectorySnapshot
+    Directory mtimes are remembered as the snapshot stats them, so listdir() knows whether the
+    previous listing is still valid without an extra system call.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        is_ignored: Callable[[str], bool] = is_ignored_directory,
+        racy_window_ns: int = RACY_WINDOW_NS,
+    ) -> None:
+        self.root = root
+        self.is_ignored = is_ignored
+        self.racy_window_ns = racy_window_ns
+        self.listed = 0
+        self.reused = 0
+        self._mtimes: dict[str, int] = {}
+        # directory -> (mtime when listed, entries minus ignored directories)
+        self._listings: dict[str, tuple[int, list[os.DirEntry[str]]]] = {}
+        self._visited: set[str] = set()
+
+    def stat(self, path: str) -> os.stat_result:
+        if path == self.root:
+            # A snapshot starts with its root: forget directories the previous one did not reach
+            self._sweep()
+        result = os.stat(path)
+        if stat.S_ISDIR(result.st_mode):
+            self._mtimes[path] = result.st_mtime_ns
+        return result
+
+    def listdir(self, path: str | None) -> Iterator[os.DirEntry[str]]:
+        path = path or "."
+        self._visited.add(path)
+        mtime = self._mtimes.get(path)
+        cached = self._listings.get(path)
+        if (
+            mtime is not None
+            and cached is not None
+            and cached[0] == mtime
+            and time.time_ns() - mtime > self.racy_window_ns
+        ):
+            self.reused += 1
+            return iter(cached[1])
+        with os.scandir(path) as scan:
+            entries = [entry for entry in scan if not self._pruned(entry)]
+        self.listed += 1
+        if mtime is not None:
+            self._listings[path] = (mtime, entries)
+        return iter(entries)
+
+    def _pruned(self, entry: os.DirEntry[str]) -> bool:
+        try:
+            return entry.is_dir() and self.is_ignored(entry.name)
+        except OSError:
+            return False
+
+    def _sweep(self) -> None:
+        if self._visited:
+            self._listings = {path: listing for path, listing in self._listings.items() if path in self._visited}
+            self._mtimes = {path: mtime for path, mtime in self._mtimes.items() if path in self._visited}
+            self._visited = set()
+
+
+class PrunedPollingEmitter(PollingEmitter):
+    def __init__(
+        self,
+        event_queue: EventQueue,
+        watch: ObservedWatch,
+        *,
+        timeout: float = DEFAULT_EMITTER_TIMEOUT,
+        event_filter: list[type[FileSystemEvent]] | None = None,
+    ) -> None:
+        self.listing = PrunedListing(watch.path)
+        # watchdog annotates listdir with a bare os.DirEntry, which strict mode reports as partially unknown
+        super().__init__(  # pyright: ignore[reportUnknownMemberType]
+            event_queue,
+            watch,
+            timeout=timeout,
+            event_filter=event_filter,
+            stat=self.listing.stat,
+            listdir=self.listing.listdir,
+        )
+
+
+class PrunedPollingObserver(BaseObserver):
+    """Polling observer that skips ignored directories and unchanged listings"""
+
+    def __init__(self, *, timeout: float = DEFAULT_OBSERVER_TIMEOUT) -> None:
+        super().__init__(PrunedPollingEmitter, timeout=timeout)
@@ -0,0 +1,135 @@
+"""
+Replay Buffer
+Recent messages of one project, stamped with increasing sequence numbers, so a client that
+reconnects (or joins mid-run) with ?since=<seq> catches up without starting a new run.
+When the gap has already fallen out of the ring, the client gets a compact SNAPSHOT of the
+current state instead (per module status, summary, latest METRICS and a log tail, plus the
+last complete report of every module that FINDINGS_DELTA messages apply to).
+"""
+
+import json
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_MAX_MESSAGES = 4096
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+# Characters of output kept per module for snapshots
+LOG_TAIL_CHARS = 64 * 1024
+
+
+def encode_message(message: dict[str, Any]) -> str:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+@dataclass(frozen=True)
+class ReplayEntry:
+    """A sequenced message: serialised JSON, or raw STREAM output of module_id"""
+
+    seq: int
+    text: str
+    module_id: str | None = None
+    # None: for every client; True/False: only for clients that did/did not ask for FINDINGS_DELTA
+    deltas: bool | None = None
+
+
+class ReplayBuffer:
+    """Bounded ring of one project's messages plus the state they add up to"""
+
+    def __init__(
+        self,
+        max_messages: int = DEFAULT_MAX_MESSAGES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        log_tail_chars: int = LOG_TAIL_CHARS,
+    ) -> None:
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.log_tail_chars = log_tail_chars
+        self.last_seq = 0
+        self._entries: deque[ReplayEntry] = deque()
+        self._size = 0
+        self._running = False
+        self._status: str | None = None
+        self._modules: dict[str, dict[str, Any]] = {}
+        # Last complete METRICS report per module; kept across runs since deltas build on it
+        self._reports: dict[str, Any] = {}
+
+    @property
+    def first_seq(self) -> int:
+        """Oldest sequence number still replayable"""
+        return self._entries[0].seq if self._entries else self.last_seq + 1
+
+    def record_message(self, message: dict[str, Any], deltas: bool | None = None) -> ReplayEntry:
+        """Stamp, serialise and keep a message (raises TypeError if it is not JSON-serialisable)"""
+        text = encode_message({**message, "seq": self.last_seq + 1})
+        self._apply(message)
+        return self._append(ReplayEntry(self.last_seq + 1, text, deltas=deltas))
+
+    def record_stream(self, module_id: str, text: str) -> ReplayEntry:
+        self._module(module_id)["log"] = self._tail(self._module(module_id)["log"] + text)
+        return self._append(ReplayEntry(self.last_seq + 1, text, module_id))
+
+    def since(self, seq: int) -> list[ReplayEntry] | None:
+        """Entries after seq, or None when some of them are no longer in the ring"""
+        if seq > self.last_seq or seq + 1 < self.first_seq:
+            # Unknown future position (e.g. the server restarted) or fell out of the ring
+            return None
+        return [entry for entry in self._entries if entry.seq > seq]
+
+    def snapshot_message(self) -> str:
+        """SNAPSHOT message describing the project as of last_seq"""
+        return encode_message(
+            {
+                "type": "SNAPSHOT",
+                "seq": self.last_seq,
+                "running": self._running,
+                "status": self._status,
+                "modules": self._modules,
+                "reports": self._reports,
+            }
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "first_seq": self.first_seq,
+            "last_seq": self.last_seq,
+            "messages": len(self._entries),
+            "bytes": self._size,
+        }
+
+    def _append(self, entry: ReplayEntry) -> ReplayEntry:
+        self.last_seq = entry.seq
+        self._entries.append(entry)
+        self._size += len(entry.text)
+        while len(self._entries) > 1 and (len(self._entries) > self.max_messages or self._size > self.max_bytes):
+            self._size -= len(self._entries.popleft().text)
+        return entry
+
+    def _tail(self, log: str) -> str:
+        return log[-self.log_tail_chars :]
+
+    def _module(self, module_id: str) -> dict[str, Any]:
+        return self._modules.setdefault(module_id, {"status": "PENDING", "summary": None, "metrics": None, "log": ""})
+
+    def _apply(self, message: dict[str, Any]) -> None:
+        kind = message.get("type")
+        module_id = message.get("module")
+        if kind == "GLOBAL_INIT":
+            self._running, self._status = True, "RUNNING"
+            self._modules = {}
+        elif kind == "GLOBAL_END":
+            self._running, self._status = False, message.get("status")
+        elif not isinstance(module_id, str):
+            return
+        elif kind == "INIT":
+            self._modules[module_id] = {"status": "RUNNING", "summary": None, "metrics": None, "log": ""}
+        elif kind in ("LOG", "ERROR"):
+            line = message.get("data") if kind == "LOG" else message.get("error")
+            self._module(module_id)["log"] = self._tail(f"{self._module(module_id)['log']}{line}\n")
+        elif kind == "END":
+            self._module(module_id).update(status=message.get("status"), summary=message.get("summary"))
+        elif kind == "METRICS":
+            report: dict[str, Any] | None = message.get("data")
+            self._module(module_id)["metrics"] = report
+            if report is not None and not report.get("partial"):
+                self._reports[module_id] = report
@@ -1,31 +1,43 @@
 import logging
 from typing import Any
 
+from ...domain.entities import Finding, FindingsDelta
 from ...domain.ports import AnalysisNotifierPort
 from ...infrastructure.adapters.websocket_notifier import WebSocketNotifier
+from ...infrastructure.metrics_store import MetricsStore
 
 logger = logging.getLogger(__name__)
 
 
 class ScopedAnalysisNotifier(AnalysisNotifierPort):
-    def __init__(self, notifier: WebSocketNotifier, project_id: str) -> None:
+    def __init__(self, notifier: WebSocketNotifier, project_id: str, metrics_store: MetricsStore | None = None) -> None:
         self.notifier = notifier
         self.project_id = project_id
+        # Where run results are persisted (None: only broadcast)
+        self.metrics_store = metrics_store
+
+    async def _publish(self, message: dict[str, Any]) -> None:
+        if self.metrics_store is not None:
+            self.metrics_store.record(self.project_id, message)
+        await self.notifier.send_update(self.project_id, message)
 
     async def send_update(self, project_id: str, message: dict[str, Any]) -> None:
         # Ignores passed project_id, uses scoped one, or maybe validates it?
         # The interface has project_id, but Orchestrator calls other methods.
         logger.debug(f"Sending WS update to {self.project_id}: {message.get('type')}")
-        await self.notifier.send_update(self.project_id, message)
+        await self._publish(message)
 
-    async def send_global_init(self) -> None:
-        await self.notifier.send_update(self.project_id, {"type": "GLOBAL_INIT"})
+    async def send_global_init(self, eta_seconds: float | None = None) -> None:
+        message: dict[str, Any] = {"type": "GLOBAL_INIT"}
+        if eta_seconds is not None:
+            message["eta_seconds"] = round(eta_seconds, 1)
+        await self._publish(message)
 
     async def broadcast_raw(self, message: dict[str, Any]) -> None:
-        await self.notifier.send_update(self.project_id, message)
+        await self._publish(message)
 
     async def send_global_end(self, status: str) -> None:
-        await self.notifier.send_update(self.project_id, {"type": "GLOBAL_END", "status": status})
+        await self._publish({"type": "GLOBAL_END", "status": status})
 
     async def send_init(self, module_id: str) -> None:
         await self.notifier.send_update(self.project_id, {"type": "INIT", "module": module_id})
@@ -34,30 +46,48 @@ class ScopedAnalysisNotifier(AnalysisNotifierPort):
         await self.notifier.send_update(self.project_id, {"type": "LOG", "module": module_id, "data": message})
 
     async def send_stream(self, module_id: str, chunk: str, encoding: str | None = None) -> None:
-        payload = {"type": "STREAM", "module": module_id, "data": chunk}
-        if encoding:
-            payload["encoding"] = encoding
+        if encoding is None:
+            # Raw text: the notifier picks the encoding each connection negotiated
+            await self.notifier.send_stream(self.project_id, module_id, chunk)
+            return
+        payload = {"type": "STREAM", "module": module_id, "data": chunk, "encoding": encoding}
         await self.notifier.send_update(self.project_id, payload)
 
     async def send_end(self, module_id: str, status: str, summary: str) -> None:
-        await self.notifier.send_update(
-            self.project_id,
+        await self._publish(
             {
                 "type": "END",
                 "module": module_id,
                 "status": status,
                 "summary": summary,
-            },
+            }
         )
 
-    async def send_metrics(self, module_id: str, metrics: dict[str, Any]) -> None:
+    async def send_metrics(self, module_id: str, metrics: dict[str, Any], incremental: bool = False) -> None:
+        message = {
+            "type": "METRICS",
+            "module": module_id,
+            "data": metrics,
+        }
+        if not incremental:
+            await self._publish(message)
+            return
+        # Still recorded in full; delta-aware clients get an incremental run as FINDINGS_DELTA
+        if self.metrics_store is not None:
+            self.metrics_store.record(self.project_id, message)
+        await self.notifier.send_update(self.project_id, message, deltas=False)
+
+    async def send_findings(self, module_id: str, findings: list[Finding], analysed_files: list[str] | None) -> None:
+        # Indexed for /api/findings; clients get the counts through METRICS
+        if self.metrics_store is not None:
+            self.metrics_store.record_findings(self.project_id, module_id, findings, analysed_files)
+
+    async def send_findings_delta(self, module_id: str, delta: FindingsDelta) -> None:
+        # Only what changed since the module's previous run, for the clients that asked for it
         await self.notifier.send_update(
             self.project_id,
-            {
-                "type": "METRICS",
-                "module": module_id,
-                "data": metrics,
-            },
+            {"type": "FINDINGS_DELTA", "module": module_id, "data": delta.to_dict()},
+            deltas=True,
         )
 
     async def send_error(self, module_id: str, error: str) -> None:
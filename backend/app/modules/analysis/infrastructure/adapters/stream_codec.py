@@ -0,0 +1,109 @@
+"""
+Stream Codec
+Encodings of STREAM output for WebSocket clients:
+- gzip_base64 (legacy): each large batch gzipped on its own, base64 encoded inside JSON
+- deflate binary frames: one raw deflate stream per (connection, module), flushed after every
+  batch, so repeated tool output compresses against everything sent before it
+
+Binary frame layout: 1 byte frame type, 1 byte module id length, module id (UTF-8),
+4 byte big-endian sequence number of the newest output in the frame, 4 byte big-endian
+length of the uncompressed output (clients know when a frame is fully inflated), deflate bytes.
+Clients opt in with a WebSocket subprotocol; the "-dict" variant primes the stream with a
+preset dictionary of typical tool output (clients must use STREAM_DICTIONARY verbatim).
+"""
+
+import base64
+import gzip
+import struct
+import zlib
+from typing import Any
+
+PROTOCOL_DEFLATE = "qg.stream.deflate.v2"
+PROTOCOL_DEFLATE_DICT = "qg.stream.deflate-dict.v2"
+# Preferred first when a client offers both
+STREAM_PROTOCOLS = (PROTOCOL_DEFLATE_DICT, PROTOCOL_DEFLATE)
+
+FRAME_STREAM = 0x01
+# Batches below this are sent as plain text on the legacy path
+LEGACY_COMPRESS_THRESHOLD = 1024
+
+# zlib favours matches near the end of the dictionary, so the most common strings go last
+STREAM_DICTIONARY = (
+    b"Pyright  - information:  - warning:  - error: is not a known attribute of module "
+    b'Import could not be resolved (reportMissingImports) is possibly unbound "None" is not '
+    b"assignable to (reportAttributeAccessIssue) (reportOptionalMemberAccess) "
+    b"(reportArgumentType) (reportReturnType) 0 errors, 0 warnings, 0 informations \n"
+    b"error TS2304: Cannot find name error TS2339: Property does not exist on type error "
+    b"TS2345: Argument of type is not assignable to parameter of type error TS2322: Type "
+    b"is not assignable to type error TS7006: Parameter implicitly has an 'any' type.\n"
+    b"Found 0 errors in 0 files.\nFound 0 errors. Watching for file changes.\n"
+    b'{"filePath":"","messages":[{"ruleId":"","severity":2,"message":"","line":1,"column":1,'
+    b'"nodeType":"Identifier","messageId":"","endLine":1,"endColumn":1}],"errorCount":0,'
+    b'"warningCount":0,"fixableErrorCount":0,"fixableWarningCount":0,"source":""}]\n'
+    b"F401 imported but unused E501 Line too long E711 Comparison to `None` should be "
+    b"`cond is None` F841 Local variable is assigned to but never used ANN001 Missing type "
+    b"annotation for function argument ANN201 Missing return type annotation for public "
+    b"function I001 Import block is un-sorted or un-formatted UP006 Use `list` instead of "
+    b"`List` for type annotation B008 Do not perform function call in argument defaults\n"
+    b"[*] 0 fixable with the `--fix` option.\nFound 0 errors.\nAll checks passed!\n"
+    b".tsx(1,1): error TS .ts(1,1): error TS .py:1:1: error: .py:1:1: "
+)
+
+
+def select_stream_protocol(offered: list[str] | tuple[str, ...]) -> str | None:
+    """Binary stream subprotocol to accept from the client's offer, None for the legacy path"""
+    for protocol in STREAM_PROTOCOLS:
+        if protocol in offered:
+            return protocol
+    return None
+
+
+def encode_legacy_stream(module_id: str, text: str, level: int = 9, seq: int | None = None) -> dict[str, Any]:
+    """JSON STREAM message, gzip+base64 encoded when larger than 1KB"""
+    message: dict[str, Any] = {"type": "STREAM", "module": module_id, "data": text}
+    if len(text) > LEGACY_COMPRESS_THRESHOLD:
+        compressed = gzip.compress(text.encode("utf-8"), compresslevel=level)
+        message.update(data=base64.b64encode(compressed).decode("ascii"), encoding="gzip_base64")
+    if seq is not None:
+        message["seq"] = seq
+    return message
+
+
+class DeflateStreamEncoder:
+    """Persistent raw deflate streams of one connection, one per module"""
+
+    def __init__(self, use_dictionary: bool = False, level: int = zlib.Z_DEFAULT_COMPRESSION) -> None:
+        self.use_dictionary = use_dictionary
+        # Applies to streams opened from now on: zlib cannot change an open stream's level
+        self.level = level
+        self._streams: dict[str, Any] = {}
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+
+    def encode(self, module_id: str, text: str, seq: int = 0) -> bytes:
+        """Binary STREAM frame continuing the module's deflate stream (sync-flushed)"""
+        name = module_id.encode("utf-8")
+        if len(name) > 255:
+            raise ValueError(f"Module id too long for a stream frame: {module_id}")
+        data = text.encode("utf-8")
+        compressor = self._streams.get(module_id)
+        if compressor is None:
+            if self.use_dictionary:
+                compressor = zlib.compressobj(self.level, wbits=-zlib.MAX_WBITS, zdict=STREAM_DICTIONARY)
+            else:
+                compressor = zlib.compressobj(self.level, wbits=-zlib.MAX_WBITS)
+            self._streams[module_id] = compressor
+        payload = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        self.raw_bytes += len(data)
+        self.sent_bytes += len(payload)
+        header = bytes((FRAME_STREAM, len(name))) + name + struct.pack(">II", seq & 0xFFFFFFFF, len(data))
+        return header + payload
+
+
+def decode_stream_frame(frame: bytes) -> tuple[str, int, int, bytes]:
+    """(module id, sequence number, uncompressed length, deflate bytes) of a binary STREAM frame"""
+    if len(frame) < 2 or frame[0] != FRAME_STREAM:
+        raise ValueError("Not a STREAM frame")
+    end = 2 + frame[1]
+    seq, raw_length = struct.unpack_from(">II", frame, end)
+    return frame[2:end].decode("utf-8"), seq, raw_length, frame[end + 8 :]
@@ -0,0 +1,367 @@
+"""
+Stream Subscribers
+Each WebSocket connection batches STREAM output on its own schedule. A StreamPacer measures
+how long the connection's sends take and derives the flush interval, batch size and
+compression level that keep output within the client's end-to-end latency budget:
+- fast local clients (editor integrations) get small, quick, lightly compressed batches
+- slow links (remote dashboards) get fewer, larger, strongly compressed batches
+Legacy (JSON gzip_base64) output does not depend on the connection, so a project's legacy
+subscribers share one SharedStreamBuffer and every batch is encoded once for all of them.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import WebSocket
+
+from ...application.engine.offload import get_offload_executor
+from .replay_buffer import ReplayEntry, encode_message
+from .stream_codec import DeflateStreamEncoder, encode_legacy_stream
+
+logger = logging.getLogger(__name__)
+
+# End-to-end budget for clients that do not ask for one (the former fixed 100 ms flush)
+DEFAULT_LATENCY_BUDGET = 0.1
+MIN_LATENCY_BUDGET = 0.01
+MAX_LATENCY_BUDGET = 5.0
+MIN_FLUSH_BYTES = 4 * 1024
+MAX_FLUSH_BYTES = 512 * 1024
+DEFAULT_FLUSH_BYTES = 32 * 1024
+DEFAULT_COMPRESSION_LEVEL = 6
+# Sends smaller than this say more about per-message latency than about bandwidth
+THROUGHPUT_SAMPLE_BYTES = 2 * 1024
+EWMA_ALPHA = 0.3
+# Links slower than SLOW_LINK_BYTES/s are worth the CPU of maximum compression; above
+# FAST_LINK_BYTES/s compression time would dominate the latency
+SLOW_LINK_BYTES = 1024 * 1024
+FAST_LINK_BYTES = 16 * 1024 * 1024
+# Frames waiting for one connection's writer (a connection this far behind is evicted), and
+# how long one frame may take to send before the connection is considered dead
+MAX_QUEUED_FRAMES = 256
+SEND_TIMEOUT = 10.0
+# Replays to a (re)connecting client wait for its writer whenever its queue is this full
+REPLAY_HIGH_WATER = 0.5
+
+
+def _ewma(previous: float | None, sample: float) -> float:
+    return sample if previous is None else EWMA_ALPHA * sample + (1 - EWMA_ALPHA) * previous
+
+
+class StreamPacer:
+    """Batching and compression parameters of one subscriber, tuned from its measured sends"""
+
+    def __init__(self, latency_budget: float = DEFAULT_LATENCY_BUDGET) -> None:
+        self.latency_budget = min(max(latency_budget, MIN_LATENCY_BUDGET), MAX_LATENCY_BUDGET)
+        self.send_latency: float | None = None
+        self.throughput: float | None = None
+        self.flush_bytes = DEFAULT_FLUSH_BYTES
+        self.flush_interval = self.latency_budget
+        self.compression_level = DEFAULT_COMPRESSION_LEVEL
+
+    def record_send(self, size: int, seconds: float) -> None:
+        """Fold one measured send into the estimates and re-derive the parameters"""
+        seconds = max(seconds, 1e-6)
+        self.send_latency = _ewma(self.send_latency, seconds)
+        if size >= THROUGHPUT_SAMPLE_BYTES:
+            self.throughput = _ewma(self.throughput, size / seconds)
+        # Output waits at most flush_interval in the buffer, then takes about send_latency to arrive;
+        # when the link alone eats the budget, waiting longer costs little and saves frames
+        self.flush_interval = max(self.latency_budget - self.send_latency, self.latency_budget / 4)
+        if self.throughput is None:
+            return
+        # A batch should be sendable in about the time it took to collect
+        self.flush_bytes = int(min(max(self.throughput * self.flush_interval, MIN_FLUSH_BYTES), MAX_FLUSH_BYTES))
+        if self.throughput < SLOW_LINK_BYTES:
+            self.compression_level = 9
+        elif self.throughput < FAST_LINK_BYTES:
+            self.compression_level = DEFAULT_COMPRESSION_LEVEL
+        else:
+            self.compression_level = 1
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "latency_budget_ms": round(self.latency_budget * 1000),
+            "send_latency_ms": None if self.send_latency is None else round(self.send_latency * 1000, 2),
+            "throughput_kbps": None if self.throughput is None else round(self.throughput / 1024, 1),
+            "flush_bytes": self.flush_bytes,
+            "flush_interval_ms": round(self.flush_interval * 1000, 1),
+            "compression_level": self.compression_level,
+        }
+
+
+@dataclass(frozen=True)
+class StreamBatch:
+    """STREAM output of one flush, per module; encoded by the writer right before it is sent"""
+
+    chunks: dict[str, str]
+    seqs: dict[str, int]
+
+
+async def encode_legacy_batch(batch: StreamBatch, level: int) -> list[str]:
+    """Serialised JSON STREAM messages of a batch, one per module"""
+    offload = get_offload_executor()
+    frames: list[str] = []
+    for module_id, text in batch.chunks.items():
+        seq = batch.seqs.get(module_id)
+        message = await offload.run("compress", encode_legacy_stream, module_id, text, level, seq, size=len(text))
+        frames.append(encode_message(message))
+    return frames
+
+
+class SharedStreamBatch:
+    """A legacy batch queued on several subscribers; encoding starts at once and runs only once"""
+
+    def __init__(self, batch: StreamBatch, level: int) -> None:
+        self._frames = asyncio.create_task(encode_legacy_batch(batch, level))
+
+    async def frames(self) -> list[str]:
+        # Shielded: an evicted subscriber must not cancel the encoding the others wait for
+        return await asyncio.shield(self._frames)
+
+
+QueuedFrame = str | bytes | StreamBatch | SharedStreamBatch
+
+
+class StreamSubscriber:
+    """
+    One connection's outbound side. STREAM output is buffered per module and flushed as paced;
+    every frame then goes through a bounded send queue drained by the connection's own writer
+    task, which also compresses the batches. Queueing never waits, so a stalled socket only
+    holds up itself. Frames keep their order, and buffered output is flushed before any later
+    message so nothing overtakes the output it follows. A connection whose queue overflows, or
+    whose socket cannot take a frame within send_timeout, is evicted.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        encoder: DeflateStreamEncoder | None = None,
+        pacer: StreamPacer | None = None,
+        max_queued_frames: int = MAX_QUEUED_FRAMES,
+        send_timeout: float = SEND_TIMEOUT,
+        on_evict: Callable[["StreamSubscriber"], None] | None = None,
+        deltas: bool = False,
+    ) -> None:
+        self.websocket = websocket
+        self.encoder = encoder
+        self.pacer = pacer or StreamPacer()
+        # Asked for FINDINGS_DELTA instead of the full METRICS of incremental runs
+        self.deltas = deltas
+        self.send_timeout = send_timeout
+        self.on_evict = on_evict
+        self.closed = False
+        self._pending: dict[str, list[str]] = {}
+        # Sequence number of the newest buffered output per module
+        self._pending_seq: dict[str, int] = {}
+        self._pending_size = 0
+        self._flush_task: asyncio.Task[None] | None = None
+        self._queue: asyncio.Queue[QueuedFrame] = asyncio.Queue(maxsize=max_queued_frames)
+        self._writer: asyncio.Task[None] | None = None
+
+    def send_entry(self, entry: ReplayEntry) -> None:
+        if entry.deltas is not None and entry.deltas != self.deltas:
+            return
+        if entry.module_id is None:
+            self.send_text(entry.text)
+        else:
+            self.send_stream(entry.module_id, entry.text, entry.seq)
+
+    def send_stream(self, module_id: str, text: str, seq: int | None = None) -> None:
+        if self.closed:
+            return
+        self._pending.setdefault(module_id, []).append(text)
+        if seq is not None:
+            self._pending_seq[module_id] = seq
+        self._pending_size += len(text)
+        if self._pending_size >= self.pacer.flush_bytes:
+            self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later(self.pacer.flush_interval))
+
+    def send_text(self, text: str) -> None:
+        """Queue an already serialised message (shared by every subscriber) behind buffered output"""
+        self.flush()
+        self._enqueue(text)
+
+    def send_batch(self, batch: SharedStreamBatch) -> None:
+        """Queue a legacy batch encoded once for every legacy subscriber, behind buffered output"""
+        self.flush()
+        self._enqueue(batch)
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        batch = StreamBatch(
+            {module_id: "".join(chunks) for module_id, chunks in self._pending.items()}, self._pending_seq
+        )
+        self._pending, self._pending_seq, self._pending_size = {}, {}, 0
+        self._enqueue(batch)
+
+    async def replay(self, entries: list[ReplayEntry]) -> None:
+        """Queue entries the client missed, letting its writer catch up whenever the queue fills"""
+        for entry in entries:
+            if self._queue.qsize() >= self._queue.maxsize * REPLAY_HIGH_WATER:
+                try:
+                    await asyncio.wait_for(self._queue.join(), timeout=self.send_timeout)
+                except TimeoutError:
+                    self._evict(f"replay stalled for {self.send_timeout}s")
+            if self.closed:
+                return
+            self.send_entry(entry)
+
+    async def drain(self) -> None:
+        """Wait until everything buffered or queued so far has been sent"""
+        self.flush()
+        await self._queue.join()
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        self.flush()
+
+    def _enqueue(self, frame: QueuedFrame) -> None:
+        if self.closed:
+            return
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_frames())
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self._evict(f"{self._queue.qsize()} frames queued")
+
+    async def _encode(self, item: QueuedFrame) -> Sequence[str | bytes]:
+        if isinstance(item, SharedStreamBatch):
+            return await item.frames()
+        if not isinstance(item, StreamBatch):
+            return [item]
+        level = self.pacer.compression_level
+        if self.encoder is None:
+            return await encode_legacy_batch(item, level)
+        offload = get_offload_executor()
+        # Level changes apply to module streams opened from now on
+        self.encoder.level = level
+        return [
+            await offload.run(
+                "compress", self.encoder.encode, module_id, text, item.seqs.get(module_id, 0), size=len(text)
+            )
+            for module_id, text in item.chunks.items()
+        ]
+
+    async def _write_frames(self) -> None:
+        while True:
+            item = await self._queue.get()
+            try:
+                frames = await self._encode(item)
+            except Exception as e:
+                logger.error(f"Error encoding WS stream: {e}")
+                self._queue.task_done()
+                continue
+            for frame in frames:
+                started = time.monotonic()
+                try:
+                    if isinstance(frame, bytes):
+                        await asyncio.wait_for(self.websocket.send_bytes(frame), timeout=self.send_timeout)
+                    else:
+                        await asyncio.wait_for(self.websocket.send_text(frame), timeout=self.send_timeout)
+                except Exception as e:
+                    self._queue.task_done()
+                    self._evict(f"send failed ({e!r})" if not isinstance(e, TimeoutError) else "send timed out")
+                    return
+                self.pacer.record_send(len(frame), time.monotonic() - started)
+            self._queue.task_done()
+
+    def _evict(self, reason: str) -> None:
+        if self.closed:
+            return
+        logger.warning(f"🐢 Evicting WebSocket client: {reason}")
+        self.close()
+        if self.on_evict is not None:
+            self.on_evict(self)
+
+    def close(self) -> None:
+        """Stop sending and drop buffered and queued output of a closed connection"""
+        self.closed = True
+        for task in (self._flush_task, self._writer):
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        self._flush_task = None
+        self._writer = None
+        self._pending.clear()
+        self._pending_seq.clear()
+        self._pending_size = 0
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+
+    def snapshot(self) -> dict[str, Any]:
+        protocol = "legacy" if self.encoder is None else "deflate-dict" if self.encoder.use_dictionary else "deflate"
+        return {
+            "protocol": protocol,
+            "deltas": self.deltas,
+            "pending_bytes": self._pending_size,
+            "queued_frames": self._queue.qsize(),
+            **self.pacer.snapshot(),
+        }
+
+
+class SharedStreamBuffer:
+    """
+    One project's STREAM output for its legacy subscribers, batched once and paced for the most
+    demanding of them: the shortest flush interval and batch size, the strongest compression.
+    Each flush is queued on all of them as one SharedStreamBatch.
+    """
+
+    def __init__(self, subscribers: Callable[[], list[StreamSubscriber]]) -> None:
+        self.subscribers = subscribers
+        self._pending: dict[str, list[str]] = {}
+        self._pending_seq: dict[str, int] = {}
+        self._pending_size = 0
+        self._flush_task: asyncio.Task[None] | None = None
+
+    def send_stream(self, module_id: str, text: str, seq: int) -> None:
+        subscribers = self.subscribers()
+        if not subscribers:
+            return
+        self._pending.setdefault(module_id, []).append(text)
+        self._pending_seq[module_id] = seq
+        self._pending_size += len(text)
+        if self._pending_size >= min(subscriber.pacer.flush_bytes for subscriber in subscribers):
+            self.flush()
+        elif self._flush_task is None:
+            delay = min(subscriber.pacer.flush_interval for subscriber in subscribers)
+            self._flush_task = asyncio.create_task(self._flush_later(delay))
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        batch = StreamBatch(
+            {module_id: "".join(chunks) for module_id, chunks in self._pending.items()}, self._pending_seq
+        )
+        self._pending, self._pending_seq, self._pending_size = {}, {}, 0
+        subscribers = self.subscribers()
+        if not subscribers:
+            return
+        shared = SharedStreamBatch(batch, max(subscriber.pacer.compression_level for subscriber in subscribers))
+        for subscriber in subscribers:
+            subscriber.send_batch(shared)
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        self.flush()
+
+    def close(self) -> None:
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+        self._flush_task = None
+        self._pending.clear()
+        self._pending_seq.clear()
+        self._pending_size = 0
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._pending_size
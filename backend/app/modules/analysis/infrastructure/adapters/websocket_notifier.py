@@ -1,8 +1,15 @@
+import asyncio
+import contextlib
 import logging
+from collections.abc import Sequence
 from typing import Any
 
 from fastapi import WebSocket
 
+from .replay_buffer import ReplayBuffer, ReplayEntry
+from .stream_codec import PROTOCOL_DEFLATE_DICT, DeflateStreamEncoder, select_stream_protocol
+from .stream_subscriber import DEFAULT_LATENCY_BUDGET, SharedStreamBuffer, StreamPacer, StreamSubscriber
+
 # from ...domain.ports import AnalysisNotifierPort # Not needed if we don't inherit
 
 logger = logging.getLogger(__name__)
@@ -11,27 +18,160 @@ logger = logging.getLogger(__name__)
 class WebSocketNotifier:
     def __init__(self) -> None:
         self.active_connections: dict[str, list[WebSocket]] = {}
+        # Per connection: negotiated STREAM encoding, paced batching and a bounded send queue
+        self.subscribers: dict[WebSocket, StreamSubscriber] = {}
+        self.evicted_connections = 0
+        # Recent sequenced messages per project, replayed to clients connecting with ?since=
+        self.replay_buffers: dict[str, ReplayBuffer] = {}
+        # STREAM output of each project's legacy connections, batched and encoded once for all of them
+        self.legacy_streams: dict[str, SharedStreamBuffer] = {}
+        self._closing: set[asyncio.Task[None]] = set()
 
-    async def connect(self, websocket: WebSocket, project_id: str) -> None:
-        await websocket.accept()
+    async def connect(
+        self,
+        websocket: WebSocket,
+        project_id: str,
+        subprotocols: Sequence[str] = (),
+        latency_budget: float | None = None,
+        since: int | None = None,
+        deltas: bool = False,
+    ) -> None:
+        protocol = select_stream_protocol(tuple(subprotocols))
+        await websocket.accept(subprotocol=protocol)
+        encoder = DeflateStreamEncoder(use_dictionary=protocol == PROTOCOL_DEFLATE_DICT) if protocol else None
+        pacer = StreamPacer(latency_budget or DEFAULT_LATENCY_BUDGET)
+        subscriber = StreamSubscriber(websocket, encoder, pacer, on_evict=self._evict, deltas=deltas)
+        self.subscribers[websocket] = subscriber
+        if since is not None:
+            await self._replay(subscriber, self._replay_buffer(project_id), since)
+            if subscriber.closed:
+                return  # evicted while catching up
+        # Registered only now: nothing is recorded between the last replayed entry and this point.
+        # Shared legacy output buffered so far was replayed already and goes to the others only
+        if project_id in self.legacy_streams:
+            self.legacy_streams[project_id].flush()
         if project_id not in self.active_connections:
             self.active_connections[project_id] = []
         self.active_connections[project_id].append(websocket)
         logger.info(f"WS Connected: {project_id} (Total: {len(self.active_connections[project_id])})")
 
     def disconnect(self, websocket: WebSocket, project_id: str) -> None:
+        subscriber = self.subscribers.pop(websocket, None)
+        if subscriber is not None:
+            subscriber.close()
         if project_id in self.active_connections:
             if websocket in self.active_connections[project_id]:
                 self.active_connections[project_id].remove(websocket)
             if not self.active_connections[project_id]:
                 del self.active_connections[project_id]
+                legacy_stream = self.legacy_streams.pop(project_id, None)
+                if legacy_stream is not None:
+                    legacy_stream.close()
 
-    async def send_update(self, project_id: str, message: dict[str, Any]) -> None:
-        if project_id in self.active_connections:
-            for connection in self.active_connections[project_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error sending WS message: {e}")
-        else:
+    def _replay_buffer(self, project_id: str) -> ReplayBuffer:
+        buffer = self.replay_buffers.get(project_id)
+        if buffer is None:
+            buffer = self.replay_buffers[project_id] = ReplayBuffer()
+        return buffer
+
+    async def _replay(self, subscriber: StreamSubscriber, buffer: ReplayBuffer, since: int) -> None:
+        """Send what the client missed after since, or a SNAPSHOT when the ring no longer has it"""
+        replayed = 0
+        while not subscriber.closed:
+            entries = buffer.since(since)
+            if entries is None:
+                subscriber.send_text(buffer.snapshot_message())
+                since = buffer.last_seq
+                logger.info(f"📸 Sent state snapshot at seq {since}")
+                continue
+            if not entries:
+                break
+            # Catching up may wait on this client; new messages are picked up by the next round
+            await subscriber.replay(entries)
+            since = entries[-1].seq
+            replayed += len(entries)
+        if replayed:
+            logger.info(f"⏪ Replayed {replayed} message(s) up to seq {since}")
+
+    def _legacy_stream(self, project_id: str) -> SharedStreamBuffer:
+        legacy_stream = self.legacy_streams.get(project_id)
+        if legacy_stream is None:
+            legacy_stream = self.legacy_streams[project_id] = SharedStreamBuffer(
+                lambda: self._legacy_subscribers(project_id)
+            )
+        return legacy_stream
+
+    def _legacy_subscribers(self, project_id: str) -> list[StreamSubscriber]:
+        subscribers = [self._subscriber(connection) for connection in self.active_connections.get(project_id, [])]
+        return [subscriber for subscriber in subscribers if subscriber.encoder is None and not subscriber.closed]
+
+    def _subscriber(self, connection: WebSocket) -> StreamSubscriber:
+        subscriber = self.subscribers.get(connection)
+        if subscriber is None:
+            # Registered without connect(): plain JSON with default pacing
+            subscriber = self.subscribers[connection] = StreamSubscriber(connection, on_evict=self._evict)
+        return subscriber
+
+    def _evict(self, subscriber: StreamSubscriber) -> None:
+        """Drop a dead or too slow connection so it stops holding up the project's other clients"""
+        self.evicted_connections += 1
+        self.subscribers.pop(subscriber.websocket, None)
+        for project_id, connections in list(self.active_connections.items()):
+            if subscriber.websocket in connections:
+                self.disconnect(subscriber.websocket, project_id)
+        task = asyncio.create_task(self._close_quietly(subscriber.websocket, subscriber.send_timeout))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket, timeout: float) -> None:
+        with contextlib.suppress(Exception):
+            # 1013: try again later; the client reconnects and starts a fresh stream
+            await asyncio.wait_for(websocket.close(code=1013), timeout=timeout)
+
+    def _fan_out(self, project_id: str, entry: ReplayEntry) -> None:
+        """Queue the entry on every connection without waiting for any of them"""
+        connections = self.active_connections.get(project_id)
+        if not connections:
             logger.warning(f"No active WS connections for project_id: {project_id}")
+            return
+        # Copied first: an overflowing connection is evicted (and unregistered) while queueing
+        subscribers = [self._subscriber(connection) for connection in connections]
+        if entry.module_id is None:
+            # Legacy output buffered so far goes out ahead of the message that follows it
+            self._legacy_stream(project_id).flush()
+        else:
+            self._legacy_stream(project_id).send_stream(entry.module_id, entry.text, entry.seq)
+            subscribers = [subscriber for subscriber in subscribers if subscriber.encoder is not None]
+        for subscriber in subscribers:
+            try:
+                subscriber.send_entry(entry)
+            except Exception as e:
+                logger.error(f"Error sending WS message: {e}")
+
+    async def send_update(self, project_id: str, message: dict[str, Any], deltas: bool | None = None) -> None:
+        """
+        Sequence and serialise once, then queue the same frame on every connection of the project
+        deltas limits the message to connections that did (True) or did not (False) ask for FINDINGS_DELTA.
+        """
+        try:
+            entry = self._replay_buffer(project_id).record_message(message, deltas)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Error serialising WS message: {e}")
+            return
+        self._fan_out(project_id, entry)
+
+    async def send_stream(self, project_id: str, module_id: str, text: str) -> None:
+        """STREAM output, batched and encoded per connection as its pacing and protocol dictate"""
+        self._fan_out(project_id, self._replay_buffer(project_id).record_stream(module_id, text))
+
+    def snapshot(self) -> dict[str, Any]:
+        """Chosen stream parameters and queue depth of every connection, per project"""
+        return {
+            "evicted": self.evicted_connections,
+            "replay": {project_id: buffer.stats() for project_id, buffer in sorted(self.replay_buffers.items())},
+            "connections": {
+                project_id: [self._subscriber(connection).snapshot() for connection in connections]
+                for project_id, connections in sorted(self.active_connections.items())
+            },
+        }
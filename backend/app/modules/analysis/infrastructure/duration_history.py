@@ -0,0 +1,92 @@
+"""
+Module Duration History
+Remembers how long each module took per project and run kind (full or incremental) as an
+exponentially weighted moving average, so the orchestrator can start the longest jobs
+first and estimate when a run will finish.
+"""
+
+import heapq
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = "data/duration-history.json"
+# Weight of the newest sample; recent runs matter more as the project grows
+EWMA_ALPHA = 0.3
+
+
+class DurationHistory:
+    """
+    EWMA of module wall times keyed by (project, module_id, kind)
+    Persisted as one small JSON file rewritten atomically after every sample.
+    """
+
+    def __init__(self, path: str | Path | None = None, alpha: float = EWMA_ALPHA) -> None:
+        self.path = Path(path) if path else None
+        self.alpha = alpha
+        self._durations: dict[str, float] | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(project: str, module_id: str, kind: str) -> str:
+        return f"{project}|{module_id}|{kind}"
+
+    def expected(self, project: str, module_id: str, kind: str) -> float | None:
+        """Expected seconds for the module, or None if it never ran for this project"""
+        with self._lock:
+            return self._load().get(self._key(project, module_id, kind))
+
+    def record(self, project: str, module_id: str, kind: str, seconds: float) -> None:
+        """Fold a measured duration into the average and persist it"""
+        key = self._key(project, module_id, kind)
+        with self._lock:
+            durations = self._load()
+            previous = durations.get(key)
+            durations[key] = seconds if previous is None else self.alpha * seconds + (1 - self.alpha) * previous
+            self._save(durations)
+
+    def _load(self) -> dict[str, float]:
+        if self._durations is None:
+            self._durations = {}
+            if self.path and self.path.exists():
+                try:
+                    self._durations = {k: float(v) for k, v in json.loads(self.path.read_text()).items()}
+                except (OSError, ValueError, AttributeError) as e:
+                    logger.warning(f"Ignoring unreadable duration history {self.path}: {e}")
+        return self._durations
+
+    def _save(self, durations: dict[str, float]) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, staging = tempfile.mkstemp(prefix=".duration-history-", dir=self.path.parent)
+            with os.fdopen(fd, "w") as f:
+                json.dump(durations, f)
+            os.replace(staging, self.path)
+        except OSError as e:
+            logger.warning(f"Duration history write failed: {e}")
+
+
+def estimate_makespan(durations: list[float], slots: int) -> float:
+    """Finish time of longest-first list scheduling of the durations on the given slots"""
+    finish_times = [0.0] * max(1, min(slots, len(durations)))
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(finish_times, finish_times[0] + duration)
+    return max(finish_times)
+
+
+_duration_history: DurationHistory | None = None
+
+
+def get_duration_history() -> DurationHistory:
+    """Return the process-wide duration history, stored at DURATION_HISTORY_PATH"""
+    global _duration_history
+    if _duration_history is None:
+        _duration_history = DurationHistory(os.environ.get("DURATION_HISTORY_PATH", DEFAULT_HISTORY_PATH))
+    return _duration_history
@@ -0,0 +1,172 @@
+"""
+Findings Index
+The current findings of every project, one row per finding, indexed by module, severity, rule
+and file so clients can ask for "all pyright errors under services/billing/" or "top rules"
+and fetch only the page they render instead of re-parsing whole logs in the browser.
+Pages are keyset-paginated on (file, line, id): a cursor stays valid while new runs replace rows.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any
+
+import aiosqlite
+
+from ..domain.entities import Finding
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+FINDINGS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id TEXT NOT NULL,
+    module_id TEXT NOT NULL,
+    file TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    col INTEGER,
+    severity TEXT NOT NULL,
+    rule TEXT,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_by_file ON findings (project_id, file, line, id);
+CREATE INDEX IF NOT EXISTS findings_by_module ON findings (project_id, module_id, severity, file);
+CREATE INDEX IF NOT EXISTS findings_by_severity ON findings (project_id, severity, file);
+CREATE INDEX IF NOT EXISTS findings_by_rule ON findings (project_id, rule, file);
+"""
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class FindingsFilter:
+    """Conditions of a findings query; path is a file or directory prefix (e.g. services/billing/)"""
+
+    module_id: str | None = None
+    severity: str | None = None
+    rule: str | None = None
+    path: str | None = None
+
+    def where(self, project_id: str) -> tuple[str, list[Any]]:
+        clauses, args = ["project_id = ?"], [project_id]
+        for column, value in (("module_id", self.module_id), ("severity", self.severity), ("rule", self.rule)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if self.path:
+            # Range on the file index instead of LIKE, which SQLite cannot serve from it
+            clauses.append("file >= ? AND file < ?")
+            args.extend((self.path, self.path[:-1] + chr(ord(self.path[-1]) + 1)))
+        return " AND ".join(clauses), args
+
+
+def encode_cursor(file: str, line: int, finding_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([file, line, finding_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, int, int]:
+    try:
+        file, line, finding_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(file), int(line), int(finding_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+class FindingsIndex:
+    """Writes and reads the findings table on a connection owned by the MetricsStore"""
+
+    async def replace(
+        self,
+        db: aiosqlite.Connection,
+        project_id: str,
+        module_id: str,
+        findings: list[Finding],
+        analysed_files: list[str] | None,
+    ) -> None:
+        """Swap in a run's findings: all of the module's (full run) or those of the files it covered"""
+        if analysed_files is None:
+            await db.execute("DELETE FROM findings WHERE project_id = ? AND module_id = ?", (project_id, module_id))
+        else:
+            files = set(analysed_files) | {f.file for f in findings}
+            await db.executemany(
+                "DELETE FROM findings WHERE project_id = ? AND module_id = ? AND file = ?",
+                [(project_id, module_id, file) for file in files],
+            )
+        await db.executemany(
+            "INSERT INTO findings (project_id, module_id, file, line, col, severity, rule, message) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    project_id,
+                    module_id,
+                    f.file,
+                    f.line or 0,
+                    f.column,
+                    f.severity,
+                    f.rule,
+                    f.message,
+                )
+                for f in findings
+            ],
+        )
+
+    async def page(
+        self,
+        db: aiosqlite.Connection,
+        project_id: str,
+        conditions: FindingsFilter,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """One page of findings ordered by file and line, with the cursor of the next page"""
+        limit = min(max(limit, 1), MAX_PAGE_SIZE)
+        where, args = conditions.where(project_id)
+        total = None
+        if cursor is None:
+            async with db.execute(f"SELECT COUNT(*) FROM findings WHERE {where}", args) as rows:
+                (total,) = await rows.fetchone() or (0,)
+        else:
+            where += " AND (file, line, id) > (?, ?, ?)"
+            args = [*args, *decode_cursor(cursor)]
+        async with db.execute(
+            f"SELECT id, module_id, file, line, col, severity, rule, message FROM findings "
+            f"WHERE {where} ORDER BY file, line, id LIMIT ?",
+            [*args, limit + 1],
+        ) as rows:
+            found = list(await rows.fetchall())
+        items: list[dict[str, Any]] = [
+            {
+                "id": finding_id,
+                "module_id": module_id,
+                "file": file,
+                "line": line,
+                "column": col,
+                "severity": severity,
+                "rule": rule,
+                "message": message,
+            }
+            for finding_id, module_id, file, line, col, severity, rule, message in found[:limit]
+        ]
+        last = items[-1] if len(found) > limit else None
+        next_cursor = None if last is None else encode_cursor(last["file"], last["line"], last["id"])
+        return {"items": items, "next_cursor": next_cursor, "total": total}
+
+    async def top_rules(
+        self, db: aiosqlite.Connection, project_id: str, conditions: FindingsFilter, limit: int = 20
+    ) -> list[dict[str, Any]]:
+        """Most frequent rules among the matching findings"""
+        where, args = conditions.where(project_id)
+        async with db.execute(
+            f"SELECT module_id, rule, severity, COUNT(*) AS count FROM findings "
+            f"WHERE {where} AND rule IS NOT NULL GROUP BY module_id, rule, severity "
+            f"ORDER BY count DESC, rule LIMIT ?",
+            [*args, min(max(limit, 1), MAX_PAGE_SIZE)],
+        ) as rows:
+            return [
+                {"module_id": module_id, "rule": rule, "severity": severity, "count": count}
+                for module_id, rule, severity, count in await rows.fetchall()
+            ]
@@ -1,9 +1,13 @@
+import codecs
 import json
 import re
 from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
+from ..domain.entities import Finding, Severity
+from .tool_parsers import TOOL_PARSERS, ToolParser, build_report
+
 
 class QualityLogParser:
     """
@@ -16,7 +20,7 @@ class QualityLogParser:
         self.total_issues = {"ERROR": 0, "WARNING": 0, "INFO": 0, "COMPLEXITY": 0}
 
         # Store module data: file_path -> { metrics: {...}, complexity_metrics: {...} }
-        self.modules_data = defaultdict(
+        self.modules_data: defaultdict[str, dict[str, dict[str, int]]] = defaultdict(
             lambda: {
                 "metrics": {"ERROR": 0, "WARNING": 0, "INFO": 0},
                 "complexity_metrics": {"COMPLEXITY": 0, "MAX_CCN": 0},
@@ -29,6 +33,14 @@ class QualityLogParser:
         # path/to/file.py:10:5 ...
         # src/comp.tsx(10,5): ...
         self.file_pattern = re.compile(r"^(.+?)(?::\d+|\(\d+)")
+        # Position and message of a finding line: file:line[:col] message / file(line,col): message
+        self.location_pattern = re.compile(r"^.+?(?::(\d+)(?::(\d+))?|\((\d+),(\d+)\))[\s:-]*(.*)$")
+        # Rule codes: F401, TS2322, E501 (Ruff/tsc) or (reportGeneralTypeIssues) (Pyright)
+        self.rule_pattern = re.compile(r"\b([A-Z]{1,3}\d{3,4})\b|\((report[A-Za-z]+)\)\s*$")
+
+        # Individual findings of the last parse, when collect_findings is enabled
+        self.collect_findings = False
+        self.findings: list[Finding] = []
 
         # Issue Type Patterns
         self.patterns = {
@@ -57,18 +69,18 @@ class QualityLogParser:
         }
 
         # Tool-specific configuration
-        self.tool_config = {
+        self.tool_config: dict[str, dict[str, tuple[str, ...]]] = {
             "F_TypeScript": {
                 "extensions": (".ts", ".tsx", ".js", ".jsx"),
-                "patterns": ["TS\\d+", "error"],
+                "patterns": ("TS\\d+", "error"),
             },
             "F_ESLint": {
                 "extensions": (".ts", ".tsx", ".js", ".jsx"),
-                "patterns": ["error", "warning"],
+                "patterns": ("error", "warning"),
             },
             "B_Ruff": {
                 "extensions": (".py",),
-                "patterns": [
+                "patterns": (
                     "E\\d+",
                     "F\\d+",
                     "W\\d+",
@@ -76,15 +88,15 @@ class QualityLogParser:
                     "C\\d+",
                     "error",
                     "warning",
-                ],
+                ),
             },
             "B_Pyright": {
                 "extensions": (".py",),
-                "patterns": ["error", "note", "information", "warning"],
+                "patterns": ("error", "note", "information", "warning"),
             },
             "B_Lizard": {
                 "extensions": (".py", ".ts", ".tsx", ".js", ".jsx", ".cpp", ".h"),
-                "patterns": ["Cyclomatic complexity", "CCN"],
+                "patterns": ("Cyclomatic complexity", "CCN"),
             },
         }
 
@@ -104,17 +116,20 @@ class QualityLogParser:
 
         lines = content.splitlines()
         for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            self._process_line(line, tool_id)
+            self.add_line(line, tool_id)
 
         return self._generate_report()
 
+    def add_line(self, line: str, tool_id: str | None = None) -> None:
+        """Count the findings of one output line into the running totals"""
+        line = line.strip()
+        if line:
+            self._process_line(line, tool_id)
+
     def _reset(self) -> None:
         self.total_issues = {k: 0 for k in self.total_issues}
         self.modules_data.clear()
+        self.findings = []
 
     def _process_line(self, line: str, tool_id: str | None = None) -> None:
         # 1. Extract File Path
@@ -156,8 +171,28 @@ class QualityLogParser:
 
         # 4. Update Metrics
         self._update_metrics(file_path, issue_type, ccn_value)
+        if self.collect_findings:
+            self.findings.append(self._build_finding(line, file_path, issue_type, ccn_value))
+
+    def _build_finding(self, line: str, file_path: str, issue_type: Severity, ccn: int) -> Finding:
+        location = self.location_pattern.match(line)
+        row, column, message = None, None, line
+        if location:
+            row = location.group(1) or location.group(3)
+            column = location.group(2) or location.group(4)
+            message = location.group(5) or line
+        rule = self.rule_pattern.search(message)
+        return Finding(
+            file_path,
+            int(row) if row else None,
+            int(column) if column else None,
+            issue_type,
+            (rule.group(1) or rule.group(2)) if rule else None,
+            message,
+            ccn,
+        )
 
-    def _determine_issue_type(self, line: str) -> str | None:
+    def _determine_issue_type(self, line: str) -> Severity | None:
         # Check Complexity first as it's specific
         for pattern in self.patterns["COMPLEXITY"]:
             if re.search(pattern, line, re.IGNORECASE):
@@ -201,7 +236,7 @@ class QualityLogParser:
 
     def _generate_report(self) -> dict[str, Any]:
         # Convert defaultdict to list of dicts
-        modules_list = []
+        modules_list: list[dict[str, Any]] = []
         for file_path, data in self.modules_data.items():
             modules_list.append(
                 {
@@ -214,6 +249,125 @@ class QualityLogParser:
         return {"total_issues": self.total_issues, "modules": modules_list}
 
 
+class LogStream:
+    """
+    One output pipe feeding a StreamingLogParser
+    Decodes UTF-8 incrementally (multi-byte characters may span chunks) and hands only
+    complete lines to the parser; the trailing partial line waits for the next chunk.
+    """
+
+    def __init__(self, parser: "StreamingLogParser") -> None:
+        self._parser = parser
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        # Pieces of the unterminated line, joined once it ends (single-line JSON reports span many chunks)
+        self._partial: list[str] = []
+
+    def feed(self, chunk: bytes) -> str:
+        """Parse the complete lines of a chunk and return its decoded text"""
+        text = self._decoder.decode(chunk)
+        if "\n" not in text:
+            self._partial.append(text)
+            return text
+        lines = ("".join(self._partial) + text).split("\n")
+        self._partial = [lines.pop()]
+        for line in lines:
+            self._parser.add_line(line)
+        return text
+
+    def close(self) -> str:
+        """Flush the decoder and parse the last unterminated line"""
+        text = self._decoder.decode(b"", final=True)
+        tail = "".join(self._partial) + text
+        self._partial = []
+        if tail:
+            self._parser.add_line(tail)
+        return text
+
+
+class GenericParser(ToolParser):
+    """QualityLogParser heuristics as a ToolParser, for tools without an exact grammar"""
+
+    def __init__(self, tool_id: str | None = None) -> None:
+        super().__init__()
+        self.tool_id = tool_id
+        self._parser = QualityLogParser()
+        self._parser.collect_findings = True
+        self.findings = self._parser.findings
+
+    def add_line(self, line: str) -> None:
+        self._parser.add_line(line, self.tool_id)
+
+
+def create_parser(tool_id: str | None = None) -> ToolParser:
+    """The exact parser of a tool's output, or the generic heuristics for unknown tools"""
+    parser = TOOL_PARSERS.get(tool_id or "")
+    return GenericParser(tool_id) if parser is None else parser()
+
+
+class StreamingLogParser:
+    """
+    Chunk-fed tool parser: output is parsed while the tool runs, so neither the full log
+    nor a joined copy of it is needed to build the report
+    """
+
+    def __init__(self, tool_id: str | None = None) -> None:
+        self.tool_id = tool_id
+        self._parser = create_parser(tool_id)
+        self._streams: list[LogStream] = []
+        self._default: LogStream | None = None
+
+    def open_stream(self) -> LogStream:
+        """A decoder for one pipe (stdout and stderr each need their own)"""
+        stream = LogStream(self)
+        self._streams.append(stream)
+        return stream
+
+    def feed(self, chunk: bytes) -> str:
+        """Feed a chunk of a single-stream log"""
+        if self._default is None:
+            self._default = self.open_stream()
+        return self._default.feed(chunk)
+
+    def add_line(self, line: str) -> None:
+        self._parser.add_line(line)
+
+    @property
+    def finding_count(self) -> int:
+        """Findings parsed so far; changes whenever a snapshot would differ"""
+        return len(self._parser.findings)
+
+    @property
+    def findings(self) -> list[Finding]:
+        """Individual findings parsed so far"""
+        return self._parser.findings
+
+    def snapshot(self) -> dict[str, Any]:
+        """Report of everything parsed so far (a new dict, safe to send while parsing continues)"""
+        return build_report(self._parser.findings)
+
+    def close(self) -> dict[str, Any]:
+        """Flush every stream and return the final report"""
+        for stream in self._streams:
+            stream.close()
+        return self.snapshot()
+
+
+def parse_log_content(content: str, tool_id: str | None = None) -> dict[str, Any]:
+    """Report of a complete log; module-level so it can run in a worker process"""
+    return parse_tool_output(content, tool_id)[0]
+
+
+def extract_findings(content: str, tool_id: str | None = None) -> list[Finding]:
+    """Individual findings of a complete log"""
+    return create_parser(tool_id).parse(content)
+
+
+def parse_tool_output(content: str, tool_id: str | None = None) -> tuple[dict[str, Any], list[Finding]]:
+    """Report and findings of a complete log in one pass"""
+    findings = extract_findings(content, tool_id)
+    return build_report(findings), findings
+
+
 # Example usage block (for testing)
 if __name__ == "__main__":
     sample_log = """
@@ -0,0 +1,164 @@
+"""
+Metrics History
+Per-run issue totals of every project and module, kept at three resolutions so trend charts
+can span months without keeping every watch-mode run:
+- raw: one point per run, kept for a couple of days
+- hour / day: aggregates (samples, sum, min, max per severity), updated as points arrive
+Each resolution has its own retention; range queries read the finest one that still covers
+the window without returning more points than a chart can use.
+"""
+
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import aiosqlite
+
+SEVERITIES = ("ERROR", "WARNING", "INFO", "COMPLEXITY")
+HOUR = 3600
+DAY = 24 * HOUR
+RAW_RETENTION = 2 * DAY
+HOURLY_RETENTION = 90 * DAY
+DAILY_RETENTION = 730 * DAY
+# Raw points are only served for windows this short (watch mode can record thousands a day)
+RAW_MAX_WINDOW = 6 * HOUR
+# Most buckets a range query should return
+MAX_POINTS = 500
+PRUNE_INTERVAL = HOUR
+
+_COLUMNS = [f"{s.lower()}_{agg}" for s in SEVERITIES for agg in ("sum", "min", "max")]
+
+
+@dataclass(frozen=True)
+class Resolution:
+    name: str
+    table: str
+    bucket_seconds: int  # 0: raw points
+    retention_seconds: int
+
+
+RESOLUTIONS = (
+    Resolution("raw", "history_raw", 0, RAW_RETENTION),
+    Resolution("hour", "history_hour", HOUR, HOURLY_RETENTION),
+    Resolution("day", "history_day", DAY, DAILY_RETENTION),
+)
+
+
+def _schema() -> str:
+    columns = ", ".join(f"{c} INTEGER NOT NULL" for c in _COLUMNS)
+    statements: list[str] = []
+    for resolution in RESOLUTIONS:
+        unique = "" if resolution.bucket_seconds == 0 else "UNIQUE "
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {resolution.table} ("
+            f"project_id TEXT NOT NULL, module_id TEXT NOT NULL, ts REAL NOT NULL, "
+            f"samples INTEGER NOT NULL, {columns});\n"
+            f"CREATE {unique}INDEX IF NOT EXISTS {resolution.table}_by_time "
+            f"ON {resolution.table} (project_id, module_id, ts);\n"
+            f"CREATE INDEX IF NOT EXISTS {resolution.table}_by_age ON {resolution.table} (ts);"
+        )
+    return "\n".join(statements)
+
+
+HISTORY_SCHEMA = _schema()
+
+
+def pick_resolution(
+    start: float,
+    end: float,
+    now: float,
+    resolutions: tuple[Resolution, ...] = RESOLUTIONS,
+    max_points: int = MAX_POINTS,
+) -> Resolution:
+    """Finest resolution that still holds data from start and answers with at most max_points buckets"""
+    for resolution in resolutions:
+        if start < now - resolution.retention_seconds:
+            continue
+        if resolution.bucket_seconds == 0:
+            if end - start <= RAW_MAX_WINDOW:
+                return resolution
+        elif (end - start) / resolution.bucket_seconds <= max_points:
+            return resolution
+    return resolutions[-1]
+
+
+class MetricsHistory:
+    """Writes and reads the history tables on a connection owned by the MetricsStore"""
+
+    def __init__(self, resolutions: tuple[Resolution, ...] = RESOLUTIONS) -> None:
+        self.resolutions = resolutions
+        self._last_prune = 0.0
+
+    async def record(
+        self, db: aiosqlite.Connection, project_id: str, module_id: str, ts: float, totals: dict[str, Any]
+    ) -> None:
+        """Store one run's totals and fold them into every aggregate bucket (inside the caller's transaction)"""
+        values = [int(totals.get(s, 0) or 0) for s in SEVERITIES]
+        row = [v for value in values for v in (value, value, value)]
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        merge = ", ".join(
+            f"{c} = {c} + excluded.{c}"
+            if c.endswith("_sum")
+            else f"{c} = {'MIN' if c.endswith('_min') else 'MAX'}({c}, excluded.{c})"
+            for c in _COLUMNS
+        )
+        for resolution in self.resolutions:
+            bucket = ts if resolution.bucket_seconds == 0 else ts - ts % resolution.bucket_seconds
+            upsert = (
+                ""
+                if resolution.bucket_seconds == 0
+                else f" ON CONFLICT (project_id, module_id, ts) DO UPDATE SET samples = samples + 1, {merge}"
+            )
+            await db.execute(
+                f"INSERT INTO {resolution.table} (project_id, module_id, ts, samples, {', '.join(_COLUMNS)}) "
+                f"VALUES (?, ?, ?, 1, {placeholders}){upsert}",
+                (project_id, module_id, bucket, *row),
+            )
+
+    async def prune(self, db: aiosqlite.Connection, now: float | None = None) -> int:
+        """Drop points past their resolution's retention, at most once per PRUNE_INTERVAL"""
+        now = time.time() if now is None else now
+        if now - self._last_prune < PRUNE_INTERVAL:
+            return 0
+        self._last_prune = now
+        removed = 0
+        for resolution in self.resolutions:
+            cursor = await db.execute(
+                f"DELETE FROM {resolution.table} WHERE ts < ?", (now - resolution.retention_seconds,)
+            )
+            removed += cursor.rowcount
+        return removed
+
+    async def query(
+        self,
+        db: aiosqlite.Connection,
+        project_id: str,
+        start: float,
+        end: float,
+        module_id: str | None = None,
+        resolution: str | None = None,
+    ) -> dict[str, Any]:
+        if resolution is None:
+            chosen = pick_resolution(start, end, time.time(), self.resolutions)
+        else:
+            chosen = next(r for r in self.resolutions if r.name == resolution)
+        # A bucket that started before the window still covers part of it
+        first = start if chosen.bucket_seconds == 0 else start - start % chosen.bucket_seconds
+        module_filter = "" if module_id is None else " AND module_id = ?"
+        async with db.execute(
+            f"SELECT module_id, ts, samples, {', '.join(_COLUMNS)} FROM {chosen.table} "
+            f"WHERE project_id = ?{module_filter} AND ts >= ? AND ts <= ? ORDER BY module_id, ts",
+            (project_id, *(() if module_id is None else (module_id,)), first, end),
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return {"resolution": chosen.name, "start": start, "end": end, "points": [_point(row) for row in rows]}
+
+
+def _point(row: Iterable[Any]) -> dict[str, Any]:
+    module_id, ts, samples, *values = row
+    point: dict[str, Any] = {"module_id": module_id, "ts": ts, "samples": samples}
+    for i, severity in enumerate(SEVERITIES):
+        total, low, high = values[i * 3 : i * 3 + 3]
+        point[severity] = {"avg": round(total / samples, 2), "min": low, "max": high}
+    return point
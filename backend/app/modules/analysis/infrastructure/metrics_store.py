@@ -0,0 +1,346 @@
+"""
+Metrics Store
+Keeps the METRICS and END results of every run in SQLite so the latest state of a project
+can be served over HTTP without a WebSocket. Analysis only enqueues the messages; a
+background writer commits them in batches, so a slow disk never holds up streaming.
+The same database holds the metrics history and the findings index.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+
+from ..domain.entities import Finding
+from .findings_index import FINDINGS_SCHEMA, FindingsFilter, FindingsIndex
+from .metrics_history import HISTORY_SCHEMA, MetricsHistory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_DB_PATH = "data/metrics.db"
+# Messages committed per transaction
+MAX_BATCH = 512
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    project_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    status TEXT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    PRIMARY KEY (project_id, run_id)
+);
+CREATE INDEX IF NOT EXISTS runs_by_start ON runs (project_id, started_at);
+CREATE TABLE IF NOT EXISTS module_results (
+    project_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    module_id TEXT NOT NULL,
+    status TEXT,
+    summary TEXT,
+    metrics TEXT,
+    PRIMARY KEY (project_id, run_id, module_id)
+);
+CREATE TABLE IF NOT EXISTS file_metrics (
+    project_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    module_id TEXT NOT NULL,
+    file TEXT NOT NULL,
+    errors INTEGER NOT NULL,
+    warnings INTEGER NOT NULL,
+    infos INTEGER NOT NULL,
+    complexity INTEGER NOT NULL,
+    max_ccn INTEGER NOT NULL,
+    PRIMARY KEY (project_id, run_id, module_id, file)
+);
+CREATE INDEX IF NOT EXISTS file_metrics_by_file ON file_metrics (project_id, run_id, file);
+"""
+
+
+def _connect(path: Path) -> aiosqlite.Connection:
+    connection = aiosqlite.connect(path)
+    # A connection abandoned with its event loop (shutdown mid-run) must not keep the process alive
+    connection.daemon = True
+    return connection
+
+
+def _file_rows(project_id: str, run_id: str, module_id: str, metrics: dict[str, Any]) -> list[tuple[Any, ...]]:
+    rows: list[tuple[Any, ...]] = []
+    entries: list[dict[str, Any]] = metrics.get("modules") or []
+    for entry in entries:
+        counts: dict[str, Any] = entry.get("metrics") or {}
+        complexity: dict[str, Any] = entry.get("complexity_metrics") or {}
+        rows.append(
+            (
+                project_id,
+                run_id,
+                module_id,
+                str(entry.get("file")),
+                int(counts.get("ERROR", 0)),
+                int(counts.get("WARNING", 0)),
+                int(counts.get("INFO", 0)),
+                int(complexity.get("COMPLEXITY", 0)),
+                int(complexity.get("MAX_CCN", 0)),
+            )
+        )
+    return rows
+
+
+class MetricsStore:
+    """
+    SQLite store of run results, keyed by (project_id, run_id, module_id, file)
+    A GLOBAL_INIT opens a new run; METRICS and END of the project then belong to it.
+    The writer connects per write burst. Reads share one long-lived read-only connection (WAL
+    lets it read while the writer commits), which close() shuts at application shutdown.
+    """
+
+    def __init__(self, path: str | Path, history: MetricsHistory | None = None) -> None:
+        self.path = Path(path)
+        self.history = history or MetricsHistory()
+        self.findings = FindingsIndex()
+        self.written = 0
+        self.failed = 0
+        self._runs: dict[str, str] = {}  # project_id -> run in progress
+        self._queue: asyncio.Queue[tuple[Any, ...]] = asyncio.Queue()
+        self._writer: asyncio.Task[None] | None = None
+        self._reader: aiosqlite.Connection | None = None
+        self._reader_lock = asyncio.Lock()
+
+    def record(self, project_id: str, message: dict[str, Any]) -> None:
+        """Queue the parts of a notifier message worth keeping; never waits for the disk"""
+        kind = message.get("type")
+        module_id = message.get("module")
+        if kind == "GLOBAL_INIT":
+            self._start_run(project_id)
+        elif kind == "GLOBAL_END":
+            run_id = self._runs.pop(project_id, None)
+            if run_id is not None:
+                self._put(("end_run", project_id, run_id, message.get("status"), time.time()))
+        elif kind == "METRICS" and isinstance(module_id, str) and isinstance(message.get("data"), dict):
+            if message["data"].get("partial"):
+                # In-progress counts: only the final report of a run is a result (or a history sample)
+                return
+            run_id = self._run_id(project_id)
+            self._put(("metrics", project_id, run_id, module_id, message["data"], time.time()))
+        elif kind == "END" and isinstance(module_id, str):
+            run_id = self._run_id(project_id)
+            self._put(("end", project_id, run_id, module_id, message.get("status"), message.get("summary")))
+
+    def record_findings(
+        self, project_id: str, module_id: str, findings: list[Finding], analysed_files: list[str] | None
+    ) -> None:
+        """Queue a run's findings for the index (analysed_files None: they replace all of the module's)"""
+        self._put(("findings", project_id, module_id, findings, analysed_files))
+
+    async def flush(self) -> None:
+        """Wait until everything recorded so far is committed (or has failed)"""
+        await self._queue.join()
+        # ...and the writer has closed its connection, so no database thread outlives the loop
+        while self._writer is not None:
+            await asyncio.wait({self._writer})
+
+    async def close(self) -> None:
+        """Close the read connection (the writer closes its own after every burst)"""
+        async with self._reader_lock:
+            if self._reader is not None:
+                reader, self._reader = self._reader, None
+                await reader.close()
+
+    async def latest(
+        self, project_id: str, module_id: str | None = None, file: str | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Current state of the project, optionally narrowed to one module and/or file
+        Run fields describe the most recent run; each module reports its most recent result,
+        since incremental and watch runs leave the modules they skip out.
+        """
+        if not self.path.exists():
+            return None
+        db = await self._read_connection()
+        try:
+            async with db.execute(
+                "SELECT run_id, status, started_at, finished_at FROM runs "
+                "WHERE project_id = ? ORDER BY started_at DESC, rowid DESC LIMIT 1",
+                (project_id,),
+            ) as cursor:
+                run = await cursor.fetchone()
+        except sqlite3.OperationalError:
+            # The writer has not created the schema yet
+            return None
+        if run is None:
+            return None
+        module_filter = "" if module_id is None else " AND m.module_id = ?"
+        module_args = () if module_id is None else (module_id,)
+        current = (
+            "WITH current AS (SELECT * FROM ("
+            "SELECT m.*, ROW_NUMBER() OVER ("
+            "PARTITION BY m.module_id ORDER BY r.started_at DESC, r.rowid DESC) AS recency "
+            "FROM module_results m JOIN runs r ON r.project_id = m.project_id AND r.run_id = m.run_id "
+            f"WHERE m.project_id = ?{module_filter}) WHERE recency = 1) "
+        )
+        async with db.execute(
+            current + "SELECT module_id, status, summary, metrics FROM current ORDER BY module_id",
+            (project_id, *module_args),
+        ) as cursor:
+            modules = {
+                row["module_id"]: {
+                    "status": row["status"],
+                    "summary": row["summary"],
+                    "metrics": None if row["metrics"] is None else json.loads(row["metrics"]),
+                }
+                for row in await cursor.fetchall()
+            }
+        file_filter = "" if file is None else " AND f.file = ?"
+        file_args = () if file is None else (file,)
+        async with db.execute(
+            current + "SELECT f.module_id, f.file, f.errors, f.warnings, f.infos, f.complexity, f.max_ccn "
+            "FROM file_metrics f JOIN current c "
+            "ON c.project_id = f.project_id AND c.run_id = f.run_id AND c.module_id = f.module_id "
+            f"WHERE f.project_id = ?{file_filter} ORDER BY f.file, f.module_id",
+            (project_id, *module_args, project_id, *file_args),
+        ) as cursor:
+            files = [dict(row) for row in await cursor.fetchall()]
+        return {"project_id": project_id, **dict(run), "modules": modules, "files": files}
+
+    async def history_range(
+        self,
+        project_id: str,
+        start: float,
+        end: float,
+        module_id: str | None = None,
+        resolution: str | None = None,
+    ) -> dict[str, Any]:
+        """Issue totals of the project over [start, end], at the resolution the window needs"""
+        empty: dict[str, Any] = {"resolution": resolution, "start": start, "end": end, "points": []}
+        if not self.path.exists():
+            return empty
+        try:
+            db = await self._read_connection()
+            return await self.history.query(db, project_id, start, end, module_id, resolution)
+        except sqlite3.OperationalError:
+            return empty
+
+    async def findings_page(
+        self, project_id: str, conditions: FindingsFilter, limit: int, cursor: str | None = None
+    ) -> dict[str, Any]:
+        """One page of the project's current findings (raises InvalidCursorError for a bad cursor)"""
+        if not self.path.exists():
+            return {"items": [], "next_cursor": None, "total": 0}
+        try:
+            return await self.findings.page(await self._read_connection(), project_id, conditions, limit, cursor)
+        except sqlite3.OperationalError:
+            return {"items": [], "next_cursor": None, "total": 0}
+
+    async def top_rules(self, project_id: str, conditions: FindingsFilter, limit: int) -> list[dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        try:
+            return await self.findings.top_rules(await self._read_connection(), project_id, conditions, limit)
+        except sqlite3.OperationalError:
+            return []
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"path": str(self.path), "queued": self._queue.qsize(), "written": self.written, "failed": self.failed}
+
+    async def _read_connection(self) -> aiosqlite.Connection:
+        async with self._reader_lock:
+            if self._reader is None:
+                reader = await _connect(self.path)
+                reader.row_factory = aiosqlite.Row
+                await reader.execute("PRAGMA query_only = ON")
+                self._reader = reader
+            return self._reader
+
+    def _start_run(self, project_id: str) -> str:
+        run_id = uuid.uuid4().hex
+        self._runs[project_id] = run_id
+        self._put(("run", project_id, run_id, time.time()))
+        return run_id
+
+    def _run_id(self, project_id: str) -> str:
+        # Results sent outside a GLOBAL_INIT/GLOBAL_END pair get a run of their own
+        return self._runs.get(project_id) or self._start_run(project_id)
+
+    def _put(self, op: tuple[Any, ...]) -> None:
+        self._queue.put_nowait(op)
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_batches())
+
+    async def _write_batches(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            async with _connect(self.path) as db:
+                await db.execute("PRAGMA journal_mode=WAL")
+                await db.execute("PRAGMA synchronous=NORMAL")
+                await db.executescript(SCHEMA + HISTORY_SCHEMA + FINDINGS_SCHEMA)
+                while not self._queue.empty():
+                    batch = [self._queue.get_nowait() for _ in range(min(self._queue.qsize(), MAX_BATCH))]
+                    try:
+                        await self._write(db, batch)
+                        self.written += len(batch)
+                    except Exception as e:
+                        self.failed += len(batch)
+                        logger.error(f"❌ Failed to store {len(batch)} metrics message(s): {e}")
+                        # Drop the batch's partial writes, or the next batch's commit would keep them
+                        await db.rollback()
+                    finally:
+                        for _ in batch:
+                            self._queue.task_done()
+        except Exception as e:
+            # Whatever broke the writer, flush() must still return: drain what is left as failed
+            logger.error(f"❌ Metrics store unavailable at {self.path}: {e}")
+            while not self._queue.empty():
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.failed += 1
+        finally:
+            self._writer = None
+            # Messages recorded while the connection was closing start the next burst
+            if not self._queue.empty():
+                self._writer = asyncio.create_task(self._write_batches())
+
+    async def _write(self, db: aiosqlite.Connection, batch: list[tuple[Any, ...]]) -> None:
+        for op, *args in batch:
+            if op == "run":
+                await db.execute(
+                    "INSERT OR IGNORE INTO runs (project_id, run_id, status, started_at) VALUES (?, ?, 'RUNNING', ?)",
+                    args,
+                )
+            elif op == "end_run":
+                project_id, run_id, status, finished_at = args
+                await db.execute(
+                    "UPDATE runs SET status = ?, finished_at = ? WHERE project_id = ? AND run_id = ?",
+                    (status, finished_at, project_id, run_id),
+                )
+            elif op == "metrics":
+                project_id, run_id, module_id, metrics, ts = args
+                await db.execute(
+                    "INSERT INTO module_results (project_id, run_id, module_id, metrics) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (project_id, run_id, module_id) DO UPDATE SET metrics = excluded.metrics",
+                    (project_id, run_id, module_id, json.dumps(metrics, separators=(",", ":"))),
+                )
+                await db.execute(
+                    "DELETE FROM file_metrics WHERE project_id = ? AND run_id = ? AND module_id = ?",
+                    (project_id, run_id, module_id),
+                )
+                await db.executemany(
+                    "INSERT OR REPLACE INTO file_metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    _file_rows(project_id, run_id, module_id, metrics),
+                )
+                await self.history.record(db, project_id, module_id, ts, metrics.get("total_issues") or {})
+            elif op == "findings":
+                await self.findings.replace(db, *args)
+            elif op == "end":
+                await db.execute(
+                    "INSERT INTO module_results (project_id, run_id, module_id, status, summary) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (project_id, run_id, module_id) "
+                    "DO UPDATE SET status = excluded.status, summary = excluded.summary",
+                    args,
+                )
+        await self.history.prune(db)
+        await db.commit()
@@ -0,0 +1,149 @@
+"""
+Content-Addressed Result Cache
+Stores the outcome of full-mode module runs on disk, keyed by a digest of everything
+that can influence the result (input files, config files, tool version, command).
+Entries are evicted least-recently-used once the cache exceeds its size quota.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ..application.engine.project_files import get_file_hasher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "data/result-cache"
+DEFAULT_CACHE_MAX_MB = 512
+
+
+@dataclass
+class CachedResult:
+    exit_code: int
+    summary: str
+    metrics: dict[str, Any] | None
+    stdout: str
+    stderr: str
+
+
+class ResultCache:
+    """
+    On-disk LRU cache of module results
+    Layout: <root>/<key[:2]>/<key>/{meta.json,stdout,stderr}; meta.json mtime is the LRU clock
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hasher = get_file_hasher()
+        self._index: dict[str, tuple[int, float]] | None = None  # key -> (size, last_used)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResult | None:
+        entry_dir = self._entry_dir(key)
+        try:
+            meta = json.loads((entry_dir / "meta.json").read_text(encoding="utf-8"))
+            stdout = (entry_dir / "stdout").read_text(encoding="utf-8")
+            stderr = (entry_dir / "stderr").read_text(encoding="utf-8")
+        except (OSError, ValueError):
+            return None
+
+        now = time.time()
+        try:
+            os.utime(entry_dir / "meta.json", (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index[key] = (index[key][0], now)
+
+        return CachedResult(
+            exit_code=int(meta["exit_code"]),
+            summary=str(meta["summary"]),
+            metrics=meta.get("metrics"),
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+    def put(self, key: str, result: CachedResult) -> None:
+        entry_dir = self._entry_dir(key)
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key[:8]}-", dir=entry_dir.parent))
+        try:
+            (staging / "stdout").write_text(result.stdout, encoding="utf-8")
+            (staging / "stderr").write_text(result.stderr, encoding="utf-8")
+            (staging / "meta.json").write_text(
+                json.dumps(
+                    {
+                        "exit_code": result.exit_code,
+                        "summary": result.summary,
+                        "metrics": result.metrics,
+                        "created_at": time.time(),
+                    }
+                ),
+                encoding="utf-8",
+            )
+            size = sum(p.stat().st_size for p in staging.iterdir())
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            staging.rename(entry_dir)
+        except OSError as e:
+            logger.warning(f"Result cache write failed for {key[:12]}: {e}")
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+
+        with self._lock:
+            self._load_index()[key] = (size, time.time())
+            self._evict()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def _load_index(self) -> dict[str, tuple[int, float]]:
+        """Lazily rebuild the size/recency index from disk (once per process)"""
+        if self._index is None:
+            self._index = {}
+            if self.root.exists():
+                for meta in self.root.glob("*/*/meta.json"):
+                    entry_dir = meta.parent
+                    try:
+                        size = sum(p.stat().st_size for p in entry_dir.iterdir())
+                        self._index[entry_dir.name] = (size, meta.stat().st_mtime)
+                    except OSError:
+                        continue
+        return self._index
+
+    def _evict(self) -> None:
+        index = self._load_index()
+        total = sum(size for size, _ in index.values())
+        if total <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            del index[key]
+            total -= size
+            logger.info(f"♻️ Evicted result cache entry {key[:12]} ({size} bytes)")
+
+
+_result_cache: ResultCache | None = None
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache, configured from the environment on first use"""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache(
+            root=os.environ.get("RESULT_CACHE_DIR", DEFAULT_CACHE_DIR),
+            max_bytes=int(os.environ.get("RESULT_CACHE_MAX_MB", DEFAULT_CACHE_MAX_MB)) * 1024 * 1024,
+        )
+    return _result_cache
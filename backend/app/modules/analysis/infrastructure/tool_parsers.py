@@ -0,0 +1,232 @@
+"""
+Tool Output Parsers
+One exact grammar per tool instead of guessing severities from words like "error":
+- Ruff: concise text (`file:line:col: CODE message`), also the multi-line "full" layout
+- Pyright: CLI text (`  file:line:col - severity: message (rule)`, continuation lines folded in)
+- TypeScript: `file(line,col): error TSxxxx: message`
+- ESLint: the `--format json` document (one line per run or shard)
+- Lizard: `--warnings_only` lines
+Parsers are fed line by line, so they work on streaming output as well as on complete logs.
+The METRICS report is derived from the findings (build_report), never parsed separately.
+"""
+
+import json
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import Any, ClassVar, cast
+
+from ..domain.entities import Finding, Severity
+
+RUFF_CONCISE_PATTERN = re.compile(r"^(?P<file>.+?):(?P<line>\d+):(?P<col>\d+): (?P<rule>[A-Z]+\d+)?:?\s*(?P<msg>.*)$")
+RUFF_HEADER_PATTERN = re.compile(r"^(?P<rule>[A-Z]+\d+)(?: \[\*\])? (?P<msg>.+)$")
+RUFF_LOCATION_PATTERN = re.compile(r"^\s*--> (?P<file>.+?):(?P<line>\d+):(?P<col>\d+)$")
+RUFF_FIXABLE_MARK = "[*] "
+PYRIGHT_PATTERN = re.compile(
+    r"^\s*(?P<file>.+?):(?P<line>\d+):(?P<col>\d+) - (?P<severity>error|warning|information): (?P<msg>.*)$"
+)
+PYRIGHT_RULE_PATTERN = re.compile(r"\s\((?P<rule>report[A-Za-z]+)\)$")
+TSC_PATTERN = re.compile(
+    r"^(?P<file>.+?)\((?P<line>\d+),(?P<col>\d+)\): (?P<severity>error|warning) (?P<rule>TS\d+): (?P<msg>.*)$"
+)
+LIZARD_PATTERN = re.compile(r"^(?P<file>.+?):(?P<line>\d+): warning: (?P<name>.+?) has \d+ NLOC, (?P<ccn>\d+) CCN")
+
+PYRIGHT_SEVERITIES: dict[str, Severity] = {"error": "ERROR", "warning": "WARNING", "information": "INFO"}
+ESLINT_SEVERITIES: dict[int, Severity] = {2: "ERROR", 1: "WARNING"}
+
+
+class ToolParser(ABC):
+    """Line-fed parser of one tool's output; findings accumulate in self.findings"""
+
+    # Module ids whose output this parser understands
+    tools: ClassVar[tuple[str, ...]] = ()
+
+    def __init__(self) -> None:
+        self.findings: list[Finding] = []
+
+    @abstractmethod
+    def add_line(self, line: str) -> None:
+        pass
+
+    def parse(self, content: str) -> list[Finding]:
+        for line in content.splitlines():
+            self.add_line(line)
+        return self.findings
+
+
+class RuffParser(ToolParser):
+    tools = ("B_Ruff",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        # (rule, message) of a "full" layout header waiting for its --> location line
+        self._header: tuple[str, str] | None = None
+
+    def add_line(self, line: str) -> None:
+        if match := RUFF_CONCISE_PATTERN.match(line):
+            message = match["msg"].removeprefix(RUFF_FIXABLE_MARK)
+            self.findings.append(
+                Finding(
+                    match["file"],
+                    int(match["line"]),
+                    int(match["col"]),
+                    _ruff_severity(match["rule"]),
+                    match["rule"],
+                    message,
+                )
+            )
+        elif match := RUFF_HEADER_PATTERN.match(line):
+            self._header = (match["rule"], match["msg"])
+        elif self._header is not None and (match := RUFF_LOCATION_PATTERN.match(line)):
+            rule, message = self._header
+            self._header = None
+            self.findings.append(
+                Finding(match["file"], int(match["line"]), int(match["col"]), _ruff_severity(rule), rule, message)
+            )
+
+
+def _ruff_severity(rule: str | None) -> Severity:
+    # Every violation fails the check; pycodestyle warnings and import sorting are the softer ones
+    if rule is not None and rule.startswith("W"):
+        return "WARNING"
+    if rule is not None and rule.startswith("I"):
+        return "INFO"
+    return "ERROR"
+
+
+class PyrightParser(ToolParser):
+    tools = ("B_Pyright",)
+
+    def add_line(self, line: str) -> None:
+        if match := PYRIGHT_PATTERN.match(line):
+            self.findings.append(
+                Finding(
+                    match["file"],
+                    int(match["line"]),
+                    int(match["col"]),
+                    PYRIGHT_SEVERITIES[match["severity"]],
+                    None,
+                    "",
+                )
+            )
+            self._extend_message(match["msg"])
+        elif self.findings and line.startswith("    ") and line.strip():
+            # Multi-line messages continue indented; the rule follows the last line
+            self._extend_message(line.strip())
+
+    def _extend_message(self, text: str) -> None:
+        finding = self.findings[-1]
+        if match := PYRIGHT_RULE_PATTERN.search(text):
+            finding.rule = match["rule"]
+            text = text[: match.start()]
+        finding.message = f"{finding.message}\n{text}" if finding.message else text
+
+
+class TscParser(ToolParser):
+    tools = ("F_TypeScript",)
+
+    def add_line(self, line: str) -> None:
+        if match := TSC_PATTERN.match(line):
+            severity: Severity = "ERROR" if match["severity"] == "error" else "WARNING"
+            self.findings.append(
+                Finding(match["file"], int(match["line"]), int(match["col"]), severity, match["rule"], match["msg"])
+            )
+        elif self.findings and line.startswith("  ") and line.strip():
+            # Elaborations ("Type 'x' is not assignable ...") belong to the previous error
+            self.findings[-1].message += f"\n{line.strip()}"
+
+
+class ESLintParser(ToolParser):
+    tools = ("F_ESLint",)
+
+    def add_line(self, line: str) -> None:
+        text = line.strip()
+        if not text.startswith("["):
+            return
+        try:
+            results = json.loads(text)
+        except json.JSONDecodeError:
+            return
+        if isinstance(results, list):
+            self.findings.extend(eslint_findings(cast(list[Any], results)))
+
+
+def eslint_findings(results: Iterable[Any]) -> list[Finding]:
+    """Findings of an `eslint --format json` document"""
+    findings: list[Finding] = []
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        report = cast(dict[str, Any], result)
+        file = str(report.get("filePath", ""))
+        messages: list[Any] = report.get("messages") or []
+        for item in messages:
+            if not isinstance(item, dict):
+                continue
+            message = cast(dict[str, Any], item)
+            severity = ESLINT_SEVERITIES.get(_int_field(message, "severity") or 0)
+            if severity is None:
+                continue
+            findings.append(
+                Finding(
+                    file,
+                    _int_field(message, "line"),
+                    _int_field(message, "column"),
+                    severity,
+                    _str_field(message, "ruleId"),
+                    str(message.get("message", "")),
+                )
+            )
+    return findings
+
+
+def _int_field(data: dict[str, Any], key: str) -> int | None:
+    value = data.get(key)
+    return value if isinstance(value, int) else None
+
+
+def _str_field(data: dict[str, Any], key: str) -> str | None:
+    value = data.get(key)
+    return value if isinstance(value, str) else None
+
+
+class LizardParser(ToolParser):
+    tools = ("B_Lizard",)
+
+    def add_line(self, line: str) -> None:
+        if match := LIZARD_PATTERN.match(line.strip()):
+            ccn = int(match["ccn"])
+            self.findings.append(
+                Finding(
+                    match["file"], int(match["line"]), None, "COMPLEXITY", "CCN", f"{match['name']} has {ccn} CCN", ccn
+                )
+            )
+
+
+TOOL_PARSERS: dict[str, type[ToolParser]] = {
+    tool: parser
+    for parser in (RuffParser, PyrightParser, TscParser, ESLintParser, LizardParser)
+    for tool in parser.tools
+}
+
+
+def build_report(findings: Iterable[Finding]) -> dict[str, Any]:
+    """METRICS report (totals and per-file counters, files in order of first finding) of a set of findings"""
+    totals = {"ERROR": 0, "WARNING": 0, "INFO": 0, "COMPLEXITY": 0}
+    per_file: dict[str, dict[str, Any]] = {}
+    for finding in findings:
+        entry = per_file.get(finding.file)
+        if entry is None:
+            entry = per_file[finding.file] = {
+                "file": finding.file,
+                "metrics": {"ERROR": 0, "WARNING": 0, "INFO": 0},
+                "complexity_metrics": {"COMPLEXITY": 0, "MAX_CCN": 0},
+            }
+        totals[finding.severity] += 1
+        if finding.severity == "COMPLEXITY":
+            complexity = entry["complexity_metrics"]
+            complexity["COMPLEXITY"] += 1
+            complexity["MAX_CCN"] = max(complexity["MAX_CCN"], finding.ccn)
+        else:
+            entry["metrics"][finding.severity] += 1
+    return {"total_issues": totals, "modules": list(per_file.values())}
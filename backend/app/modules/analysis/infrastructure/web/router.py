@@ -1,4 +1,5 @@
 import logging
+import time
 from pathlib import Path
 from typing import Any, Literal
 
@@ -14,11 +15,17 @@ from pydantic import BaseModel, field_validator
 
 from ...application.services import AnalysisOrchestratorService
 from ...infrastructure.adapters.websocket_notifier import WebSocketNotifier
+from ...infrastructure.findings_index import DEFAULT_PAGE_SIZE, FindingsFilter, InvalidCursorError
+from ...infrastructure.metrics_store import MetricsStore
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+DEFAULT_HISTORY_WINDOW = 7 * 24 * 3600
+
+Severity = Literal["ERROR", "WARNING", "INFO", "COMPLEXITY"]
+
 
 class RunAnalysisRequest(BaseModel):
     project_path: str
@@ -60,6 +67,10 @@ async def get_notifier() -> WebSocketNotifier:
     raise NotImplementedError
 
 
+async def get_metrics_store() -> MetricsStore:
+    raise NotImplementedError
+
+
 @router.get("/api/tools", response_model=list[ToolMetadata])
 async def get_tools(
     service: AnalysisOrchestratorService = Depends(get_analysis_service),  # noqa: B008
@@ -67,6 +78,20 @@ async def get_tools(
     return service.get_available_tools()
 
 
+@router.get("/api/scheduler")
+async def get_scheduler_status(
+    service: AnalysisOrchestratorService = Depends(get_analysis_service),  # noqa: B008
+) -> dict[str, Any]:
+    return service.get_scheduler_status()
+
+
+@router.get("/api/diagnostics")
+async def get_diagnostics(
+    service: AnalysisOrchestratorService = Depends(get_analysis_service),  # noqa: B008
+) -> dict[str, Any]:
+    return service.get_diagnostics()
+
+
 @router.post("/api/run-analysis", status_code=status.HTTP_202_ACCEPTED)
 async def run_analysis(
     request: RunAnalysisRequest,
@@ -122,7 +147,20 @@ async def websocket_endpoint(
     service: AnalysisOrchestratorService = Depends(get_analysis_service),  # noqa: B008
 ) -> None:
     project_id = "default_session"
-    await notifier.connect(websocket, project_id)
+    # Clients state their end-to-end latency budget for live output, e.g. ?latency_ms=20 for an editor
+    latency_ms = websocket.query_params.get("latency_ms")
+    # Reconnecting clients resume after the last sequence number they saw (?since=0: everything kept)
+    since = websocket.query_params.get("since")
+    # ?deltas=1: incremental runs arrive as FINDINGS_DELTA (the changed report rows) instead of full METRICS
+    deltas = websocket.query_params.get("deltas") == "1"
+    await notifier.connect(
+        websocket,
+        project_id,
+        websocket.scope.get("subprotocols", []),
+        latency_budget=float(latency_ms) / 1000 if latency_ms and latency_ms.isdigit() else None,
+        since=int(since) if since and since.isdigit() else None,
+        deltas=deltas,
+    )
     try:
         while True:
             data = await websocket.receive_json()
@@ -140,8 +178,61 @@ async def websocket_endpoint(
 @router.get("/api/metrics/{project_id}")
 async def get_metrics(
     project_id: str,
-    service: AnalysisOrchestratorService = Depends(get_analysis_service),  # noqa: B008
-) -> Any:  # noqa: ANN401
-    # STATUS-006: Metrics Not Generated
-    # For now, we don't have metrics storage, so always return 404
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics not found")
+    module_id: str | None = None,
+    file: str | None = None,
+    store: MetricsStore = Depends(get_metrics_store),  # noqa: B008
+) -> dict[str, Any]:
+    metrics = await store.latest(project_id, module_id=module_id, file=file)
+    if metrics is None:
+        # STATUS-006: Metrics Not Generated
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics not found")
+    return metrics
+
+
+@router.get("/api/metrics/{project_id}/history")
+async def get_metrics_history(
+    project_id: str,
+    start: float | None = None,
+    end: float | None = None,
+    module_id: str | None = None,
+    resolution: Literal["raw", "hour", "day"] | None = None,
+    store: MetricsStore = Depends(get_metrics_store),  # noqa: B008
+) -> dict[str, Any]:
+    # Epoch seconds; the last week unless the client asks for another window
+    end = time.time() if end is None else end
+    start = end - DEFAULT_HISTORY_WINDOW if start is None else start
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must not be after end")
+    return await store.history_range(project_id, start, end, module_id=module_id, resolution=resolution)
+
+
+@router.get("/api/findings/{project_id}")
+async def get_findings(
+    project_id: str,
+    module_id: str | None = None,
+    severity: Severity | None = None,
+    rule: str | None = None,
+    path: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    store: MetricsStore = Depends(get_metrics_store),  # noqa: B008
+) -> dict[str, Any]:
+    # path is a file or a directory prefix (services/billing/); pass next_cursor back for the next page
+    conditions = FindingsFilter(module_id=module_id, severity=severity, rule=rule, path=path)
+    try:
+        return await store.findings_page(project_id, conditions, limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+@router.get("/api/findings/{project_id}/rules")
+async def get_top_rules(
+    project_id: str,
+    module_id: str | None = None,
+    severity: Severity | None = None,
+    path: str | None = None,
+    limit: int = 20,
+    store: MetricsStore = Depends(get_metrics_store),  # noqa: B008
+) -> list[dict[str, Any]]:
+    conditions = FindingsFilter(module_id=module_id, severity=severity, path=path)
+    return await store.top_rules(project_id, conditions, limit)
@@ -1,3 +1,5 @@
+import asyncio
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -5,8 +7,11 @@ from fastapi import FastAPI, WebSocket
 from fastapi.testclient import TestClient
 
 from app.modules.analysis.application.services import AnalysisOrchestratorService
+from app.modules.analysis.domain.entities import Finding
+from app.modules.analysis.infrastructure.metrics_store import MetricsStore
 from app.modules.analysis.infrastructure.web.router import (
     get_analysis_service,
+    get_metrics_store,
     get_notifier,
     router,
 )
@@ -31,7 +36,14 @@ def mock_notifier() -> MagicMock:
     # Important: The router calls await notifier.connect(websocket, ...)
     # We need to simulate the side effect of accepting the websocket connection
     # because the real implementation does it.
-    async def side_effect_connect(websocket: WebSocket, project_id: str):
+    async def side_effect_connect(
+        websocket: WebSocket,
+        project_id: str,
+        subprotocols: list[str],
+        latency_budget: float | None = None,
+        since: int | None = None,
+        deltas: bool = False,
+    ):
         await websocket.accept()
 
     notifier.connect.side_effect = side_effect_connect
@@ -49,7 +61,7 @@ def client(mock_service: MagicMock, mock_notifier: MagicMock) -> TestClient:
     return TestClient(app)
 
 
-def test_run_analysis(client: TestClient, mock_service: MagicMock, tmp_path):
+def test_run_analysis(client: TestClient, mock_service: MagicMock, tmp_path: Path):
     payload = {
         "project_path": str(tmp_path),
         "mode": "full",
@@ -95,3 +107,85 @@ def test_websocket_endpoint(client: TestClient, mock_notifier: MagicMock, mock_s
         # Let's just verify connection and disconnection for now
 
     mock_notifier.disconnect.assert_called()
+
+
+def test_get_scheduler_status(client: TestClient, mock_service: MagicMock):
+    mock_service.get_scheduler_status.return_value = {"max_slots": 3, "running": [], "queued": []}
+
+    response = client.get("/api/scheduler")
+
+    assert response.status_code == 200
+    assert response.json()["max_slots"] == 3
+    mock_service.get_scheduler_status.assert_called_once()
+
+
+def test_get_diagnostics(client: TestClient, mock_service: MagicMock):
+    mock_service.get_diagnostics.return_value = {"log_queues": {"/p:B_Ruff": {"dropped_bytes": 10}}}
+
+    response = client.get("/api/diagnostics")
+
+    assert response.status_code == 200
+    assert response.json()["log_queues"]["/p:B_Ruff"]["dropped_bytes"] == 10
+
+
+def test_get_metrics_serves_the_latest_run(client: TestClient, tmp_path: Path):
+    store = MetricsStore(tmp_path / "metrics.db")
+
+    async def record() -> None:
+        store.record("p1", {"type": "GLOBAL_INIT"})
+        store.record("p1", {"type": "END", "module": "B_Ruff", "status": "PASS", "summary": "clean"})
+        store.record("p1", {"type": "GLOBAL_END", "status": "PASS"})
+        await store.flush()
+
+    asyncio.run(record())
+    app.dependency_overrides[get_metrics_store] = lambda: store
+
+    response = client.get("/api/metrics/p1")
+    missing = client.get("/api/metrics/p2")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "PASS"
+    assert response.json()["modules"]["B_Ruff"]["summary"] == "clean"
+    assert missing.status_code == 404
+
+
+def test_get_metrics_history_defaults_to_the_last_week(client: TestClient, tmp_path: Path):
+    store = MetricsStore(tmp_path / "metrics.db")
+
+    async def record() -> None:
+        store.record("p1", {"type": "METRICS", "module": "B_Ruff", "data": {"total_issues": {"ERROR": 2}}})
+        await store.flush()
+
+    asyncio.run(record())
+    app.dependency_overrides[get_metrics_store] = lambda: store
+
+    response = client.get("/api/metrics/p1/history")
+    invalid = client.get("/api/metrics/p1/history?start=10&end=5")
+
+    assert response.status_code == 200
+    assert response.json()["resolution"] == "hour"
+    assert response.json()["points"][0]["ERROR"] == {"avg": 2.0, "min": 2, "max": 2}
+    assert invalid.status_code == 400
+
+
+def test_get_findings_pages_through_the_index(client: TestClient, tmp_path: Path):
+    store = MetricsStore(tmp_path / "metrics.db")
+    findings = [Finding(f"services/billing/f{i}.py", 1, None, "ERROR", "F401", "m") for i in range(3)]
+
+    async def record() -> None:
+        store.record_findings("p1", "B_Ruff", findings, None)
+        await store.flush()
+
+    asyncio.run(record())
+    app.dependency_overrides[get_metrics_store] = lambda: store
+
+    first = client.get("/api/findings/p1?path=services/billing/&limit=2").json()
+    second = client.get(f"/api/findings/p1?path=services/billing/&limit=2&cursor={first['next_cursor']}").json()
+    rules = client.get("/api/findings/p1/rules").json()
+    invalid = client.get("/api/findings/p1?cursor=broken")
+
+    assert first["total"] == 3
+    assert [f["file"] for f in first["items"] + second["items"]] == [f.file for f in findings]
+    assert second["next_cursor"] is None
+    assert rules == [{"module_id": "B_Ruff", "rule": "F401", "severity": "ERROR", "count": 3}]
+    assert invalid.status_code == 400
@@ -11,7 +11,9 @@ from watchdog.observers.polling import PollingObserver
 from app.modules.analysis.infrastructure.adapters.file_watcher import (
     CodeChangeHandler,
     WatchManager,
+    start_native_observer,
 )
+from app.modules.analysis.infrastructure.adapters.pruned_polling import PrunedPollingObserver
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -72,8 +74,7 @@ async def watcher_adapter(tmp_path: Path, mock_callback: MagicMock):
 
         manager._run_analysis = async_callback_wrapper
 
-        # Use PollingObserver for reliability in tests (like in the real code)
-        # The real code uses PollingObserver.
+        # The real code uses native file events here, polling only where they are missing
 
         # Start watching
         start_task = asyncio.create_task(manager.start_watching())
@@ -226,10 +227,10 @@ async def test_project_switch_updates_monitoring(tmp_path: Path):
     mock_ws.send_global_init = AsyncMock()
     mock_ws.send_global_end = AsyncMock()
 
-    # Patch PollingObserver to be faster (0.1s timeout)
+    # Patch the polling fallback to be faster (0.1s timeout)
     # This ensures that 0.7s wait (0.5 debounce + 0.2 buffer) is enough
-    with patch("app.modules.analysis.infrastructure.adapters.file_watcher.PollingObserver") as MockObserver:
-        MockObserver.side_effect = lambda: PollingObserver(timeout=0.1)
+    with patch("app.modules.analysis.infrastructure.adapters.file_watcher.PrunedPollingObserver") as MockObserver:
+        MockObserver.side_effect = lambda: PrunedPollingObserver(timeout=0.1)
 
         # Patch delay
         original_init = CodeChangeHandler.__init__
@@ -307,3 +308,18 @@ async def test_project_switch_updates_monitoring(tmp_path: Path):
             # Cleanup B
             await manager_b.stop_watching()
             await task_b
+
+
+def test_native_observer_is_used_where_the_kernel_reports_changes(tmp_path: Path):
+    # Arrange
+    handler = MagicMock()
+
+    # Act
+    observer = start_native_observer(tmp_path, handler)
+
+    # Assert
+    assert observer is not None
+    assert not isinstance(observer, PollingObserver)
+    observer.stop()
+    observer.join()
+    assert list(tmp_path.iterdir()) == []
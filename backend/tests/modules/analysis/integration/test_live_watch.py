@@ -46,12 +46,12 @@ async def test_live_watch_real_filesystem(tmp_path: Path):
 
     # We patch Orchestrator because we don't want to run actual tools (ESLint, Pyright)
     # in this test, we just want to know they WOULD be triggered.
-    # We also patch PollingObserver to use the native Observer (inotify) which is faster/more reliable for local tests
+    # We also patch the polling fallback to use the native Observer (inotify), faster and more reliable locally
     with (
         patch("app.modules.analysis.infrastructure.adapters.file_watcher.AnalysisOrchestrator") as MockOrchestrator,
         patch.object(CodeChangeHandler, "__init__", fast_init),
         patch(
-            "app.modules.analysis.infrastructure.adapters.file_watcher.PollingObserver",
+            "app.modules.analysis.infrastructure.adapters.file_watcher.PrunedPollingObserver",
             Observer,
         ),
     ):
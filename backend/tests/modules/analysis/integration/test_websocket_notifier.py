@@ -1,13 +1,49 @@
-from unittest.mock import AsyncMock
+import asyncio
+import base64
+import gzip
+import json
+import time
+import zlib
+from typing import Any
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi import WebSocket
 
+from app.modules.analysis.infrastructure.adapters import stream_subscriber
+from app.modules.analysis.infrastructure.adapters.replay_buffer import ReplayBuffer
+from app.modules.analysis.infrastructure.adapters.stream_codec import (
+    PROTOCOL_DEFLATE,
+    PROTOCOL_DEFLATE_DICT,
+    STREAM_DICTIONARY,
+    decode_stream_frame,
+    encode_legacy_stream,
+)
+from app.modules.analysis.infrastructure.adapters.stream_subscriber import StreamSubscriber
 from app.modules.analysis.infrastructure.adapters.websocket_notifier import (
     WebSocketNotifier,
 )
 
 
+async def drain(notifier: WebSocketNotifier) -> None:
+    for legacy_stream in notifier.legacy_streams.values():
+        legacy_stream.flush()
+    for subscriber in list(notifier.subscribers.values()):
+        await subscriber.drain()
+
+
+async def stall(_: str) -> None:
+    await asyncio.sleep(10)
+
+
+async def lag(_: str) -> None:
+    await asyncio.sleep(0.001)
+
+
+def sent_json(websocket: AsyncMock) -> list[dict[str, Any]]:
+    return [json.loads(c.args[0]) for c in websocket.send_text.call_args_list]
+
+
 @pytest.mark.asyncio
 async def test_websocket_connect():
     # Arrange
@@ -52,10 +88,11 @@ async def test_websocket_send_update():
 
     # Act
     await notifier.send_update(project_id, message)
+    await drain(notifier)
 
-    # Assert
-    mock_ws1.send_json.assert_called_once_with(message)
-    mock_ws2.send_json.assert_called_once_with(message)
+    # Assert: serialised once, the same frame on every connection
+    mock_ws1.send_text.assert_called_once_with('{"data":"test","seq":1}')
+    mock_ws2.send_text.assert_called_once_with('{"data":"test","seq":1}')
 
 
 @pytest.mark.asyncio
@@ -71,3 +108,278 @@ async def test_websocket_send_update_no_connections():
 
     # Assert
     # No assertions needed, just ensuring no crash
+
+
+@pytest.mark.asyncio
+async def test_websocket_stream_uses_negotiated_deflate_stream():
+    # Arrange
+    notifier = WebSocketNotifier()
+    binary_ws = AsyncMock(spec=WebSocket)
+    legacy_ws = AsyncMock(spec=WebSocket)
+    await notifier.connect(binary_ws, "p1", ["chat", PROTOCOL_DEFLATE])
+    await notifier.connect(legacy_ws, "p1")
+    batch = "".join(f"src/app_{i}.py:{i * 7}:1: F401 `os` imported but unused\n" for i in range(40))
+
+    # Act
+    for _ in range(2):
+        await notifier.send_stream("p1", "B_Ruff", batch)
+        await drain(notifier)
+
+    # Assert
+    binary_ws.accept.assert_called_once_with(subprotocol=PROTOCOL_DEFLATE)
+    legacy_ws.accept.assert_called_once_with(subprotocol=None)
+    frames = [c.args[0] for c in binary_ws.send_bytes.call_args_list]
+    decompressor = zlib.decompressobj(wbits=-zlib.MAX_WBITS)
+    for frame in frames:
+        module_id, _, raw_length, payload = decode_stream_frame(frame)
+        assert module_id == "B_Ruff"
+        assert raw_length == len(batch.encode())
+        assert decompressor.decompress(payload).decode() == batch
+    # The second batch compresses against the first
+    assert len(frames[1]) < len(frames[0]) / 4
+    legacy = sent_json(legacy_ws)[0]
+    assert legacy["encoding"] == "gzip_base64"
+    assert gzip.decompress(base64.b64decode(legacy["data"])).decode() == batch
+
+
+@pytest.mark.asyncio
+async def test_legacy_stream_batch_is_encoded_once_for_all_legacy_clients():
+    # Arrange
+    notifier = WebSocketNotifier()
+    connections = [AsyncMock(spec=WebSocket) for _ in range(3)]
+    for websocket in connections:
+        await notifier.connect(websocket, "p1")
+    batch = "".join(f"src/app_{i}.py:{i * 7}:1: F401 `os` imported but unused\n" for i in range(40))
+
+    # Act
+    with patch.object(stream_subscriber, "encode_legacy_stream", wraps=encode_legacy_stream) as encode:
+        await notifier.send_stream("p1", "B_Ruff", batch)
+        await drain(notifier)
+
+    # Assert
+    encode.assert_called_once()
+    frames = {websocket.send_text.call_args.args[0] for websocket in connections}
+    assert len(frames) == 1
+    assert gzip.decompress(base64.b64decode(json.loads(frames.pop())["data"])).decode() == batch
+
+
+@pytest.mark.asyncio
+async def test_legacy_client_joining_mid_batch_gets_buffered_output_once():
+    # Arrange
+    notifier = WebSocketNotifier()
+    first_ws = AsyncMock(spec=WebSocket)
+    late_ws = AsyncMock(spec=WebSocket)
+    await notifier.connect(first_ws, "p1")
+    await notifier.send_stream("p1", "B_Ruff", "a.py:1:1: F401 unused\n")
+
+    # Act
+    await notifier.connect(late_ws, "p1", since=0)
+    await notifier.send_stream("p1", "B_Ruff", "b.py:1:1: F401 unused\n")
+    await drain(notifier)
+
+    # Assert
+    assert [m["data"] for m in sent_json(first_ws)] == ["a.py:1:1: F401 unused\n", "b.py:1:1: F401 unused\n"]
+    assert [m["data"] for m in sent_json(late_ws)] == ["a.py:1:1: F401 unused\n", "b.py:1:1: F401 unused\n"]
+
+
+@pytest.mark.asyncio
+async def test_websocket_stream_is_flushed_before_later_messages():
+    # Arrange
+    notifier = WebSocketNotifier()
+    dict_ws = AsyncMock(spec=WebSocket)
+    legacy_ws = AsyncMock(spec=WebSocket)
+    await notifier.connect(dict_ws, "p1", [PROTOCOL_DEFLATE, PROTOCOL_DEFLATE_DICT])
+    await notifier.connect(legacy_ws, "p1")
+
+    # Act
+    await notifier.send_stream("p1", "F_TypeScript", "a.ts(1,1): error TS2304: Cannot find name 'x'.\n")
+    await notifier.send_update("p1", {"type": "END", "module": "F_TypeScript"})
+    await drain(notifier)
+    notifier.disconnect(dict_ws, "p1")
+
+    # Assert
+    dict_ws.accept.assert_called_once_with(subprotocol=PROTOCOL_DEFLATE_DICT)
+    _, seq, _, payload = decode_stream_frame(dict_ws.send_bytes.call_args.args[0])
+    assert seq == 1
+    decompressor = zlib.decompressobj(wbits=-zlib.MAX_WBITS, zdict=STREAM_DICTIONARY)
+    assert decompressor.decompress(payload).decode() == "a.ts(1,1): error TS2304: Cannot find name 'x'.\n"
+    assert sent_json(legacy_ws) == [
+        {
+            "type": "STREAM",
+            "module": "F_TypeScript",
+            "data": "a.ts(1,1): error TS2304: Cannot find name 'x'.\n",
+            "seq": 1,
+        },
+        {"type": "END", "module": "F_TypeScript", "seq": 2},
+    ]
+    assert dict_ws not in notifier.subscribers
+
+
+@pytest.mark.asyncio
+async def test_websocket_stream_batches_until_the_subscriber_flush_interval():
+    # Arrange
+    notifier = WebSocketNotifier()
+    mock_ws = AsyncMock(spec=WebSocket)
+    await notifier.connect(mock_ws, "p1", latency_budget=0.02)
+
+    # Act
+    await notifier.send_stream("p1", "B_Ruff", "first\n")
+    await notifier.send_stream("p1", "B_Ruff", "second\n")
+    before = mock_ws.send_text.call_count
+    await asyncio.sleep(0.05)
+
+    # Assert
+    assert before == 0
+    assert sent_json(mock_ws) == [{"type": "STREAM", "module": "B_Ruff", "data": "first\nsecond\n", "seq": 2}]
+    assert notifier.snapshot()["connections"]["p1"][0]["latency_budget_ms"] == 20
+
+
+@pytest.mark.asyncio
+async def test_stalled_connection_is_evicted_without_delaying_the_others():
+    # Arrange
+    notifier = WebSocketNotifier()
+    stalled_ws = AsyncMock(spec=WebSocket)
+    healthy_ws = AsyncMock(spec=WebSocket)
+    stalled_ws.send_text.side_effect = stall
+    await notifier.connect(stalled_ws, "p1")
+    await notifier.connect(healthy_ws, "p1")
+    notifier.subscribers[stalled_ws].send_timeout = 0.05
+
+    # Act
+    started = time.monotonic()
+    for i in range(3):
+        await notifier.send_update("p1", {"type": "LOG", "data": str(i)})
+    queued = time.monotonic() - started
+    await drain(notifier)
+    await asyncio.sleep(0.1)
+
+    # Assert
+    assert queued < 0.05
+    assert [m["data"] for m in sent_json(healthy_ws)] == ["0", "1", "2"]
+    assert notifier.active_connections["p1"] == [healthy_ws]
+    assert notifier.evicted_connections == 1
+    stalled_ws.close.assert_called_once_with(code=1013)
+
+
+@pytest.mark.asyncio
+async def test_full_send_queue_evicts_the_connection():
+    # Arrange
+    notifier = WebSocketNotifier()
+    mock_ws = AsyncMock(spec=WebSocket)
+    mock_ws.send_text.side_effect = stall
+    notifier.active_connections["p1"] = [mock_ws]
+    notifier.subscribers[mock_ws] = StreamSubscriber(
+        mock_ws, max_queued_frames=1, send_timeout=5, on_evict=notifier._evict
+    )
+
+    # Act
+    started = time.monotonic()
+    for i in range(3):
+        await notifier.send_update("p1", {"data": i})
+    queued = time.monotonic() - started
+
+    # Assert: evicted on overflow, without waiting out the send timeout
+    assert queued < 0.05
+    assert "p1" not in notifier.active_connections
+    assert mock_ws not in notifier.subscribers
+
+
+@pytest.mark.asyncio
+async def test_replay_waits_for_the_client_instead_of_overflowing():
+    # Arrange
+    buffer = ReplayBuffer()
+    for i in range(10):
+        buffer.record_message({"type": "LOG", "data": str(i)})
+    mock_ws = AsyncMock(spec=WebSocket)
+    mock_ws.send_text.side_effect = lag
+    evicted: list[StreamSubscriber] = []
+    subscriber = StreamSubscriber(mock_ws, max_queued_frames=4, send_timeout=5, on_evict=evicted.append)
+
+    # Act
+    await subscriber.replay(buffer.since(0) or [])
+    await subscriber.drain()
+
+    # Assert
+    assert [m["data"] for m in sent_json(mock_ws)] == [str(i) for i in range(10)]
+    assert evicted == []
+
+
+@pytest.mark.asyncio
+async def test_reconnecting_client_gets_missed_messages_replayed():
+    # Arrange
+    notifier = WebSocketNotifier()
+    await notifier.send_update("p1", {"type": "GLOBAL_INIT"})
+    await notifier.send_update("p1", {"type": "INIT", "module": "B_Ruff"})
+    await notifier.send_stream("p1", "B_Ruff", "a.py:1:1: F401 unused\n")
+    await notifier.send_update("p1", {"type": "END", "module": "B_Ruff", "status": "FAIL"})
+    mock_ws = AsyncMock(spec=WebSocket)
+
+    # Act
+    await notifier.connect(mock_ws, "p1", since=1)
+    await notifier.send_update("p1", {"type": "GLOBAL_END", "status": "FAIL"})
+    await drain(notifier)
+
+    # Assert
+    assert sent_json(mock_ws) == [
+        {"type": "INIT", "module": "B_Ruff", "seq": 2},
+        {"type": "STREAM", "module": "B_Ruff", "data": "a.py:1:1: F401 unused\n", "seq": 3},
+        {"type": "END", "module": "B_Ruff", "status": "FAIL", "seq": 4},
+        {"type": "GLOBAL_END", "status": "FAIL", "seq": 5},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_client_behind_the_ring_gets_a_snapshot():
+    # Arrange
+    notifier = WebSocketNotifier()
+    notifier.replay_buffers["p1"] = ReplayBuffer(max_messages=2)
+    await notifier.send_update("p1", {"type": "GLOBAL_INIT"})
+    await notifier.send_update("p1", {"type": "INIT", "module": "B_Ruff"})
+    await notifier.send_update("p1", {"type": "LOG", "module": "B_Ruff", "data": "Running ruff"})
+    await notifier.send_update("p1", {"type": "METRICS", "module": "B_Ruff", "data": {"total_issues": {}}})
+    mock_ws = AsyncMock(spec=WebSocket)
+
+    # Act
+    await notifier.connect(mock_ws, "p1", since=0)
+    await drain(notifier)
+
+    # Assert
+    (snapshot,) = sent_json(mock_ws)
+    assert snapshot["type"] == "SNAPSHOT"
+    assert snapshot["seq"] == 4
+    assert snapshot["running"] is True
+    assert snapshot["modules"]["B_Ruff"] == {
+        "status": "RUNNING",
+        "summary": None,
+        "metrics": {"total_issues": {}},
+        "log": "Running ruff\n",
+    }
+
+
+@pytest.mark.asyncio
+async def test_delta_clients_get_findings_delta_instead_of_incremental_metrics():
+    # Arrange
+    notifier = WebSocketNotifier()
+    legacy_ws, delta_ws = AsyncMock(spec=WebSocket), AsyncMock(spec=WebSocket)
+    await notifier.connect(legacy_ws, "p1")
+    await notifier.connect(delta_ws, "p1", deltas=True)
+    metrics: dict[str, Any] = {"type": "METRICS", "module": "B_Ruff", "data": {"total_issues": {}}}
+    delta: dict[str, Any] = {
+        "type": "FINDINGS_DELTA",
+        "module": "B_Ruff",
+        "data": {"added": [], "resolved": ["fp"], "total": 0},
+    }
+
+    # Act
+    await notifier.send_update("p1", metrics)
+    await notifier.send_update("p1", metrics, deltas=False)
+    await notifier.send_update("p1", delta, deltas=True)
+    late_ws = AsyncMock(spec=WebSocket)
+    await notifier.connect(late_ws, "p1", since=0, deltas=True)
+    await drain(notifier)
+
+    # Assert
+    assert [(m["type"], m["seq"]) for m in sent_json(legacy_ws)] == [("METRICS", 1), ("METRICS", 2)]
+    assert [(m["type"], m["seq"]) for m in sent_json(delta_ws)] == [("METRICS", 1), ("FINDINGS_DELTA", 3)]
+    # Replays follow the same split
+    assert sent_json(late_ws) == sent_json(delta_ws)
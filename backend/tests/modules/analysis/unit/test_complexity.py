@@ -0,0 +1,129 @@
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.modules.analysis.application.engine import complexity
+from app.modules.analysis.application.engine.complexity import ComplexityAnalyzer, shard_by_size
+from app.modules.analysis.application.engine.modules import LizardModule
+from app.modules.analysis.application.engine.scheduler import AnalysisScheduler, ResourceProbe
+from app.modules.analysis.domain.ports import AnalysisNotifierPort
+
+pytestmark = pytest.mark.skipif(not ComplexityAnalyzer.is_available(), reason="lizard not installed")
+
+
+class IdleProbe(ResourceProbe):
+    def cpu_count(self) -> int:
+        return 8
+
+    def load_average(self) -> float:
+        return 0.0
+
+    def available_memory_mb(self) -> int | None:
+        return 8192
+
+
+def complex_function(name: str, branches: int) -> str:
+    body = "".join(f"    if x == {i}:\n        return {i}\n" for i in range(branches))
+    return f"def {name}(x):\n{body}    return -1\n"
+
+
+@pytest.fixture
+def analyzer() -> Iterator[ComplexityAnalyzer]:
+    instance = ComplexityAnalyzer(max_workers=2)
+    yield instance
+    instance.shutdown()
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "hot.py").write_text(complex_function("hot", 20) + complex_function("mild", 3))
+    (tmp_path / "pkg" / "calm.py").write_text(complex_function("calm", 2))
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "vendor.js").write_text("function v(x){" + "if(x){}" * 30 + "}\n")
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_full_scan_returns_structured_results(project: Path, analyzer: ComplexityAnalyzer):
+    # Act
+    functions = await analyzer.analyze(project)
+
+    # Assert
+    assert [(f.name, f.file, f.line, f.ccn) for f in functions] == [("hot", "pkg/hot.py", 1, 21)]
+    assert functions[0].nloc > 0
+
+
+@pytest.mark.asyncio
+async def test_incremental_scan_only_reads_given_files(project: Path, analyzer: ComplexityAnalyzer):
+    functions = await analyzer.analyze(project, ["pkg/calm.py", "README.md"], ccn_threshold=None)
+
+    assert [f.name for f in functions] == ["calm"]
+
+
+def test_shards_are_balanced_by_size(tmp_path: Path):
+    for name, size in {"a": 900, "b": 500, "c": 400, "d": 100}.items():
+        (tmp_path / f"{name}.py").write_text("x" * size)
+
+    shards = shard_by_size(tmp_path, ["a.py", "b.py", "c.py", "d.py", "missing.py"], 2)
+
+    assert sorted(shards) == [["a.py", "d.py"], ["b.py", "c.py"]]
+
+
+@pytest.mark.asyncio
+async def test_lizard_module_runs_in_process(project: Path, analyzer: ComplexityAnalyzer):
+    # Arrange
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+    module = LizardModule("B_Lizard", "Lizard", str(project), notifier)
+
+    # Act
+    with (
+        patch.object(complexity, "_analyzer", analyzer),
+        patch("asyncio.create_subprocess_exec") as mock_exec,
+    ):
+        status = await module.run()
+
+    # Assert
+    assert status == "FAIL"
+    mock_exec.assert_not_called()
+    metrics = notifier.send_metrics.call_args.args[1]
+    assert metrics["total_issues"]["COMPLEXITY"] == 1
+    assert metrics["modules"][0]["file"] == "pkg/hot.py"
+    assert metrics["modules"][0]["complexity_metrics"]["MAX_CCN"] == 21
+    assert notifier.send_end.call_args.args[2] == "❌ 1 function(s) exceed complexity 15"
+
+
+@pytest.mark.asyncio
+async def test_lizard_workers_are_bounded_by_free_slots(project: Path):
+    # Arrange: 3 slots, one busy elsewhere; the module holds one of the remaining two
+    scheduler = AnalysisScheduler(max_slots=3, probe=IdleProbe())
+    other = scheduler.try_acquire("other", "B_Ruff")
+    own = scheduler.try_acquire(str(project), "B_Lizard")
+    analyzer = ComplexityAnalyzer(max_workers=8)
+    module = LizardModule("B_Lizard", "Lizard", str(project), AsyncMock(spec=AnalysisNotifierPort), scheduler=scheduler)
+
+    # Act
+    with (
+        patch.object(complexity, "_analyzer", analyzer),
+        patch.object(analyzer, "analyze", AsyncMock(return_value=[])) as mock_analyze,
+    ):
+        await module.run()
+
+    # Assert: own slot plus the free one, borrowed slots returned afterwards
+    assert mock_analyze.call_args.args[3] == 2
+    assert list(scheduler.running.values()) == [other, own]
+
+
+def test_analyzer_pool_never_exceeds_scheduler_slots(monkeypatch: pytest.MonkeyPatch):
+    # Arrange
+    monkeypatch.setenv("LIZARD_WORKERS", "64")
+    monkeypatch.setattr(complexity, "_analyzer", None)
+    monkeypatch.setattr(complexity, "get_scheduler", lambda: AnalysisScheduler(max_slots=3, probe=IdleProbe()))
+
+    # Act
+    analyzer = complexity.get_complexity_analyzer()
+
+    # Assert
+    assert analyzer.max_workers == 3
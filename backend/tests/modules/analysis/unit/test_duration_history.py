@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from app.modules.analysis.infrastructure.duration_history import DurationHistory, estimate_makespan
+
+
+def test_durations_are_averaged_and_persisted(tmp_path: Path):
+    # Arrange
+    path = tmp_path / "history.json"
+    history = DurationHistory(path, alpha=0.5)
+
+    # Act
+    history.record("/p", "F_TypeScript", "full", 10.0)
+    history.record("/p", "F_TypeScript", "full", 20.0)
+
+    # Assert
+    reloaded = DurationHistory(path)
+    assert reloaded.expected("/p", "F_TypeScript", "full") == pytest.approx(15.0)
+    assert reloaded.expected("/p", "F_TypeScript", "incremental") is None
+    assert reloaded.expected("/other", "F_TypeScript", "full") is None
+
+
+def test_unreadable_history_starts_empty(tmp_path: Path):
+    path = tmp_path / "history.json"
+    path.write_text("not json")
+
+    assert DurationHistory(path).expected("/p", "B_Ruff", "full") is None
+
+
+def test_makespan_of_longest_first_schedule():
+    assert estimate_makespan([60, 30, 40, 10, 2], 2) == pytest.approx(72)
+    assert estimate_makespan([5, 3], 4) == pytest.approx(5)
+    assert estimate_makespan([], 2) == 0
@@ -1,5 +1,6 @@
 # pyright: reportPrivateUsage=none
 import asyncio
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -7,6 +8,8 @@ import pytest
 from app.modules.analysis.infrastructure.adapters.file_watcher import (
     CodeChangeHandler,
     WatchManager,
+    mount_fstype,
+    start_native_observer,
 )
 
 # --- CodeChangeHandler Tests ---
@@ -70,7 +73,8 @@ async def test_watch_manager_start_watching():
 
     # Mock PollingObserver
     with (
-        patch("app.modules.analysis.infrastructure.adapters.file_watcher.PollingObserver") as MockObserver,
+        patch("app.modules.analysis.infrastructure.adapters.file_watcher.start_native_observer", return_value=None),
+        patch("app.modules.analysis.infrastructure.adapters.file_watcher.PrunedPollingObserver") as MockObserver,
         patch("app.modules.analysis.infrastructure.adapters.file_watcher.AnalysisOrchestrator") as MockOrchestrator,
     ):
         mock_observer = MagicMock()
@@ -99,6 +103,84 @@ async def test_watch_manager_start_watching():
         mock_observer.start.assert_called_once()
         MockOrchestrator.assert_called_once()
         mock_orchestrator.execute.assert_called_once()
+        messages = [call.args[0]["message"] for call in ws_manager.broadcast_raw.call_args_list]
+        assert any("ACTIVATED" in message and "(polling observer)" in message for message in messages)
+
+
+MOUNTS = """\
+/dev/vda / ext4 rw,relatime 0 0
+server:/export /mnt/code nfs4 rw,relatime 0 0
+/dev/vdb /mnt/code/local ext4 rw,relatime 0 0
+sshfs#dev@host: /mnt/my\\040share fuse.sshfs rw,relatime 0 0
+"""
+
+
+@pytest.mark.parametrize(
+    ("path", "fstype"),
+    [
+        ("/home/dev/project", "ext4"),
+        ("/mnt/code/project", "nfs4"),
+        ("/mnt/code/local/project", "ext4"),
+        ("/mnt/codebase", "ext4"),
+        ("/mnt/my share/project", "fuse.sshfs"),
+    ],
+)
+def test_mount_fstype_reads_the_longest_matching_mount(tmp_path: Path, path: str, fstype: str):
+    # Arrange
+    mounts = tmp_path / "mounts"
+    mounts.write_text(MOUNTS)
+
+    # Act / Assert
+    assert mount_fstype(path, mounts) == fstype
+
+
+@pytest.mark.parametrize("fstype", ["nfs", "nfs4", "cifs", "smb3", "9p", "virtiofs", "fuse.sshfs"])
+def test_network_and_shared_filesystems_are_polled(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fstype: str):
+    # Arrange
+    monkeypatch.delenv("WATCH_OBSERVER", raising=False)
+
+    # Act
+    with (
+        patch("app.modules.analysis.infrastructure.adapters.file_watcher.mount_fstype", return_value=fstype),
+        patch("app.modules.analysis.infrastructure.adapters.file_watcher.Observer") as MockObserver,
+    ):
+        observer = start_native_observer(tmp_path, MagicMock())
+
+    # Assert: nothing written into the project either
+    assert observer is None
+    MockObserver.assert_not_called()
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize(("override", "native"), [("native", True), ("polling", False)])
+def test_watch_observer_env_overrides_detection(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, override: str, native: bool
+):
+    # Arrange
+    monkeypatch.setenv("WATCH_OBSERVER", override)
+
+    # Act
+    with (
+        patch("app.modules.analysis.infrastructure.adapters.file_watcher.mount_fstype", return_value="nfs4"),
+        patch("app.modules.analysis.infrastructure.adapters.file_watcher.Observer") as MockObserver,
+    ):
+        observer = start_native_observer(tmp_path, MagicMock())
+
+    # Assert
+    assert (observer is MockObserver.return_value) is native
+
+
+def test_native_observer_falls_back_when_watches_cannot_be_added(tmp_path: Path):
+    # Arrange
+    handler = MagicMock()
+
+    # Act
+    with patch("app.modules.analysis.infrastructure.adapters.file_watcher.Observer") as MockObserver:
+        MockObserver.return_value.start.side_effect = OSError(28, "inotify watch limit reached")
+        observer = start_native_observer(tmp_path, handler)
+
+    # Assert
+    assert observer is None
 
 
 @pytest.mark.asyncio
@@ -240,7 +322,8 @@ async def test_watch_manager_integration_flow():
     manager = WatchManager("/tmp/test", ws_manager)
 
     with (
-        patch("app.modules.analysis.infrastructure.adapters.file_watcher.PollingObserver") as MockObserver,
+        patch("app.modules.analysis.infrastructure.adapters.file_watcher.start_native_observer", return_value=None),
+        patch("app.modules.analysis.infrastructure.adapters.file_watcher.PrunedPollingObserver") as MockObserver,
         patch("app.modules.analysis.infrastructure.adapters.file_watcher.AnalysisOrchestrator") as MockOrchestrator,
     ):
         mock_observer = MockObserver.return_value
@@ -286,3 +369,40 @@ async def test_watch_manager_integration_flow():
         # Cleanup: Stop the manager
         manager.stop_event.set()
         await task
+
+
+@pytest.mark.asyncio
+async def test_debounced_supersede_drops_absorbed_files():
+    # Arrange
+    supersede = AsyncMock(return_value=["main.py"])
+    handler = CodeChangeHandler("/tmp/test", AsyncMock(), asyncio.get_running_loop(), supersede=supersede)
+    handler.debounce_delay = 0
+    handler.is_analyzing = True
+    handler.modified_files = {"main.py", "other.py"}
+
+    # Act
+    await handler._debounced_supersede()
+
+    # Assert
+    supersede.assert_awaited_once_with(["main.py", "other.py"])
+    assert handler.modified_files == {"other.py"}
+
+
+@pytest.mark.asyncio
+async def test_watch_manager_supersede_notifies_sessions_first():
+    # Arrange
+    ws_manager = AsyncMock()
+    manager = WatchManager("/tmp/test", ws_manager)
+    session = AsyncMock()
+    orchestrator = MagicMock()
+    orchestrator.supersede.return_value = ["main.py"]
+    manager.sessions = {"B_Pyright": session}
+    manager.active_orchestrator = orchestrator
+
+    # Act
+    absorbed = await manager._supersede(["main.py"])
+
+    # Assert
+    assert absorbed == ["main.py"]
+    session.notify_changed.assert_awaited_once_with(["main.py"])
+    orchestrator.supersede.assert_called_once_with(["main.py"])
@@ -0,0 +1,100 @@
+from collections.abc import AsyncIterator
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+from app.modules.analysis.domain.entities import Finding, Severity
+from app.modules.analysis.infrastructure.findings_index import (
+    FINDINGS_SCHEMA,
+    FindingsFilter,
+    FindingsIndex,
+    InvalidCursorError,
+)
+
+
+def finding(
+    file: str, line: int, severity: Severity = "ERROR", rule: str | None = "reportGeneralTypeIssues"
+) -> Finding:
+    return Finding(file, line, 1, severity, rule, "m")
+
+
+@pytest_asyncio.fixture
+async def db() -> AsyncIterator[aiosqlite.Connection]:
+    async with aiosqlite.connect(":memory:") as connection:
+        await connection.executescript(FINDINGS_SCHEMA)
+        yield connection
+
+
+@pytest.mark.asyncio
+async def test_incremental_runs_replace_only_the_analysed_files(db: aiosqlite.Connection):
+    # Arrange
+    index = FindingsIndex()
+    await index.replace(db, "p1", "B_Pyright", [finding("a.py", 1), finding("b.py", 2)], None)
+
+    # Act
+    await index.replace(db, "p1", "B_Pyright", [finding("a.py", 5)], ["a.py"])
+    page = await index.page(db, "p1", FindingsFilter())
+
+    # Assert
+    assert [(f["file"], f["line"]) for f in page["items"]] == [("a.py", 5), ("b.py", 2)]
+    assert page["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_filters_by_directory_prefix_and_severity(db: aiosqlite.Connection):
+    # Arrange
+    index = FindingsIndex()
+    findings = [
+        finding("services/billing/api.py", 1),
+        finding("services/billing/models.py", 2, "WARNING"),
+        finding("services/billing_v2/api.py", 3),
+        finding("services/users.py", 4),
+    ]
+    await index.replace(db, "p1", "B_Pyright", findings, None)
+
+    # Act
+    page = await index.page(db, "p1", FindingsFilter(severity="ERROR", path="services/billing/"))
+
+    # Assert
+    assert [f["file"] for f in page["items"]] == ["services/billing/api.py"]
+
+
+@pytest.mark.asyncio
+async def test_cursor_iterates_every_finding_once(db: aiosqlite.Connection):
+    # Arrange
+    index = FindingsIndex()
+    await index.replace(db, "p1", "B_Ruff", [finding(f"f{i % 3}.py", i) for i in range(10)], None)
+
+    # Act
+    seen: list[tuple[str, int]] = []
+    cursor: str | None = None
+    while True:
+        page = await index.page(db, "p1", FindingsFilter(), limit=3, cursor=cursor)
+        seen.extend((f["file"], f["line"]) for f in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # Assert
+    assert seen == sorted(seen)
+    assert len(seen) == 10
+    with pytest.raises(InvalidCursorError):
+        await index.page(db, "p1", FindingsFilter(), cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_top_rules_counts_matching_findings(db: aiosqlite.Connection):
+    # Arrange
+    index = FindingsIndex()
+    findings = [finding("a.py", 1, rule="F401"), finding("b.py", 1, rule="F401"), finding("c.py", 1, rule="E501")]
+    await index.replace(db, "p1", "B_Ruff", [*findings, finding("d.py", 1, rule=None)], None)
+
+    # Act
+    rules = await index.top_rules(db, "p1", FindingsFilter(module_id="B_Ruff"))
+
+    # Assert
+    assert rules == [
+        {"module_id": "B_Ruff", "rule": "F401", "severity": "ERROR", "count": 2},
+        {"module_id": "B_Ruff", "rule": "E501", "severity": "ERROR", "count": 1},
+    ]
@@ -0,0 +1,155 @@
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.modules.analysis.application.engine.findings_store import ProjectFindingsStore
+from app.modules.analysis.application.engine.modules import RuffModule
+from app.modules.analysis.domain.entities import Finding
+from app.modules.analysis.domain.ports import AnalysisNotifierPort
+
+
+def entry(file: str, errors: int) -> dict[str, Any]:
+    return {
+        "file": file,
+        "metrics": {"ERROR": errors, "WARNING": 0, "INFO": 0},
+        "complexity_metrics": {"COMPLEXITY": 0, "MAX_CCN": 0},
+    }
+
+
+def report(*entries: dict[str, Any]) -> dict[str, Any]:
+    return {"total_issues": {}, "modules": list(entries)}
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text(f"# {name}\n")
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_incremental_merge_keeps_untouched_files(project: Path):
+    # Arrange
+    store = ProjectFindingsStore(project)
+    await store.merge("B_Ruff", report(entry("a.py", 2), entry("b.py", 1)), analysed_files=None)
+
+    # Act: only a.py re-analysed, now clean; c.py gains an error
+    (project / "a.py").write_text("# fixed\n")
+    merged = await store.merge("B_Ruff", report(entry("c.py", 3)), analysed_files=["a.py", "c.py"])
+
+    # Assert
+    assert [m["file"] for m in merged["modules"]] == ["b.py", "c.py"]
+    assert merged["total_issues"]["ERROR"] == 4
+
+
+@pytest.mark.asyncio
+async def test_incremental_merge_reports_the_changed_rows(project: Path):
+    # Arrange
+    store = ProjectFindingsStore(project)
+    await store.merge("B_Ruff", report(entry("a.py", 2), entry("b.py", 1)), analysed_files=None)
+
+    # Act: a.py is fixed, c.py gains an error, b.py is untouched
+    merged, changes = await store.merge_changes("B_Ruff", report(entry("c.py", 3)), analysed_files=["a.py", "c.py"])
+
+    # Assert
+    assert changes == {"total_issues": merged["total_issues"], "modules": [entry("c.py", 3)], "removed": ["a.py"]}
+
+
+@pytest.mark.asyncio
+async def test_full_run_replaces_module_entries(project: Path):
+    store = ProjectFindingsStore(project)
+    await store.merge("B_Ruff", report(entry("a.py", 2)), analysed_files=None)
+
+    merged = await store.merge("B_Ruff", report(entry("b.py", 1)), analysed_files=None)
+
+    assert [m["file"] for m in merged["modules"]] == ["b.py"]
+
+
+@pytest.mark.asyncio
+async def test_entries_for_changed_or_deleted_files_are_dropped(project: Path):
+    store = ProjectFindingsStore(project)
+    await store.merge("B_Ruff", report(entry("a.py", 1), entry("b.py", 1)), analysed_files=None)
+
+    (project / "a.py").write_text("# edited outside the watcher\n")
+    (project / "b.py").unlink()
+    merged = await store.merge("B_Ruff", report(), analysed_files=["c.py"])
+
+    assert merged["modules"] == []
+
+
+@pytest.mark.asyncio
+async def test_absolute_paths_are_normalised(project: Path):
+    store = ProjectFindingsStore(project)
+
+    merged = await store.merge("B_Pyright", report(entry(str(project / "a.py"), 1)), analysed_files=None)
+    merged = await store.merge("B_Pyright", report(entry("./b.py", 1)), analysed_files=["b.py"])
+
+    assert [m["file"] for m in merged["modules"]] == ["a.py", "b.py"]
+
+
+@pytest.mark.asyncio
+async def test_diff_reports_only_added_and_resolved_findings(project: Path):
+    # Arrange
+    store = ProjectFindingsStore(project)
+    kept, fixed = Finding("a.py", 1, 1, "ERROR", "E1", "kept"), Finding("a.py", 1, 1, "ERROR", "E2", "fixed")
+    other = Finding("b.py", 1, 1, "ERROR", "E1", "untouched")
+    first = await store.diff("B_Ruff", [kept, fixed, other], analysed_files=None)
+    new = Finding("a.py", 1, 1, "WARNING", "W1", "new")
+
+    # Act
+    delta = await store.diff("B_Ruff", [kept, new], analysed_files=["a.py"])
+
+    # Assert
+    assert len(first.added) == 3
+    assert list(delta.added.values()) == [new]
+    assert delta.resolved == [fp for fp, finding in first.added.items() if finding is fixed]
+    assert delta.total == 3
+
+
+@pytest.mark.asyncio
+async def test_unchanged_rerun_produces_an_empty_delta(project: Path):
+    store = ProjectFindingsStore(project)
+    findings = [Finding("a.py", 1, 1, "ERROR", "E1", "m")]
+    await store.diff("B_Ruff", findings, analysed_files=None)
+
+    delta = await store.diff("B_Ruff", findings, analysed_files=None)
+
+    assert delta.is_empty
+
+
+@pytest.mark.asyncio
+async def test_module_publishes_project_wide_metrics(project: Path):
+    # Arrange
+    store = ProjectFindingsStore(project)
+    await store.merge("B_Ruff", report(entry("b.py", 1)), analysed_files=None)
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+    module = RuffModule("B_Ruff", "Ruff", str(project), notifier, findings_store=store)
+
+    process = AsyncMock()
+    process.stdout.read.side_effect = [b"a.py:1:1: F401 `os` imported but unused\n", b""]
+    process.stderr.read.side_effect = [b""]
+    process.wait.return_value = 1
+    process.returncode = 1
+
+    # Act
+    with patch("asyncio.create_subprocess_exec", return_value=process):
+        await module.run(files=["a.py"])
+
+    # Assert
+    sent = notifier.send_metrics.call_args.args[1]
+    assert [m["file"] for m in sent["modules"]] == ["a.py", "b.py"]
+    assert sent["total_issues"]["ERROR"] == 2
+    assert notifier.send_metrics.call_args.kwargs == {"incremental": True}
+    # Individual findings of the analysed file go to the findings index
+    notifier.send_findings.assert_called_once_with(
+        "B_Ruff",
+        [Finding("a.py", 1, 1, "ERROR", "F401", "`os` imported but unused")],
+        ["a.py"],
+    )
+    # Clients only get what changed since the previous run
+    delta = notifier.send_findings_delta.call_args.args[1]
+    assert list(delta.added.values()) == [Finding("a.py", 1, 1, "ERROR", "F401", "`os` imported but unused")]
+    # ...including the report rows they need instead of the full METRICS
+    assert delta.metrics == {"total_issues": sent["total_issues"], "modules": [sent["modules"][0]], "removed": []}
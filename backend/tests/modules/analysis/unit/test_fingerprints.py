@@ -0,0 +1,50 @@
+from collections.abc import Callable
+
+from app.modules.analysis.application.engine.fingerprints import fingerprint_findings, normalize_message
+from app.modules.analysis.domain.entities import Finding
+
+
+def lines_of(sources: dict[str, str]) -> Callable[[str], list[str] | None]:
+    return lambda file: sources[file].splitlines() if file in sources else None
+
+
+def test_fingerprint_survives_lines_inserted_above():
+    # Arrange
+    before = {"a.py": "import os\n"}
+    after = {"a.py": "# header\n\nimport os\n"}
+
+    # Act
+    first = fingerprint_findings("B_Ruff", [Finding("a.py", 1, 8, "ERROR", "F401", "`os` unused")], lines_of(before))
+    second = fingerprint_findings("B_Ruff", [Finding("a.py", 3, 8, "ERROR", "F401", "`os` unused")], lines_of(after))
+
+    # Assert
+    assert first.keys() == second.keys()
+
+
+def test_fingerprint_changes_with_the_flagged_code():
+    # Act
+    first = fingerprint_findings(
+        "B_Ruff", [Finding("a.py", 1, 8, "ERROR", "F401", "m")], lines_of({"a.py": "import os"})
+    )
+    second = fingerprint_findings(
+        "B_Ruff", [Finding("a.py", 1, 8, "ERROR", "F401", "m")], lines_of({"a.py": "import re"})
+    )
+
+    # Assert
+    assert first.keys() != second.keys()
+
+
+def test_identical_findings_in_a_file_get_distinct_fingerprints():
+    # Arrange
+    findings = [Finding("a.py", None, None, "ERROR", "E1", "m"), Finding("a.py", None, None, "ERROR", "E1", "m")]
+
+    # Act
+    fingerprinted = fingerprint_findings("B_Ruff", findings, lines_of({}))
+
+    # Assert
+    assert len(fingerprinted) == 2
+
+
+def test_messages_are_compared_without_numbers_or_spacing():
+    # Act / Assert
+    assert normalize_message("Line too long (124 > 120)") == normalize_message("Line too long  (131 > 120)")
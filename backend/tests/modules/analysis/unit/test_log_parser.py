@@ -1,6 +1,6 @@
 import pytest
 
-from app.modules.analysis.infrastructure.log_parser import QualityLogParser
+from app.modules.analysis.infrastructure.log_parser import QualityLogParser, StreamingLogParser, extract_findings
 
 
 class TestQualityLogParser:
@@ -142,3 +142,66 @@ src/complex.py:20: warning Cyclomatic complexity > 10 (20)
         complex_mod = modules["src/complex.py"]
         assert complex_mod["complexity_metrics"]["COMPLEXITY"] == 2
         assert complex_mod["complexity_metrics"]["MAX_CCN"] == 20  # Should be the max of 15 and 20
+
+
+class TestStreamingLogParser:
+    def test_lines_split_across_chunks_are_parsed_once_complete(self):
+        parser = StreamingLogParser("B_Ruff")
+
+        parser.feed(b"backend/main.py:10:1: E402 Module level")
+        assert parser.snapshot()["total_issues"]["ERROR"] == 0
+
+        parser.feed(b" import\nbackend/utils.py:5:1: F401 'os'")
+        assert parser.snapshot()["total_issues"]["ERROR"] == 1
+
+        report = parser.close()
+        assert report["total_issues"]["ERROR"] == 2
+        assert {m["file"] for m in report["modules"]} == {"backend/main.py", "backend/utils.py"}
+
+    def test_multibyte_characters_split_across_chunks_decode_cleanly(self):
+        parser = StreamingLogParser()
+        encoded = "src/é.ts(1,1): error TS1: ü\n".encode()
+        split = encoded.index("é".encode()) + 1
+
+        text = parser.feed(encoded[:split]) + parser.feed(encoded[split:])
+
+        assert text == encoded.decode()
+        assert parser.close()["modules"][0]["file"] == "src/é.ts"
+
+    def test_streams_keep_their_own_partial_lines(self):
+        parser = StreamingLogParser()
+        stdout, stderr = parser.open_stream(), parser.open_stream()
+
+        stdout.feed(b"a.py:1:1: error")
+        stderr.feed(b"b.py:2:1: warning: w\n")
+        stdout.feed(b": e\n")
+
+        assert parser.close()["total_issues"] == {"ERROR": 1, "WARNING": 1, "INFO": 0, "COMPLEXITY": 0}
+
+    def test_snapshot_is_not_mutated_by_later_chunks(self):
+        parser = StreamingLogParser()
+        parser.feed(b"a.py:1:1: error: e\n")
+        snapshot = parser.snapshot()
+
+        parser.feed(b"a.py:2:1: error: e\n")
+
+        assert snapshot["modules"][0]["metrics"]["ERROR"] == 1
+        assert parser.finding_count == 2
+
+
+def test_extract_findings_keeps_position_rule_and_message():
+    log = (
+        "src/button.tsx(25,10): error TS2322: Type 'string' is not assignable to type 'number'.\n"
+        "/p/app/main.py:3:5 - error: Import could not be resolved (reportMissingImports)\n"
+        "core/complex.py:12: warning Cyclomatic complexity > 15 (18)\n"
+        "Found 3 problems\n"
+    )
+
+    findings = extract_findings(log)
+
+    assert [(f.file, f.line, f.column, f.severity, f.rule) for f in findings] == [
+        ("src/button.tsx", 25, 10, "ERROR", "TS2322"),
+        ("/p/app/main.py", 3, 5, "ERROR", "reportMissingImports"),
+        ("core/complex.py", 12, None, "COMPLEXITY", None),
+    ]
+    assert findings[0].message == "error TS2322: Type 'string' is not assignable to type 'number'."
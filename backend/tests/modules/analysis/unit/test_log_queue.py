@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from app.modules.analysis.application.engine.log_queue import BoundedLogQueue, OverflowPolicy
+
+
+async def drain(queue: BoundedLogQueue) -> list[str]:
+    queue.close()
+    chunks: list[str] = []
+    while (chunk := await queue.get()) is not None:
+        chunks.append(chunk)
+    return chunks
+
+
+@pytest.mark.asyncio
+async def test_drop_middle_keeps_head_and_tail_with_marker():
+    # Arrange
+    queue = BoundedLogQueue(OverflowPolicy.DROP_MIDDLE, max_bytes=10)
+
+    # Act
+    for chunk in ["head|", "aaaa", "bbbb", "cccc", "tail"]:
+        await queue.put(chunk)
+
+    # Assert
+    assert queue.size <= 10
+    assert await drain(queue) == ["head|\n… [12 bytes elided for a slow client] …\n", "tail"]
+    assert queue.stats.dropped_bytes == 12
+
+
+@pytest.mark.asyncio
+async def test_coalesce_merges_chunks_past_item_limit():
+    # Arrange
+    queue = BoundedLogQueue(OverflowPolicy.COALESCE, max_bytes=100, max_items=2)
+
+    # Act
+    for chunk in ["a", "b", "c", "d"]:
+        await queue.put(chunk)
+
+    # Assert
+    assert await drain(queue) == ["a", "bcd"]
+    assert queue.stats.coalesced_bytes == 2
+    assert queue.stats.dropped_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_block_waits_for_the_consumer():
+    # Arrange
+    queue = BoundedLogQueue(OverflowPolicy.BLOCK, max_bytes=4)
+    await queue.put("1234")
+
+    # Act
+    producer = asyncio.create_task(queue.put("5678"))
+    await asyncio.sleep(0.02)
+    blocked = not producer.done()
+    first = await queue.get()
+    await producer
+
+    # Assert
+    assert blocked
+    assert first == "1234"
+    assert await drain(queue) == ["5678"]
+    assert queue.stats.blocked_seconds > 0
+    assert queue.stats.peak_bytes == 4
+
+
+@pytest.mark.asyncio
+async def test_get_waits_for_data_and_ends_on_close():
+    queue = BoundedLogQueue()
+
+    getter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    await queue.put("x")
+
+    assert await getter == "x"
+    queue.close()
+    assert await queue.get() is None
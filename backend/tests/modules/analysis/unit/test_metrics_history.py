@@ -0,0 +1,73 @@
+import aiosqlite
+import pytest
+
+from app.modules.analysis.infrastructure.metrics_history import (
+    DAY,
+    HISTORY_SCHEMA,
+    HOUR,
+    MetricsHistory,
+    pick_resolution,
+)
+
+NOW = 1_700_000_000.0
+
+
+@pytest.mark.parametrize(
+    "start, end, expected",
+    [
+        (NOW - HOUR, NOW, "raw"),
+        (NOW - 7 * DAY, NOW, "hour"),
+        (NOW - 60 * DAY, NOW, "day"),
+        # Raw points of three days ago are already gone
+        (NOW - 3 * DAY, NOW - 3 * DAY + HOUR, "hour"),
+    ],
+)
+def test_pick_resolution(start: float, end: float, expected: str):
+    # Act
+    resolution = pick_resolution(start, end, NOW)
+
+    # Assert
+    assert resolution.name == expected
+
+
+@pytest.mark.asyncio
+async def test_points_are_rolled_up_into_buckets():
+    # Arrange
+    history = MetricsHistory()
+    hour = NOW - NOW % HOUR
+    async with aiosqlite.connect(":memory:") as db:
+        await db.executescript(HISTORY_SCHEMA)
+        for offset, errors in ((10, 4), (20, 2), (30, 6)):
+            await history.record(db, "p1", "B_Ruff", hour + offset, {"ERROR": errors, "WARNING": 1})
+
+        # Act
+        raw = await history.query(db, "p1", hour, hour + HOUR, resolution="raw")
+        hourly = await history.query(db, "p1", hour + 15, hour + HOUR, resolution="hour")
+
+    # Assert
+    assert [p["ERROR"]["max"] for p in raw["points"]] == [4, 2, 6]
+    (bucket,) = hourly["points"]
+    assert bucket["ts"] == hour
+    assert bucket["samples"] == 3
+    assert bucket["ERROR"] == {"avg": 4.0, "min": 2, "max": 6}
+    assert bucket["WARNING"] == {"avg": 1.0, "min": 1, "max": 1}
+
+
+@pytest.mark.asyncio
+async def test_prune_applies_each_resolution_retention():
+    # Arrange
+    history = MetricsHistory()
+    async with aiosqlite.connect(":memory:") as db:
+        await db.executescript(HISTORY_SCHEMA)
+        await history.record(db, "p1", "B_Ruff", NOW - 10 * DAY, {"ERROR": 1})
+        await history.record(db, "p1", "B_Ruff", NOW, {"ERROR": 2})
+
+        # Act
+        removed = await history.prune(db, now=NOW)
+        raw = await history.query(db, "p1", NOW - 30 * DAY, NOW, resolution="raw")
+        daily = await history.query(db, "p1", NOW - 30 * DAY, NOW, resolution="day")
+
+    # Assert
+    assert removed == 1
+    assert [p["ERROR"]["max"] for p in raw["points"]] == [2]
+    assert len(daily["points"]) == 2
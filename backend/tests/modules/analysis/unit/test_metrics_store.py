@@ -0,0 +1,251 @@
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+import pytest
+
+from app.modules.analysis.infrastructure.metrics_store import MetricsStore
+
+METRICS = {
+    "total_issues": {"ERROR": 3, "WARNING": 1, "INFO": 0, "COMPLEXITY": 0},
+    "modules": [
+        {
+            "file": "app/a.py",
+            "metrics": {"ERROR": 2, "WARNING": 1, "INFO": 0},
+            "complexity_metrics": {"COMPLEXITY": 0, "MAX_CCN": 0},
+        },
+        {
+            "file": "app/b.py",
+            "metrics": {"ERROR": 1, "WARNING": 0, "INFO": 0},
+            "complexity_metrics": {"COMPLEXITY": 0, "MAX_CCN": 0},
+        },
+    ],
+}
+
+
+def record_run(store: MetricsStore, project_id: str, status: str) -> None:
+    store.record(project_id, {"type": "GLOBAL_INIT"})
+    store.record(project_id, {"type": "INIT", "module": "B_Ruff"})
+    store.record(project_id, {"type": "METRICS", "module": "B_Ruff", "data": METRICS})
+    store.record(project_id, {"type": "END", "module": "B_Ruff", "status": status, "summary": "3 errors"})
+    store.record(project_id, {"type": "GLOBAL_END", "status": status})
+
+
+@pytest.mark.asyncio
+async def test_latest_run_results_are_served_from_the_store(tmp_path: Path):
+    # Arrange
+    store = MetricsStore(tmp_path / "metrics.db")
+    record_run(store, "p1", "PASS")
+    record_run(store, "p1", "FAIL")
+
+    # Act
+    queued = store.snapshot()["queued"]
+    await store.flush()
+    latest = await store.latest("p1")
+
+    # Assert: recording only queues, the writer commits in the background
+    assert queued == 8
+    assert latest is not None
+    assert latest["status"] == "FAIL"
+    assert latest["modules"] == {"B_Ruff": {"status": "FAIL", "summary": "3 errors", "metrics": METRICS}}
+    assert [f["file"] for f in latest["files"]] == ["app/a.py", "app/b.py"]
+    assert store.snapshot()["written"] == 8
+
+
+@pytest.mark.asyncio
+async def test_latest_can_be_narrowed_to_a_file(tmp_path: Path):
+    # Arrange
+    store = MetricsStore(tmp_path / "metrics.db")
+    record_run(store, "p1", "FAIL")
+    await store.flush()
+
+    # Act
+    latest = await store.latest("p1", module_id="B_Ruff", file="app/b.py")
+
+    # Assert
+    assert latest is not None
+    assert latest["files"] == [
+        {
+            "module_id": "B_Ruff",
+            "file": "app/b.py",
+            "errors": 1,
+            "warnings": 0,
+            "infos": 0,
+            "complexity": 0,
+            "max_ccn": 0,
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unknown_project_has_no_metrics(tmp_path: Path):
+    # Arrange
+    store = MetricsStore(tmp_path / "metrics.db")
+    record_run(store, "p1", "PASS")
+    await store.flush()
+
+    # Act / Assert
+    assert await store.latest("p2") is None
+    assert await MetricsStore(tmp_path / "missing.db").latest("p1") is None
+
+
+@pytest.mark.asyncio
+async def test_run_totals_are_kept_in_the_history(tmp_path: Path):
+    # Arrange
+    store = MetricsStore(tmp_path / "metrics.db")
+    record_run(store, "p1", "FAIL")
+    record_run(store, "p1", "FAIL")
+    await store.flush()
+
+    # Act
+    history = await store.history_range("p1", time.time() - 3600, time.time())
+
+    # Assert
+    assert history["resolution"] == "raw"
+    assert [p["ERROR"]["avg"] for p in history["points"]] == [3, 3]
+
+
+@pytest.mark.asyncio
+async def test_partial_metrics_are_not_stored(tmp_path: Path):
+    # Arrange: two in-progress snapshots precede the run's final report
+    store = MetricsStore(tmp_path / "metrics.db")
+    partial: dict[str, Any] = {
+        "total_issues": {"ERROR": 1, "WARNING": 0, "INFO": 0, "COMPLEXITY": 0},
+        "modules": [],
+        "partial": True,
+    }
+    store.record("p1", {"type": "GLOBAL_INIT"})
+    store.record("p1", {"type": "METRICS", "module": "B_Ruff", "data": partial})
+    store.record("p1", {"type": "METRICS", "module": "B_Ruff", "data": partial})
+    store.record("p1", {"type": "METRICS", "module": "B_Ruff", "data": METRICS})
+    store.record("p1", {"type": "GLOBAL_END", "status": "FAIL"})
+
+    # Act
+    queued = store.snapshot()["queued"]
+    await store.flush()
+    history = await store.history_range("p1", time.time() - 3600, time.time())
+    latest = await store.latest("p1")
+
+    # Assert
+    assert queued == 3
+    assert [p["ERROR"]["avg"] for p in history["points"]] == [3]
+    assert latest is not None
+    assert latest["modules"]["B_Ruff"]["metrics"] == METRICS
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_leaves_no_partial_rows(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Arrange: the history write fails after the module and file rows were written, while
+    # the run's END is queued for the next batch on the same connection
+    store = MetricsStore(tmp_path / "metrics.db")
+    store.record("p1", {"type": "GLOBAL_INIT"})
+    await store.flush()
+
+    async def failing_record(*args: Any) -> None:
+        monkeypatch.undo()
+        store.record("p1", {"type": "END", "module": "B_Ruff", "status": "FAIL", "summary": "3 errors"})
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(store.history, "record", failing_record)
+
+    # Act
+    store.record("p1", {"type": "METRICS", "module": "B_Ruff", "data": METRICS})
+    await store.flush()
+    latest = await store.latest("p1")
+
+    # Assert
+    assert store.snapshot()["failed"] == 1
+    assert latest is not None
+    assert latest["modules"] == {"B_Ruff": {"status": "FAIL", "summary": "3 errors", "metrics": None}}
+    assert latest["files"] == []
+
+
+@pytest.mark.asyncio
+async def test_latest_keeps_modules_skipped_by_the_newest_run(tmp_path: Path):
+    # Arrange: an incremental run only touches B_Ruff, F_ESLint keeps its full-run result
+    store = MetricsStore(tmp_path / "metrics.db")
+    store.record("p1", {"type": "GLOBAL_INIT"})
+    store.record("p1", {"type": "END", "module": "B_Ruff", "status": "FAIL", "summary": "3 errors"})
+    store.record("p1", {"type": "END", "module": "F_ESLint", "status": "PASS", "summary": "clean"})
+    store.record("p1", {"type": "GLOBAL_END", "status": "FAIL"})
+    await store.flush()
+    store.record("p1", {"type": "GLOBAL_INIT"})
+    store.record("p1", {"type": "METRICS", "module": "B_Ruff", "data": METRICS})
+    store.record("p1", {"type": "END", "module": "B_Ruff", "status": "PASS", "summary": "clean"})
+    store.record("p1", {"type": "GLOBAL_END", "status": "PASS"})
+    await store.flush()
+
+    # Act
+    latest = await store.latest("p1")
+    eslint = await store.latest("p1", module_id="F_ESLint")
+
+    # Assert
+    assert latest is not None
+    assert latest["status"] == "PASS"
+    assert {m: r["summary"] for m, r in latest["modules"].items()} == {"B_Ruff": "clean", "F_ESLint": "clean"}
+    assert [f["file"] for f in latest["files"]] == ["app/a.py", "app/b.py"]
+    assert eslint is not None
+    assert eslint["modules"] == {"F_ESLint": {"status": "PASS", "summary": "clean", "metrics": None}}
+    assert eslint["files"] == []
+
+
+@pytest.mark.asyncio
+async def test_unexpected_write_error_does_not_stall_the_writer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Arrange
+    store = MetricsStore(tmp_path / "metrics.db")
+    store.record("p1", {"type": "GLOBAL_INIT"})
+    await store.flush()
+
+    async def broken_record(*args: Any) -> None:
+        monkeypatch.undo()
+        raise ValueError("bad metrics payload")
+
+    monkeypatch.setattr(store.history, "record", broken_record)
+
+    # Act
+    store.record("p1", {"type": "METRICS", "module": "B_Ruff", "data": METRICS})
+    await asyncio.wait_for(store.flush(), timeout=5)
+    store.record("p1", {"type": "END", "module": "B_Ruff", "status": "PASS", "summary": "clean"})
+    await asyncio.wait_for(store.flush(), timeout=5)
+    latest = await store.latest("p1")
+
+    # Assert
+    assert store.snapshot()["failed"] == 1
+    assert store.snapshot()["written"] == 2
+    assert latest is not None
+    assert latest["modules"]["B_Ruff"]["summary"] == "clean"
+
+
+@pytest.mark.asyncio
+async def test_reads_share_one_connection_until_closed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Arrange
+    store = MetricsStore(tmp_path / "metrics.db")
+    record_run(store, "p1", "PASS")
+    await store.flush()
+    connections: list[aiosqlite.Connection] = []
+    connect = aiosqlite.connect
+
+    def tracking_connect(path: Path) -> aiosqlite.Connection:
+        connections.append(connect(path))
+        return connections[-1]
+
+    monkeypatch.setattr(aiosqlite, "connect", tracking_connect)
+
+    # Act
+    first = await store.latest("p1")
+    await store.history_range("p1", 0, time.time())
+    record_run(store, "p1", "FAIL")
+    await store.flush()
+    second = await store.latest("p1")
+    await store.close()
+
+    # Assert: one read connection (plus the writer's), which still sees later commits
+    assert first is not None and first["status"] == "PASS"
+    assert second is not None and second["status"] == "FAIL"
+    assert len(connections) == 2
+    for connection in connections:
+        connection.join(timeout=5)
+        assert not connection.is_alive()
@@ -168,7 +168,8 @@ def test_ruff_module(mock_notifier: MagicMock, tmp_path):
     module = RuffModule("ruff", "Ruff", str(tmp_path), mock_notifier)
 
     # Command
-    assert module.get_command() == ["ruff", "check", "."]
+    assert module.get_command() == ["ruff", "check", "--force-exclude", "--output-format", "concise", "."]
+    assert module.get_command(["app/api.pyi"])[-1] == "app/api.pyi"
 
     # Summary
     text_output = "Found 2 errors."
@@ -182,6 +183,8 @@ def test_pyright_module(mock_notifier: MagicMock, tmp_path):
 
     # Command
     assert module.get_command() == ["python3", "-u", "-m", "pyright", "."]
+    assert module.get_command(["app/api.pyi", "README.md"]) == ["python3", "-u", "-m", "pyright", "app/api.pyi"]
+    assert module.get_command(["README.md"]) == []
 
     # Summary
     text_output = "2 errors, 0 warnings"
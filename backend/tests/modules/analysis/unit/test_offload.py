@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.modules.analysis.application.engine.offload import OffloadExecutor
+from app.modules.analysis.infrastructure.log_parser import QualityLogParser, parse_log_content
+
+LOG = "src/a.ts(1,1): error TS2322: Type 'string' is not assignable to type 'number'.\n" * 50
+
+
+@pytest.mark.asyncio
+async def test_small_inputs_run_inline_and_large_ones_on_a_thread():
+    # Arrange
+    executor = OffloadExecutor(max_threads=2, inline_bytes=100)
+    main_thread = threading.get_ident()
+
+    # Act
+    small = await executor.run("summary", threading.get_ident, size=10)
+    large = await executor.run("summary", threading.get_ident, size=1000)
+    executor.shutdown()
+
+    # Assert
+    assert small == main_thread
+    assert large != main_thread
+    stats = executor.snapshot()["stages"]["summary"]
+    assert stats["inline"] == 1
+    assert stats["threaded"] == 1
+    assert stats["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_jobs_beyond_the_pool_size_wait_on_the_loop():
+    # Arrange
+    executor = OffloadExecutor(max_threads=1, inline_bytes=0)
+
+    # Act
+    await asyncio.gather(*(executor.run("compress", time.sleep, 0.05, size=1) for _ in range(3)))
+    executor.shutdown()
+
+    # Assert
+    stats = executor.stages["compress"]
+    assert stats.peak_queued == 2
+    assert stats.queued == 0
+    assert stats.wait_seconds >= 0.1
+    assert stats.max_latency_seconds >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_large_logs_are_parsed_in_a_worker_process():
+    # Arrange
+    executor = OffloadExecutor(max_processes=1, inline_bytes=0, process_bytes=1024)
+
+    # Act
+    report = await executor.run_cpu("parse", parse_log_content, LOG, "F_TypeScript", size=len(LOG))
+    executor.shutdown()
+
+    # Assert
+    assert report == QualityLogParser().parse_content(LOG, "F_TypeScript")
+    assert executor.stages["parse"].processed == 1
@@ -1,9 +1,26 @@
+import asyncio
+from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.modules.analysis.application.engine.base_module import AnalysisModule
 from app.modules.analysis.application.engine.orchestrator import AnalysisOrchestrator
+from app.modules.analysis.application.engine.scheduler import AnalysisScheduler, ResourceProbe
 from app.modules.analysis.domain.ports import AnalysisNotifierPort
+from app.modules.analysis.infrastructure.duration_history import DurationHistory
+
+
+class IdleProbe(ResourceProbe):
+    def cpu_count(self) -> int:
+        return 8
+
+    def load_average(self) -> float:
+        return 0.0
+
+    def available_memory_mb(self) -> int | None:
+        return 8192
 
 
 @pytest.fixture
@@ -188,3 +205,220 @@ async def test_run_parallel_modules_exception(mock_notifier: MagicMock):
 
         # Assert
         assert results == {"F_TypeScript": "FAIL"}
+
+
+@pytest.mark.asyncio
+async def test_run_parallel_modules_starts_longest_expected_first(mock_notifier: MagicMock, tmp_path: Path):
+    # Arrange
+    history = DurationHistory(tmp_path / "history.json")
+    history.record("/tmp/test", "B_Ruff", "full", 1.0)
+    history.record("/tmp/test", "B_Lizard", "full", 50.0)
+    orchestrator = AnalysisOrchestrator(
+        project_path="/tmp/test",
+        mode="full",
+        ws_manager=mock_notifier,
+        selected_tools=["B_Ruff", "B_Lizard", "F_TypeScript"],
+        scheduler=AnalysisScheduler(max_slots=1),
+        duration_history=history,
+    )
+    started: list[str] = []
+
+    def module_factory(module_id: str, **_: Any) -> AsyncMock:
+        module = AsyncMock()
+        module.module_id = module_id
+
+        def run(files: list[str] | None) -> str:
+            started.append(module_id)
+            return "PASS"
+
+        module.run.side_effect = run
+        module.ran_tool = True
+        return module
+
+    with patch.dict(
+        "app.modules.analysis.application.engine.orchestrator.MODULE_CLASSES",
+        {module_id: module_factory for module_id in ["B_Ruff", "B_Lizard", "F_TypeScript"]},
+    ):
+        # Act
+        await orchestrator.run_parallel_modules()
+
+    # Assert: history first (Lizard 50s), then the TypeScript default (60s) ahead of Ruff (1s)
+    assert started == ["F_TypeScript", "B_Lizard", "B_Ruff"]
+    assert history.expected("/tmp/test", "F_TypeScript", "full") is not None
+
+
+@pytest.mark.asyncio
+async def test_only_runs_of_the_tool_itself_are_timed(mock_notifier: MagicMock, tmp_path: Path):
+    # Arrange: Ruff runs, Lizard is replayed from the result cache, TypeScript has nothing to check
+    history = DurationHistory(tmp_path / "history.json")
+    orchestrator = AnalysisOrchestrator(
+        project_path="/tmp/test",
+        mode="full",
+        ws_manager=mock_notifier,
+        selected_tools=["B_Ruff", "B_Lizard", "F_TypeScript"],
+        scheduler=AnalysisScheduler(max_slots=3, probe=IdleProbe()),
+        duration_history=history,
+    )
+    outcomes = {"B_Ruff": ("PASS", True), "B_Lizard": ("PASS", False), "F_TypeScript": ("SKIPPED", False)}
+
+    def module_factory(module_id: str, **_: Any) -> AsyncMock:
+        module = AsyncMock()
+        module.module_id = module_id
+        module.run.return_value, module.ran_tool = outcomes[module_id]
+        return module
+
+    with patch.dict(
+        "app.modules.analysis.application.engine.orchestrator.MODULE_CLASSES",
+        {module_id: module_factory for module_id in outcomes},
+    ):
+        # Act
+        await orchestrator.run_parallel_modules()
+
+    # Assert
+    assert history.expected("/tmp/test", "B_Ruff", "full") is not None
+    assert history.expected("/tmp/test", "B_Lizard", "full") is None
+    assert history.expected("/tmp/test", "F_TypeScript", "full") is None
+
+
+@pytest.mark.asyncio
+async def test_execute_sends_eta_once_every_module_has_history(mock_notifier: MagicMock, tmp_path: Path):
+    # Arrange
+    history = DurationHistory(tmp_path / "history.json")
+    orchestrator = AnalysisOrchestrator(
+        project_path="/tmp/test",
+        mode="full",
+        ws_manager=mock_notifier,
+        selected_tools=["B_Ruff", "B_Lizard"],
+        scheduler=AnalysisScheduler(max_slots=1),
+        duration_history=history,
+    )
+    orchestrator.run_parallel_modules = AsyncMock(return_value={"B_Ruff": "PASS", "B_Lizard": "PASS"})
+
+    # Act
+    await orchestrator.execute()
+    history.record("/tmp/test", "B_Ruff", "full", 2.0)
+    history.record("/tmp/test", "B_Lizard", "full", 8.0)
+    await orchestrator.execute()
+
+    # Assert
+    assert [c.args for c in mock_notifier.send_global_init.call_args_list] == [(None,), (10.0,)]
+
+
+@pytest.mark.asyncio
+async def test_supersede_restarts_only_affected_modules(mock_notifier: MagicMock, tmp_path: Path):
+    # Arrange
+    orchestrator = AnalysisOrchestrator(
+        project_path="/tmp/test",
+        mode="incremental",
+        ws_manager=mock_notifier,
+        selected_tools=["B_Ruff", "B_Lizard", "F_ESLint"],
+        scheduler=AnalysisScheduler(max_slots=3, probe=IdleProbe()),
+        duration_history=DurationHistory(tmp_path / "history.json"),
+    )
+    release = asyncio.Event()
+    calls: list[tuple[str, list[str]]] = []
+
+    def module_factory(module_id: str, **_: Any) -> MagicMock:
+        async def run(files: list[str]) -> str:
+            # Keep the list itself: a run must never see its file set change under it
+            calls.append((module_id, files))
+            if module_id != "B_Lizard":
+                await release.wait()
+            return "PASS"
+
+        module = MagicMock()
+        module.module_id = module_id
+        module.run = run
+        module.is_affected_by.return_value = module_id != "F_ESLint"
+        return module
+
+    with patch.dict(
+        "app.modules.analysis.application.engine.orchestrator.MODULE_CLASSES",
+        {module_id: module_factory for module_id in ["B_Ruff", "B_Lizard", "F_ESLint"]},
+    ):
+        run = asyncio.create_task(orchestrator.run_parallel_modules(["a.py"]))
+        for _ in range(200):
+            if len(calls) == 3 and "B_Lizard" in orchestrator.finished_modules:
+                break
+            await asyncio.sleep(0.01)
+
+        # Act
+        absorbed = orchestrator.supersede(["a.py", "b.py"])
+        ignored = orchestrator.supersede(["c.py"])
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await run
+
+    # Assert
+    assert absorbed == ["a.py", "b.py"]
+    assert ignored == []
+    assert results == {"B_Ruff": "PASS", "B_Lizard": "PASS", "F_ESLint": "PASS"}
+    assert [c for c in calls if c[0] == "F_ESLint"] == [("F_ESLint", ["a.py"])]
+    assert [c for c in calls if c[0] == "B_Ruff"] == [("B_Ruff", ["a.py"]), ("B_Ruff", ["a.py", "b.py"])]
+    assert [c for c in calls if c[0] == "B_Lizard"] == [("B_Lizard", ["a.py"]), ("B_Lizard", ["a.py", "b.py"])]
+
+
+class BlockingModule(AnalysisModule):
+    """Test module whose first run blocks until cancelled"""
+
+    input_extensions = (".py",)
+    runs: list[list[str]] = []
+
+    def get_command(self, files: list[str] | None = None) -> list[str]:
+        return ["tool", *(files or ["."])]
+
+    def get_summary(self, stdout: str, stderr: str, exit_code: int) -> str:
+        return "done"
+
+    async def run_command(self, cmd: list[str], files: list[str] | None) -> tuple[str, str, int | None]:
+        self.runs.append(list(files or []))
+        if len(self.runs) == 1:
+            await asyncio.Event().wait()
+        return "", "", 0
+
+
+@pytest.mark.asyncio
+async def test_superseded_run_sends_no_cancelled_end(mock_notifier: MagicMock, tmp_path: Path):
+    # Arrange
+    orchestrator = AnalysisOrchestrator(
+        project_path=str(tmp_path),
+        mode="incremental",
+        ws_manager=mock_notifier,
+        selected_tools=["B_Ruff"],
+        scheduler=AnalysisScheduler(max_slots=1, probe=IdleProbe()),
+        duration_history=DurationHistory(tmp_path / "history.json"),
+    )
+    BlockingModule.runs = []
+    with patch.dict("app.modules.analysis.application.engine.orchestrator.MODULE_CLASSES", {"B_Ruff": BlockingModule}):
+        run = asyncio.create_task(orchestrator.run_parallel_modules(["a.py"]))
+        while not BlockingModule.runs:
+            await asyncio.sleep(0.01)
+
+        # Act
+        orchestrator.supersede(["a.py", "b.py"])
+        results = await run
+
+    # Assert: one END for the restarted run, none for the cancelled one
+    assert results == {"B_Ruff": "PASS"}
+    assert BlockingModule.runs == [["a.py"], ["a.py", "b.py"]]
+    assert [c.args for c in mock_notifier.send_end.call_args_list] == [("B_Ruff", "PASS", "done")]
+
+
+def test_supersede_reruns_module_that_is_done_but_not_yet_finished(mock_notifier: MagicMock):
+    # Arrange: the module's task completed, run_module_with_slot has not resumed yet
+    orchestrator = AnalysisOrchestrator(project_path="/tmp/test", mode="incremental", ws_manager=mock_notifier)
+    module = MagicMock(module_id="B_Ruff")
+    module.is_affected_by.return_value = True
+    task = MagicMock()
+    task.done.return_value = True
+    orchestrator.active_files = ["a.py"]
+    orchestrator.active_modules = [module]
+    orchestrator.module_tasks["B_Ruff"] = task
+
+    # Act
+    absorbed = orchestrator.supersede(["a.py"])
+
+    # Assert
+    assert absorbed == ["a.py"]
+    assert orchestrator.stale_modules == {"B_Ruff"}
+    task.cancel.assert_not_called()
@@ -0,0 +1,120 @@
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.analysis.application.engine.modules import ESLintModule, RuffModule
+from app.modules.analysis.application.engine.output_capture import OutputCapture
+from app.modules.analysis.domain.ports import AnalysisNotifierPort
+from app.modules.analysis.infrastructure.result_cache import ResultCache
+
+
+def test_output_within_budget_is_kept_whole():
+    # Arrange
+    capture = OutputCapture(memory_bytes=8, budget_bytes=1024, tail_bytes=16)
+
+    # Act
+    for i in range(20):
+        capture.write(f"line {i}\n")
+
+    # Assert
+    assert capture.getvalue() == "".join(f"line {i}\n" for i in range(20))
+    assert capture._spool is not None
+    assert not capture.truncated
+    capture.close()
+
+
+def test_output_past_budget_keeps_head_and_tail():
+    # Arrange
+    capture = OutputCapture(memory_bytes=4, budget_bytes=40, tail_bytes=20)
+
+    # Act
+    capture.write("HEAD-")
+    for _ in range(100):
+        capture.write("middle\n")
+    capture.write("Found 3 errors.\n")
+
+    # Assert
+    text = capture.getvalue()
+    assert text.startswith("HEAD-middle")
+    assert text.endswith("Found 3 errors.\n")
+    assert capture.truncated
+    assert f"[{capture.truncated_bytes} bytes truncated]" in text
+    assert capture.total_bytes == 5 + 700 + 16
+    capture.close()
+
+
+def test_multibyte_characters_survive_the_spool_boundary():
+    capture = OutputCapture(memory_bytes=3, budget_bytes=1024)
+
+    capture.write("aéü€")
+
+    assert capture.getvalue() == "aéü€"
+    capture.close()
+
+
+@pytest.mark.asyncio
+async def test_module_reports_truncated_output(tmp_path: Path):
+    # Arrange
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+    module = RuffModule("B_Ruff", "Ruff", str(tmp_path), notifier)
+    process = AsyncMock()
+    process.stdout.read.side_effect = [b"x.py:1:1: F401 unused\n" * 50, b"Found 50 errors.\n", b""]
+    process.stderr.read.side_effect = [b""]
+    process.wait.return_value = 1
+    process.returncode = 1
+
+    def small_captures() -> tuple[OutputCapture, OutputCapture]:
+        return OutputCapture(64, 256, 32), OutputCapture(64, 256, 32)
+
+    # Act
+    with (
+        patch("asyncio.create_subprocess_exec", return_value=process),
+        patch("app.modules.analysis.application.engine.base_module.create_output_captures", small_captures),
+    ):
+        await module.run(["x.py"])
+
+    # Assert
+    logs = [c.args[1] for c in notifier.send_log.call_args_list]
+    assert any(log.startswith("✂️ stdout truncated") for log in logs)
+    assert notifier.send_end.call_args.args[2] == "❌ 50 issue(s) found"
+    assert notifier.send_metrics.call_args.args[1]["total_issues"]["ERROR"] == 50
+
+
+@pytest.mark.asyncio
+async def test_eslint_summary_survives_truncated_json(tmp_path: Path):
+    # Arrange: one JSON document, far larger than the capture budget
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+    cache = MagicMock(spec=ResultCache)
+    cache.get.return_value = None
+    module = ESLintModule("F_ESLint", "ESLint", str(tmp_path), notifier, result_cache=cache)
+    message = {"ruleId": "no-unused-vars", "severity": 2, "message": "unused", "line": 1, "column": 1}
+    results = [
+        {"filePath": f"src/f{i}.ts", "messages": [message], "errorCount": 1, "warningCount": 0} for i in range(30)
+    ]
+    document = json.dumps(results).encode()
+    process = AsyncMock()
+    process.stdout.read.side_effect = [document[:1000], document[1000:], b"\n", b""]
+    process.stderr.read.side_effect = [b""]
+    process.wait.return_value = 1
+    process.returncode = 1
+
+    def small_captures() -> tuple[OutputCapture, OutputCapture]:
+        return OutputCapture(64, 256, 32), OutputCapture(64, 256, 32)
+
+    # Act
+    with (
+        patch.object(ESLintModule, "get_command", return_value=["eslint", "--format", "json", "src"]),
+        patch.object(ESLintModule, "run_persistent", AsyncMock(return_value=None)),
+        patch.object(ESLintModule, "get_cache_key", AsyncMock(return_value="key")),
+        patch("asyncio.create_subprocess_exec", return_value=process),
+        patch("app.modules.analysis.application.engine.base_module.create_output_captures", small_captures),
+    ):
+        await module.run()
+
+    # Assert
+    assert module.output_truncated
+    assert notifier.send_end.call_args.args[2] == "❌ 30 error(s), 0 warning(s)"
+    assert notifier.send_metrics.call_args.args[1]["total_issues"]["ERROR"] == 30
+    cache.put.assert_not_called()
@@ -0,0 +1,75 @@
+import os
+import time
+from pathlib import Path
+
+from watchdog.utils.dirsnapshot import DirectorySnapshot, DirectorySnapshotDiff
+
+from app.modules.analysis.infrastructure.adapters.pruned_polling import PrunedListing
+
+
+def take(root: Path, listing: PrunedListing) -> DirectorySnapshot:
+    return DirectorySnapshot(str(root), stat=listing.stat, listdir=listing.listdir)
+
+
+def make_project(root: Path) -> None:
+    (root / "src").mkdir()
+    (root / "src" / "app.py").write_text("x = 1\n")
+    (root / "node_modules" / "pkg").mkdir(parents=True)
+    (root / "node_modules" / "pkg" / "index.js").write_text("")
+    (root / ".venv").mkdir()
+    (root / ".venv" / "site.py").write_text("")
+
+
+def age(path: Path) -> None:
+    # Make a directory's listing old enough to be trusted
+    past = time.time() - 60
+    os.utime(path, (past, past))
+
+
+def test_ignored_directories_are_never_listed_or_stated(tmp_path: Path):
+    # Arrange
+    make_project(tmp_path)
+
+    # Act
+    snapshot = take(tmp_path, PrunedListing(str(tmp_path)))
+
+    # Assert
+    assert str(tmp_path / "src" / "app.py") in snapshot.paths
+    assert not any("node_modules" in str(path) or ".venv" in str(path) for path in snapshot.paths)
+
+
+def test_unchanged_directories_reuse_their_listing(tmp_path: Path):
+    # Arrange
+    make_project(tmp_path)
+    age(tmp_path)
+    age(tmp_path / "src")
+    listing = PrunedListing(str(tmp_path))
+    take(tmp_path, listing)
+
+    # Act
+    take(tmp_path, listing)
+
+    # Assert
+    assert listing.listed == 2
+    assert listing.reused == 2
+
+
+def test_changes_are_still_detected(tmp_path: Path):
+    # Arrange
+    make_project(tmp_path)
+    age(tmp_path)
+    listing = PrunedListing(str(tmp_path), racy_window_ns=0)
+    before = take(tmp_path, listing)
+
+    # Act
+    (tmp_path / "src" / "app.py").write_text("x = 2\n")
+    os.utime(tmp_path / "src" / "app.py", (time.time() + 5, time.time() + 5))
+    (tmp_path / "src" / "new.py").write_text("")
+    (tmp_path / "node_modules" / "pkg" / "other.js").write_text("")
+    diff = DirectorySnapshotDiff(before, take(tmp_path, listing))
+
+    # Assert
+    assert diff.files_modified == [str(tmp_path / "src" / "app.py")]
+    assert diff.files_created == [str(tmp_path / "src" / "new.py")]
+    # The root did not change, so its listing was reused
+    assert listing.reused == 1
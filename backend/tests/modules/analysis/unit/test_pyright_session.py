@@ -0,0 +1,192 @@
+import asyncio
+import sys
+import textwrap
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.modules.analysis.application.engine.modules import PyrightModule
+from app.modules.analysis.application.engine.pyright_session import PyrightLanguageServerSession
+from app.modules.analysis.application.engine.sessions import ToolOutput
+from app.modules.analysis.domain.ports import AnalysisNotifierPort
+
+# Minimal LSP server: reports an error on every line containing "bad"
+FAKE_LANGSERVER = textwrap.dedent(
+    """
+    import json, sys
+
+    def read():
+        length = 0
+        while True:
+            line = sys.stdin.buffer.readline()
+            if not line:
+                sys.exit(0)
+            if line in (b"\\r\\n", b"\\n"):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return json.loads(sys.stdin.buffer.read(length))
+
+    def send(message):
+        body = json.dumps(message).encode()
+        sys.stdout.buffer.write(b"Content-Length: %d\\r\\n\\r\\n" % len(body) + body)
+        sys.stdout.buffer.flush()
+
+    def publish(uri, version, text):
+        diagnostics = [
+            {
+                "range": {"start": {"line": i, "character": 4}, "end": {"line": i, "character": 7}},
+                "severity": 1,
+                "message": "bad name",
+                "code": "reportUndefinedVariable",
+            }
+            for i, line in enumerate(text.splitlines())
+            if "bad" in line
+        ]
+        send({"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics",
+              "params": {"uri": uri, "version": version, "diagnostics": diagnostics}})
+
+    while True:
+        msg = read()
+        method = msg.get("method")
+        if method == "initialize":
+            send({"jsonrpc": "2.0", "id": msg["id"], "result": {"capabilities": {}}})
+        elif method == "shutdown":
+            send({"jsonrpc": "2.0", "id": msg["id"], "result": None})
+        elif method == "exit":
+            sys.exit(0)
+        elif method == "textDocument/didOpen":
+            doc = msg["params"]["textDocument"]
+            publish(doc["uri"], doc["version"], doc["text"])
+        elif method == "textDocument/didChange":
+            doc = msg["params"]["textDocument"]
+            publish(doc["uri"], doc["version"], msg["params"]["contentChanges"][0]["text"])
+    """
+)
+
+
+@pytest.fixture
+def fake_server(tmp_path: Path) -> list[str]:
+    script = tmp_path / "fake_langserver.py"
+    script.write_text(FAKE_LANGSERVER)
+    return [sys.executable, str(script)]
+
+
+@pytest.mark.asyncio
+async def test_session_renders_diagnostics_in_cli_format(tmp_path: Path, fake_server: list[str]):
+    # Arrange
+    (tmp_path / "app.py").write_text("x = 1\ny = bad\n")
+    session = PyrightLanguageServerSession(tmp_path, command=fake_server)
+
+    try:
+        # Act
+        output = await session.check(["app.py"])
+    finally:
+        await session.stop()
+
+    # Assert
+    assert output is not None
+    assert f"  {tmp_path / 'app.py'}:2:5 - error: bad name (reportUndefinedVariable)" in output.stdout
+    assert "1 errors, 0 warnings, 0 informations" in output.stdout
+    assert output.exit_code == 1
+
+
+@pytest.mark.asyncio
+async def test_session_picks_up_saved_changes(tmp_path: Path, fake_server: list[str]):
+    # Arrange
+    source = tmp_path / "app.py"
+    source.write_text("y = bad\n")
+    session = PyrightLanguageServerSession(tmp_path, command=fake_server)
+
+    try:
+        first = await session.check(["app.py"])
+        # Act
+        source.write_text("y = 1\n")
+        await session.notify_changed(["app.py"])
+        second = await session.check(["app.py"])
+    finally:
+        await session.stop()
+
+    # Assert
+    assert first is not None and first.exit_code == 1
+    assert second is not None and second.exit_code == 0
+    assert "0 errors" in second.stdout
+
+
+@pytest.mark.asyncio
+async def test_session_returns_none_when_server_cannot_start(tmp_path: Path):
+    session = PyrightLanguageServerSession(tmp_path, command=[str(tmp_path / "missing-langserver")])
+
+    assert await session.check(["app.py"]) is None
+
+
+@pytest.mark.asyncio
+async def test_module_uses_session_output_without_spawning(tmp_path: Path):
+    # Arrange
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+    session = AsyncMock()
+    session.name = "Pyright language server"
+    session.check.return_value = ToolOutput("0 errors, 0 warnings, 0 informations \n", "", 0)
+    module = PyrightModule("B_Pyright", "Pyright", str(tmp_path), notifier, session=session)
+
+    # Act
+    with patch("asyncio.create_subprocess_exec") as mock_exec:
+        status = await module.run(files=["app.py"])
+
+    # Assert
+    assert status == "PASS"
+    mock_exec.assert_not_called()
+    session.check.assert_awaited_once_with(["app.py"])
+
+
+@pytest.mark.asyncio
+async def test_module_falls_back_to_cli_when_session_declines(tmp_path: Path):
+    # Arrange
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+    session = AsyncMock()
+    session.name = "Pyright language server"
+    session.check.return_value = None
+    module = PyrightModule("B_Pyright", "Pyright", str(tmp_path), notifier, session=session)
+
+    process = AsyncMock()
+    process.stdout.read.side_effect = [b"0 errors, 0 warnings, 0 informations \n", b""]
+    process.stderr.read.side_effect = [b""]
+    process.wait.return_value = 0
+    process.returncode = 0
+
+    # Act
+    with patch("asyncio.create_subprocess_exec", return_value=process) as mock_exec:
+        status = await module.run(files=["app.py"])
+
+    # Assert
+    assert status == "PASS"
+    mock_exec.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_start_closes_the_server(tmp_path: Path):
+    # Arrange: a server that never answers initialize
+    session = PyrightLanguageServerSession(tmp_path, command=[sys.executable, "-c", "import sys; sys.stdin.read()"])
+    spawned: list[asyncio.subprocess.Process] = []
+    spawn = asyncio.create_subprocess_exec
+
+    async def tracking_spawn(*args: Any, **kwargs: Any) -> asyncio.subprocess.Process:
+        process = await spawn(*args, **kwargs)
+        spawned.append(process)
+        return process
+
+    # Act
+    with patch("asyncio.create_subprocess_exec", tracking_spawn):
+        start = asyncio.create_task(session.start())
+        while not spawned:
+            await asyncio.sleep(0.01)
+        start.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await start
+
+    # Assert
+    assert spawned[0].returncode is not None
+    assert session.client is None
@@ -0,0 +1,71 @@
+import json
+
+from app.modules.analysis.infrastructure.adapters.replay_buffer import ReplayBuffer
+
+
+def test_entries_after_a_sequence_number_are_replayable():
+    # Arrange
+    buffer = ReplayBuffer()
+    buffer.record_message({"type": "GLOBAL_INIT"})
+    buffer.record_stream("B_Ruff", "line\n")
+    buffer.record_message({"type": "GLOBAL_END", "status": "PASS"})
+
+    # Act
+    entries = buffer.since(1)
+
+    # Assert
+    assert entries is not None
+    assert [(e.seq, e.module_id) for e in entries] == [(2, "B_Ruff"), (3, None)]
+    assert entries[1].text == '{"type":"GLOBAL_END","status":"PASS","seq":3}'
+    assert buffer.since(3) == []
+
+
+def test_gaps_outside_the_ring_are_reported():
+    # Arrange
+    buffer = ReplayBuffer(max_messages=100, max_bytes=20)
+
+    # Act
+    for i in range(5):
+        buffer.record_stream("B_Ruff", f"line {i}\n")
+
+    # Assert
+    assert buffer.stats() == {"first_seq": 4, "last_seq": 5, "messages": 2, "bytes": 14}
+    assert buffer.since(2) is None
+    assert buffer.since(3) is not None
+    # A position the server never reached (it restarted since) is a gap too
+    assert buffer.since(9) is None
+
+
+def test_snapshot_tracks_module_state_and_log_tail():
+    # Arrange
+    buffer = ReplayBuffer(log_tail_chars=8)
+    buffer.record_message({"type": "GLOBAL_INIT"})
+    buffer.record_message({"type": "INIT", "module": "B_Ruff"})
+    buffer.record_stream("B_Ruff", "0123456789")
+    buffer.record_message({"type": "END", "module": "B_Ruff", "status": "PASS", "summary": "✅ ok"})
+    buffer.record_message({"type": "GLOBAL_END", "status": "PASS"})
+
+    # Act
+    snapshot = buffer.snapshot_message()
+
+    # Assert
+    assert snapshot == (
+        '{"type":"SNAPSHOT","seq":5,"running":false,"status":"PASS",'
+        '"modules":{"B_Ruff":{"status":"PASS","summary":"✅ ok","metrics":null,"log":"23456789"}},"reports":{}}'
+    )
+
+
+def test_snapshot_keeps_the_last_complete_report_across_runs():
+    # Arrange: deltas of later runs apply to the last complete report, not a partial one
+    buffer = ReplayBuffer()
+    buffer.record_message({"type": "METRICS", "module": "B_Ruff", "data": {"total_issues": {"ERROR": 1}}})
+    buffer.record_message({"type": "GLOBAL_INIT"})
+    buffer.record_message({"type": "INIT", "module": "B_Ruff"})
+
+    # Act
+    buffer.record_message({"type": "METRICS", "module": "B_Ruff", "data": {"total_issues": {}, "partial": True}})
+    snapshot = json.loads(buffer.snapshot_message())
+
+    # Assert
+    assert snapshot["modules"]["B_Ruff"]["metrics"] == {"total_issues": {}, "partial": True}
+    assert snapshot["reports"] == {"B_Ruff": {"total_issues": {"ERROR": 1}}}
@@ -0,0 +1,215 @@
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.analysis.application.engine.base_module import AnalysisModule
+from app.modules.analysis.application.engine.modules import RuffModule, TypeScriptModule
+from app.modules.analysis.domain.ports import AnalysisNotifierPort
+from app.modules.analysis.infrastructure.result_cache import CachedResult, ResultCache
+
+
+class CachedToolModule(AnalysisModule):
+    input_extensions = (".py",)
+    config_files = ("pyproject.toml",)
+
+    def get_command(self, files: list[str] | None = None) -> list[str]:
+        return ["tool", "check", "."]
+
+    def get_summary(self, stdout: str, stderr: str, exit_code: int) -> str:
+        return f"exit {exit_code}"
+
+    async def get_tool_version(self, lockfiles: str = "") -> str | None:
+        return "tool 1.0"
+
+
+def make_process(stdout: bytes, returncode: int) -> MagicMock:
+    process = AsyncMock()
+    process.stdout.read.side_effect = [stdout, b""]
+    process.stderr.read.side_effect = [b""]
+    process.wait.return_value = returncode
+    process.returncode = returncode
+    return process
+
+
+def test_result_cache_roundtrip(tmp_path: Path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    result = CachedResult(exit_code=1, summary="❌ 1 issue", metrics={"total_issues": {}}, stdout="out", stderr="err")
+
+    cache.put("ab" * 32, result)
+
+    assert cache.get("ab" * 32) == result
+    assert cache.get("cd" * 32) is None
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=5000)
+    payload = "x" * 2000
+    for key in ("a" * 64, "b" * 64):
+        cache.put(key, CachedResult(0, "ok", None, payload, ""))
+
+    # Touch "a" so "b" becomes the least recently used entry
+    meta = tmp_path / "cache" / "bb" / ("b" * 64) / "meta.json"
+    os.utime(meta, (1, 1))
+    assert cache.get("a" * 64) is not None
+
+    cache.put("c" * 64, CachedResult(0, "ok", None, payload, ""))
+
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) is not None
+    assert cache.get("c" * 64) is not None
+
+
+def test_file_hasher_memoises_unchanged_files(tmp_path: Path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=1024)
+    source = tmp_path / "main.py"
+    source.write_text("print('a')")
+
+    first = cache.hasher.digest(source)
+    with patch("builtins.open", side_effect=AssertionError("file re-read")):
+        assert cache.hasher.digest(source) == first
+
+    source.write_text("print('changed')")
+    assert cache.hasher.digest(source) != first
+
+
+@pytest.mark.asyncio
+async def test_full_run_replays_cached_result(tmp_path: Path):
+    # Arrange
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "main.py").write_text("import os\n")
+    cache = ResultCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+
+    first = CachedToolModule("B_Tool", "Tool", str(project), notifier, result_cache=cache)
+    with patch("asyncio.create_subprocess_exec", return_value=make_process(b"main.py:1:1: F401 unused\n", 1)):
+        assert await first.run() == "FAIL"
+
+    notifier.reset_mock()
+
+    # Act: same tree, new module instance
+    second = CachedToolModule("B_Tool", "Tool", str(project), notifier, result_cache=cache)
+    with patch("asyncio.create_subprocess_exec") as mock_exec:
+        result = await second.run()
+
+    # Assert
+    assert result == "FAIL"
+    mock_exec.assert_not_called()
+    assert first.ran_tool and not second.ran_tool
+    notifier.send_metrics.assert_called_once()
+    notifier.send_end.assert_called_once_with("B_Tool", "FAIL", "exit 1")
+    streamed = "".join(c.args[1] for c in notifier.send_stream.call_args_list)
+    assert "F401" in streamed
+
+
+@pytest.mark.asyncio
+async def test_changed_input_misses_cache(tmp_path: Path):
+    # Arrange
+    project = tmp_path / "project"
+    project.mkdir()
+    source = project / "main.py"
+    source.write_text("import os\n")
+    cache = ResultCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+
+    module = CachedToolModule("B_Tool", "Tool", str(project), notifier, result_cache=cache)
+    with patch("asyncio.create_subprocess_exec", return_value=make_process(b"", 0)):
+        await module.run()
+
+    source.write_text("import sys\n")
+
+    # Act
+    with patch("asyncio.create_subprocess_exec", return_value=make_process(b"", 0)) as mock_exec:
+        await module.run()
+
+    # Assert
+    mock_exec.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cache_key_covers_lockfiles(tmp_path: Path):
+    # Arrange
+    (tmp_path / "main.py").write_text("import os\n")
+    lockfile = tmp_path / "uv.lock"
+    lockfile.write_text("version = 1\n")
+    cache = ResultCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    module = CachedToolModule("B_Tool", "Tool", str(tmp_path), AsyncMock(spec=AnalysisNotifierPort), result_cache=cache)
+    before = await module.get_cache_key(["tool", "check", "."])
+
+    # Act
+    lockfile.write_text("version = 2\n")
+    after = await module.get_cache_key(["tool", "check", "."])
+
+    # Assert
+    assert before != after
+
+
+@pytest.mark.asyncio
+async def test_tool_version_is_resolved_per_project_and_lockfile_state(tmp_path: Path):
+    # Arrange: each project resolves npx tools from its own node_modules
+    projects = [tmp_path / "one", tmp_path / "two"]
+    for project in projects:
+        project.mkdir()
+        (project / "a.ts").write_text("let a = 1;\n")
+        (project / "package-lock.json").write_text("{}")
+    cache = ResultCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+    modules = [TypeScriptModule("F_TypeScript", "TS", str(p), notifier, result_cache=cache) for p in projects]
+    versions = iter([b"Version 5.0.0", b"Version 5.4.0", b"Version 5.5.0"])
+
+    def version_process(*args: Any, **kwargs: Any) -> AsyncMock:
+        process = AsyncMock()
+        process.communicate.return_value = (next(versions), b"")
+        process.returncode = 0
+        return process
+
+    # Act
+    with patch("asyncio.create_subprocess_exec", side_effect=version_process) as mock_exec:
+        first = await modules[0].get_cache_key(["npx", "tsc"])
+        second = await modules[1].get_cache_key(["npx", "tsc"])
+        repeated = await modules[0].get_cache_key(["npx", "tsc"])
+        (projects[0] / "package-lock.json").write_text('{"typescript": "5.5.0"}')
+        upgraded = await modules[0].get_cache_key(["npx", "tsc"])
+
+    # Assert
+    assert mock_exec.call_count == 3
+    assert len({first, second, upgraded}) == 3
+    assert repeated == first
+
+
+@pytest.mark.asyncio
+async def test_cache_key_follows_tool_excludes(tmp_path: Path):
+    # Arrange: Ruff checks build/ and .github/ (skipped by the watcher) but never .venv/
+    for folder in ("build", ".github", ".venv"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "script.py").write_text("import os\n")
+    cache = ResultCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    module = RuffModule("B_Ruff", "Ruff", str(tmp_path), AsyncMock(spec=AnalysisNotifierPort), result_cache=cache)
+
+    # Act
+    with patch.object(RuffModule, "get_tool_version", AsyncMock(return_value="ruff 0.1")):
+        original = await module.get_cache_key(["ruff", "check", "."])
+        (tmp_path / ".venv" / "script.py").write_text("import sys\n")
+        venv_changed = await module.get_cache_key(["ruff", "check", "."])
+        (tmp_path / "build" / "script.py").write_text("import sys\n")
+        build_changed = await module.get_cache_key(["ruff", "check", "."])
+
+    # Assert
+    assert venv_changed == original
+    assert build_changed != original
+
+
+@pytest.mark.asyncio
+async def test_incremental_run_bypasses_cache(tmp_path: Path):
+    cache = MagicMock(spec=ResultCache)
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+    module = CachedToolModule("B_Tool", "Tool", str(tmp_path), notifier, result_cache=cache)
+
+    with patch("asyncio.create_subprocess_exec", return_value=make_process(b"", 0)):
+        await module.run(files=["main.py"])
+
+    cache.get.assert_not_called()
+    cache.put.assert_not_called()
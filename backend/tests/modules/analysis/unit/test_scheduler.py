@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from app.modules.analysis.application.engine.scheduler import (
+    AnalysisScheduler,
+    ResourceProbe,
+)
+
+
+class FakeProbe(ResourceProbe):
+    def __init__(self, cpus: int = 8, load: float = 0.0, memory_mb: int | None = 8192) -> None:
+        self.cpus = cpus
+        self.load = load
+        self.memory_mb = memory_mb
+
+    def cpu_count(self) -> int:
+        return self.cpus
+
+    def load_average(self) -> float:
+        return self.load
+
+    def available_memory_mb(self) -> int | None:
+        return self.memory_mb
+
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_global_slots():
+    # Arrange
+    scheduler = AnalysisScheduler(max_slots=2, probe=FakeProbe())
+    active = 0
+    peak = 0
+
+    async def job(module_id: str):
+        nonlocal active, peak
+        async with scheduler.slot("p1", module_id, memory_mb=64):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+
+    # Act
+    await asyncio.gather(*(job(f"m{i}") for i in range(6)))
+
+    # Assert
+    assert peak == 2
+    assert scheduler.running == {}
+    assert scheduler.queued == []
+
+
+@pytest.mark.asyncio
+async def test_scheduler_holds_jobs_when_memory_is_short():
+    # Arrange
+    probe = FakeProbe(memory_mb=1000)
+    scheduler = AnalysisScheduler(max_slots=4, memory_reserve_mb=0, probe=probe)
+    first_started = asyncio.Event()
+    release_first = asyncio.Event()
+
+    async def first():
+        async with scheduler.slot("p1", "F_TypeScript", memory_mb=900):
+            first_started.set()
+            await release_first.wait()
+
+    async def second():
+        async with scheduler.slot("p2", "B_Pyright", memory_mb=900):
+            pass
+
+    # Act
+    t1 = asyncio.create_task(first())
+    await first_started.wait()
+    t2 = asyncio.create_task(second())
+    await asyncio.sleep(0.01)
+
+    # Assert: second job waits although a slot is free
+    snapshot = scheduler.snapshot()
+    assert [j["module"] for j in snapshot["running"]] == ["F_TypeScript"]
+    assert [j["module"] for j in snapshot["queued"]] == ["B_Pyright"]
+
+    release_first.set()
+    await asyncio.gather(t1, t2)
+    assert scheduler.queued == []
+
+
+@pytest.mark.asyncio
+async def test_scheduler_always_admits_when_idle():
+    # Arrange: host reports no spare CPU and no memory
+    scheduler = AnalysisScheduler(max_slots=2, probe=FakeProbe(cpus=1, load=4.0, memory_mb=0))
+
+    # Act / Assert: a lone job must not starve
+    async with scheduler.slot("p1", "B_Ruff"):
+        assert len(scheduler.running) == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_cancelled_waiter_leaves_queue():
+    # Arrange
+    scheduler = AnalysisScheduler(max_slots=1, probe=FakeProbe())
+    hold = asyncio.Event()
+
+    async def holder():
+        async with scheduler.slot("p1", "B_Ruff"):
+            await hold.wait()
+
+    async def waiter():
+        async with scheduler.slot("p1", "B_Lizard"):
+            pass
+
+    t1 = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    t2 = asyncio.create_task(waiter())
+    await asyncio.sleep(0)
+    assert len(scheduler.queued) == 1
+
+    # Act
+    t2.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await t2
+
+    # Assert
+    assert scheduler.queued == []
+    hold.set()
+    await t1
+    assert scheduler.running == {}
@@ -1,13 +1,15 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.modules.analysis.domain.entities import Finding, FindingsDelta
 from app.modules.analysis.infrastructure.adapters.scoped_notifier import (
     ScopedAnalysisNotifier,
 )
 from app.modules.analysis.infrastructure.adapters.websocket_notifier import (
     WebSocketNotifier,
 )
+from app.modules.analysis.infrastructure.metrics_store import MetricsStore
 
 
 @pytest.mark.asyncio
@@ -39,6 +41,19 @@ async def test_scoped_notifier_send_global_init():
     mock_notifier.send_update.assert_called_once_with(project_id, {"type": "GLOBAL_INIT"})
 
 
+@pytest.mark.asyncio
+async def test_scoped_notifier_send_global_init_with_eta():
+    # Arrange
+    mock_notifier = AsyncMock(spec=WebSocketNotifier)
+    scoped_notifier = ScopedAnalysisNotifier(mock_notifier, "test_project")
+
+    # Act
+    await scoped_notifier.send_global_init(42.123)
+
+    # Assert
+    mock_notifier.send_update.assert_called_once_with("test_project", {"type": "GLOBAL_INIT", "eta_seconds": 42.1})
+
+
 @pytest.mark.asyncio
 async def test_scoped_notifier_broadcast_raw():
     # Arrange
@@ -67,3 +82,68 @@ async def test_scoped_notifier_send_global_end():
 
     # Assert
     mock_notifier.send_update.assert_called_once_with(project_id, {"type": "GLOBAL_END", "status": status})
+
+
+@pytest.mark.asyncio
+async def test_scoped_notifier_send_stream_leaves_encoding_to_notifier():
+    # Arrange
+    mock_notifier = AsyncMock(spec=WebSocketNotifier)
+    scoped_notifier = ScopedAnalysisNotifier(mock_notifier, "test_project")
+
+    # Act
+    await scoped_notifier.send_stream("mod1", "line\n")
+
+    # Assert
+    mock_notifier.send_stream.assert_called_once_with("test_project", "mod1", "line\n")
+    mock_notifier.send_update.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_scoped_notifier_records_results_in_the_metrics_store():
+    # Arrange
+    mock_notifier = AsyncMock(spec=WebSocketNotifier)
+    metrics_store = MagicMock(spec=MetricsStore)
+    scoped_notifier = ScopedAnalysisNotifier(mock_notifier, "test_project", metrics_store)
+
+    # Act
+    await scoped_notifier.send_metrics("mod1", {"total_issues": {}})
+    await scoped_notifier.send_end("mod1", "PASS", "ok")
+
+    # Assert
+    assert [c.args for c in metrics_store.record.call_args_list] == [
+        ("test_project", {"type": "METRICS", "module": "mod1", "data": {"total_issues": {}}}),
+        ("test_project", {"type": "END", "module": "mod1", "status": "PASS", "summary": "ok"}),
+    ]
+    assert mock_notifier.send_update.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_scoped_notifier_sends_findings_delta():
+    # Arrange
+    mock_notifier = AsyncMock(spec=WebSocketNotifier)
+    scoped_notifier = ScopedAnalysisNotifier(mock_notifier, "p1")
+    delta = FindingsDelta({"fp1": Finding("a.py", 3, 1, "ERROR", "F401", "m")}, ["fp0"], 1)
+
+    # Act
+    await scoped_notifier.send_findings_delta("B_Ruff", delta)
+
+    # Assert
+    message = mock_notifier.send_update.call_args.args[1]
+    assert message["type"] == "FINDINGS_DELTA"
+    assert mock_notifier.send_update.call_args.kwargs == {"deltas": True}
+    assert message["data"]["added"][0]["fingerprint"] == "fp1"
+    assert message["data"]["resolved"] == ["fp0"]
+
+
+@pytest.mark.asyncio
+async def test_scoped_notifier_keeps_incremental_metrics_from_delta_clients():
+    # Arrange
+    mock_notifier = AsyncMock(spec=WebSocketNotifier)
+    scoped_notifier = ScopedAnalysisNotifier(mock_notifier, "p1")
+
+    # Act
+    await scoped_notifier.send_metrics("B_Ruff", {"total_issues": {}})
+    await scoped_notifier.send_metrics("B_Ruff", {"total_issues": {}}, incremental=True)
+
+    # Assert
+    assert [c.kwargs for c in mock_notifier.send_update.call_args_list] == [{}, {"deltas": False}]
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.analysis.application.engine.modules import ESLintModule, PyrightModule, RuffModule
+from app.modules.analysis.application.engine.project_files import balance_shards
+from app.modules.analysis.application.engine.scheduler import AnalysisScheduler, ResourceProbe
+from app.modules.analysis.domain.ports import AnalysisNotifierPort
+
+
+def mock_process(stdout: bytes, returncode: int) -> AsyncMock:
+    process = AsyncMock()
+    process.stdout.read.side_effect = [stdout, b""]
+    process.stderr.read.side_effect = [b""]
+    process.wait.return_value = returncode
+    process.returncode = returncode
+    return process
+
+
+class IdleProbe(ResourceProbe):
+    def cpu_count(self) -> int:
+        return 8
+
+    def load_average(self) -> float:
+        return 0.0
+
+    def available_memory_mb(self) -> int | None:
+        return 8192
+
+
+@pytest.fixture
+def notifier() -> AsyncMock:
+    return AsyncMock(spec=AnalysisNotifierPort)
+
+
+def test_balance_shards_puts_heaviest_items_on_lightest_shard():
+    shards = balance_shards([(1, "d"), (9, "a"), (5, "b"), (4, "c")], 2)
+
+    assert sorted(shards) == [["a", "d"], ["b", "c"]]
+
+
+def test_large_file_lists_are_chunked(tmp_path: Path, notifier: AsyncMock, monkeypatch: pytest.MonkeyPatch):
+    # Arrange
+    (tmp_path / "pyproject.toml").write_text("")
+    monkeypatch.setattr(RuffModule, "max_shard_files", 2)
+    module = RuffModule("B_Ruff", "Ruff", str(tmp_path), notifier)
+    files = ["a.py", "b.py", "README.md", "c.py"]
+
+    # Act
+    commands = module._plan_file_shards(module.get_command(files), files)
+
+    # Assert
+    assert commands == [
+        ["ruff", "check", "--force-exclude", "--output-format", "concise", "a.py", "b.py"],
+        ["ruff", "check", "--force-exclude", "--output-format", "concise", "c.py"],
+    ]
+
+
+def test_full_scan_is_split_by_directory_weight(tmp_path: Path, notifier: AsyncMock):
+    # Arrange
+    (tmp_path / "pyproject.toml").write_text("")
+    for name, count in {"big": 3, "small": 1, "tiny": 1}.items():
+        (tmp_path / name).mkdir()
+        for i in range(count):
+            (tmp_path / name / f"m{i}.py").write_text("")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "vendor.py").write_text("")
+    (tmp_path / "setup.py").write_text("")
+    module = RuffModule("B_Ruff", "Ruff", str(tmp_path), notifier, scheduler=AnalysisScheduler(max_slots=2))
+
+    # Act
+    commands = module._plan_directory_shards(["ruff", "check", "."])
+
+    # Assert
+    assert sorted(commands) == [["ruff", "check", "big"], ["ruff", "check", "setup.py", "small", "tiny"]]
+
+
+@pytest.mark.skipif(shutil.which("ruff") is None, reason="ruff not installed")
+def test_ruff_shards_respect_config_excludes(tmp_path: Path, notifier: AsyncMock):
+    # Arrange
+    (tmp_path / "pyproject.toml").write_text('[tool.ruff]\nextend-exclude = ["generated"]\n')
+    for name in ("generated", "src"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "module.py").write_text("import os\n")
+    module = RuffModule("B_Ruff", "Ruff", str(tmp_path), notifier, scheduler=AnalysisScheduler(max_slots=2))
+    commands = module._plan_directory_shards(module.get_command())
+
+    # Act
+    outputs = [subprocess.run(cmd, cwd=tmp_path, capture_output=True, text=True).stdout for cmd in commands]
+
+    # Assert
+    assert len(commands) == 2
+    assert "src/module.py" in "".join(outputs)
+    assert "generated" not in "".join(outputs)
+
+
+@pytest.mark.asyncio
+async def test_shards_run_concurrently_and_merge(tmp_path: Path, notifier: AsyncMock):
+    # Arrange
+    scheduler = AnalysisScheduler(max_slots=4, probe=IdleProbe())
+    module = RuffModule("B_Ruff", "Ruff", str(tmp_path), notifier, scheduler=scheduler)
+    processes = [
+        mock_process(b"a.py:1:1: F401 unused\nFound 1 error.\n[*] 1 fixable with the `--fix` option.\n", 1),
+        mock_process(b"All checks passed!\n", 0),
+        mock_process(b"c.py:2:1: E711 comparison\nFound 1 error.\n", 1),
+    ]
+
+    # Act
+    with patch("asyncio.create_subprocess_exec", side_effect=processes):
+        stdout, _, exit_code = await module.run_shards([["ruff", "a.py"], ["ruff", "b.py"], ["ruff", "c.py"]])
+
+    # Assert
+    assert exit_code == 1
+    assert stdout.splitlines() == [
+        "a.py:1:1: F401 unused",
+        "c.py:2:1: E711 comparison",
+        "Found 2 errors.",
+        "[*] 1 fixable with the `--fix` option.",
+    ]
+    assert scheduler.running == {}
+    notifier.send_log.assert_any_call("B_Ruff", "🧩 Split into 3 shards on 3 slot(s)")
+
+
+@pytest.mark.asyncio
+async def test_interleaved_shard_output_is_parsed_per_shard(tmp_path: Path, notifier: AsyncMock):
+    # Arrange: shard b reports a finding between shard a's finding and its continuation line
+    scheduler = AnalysisScheduler(max_slots=2, probe=IdleProbe())
+    module = PyrightModule("B_Pyright", "Pyright", str(tmp_path), notifier, scheduler=scheduler)
+
+    def paced_process(chunks: list[tuple[float, bytes]]) -> AsyncMock:
+        async def read(n: int) -> bytes:
+            delay, chunk = chunks.pop(0)
+            await asyncio.sleep(delay)
+            return chunk
+
+        process = mock_process(b"", 1)
+        process.stdout.read.side_effect = read
+        return process
+
+    processes = [
+        paced_process([(0, b"  a.py:1:1 - error: bad\n"), (0.05, b"    detail (reportArgumentType)\n"), (0, b"")]),
+        paced_process([(0.02, b"  b.py:2:1 - error: worse (reportCallIssue)\n"), (0, b"")]),
+    ]
+
+    # Act
+    shards = [["pyright", "a.py"], ["pyright", "b.py"]]
+    with (
+        patch("asyncio.create_subprocess_exec", side_effect=processes),
+        patch.object(module, "plan_shards", AsyncMock(return_value=shards)),
+    ):
+        stdout, stderr, _ = await module.run_command(["pyright", "a.py", "b.py"], ["a.py", "b.py"])
+    findings = module.build_findings(stdout, stderr)
+
+    # Assert
+    assert [(f.file, f.rule, f.message) for f in findings] == [
+        ("a.py", "reportArgumentType", "bad\ndetail"),
+        ("b.py", "reportCallIssue", "worse"),
+    ]
+
+
+def test_eslint_and_pyright_outputs_merge_like_one_run(tmp_path: Path, notifier: AsyncMock):
+    eslint = ESLintModule("F_ESLint", "ESLint", str(tmp_path), notifier)
+    pyright = PyrightModule("B_Pyright", "Pyright", str(tmp_path), notifier)
+
+    merged_eslint = eslint.merge_shard_outputs(
+        [json.dumps([{"filePath": "a.ts"}]), "", json.dumps([{"filePath": "b.ts"}])]
+    )
+    merged_pyright = pyright.merge_shard_outputs(
+        [
+            "  a.py:1:1 - error: bad\n1 error, 0 warnings, 0 informations \n",
+            "0 errors, 2 warnings, 1 information \n",
+        ]
+    )
+
+    assert [r["filePath"] for r in json.loads(merged_eslint)] == ["a.ts", "b.ts"]
+    assert merged_pyright.splitlines() == ["  a.py:1:1 - error: bad", "1 errors, 2 warnings, 1 informations "]
+
+
+def test_try_acquire_never_overtakes_the_queue():
+    # Arrange
+    scheduler = AnalysisScheduler(max_slots=1)
+
+    # Act
+    job = scheduler.try_acquire("p1", "m#shard")
+    second = scheduler.try_acquire("p1", "m#shard")
+    assert job is not None
+    scheduler.release(job)
+    scheduler.queued.append(MagicMock())
+    blocked = scheduler.try_acquire("p1", "m#shard")
+
+    # Assert
+    assert second is None
+    assert blocked is None
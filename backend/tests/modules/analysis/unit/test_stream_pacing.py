@@ -0,0 +1,39 @@
+from app.modules.analysis.infrastructure.adapters.stream_subscriber import StreamPacer
+
+
+def test_fast_local_client_gets_quick_light_batches():
+    # Arrange
+    pacer = StreamPacer(latency_budget=0.02)
+
+    # Act
+    for _ in range(5):
+        pacer.record_send(64 * 1024, 0.001)
+
+    # Assert
+    assert pacer.flush_interval <= 0.02
+    assert pacer.compression_level == 1
+    assert pacer.flush_bytes > 64 * 1024
+
+
+def test_slow_link_gets_large_strongly_compressed_batches():
+    # Arrange
+    pacer = StreamPacer(latency_budget=1.0)
+
+    # Act
+    for _ in range(5):
+        pacer.record_send(32 * 1024, 0.4)
+
+    # Assert
+    assert 0.5 < pacer.flush_interval < 1.0
+    assert pacer.compression_level == 9
+    # About as much as the link carries in one flush interval
+    assert 40 * 1024 < pacer.flush_bytes < 80 * 1024
+
+
+def test_link_slower_than_the_budget_still_batches():
+    pacer = StreamPacer(latency_budget=0.1)
+
+    pacer.record_send(8 * 1024, 0.5)
+
+    assert pacer.flush_interval == 0.025
+    assert pacer.snapshot()["send_latency_ms"] == 500.0
@@ -1,10 +1,12 @@
 import asyncio
 import time
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from app.modules.analysis.application.engine.base_module import AnalysisModule
+from app.modules.analysis.application.engine.findings_store import ProjectFindingsStore
 from app.modules.analysis.domain.ports import AnalysisNotifierPort
 
 
@@ -88,3 +90,53 @@ async def test_io_decoupling_architecture():
     # So reads will be spaced out.
 
     assert read_duration < 0.2, f"Reads took too long ({read_duration}s), indicating coupling with sender."
+
+
+@pytest.mark.asyncio
+async def test_partial_metrics_are_sent_while_the_tool_runs():
+    # Arrange
+    mock_notifier = AsyncMock(spec=AnalysisNotifierPort)
+    module = MockModule("test_partial", "Test Module", "/tmp", mock_notifier)
+    chunks = [b"a.py:1:1: error: first\n", b"a.py:2:1: error: second\n", b""]
+
+    async def slow_read(n: int) -> bytes:
+        await asyncio.sleep(0.05)
+        return chunks.pop(0)
+
+    mock_process = AsyncMock()
+    mock_process.stdout.read.side_effect = slow_read
+    mock_process.stderr.read.side_effect = [b""]
+    mock_process.wait.return_value = 1
+    mock_process.returncode = 1
+
+    # Act
+    with (
+        patch("asyncio.create_subprocess_exec", return_value=mock_process),
+        patch("app.modules.analysis.application.engine.base_module.PARTIAL_METRICS_INTERVAL", 0.02),
+    ):
+        await module.run()
+
+    # Assert
+    reports = [c.args[1] for c in mock_notifier.send_metrics.call_args_list]
+    assert reports[0]["partial"] is True
+    assert reports[0]["total_issues"]["ERROR"] == 1
+    assert "partial" not in reports[-1]
+    assert reports[-1]["total_issues"]["ERROR"] == 2
+
+
+@pytest.mark.asyncio
+async def test_partial_metrics_leave_the_findings_store_untouched():
+    # Arrange
+    mock_notifier = AsyncMock(spec=AnalysisNotifierPort)
+    findings_store = AsyncMock(spec=ProjectFindingsStore)
+    module = MockModule("test_partial", "Test Module", "/tmp", mock_notifier, findings_store=findings_store)
+    snapshot: dict[str, Any] = {"total_issues": {"ERROR": 1, "WARNING": 0, "INFO": 0, "COMPLEXITY": 0}, "modules": []}
+
+    # Act
+    await module.publish_metrics(snapshot, None, partial=True)
+
+    # Assert: only the final report of a run replaces the module's findings
+    findings_store.merge.assert_not_awaited()
+    mock_notifier.send_metrics.assert_awaited_once_with(
+        "test_partial", {**snapshot, "partial": True}, incremental=False
+    )
@@ -0,0 +1,160 @@
+import json
+import pickle
+
+from app.modules.analysis.domain.entities import Finding
+from app.modules.analysis.infrastructure.log_parser import GenericParser, create_parser
+from app.modules.analysis.infrastructure.tool_parsers import (
+    ESLintParser,
+    LizardParser,
+    PyrightParser,
+    RuffParser,
+    TscParser,
+    build_report,
+)
+
+
+def test_ruff_concise_and_full_layouts_give_the_same_findings():
+    # Arrange
+    concise = (
+        "app/main.py:3:8: F401 [*] `os` imported but unused\nFound 1 error.\n[*] 1 fixable with the `--fix` option.\n"
+    )
+    full = (
+        "F401 [*] `os` imported but unused\n"
+        " --> app/main.py:3:8\n"
+        "  |\n"
+        "3 | import os\n"
+        "  |        ^^\n"
+        "  |\n"
+        "Found 1 error.\n"
+    )
+
+    # Act
+    from_concise = RuffParser().parse(concise)
+    from_full = RuffParser().parse(full)
+
+    # Assert
+    assert from_concise == from_full == [Finding("app/main.py", 3, 8, "ERROR", "F401", "`os` imported but unused")]
+
+
+def test_ruff_severity_follows_the_rule_prefix():
+    # Act
+    findings = RuffParser().parse("a.py:1:1: W291 Trailing whitespace\na.py:2:1: I001 Import block is un-sorted\n")
+
+    # Assert
+    assert [f.severity for f in findings] == ["WARNING", "INFO"]
+
+
+def test_pyright_folds_continuation_lines_and_reads_the_rule():
+    # Arrange
+    log = (
+        "/p/app/main.py\n"
+        '  /p/app/main.py:4:12 - error: Argument of type "str" cannot be assigned\n'
+        '    "str" is not assignable to "int" (reportArgumentType)\n'
+        "  /p/app/main.py:9:1 - warning: Import cycle (reportImportCycles)\n"
+        "1 error, 1 warning, 0 informations\n"
+    )
+
+    # Act
+    findings = PyrightParser().parse(log)
+
+    # Assert
+    assert [(f.line, f.severity, f.rule) for f in findings] == [
+        (4, "ERROR", "reportArgumentType"),
+        (9, "WARNING", "reportImportCycles"),
+    ]
+    assert findings[0].message == 'Argument of type "str" cannot be assigned\n"str" is not assignable to "int"'
+
+
+def test_tsc_appends_elaborations_to_the_previous_error():
+    # Arrange
+    log = (
+        "src/a.ts(3,7): error TS2322: Type 'string' is not assignable to type 'number'.\n"
+        "  Property 'x' is missing.\n"
+        "Found 1 error in src/a.ts:3\n"
+    )
+
+    # Act
+    findings = TscParser().parse(log)
+
+    # Assert
+    assert len(findings) == 1
+    assert (findings[0].file, findings[0].line, findings[0].column, findings[0].rule) == ("src/a.ts", 3, 7, "TS2322")
+    assert findings[0].message.endswith("\nProperty 'x' is missing.")
+
+
+def test_eslint_json_documents_are_counted():
+    # Arrange
+    document = [
+        {
+            "filePath": "/p/src/a.tsx",
+            "messages": [
+                {"ruleId": "no-unused-vars", "severity": 2, "message": "x is unused", "line": 2, "column": 7},
+                {"ruleId": "eqeqeq", "severity": 1, "message": "Expected ===", "line": 5, "column": 9},
+            ],
+        }
+    ]
+
+    # Act
+    findings = ESLintParser().parse(f"> eslint\n{json.dumps(document)}\n")
+
+    # Assert
+    assert [(f.severity, f.rule) for f in findings] == [("ERROR", "no-unused-vars"), ("WARNING", "eqeqeq")]
+
+
+def test_lizard_warnings_become_complexity_findings():
+    # Act
+    findings = LizardParser().parse(
+        "core/complex.py:12: warning: handle has 40 NLOC, 18 CCN, 200 token, 2 PARAM, 50 length\n"
+    )
+
+    # Assert
+    assert findings == [Finding("core/complex.py", 12, None, "COMPLEXITY", "CCN", "handle has 18 CCN", 18)]
+
+
+def test_report_is_derived_from_findings():
+    # Arrange
+    findings = [
+        Finding("b.py", 1, 1, "ERROR", "F401", "m"),
+        Finding("a.py", 2, None, "COMPLEXITY", "CCN", "f has 20 CCN", 20),
+        Finding("b.py", 3, 1, "WARNING", "W291", "m"),
+        Finding("a.py", 9, None, "COMPLEXITY", "CCN", "g has 16 CCN", 16),
+    ]
+
+    # Act
+    report = build_report(findings)
+
+    # Assert
+    assert report["total_issues"] == {"ERROR": 1, "WARNING": 1, "INFO": 0, "COMPLEXITY": 2}
+    assert report["modules"] == [
+        {
+            "file": "b.py",
+            "metrics": {"ERROR": 1, "WARNING": 1, "INFO": 0},
+            "complexity_metrics": {"COMPLEXITY": 0, "MAX_CCN": 0},
+        },
+        {
+            "file": "a.py",
+            "metrics": {"ERROR": 0, "WARNING": 0, "INFO": 0},
+            "complexity_metrics": {"COMPLEXITY": 2, "MAX_CCN": 20},
+        },
+    ]
+
+
+def test_unknown_tools_fall_back_to_the_generic_parser():
+    # Act
+    parser = create_parser("X_Custom")
+
+    # Assert
+    assert isinstance(parser, GenericParser)
+    assert isinstance(create_parser("B_Ruff"), RuffParser)
+
+
+def test_findings_survive_a_trip_to_a_worker_process():
+    # Arrange
+    finding = Finding("app/main.py", 3, 8, "ERROR", "F401", "m")
+
+    # Act
+    copy = pickle.loads(pickle.dumps(finding))
+
+    # Assert
+    assert copy == finding
+    assert copy.file is finding.file
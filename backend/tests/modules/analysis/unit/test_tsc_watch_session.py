@@ -0,0 +1,98 @@
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from app.modules.analysis.application.engine.tsc_watch_session import TscWatchSession, find_tsconfig_project
+
+# Mimics `tsc --watch --pretty false`: one pass at start, one more whenever app.ts changes
+FAKE_TSC_WATCH = textwrap.dedent(
+    """
+    import os, sys, time
+
+    def compile_pass(kind):
+        print(f"10:00:00 AM - {kind}...", flush=True)
+        text = open("app.ts").read()
+        errors = [i for i, line in enumerate(text.splitlines(), 1) if "bad" in line]
+        for i in errors:
+            print(f"app.ts({i},7): error TS2304: Cannot find name 'bad'.", flush=True)
+        print(f"10:00:01 AM - Found {len(errors)} error{'' if len(errors) == 1 else 's'}. "
+              "Watching for file changes.", flush=True)
+
+    compile_pass("Starting compilation in watch mode")
+    seen = os.stat("app.ts").st_mtime_ns
+    while True:
+        time.sleep(0.02)
+        mtime = os.stat("app.ts").st_mtime_ns
+        if mtime != seen:
+            seen = mtime
+            compile_pass("File change detected. Starting incremental compilation")
+    """
+)
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "tsconfig.json").write_text("{}")
+    (tmp_path / "app.ts").write_text("const x = bad;\n")
+    (tmp_path / "fake_tsc.py").write_text(FAKE_TSC_WATCH)
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_first_cycle_is_reported_like_the_cli(project: Path):
+    # Arrange
+    session = TscWatchSession(project, command=[sys.executable, "fake_tsc.py"])
+
+    try:
+        # Act
+        output = await session.check(["app.ts"])
+    finally:
+        await session.stop()
+
+    # Assert
+    assert output is not None
+    assert output.stdout == "app.ts(1,7): error TS2304: Cannot find name 'bad'.\n"
+    assert output.exit_code == 1
+
+
+@pytest.mark.asyncio
+async def test_save_waits_for_the_recheck_that_saw_it(project: Path):
+    # Arrange
+    session = TscWatchSession(project, command=[sys.executable, "fake_tsc.py"])
+
+    try:
+        await session.check(["app.ts"])
+
+        # Act: fix the error; the stale first cycle must not be reused
+        time.sleep(0.05)
+        (project / "app.ts").write_text("const x = 1;\n")
+        output = await session.check(["app.ts"])
+    finally:
+        await session.stop()
+
+    # Assert
+    assert output is not None
+    assert output.stdout == ""
+    assert output.exit_code == 0
+    assert len(session.cycles) == 2
+
+
+@pytest.mark.asyncio
+async def test_crashed_watcher_falls_back(project: Path):
+    session = TscWatchSession(project, command=[sys.executable, "-c", "raise SystemExit(1)"])
+
+    assert await session.check(["app.ts"]) is None
+
+
+def test_find_tsconfig_project(tmp_path: Path):
+    assert find_tsconfig_project(tmp_path) is None
+
+    (tmp_path / "frontend").mkdir()
+    (tmp_path / "frontend" / "tsconfig.json").write_text("{}")
+    assert find_tsconfig_project(tmp_path) == "frontend"
+
+    (tmp_path / "tsconfig.json").write_text("{}")
+    assert find_tsconfig_project(tmp_path) == "."
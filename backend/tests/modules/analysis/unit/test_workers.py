@@ -0,0 +1,214 @@
+import json
+import sys
+import textwrap
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.analysis.application.engine import workers
+from app.modules.analysis.application.engine.modules import ESLintModule
+from app.modules.analysis.application.engine.workers import WorkerError, WorkerPool, WorkerTimeoutError
+from app.modules.analysis.domain.ports import AnalysisNotifierPort
+
+FAKE_WORKER = textwrap.dedent(
+    """
+    import json, os, sys, time
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        method = request["method"]
+        if method == "crash":
+            sys.exit(1)
+        if method == "hang":
+            time.sleep(60)
+        if method == "ping":
+            result = "pong"
+        elif method == "pid":
+            result = os.getpid()
+        else:
+            print(json.dumps({"id": request["id"], "error": "unknown method"}), flush=True)
+            continue
+        print(json.dumps({"id": request["id"], "result": result}), flush=True)
+    """
+)
+
+
+@pytest.fixture
+def worker_command(tmp_path: Path) -> list[str]:
+    script = tmp_path / "fake_worker.py"
+    script.write_text(FAKE_WORKER)
+    return [sys.executable, str(script)]
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_worker_per_project_and_tool(tmp_path: Path, worker_command: list[str]):
+    # Arrange
+    pool = WorkerPool()
+
+    try:
+        # Act
+        first = await pool.acquire(tmp_path, "F_ESLint", worker_command)
+        second = await pool.acquire(tmp_path, "F_ESLint", worker_command)
+        pid = await second.request("pid", {}, timeout=5)
+    finally:
+        await pool.shutdown()
+
+    # Assert
+    assert first is second
+    assert pid == first.pid
+
+
+@pytest.mark.asyncio
+async def test_crashed_worker_is_restarted(tmp_path: Path, worker_command: list[str]):
+    # Arrange
+    pool = WorkerPool()
+    worker = await pool.acquire(tmp_path, "F_ESLint", worker_command)
+
+    try:
+        # Act
+        with pytest.raises(WorkerError):
+            await worker.request("crash", {}, timeout=5)
+        replacement = await pool.acquire(tmp_path, "F_ESLint", worker_command)
+
+        # Assert
+        assert replacement is not worker
+        assert await replacement.request("pid", {}, timeout=5) == replacement.pid
+    finally:
+        await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_worker_is_retired(tmp_path: Path, worker_command: list[str]):
+    # Arrange
+    pool = WorkerPool()
+    worker = await pool.acquire(tmp_path, "F_ESLint", worker_command)
+
+    try:
+        # Act
+        with pytest.raises(WorkerTimeoutError):
+            await worker.request("hang", {}, timeout=0.2)
+        await pool.retire(tmp_path, "F_ESLint", worker)
+        replacement = await pool.acquire(tmp_path, "F_ESLint", worker_command)
+
+        # Assert
+        assert not worker.is_alive
+        assert replacement is not worker
+        assert len(pool._restarts[(str(tmp_path), "F_ESLint")]) == 1  # pyright: ignore[reportPrivateUsage]
+    finally:
+        await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_restart_budget_stops_crash_loops(tmp_path: Path):
+    pool = WorkerPool()
+    broken = [sys.executable, "-c", "raise SystemExit(1)"]
+
+    for _ in range(workers.MAX_RESTARTS):
+        with pytest.raises(WorkerError):
+            await pool.acquire(tmp_path, "F_ESLint", broken)
+
+    with pytest.raises(WorkerError, match="not restarting"):
+        await pool.acquire(tmp_path, "F_ESLint", broken)
+
+
+@pytest.mark.asyncio
+async def test_idle_workers_are_shut_down(tmp_path: Path, worker_command: list[str]):
+    # Arrange
+    pool = WorkerPool(idle_seconds=0)
+    worker = await pool.acquire(tmp_path, "F_ESLint", worker_command)
+
+    # Act
+    stopped = await pool.shutdown_idle()
+
+    # Assert
+    assert stopped == 1
+    assert not worker.is_alive
+    assert pool.snapshot() == []
+
+
+def eslint_project(tmp_path: Path) -> Path:
+    (tmp_path / ".eslintrc.json").write_text("{}")
+    (tmp_path / "src").mkdir()
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_eslint_served_by_worker(tmp_path: Path):
+    # Arrange
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+    worker = MagicMock(pid=4242)
+    worker.request = AsyncMock(return_value=[{"filePath": "/p/src/a.ts", "errorCount": 1, "warningCount": 0}])
+    pool = MagicMock()
+    pool.acquire = AsyncMock(return_value=worker)
+    module = ESLintModule("F_ESLint", "ESLint", str(eslint_project(tmp_path)), notifier, worker_pool=pool)
+
+    # Act
+    with patch("shutil.which", return_value="/usr/bin/node"), patch("asyncio.create_subprocess_exec") as mock_exec:
+        status = await module.run(files=["src/a.ts"])
+
+    # Assert
+    assert status == "FAIL"
+    mock_exec.assert_not_called()
+    method, params = worker.request.call_args.args
+    assert method == "lint"
+    assert params["patterns"] == ["src/a.ts"]
+    assert params["cwd"] == str(tmp_path.resolve())
+    notifier.send_end.assert_called_once()
+    assert notifier.send_end.call_args.args[1] == "FAIL"
+
+
+@pytest.mark.asyncio
+async def test_eslint_falls_back_to_cli_when_worker_fails(tmp_path: Path):
+    # Arrange
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+    pool = MagicMock()
+    pool.acquire = AsyncMock(side_effect=WorkerError("cannot start node"))
+    module = ESLintModule("F_ESLint", "ESLint", str(eslint_project(tmp_path)), notifier, worker_pool=pool)
+
+    process = AsyncMock()
+    process.stdout.read.side_effect = [json.dumps([]).encode(), b""]
+    process.stderr.read.side_effect = [b""]
+    process.wait.return_value = 0
+    process.returncode = 0
+
+    # Act
+    with (
+        patch("shutil.which", return_value="/usr/bin/node"),
+        patch("asyncio.create_subprocess_exec", return_value=process) as mock_exec,
+    ):
+        status = await module.run(files=["src/a.ts"])
+
+    # Assert
+    assert status == "PASS"
+    mock_exec.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_eslint_retires_worker_after_timeout(tmp_path: Path):
+    # Arrange
+    notifier = AsyncMock(spec=AnalysisNotifierPort)
+    worker = MagicMock(pid=4242)
+    worker.request = AsyncMock(side_effect=WorkerTimeoutError("lint timed out after 300s"))
+    pool = MagicMock()
+    pool.acquire = AsyncMock(return_value=worker)
+    pool.retire = AsyncMock()
+    module = ESLintModule("F_ESLint", "ESLint", str(eslint_project(tmp_path)), notifier, worker_pool=pool)
+
+    process = AsyncMock()
+    process.stdout.read.side_effect = [json.dumps([]).encode(), b""]
+    process.stderr.read.side_effect = [b""]
+    process.wait.return_value = 0
+    process.returncode = 0
+
+    # Act
+    with (
+        patch("shutil.which", return_value="/usr/bin/node"),
+        patch("asyncio.create_subprocess_exec", return_value=process) as mock_exec,
+    ):
+        status = await module.run(files=["src/a.ts"])
+
+    # Assert
+    assert status == "PASS"
+    mock_exec.assert_called_once()
+    pool.retire.assert_awaited_once_with(module.project_path, "F_ESLint", worker)
@@ -22,11 +22,17 @@ export {
   handleInitMessage,
   handleEndMessage,
   handleMetricsMessage,
+  handleSnapshotModule,
+  applySnapshot,
   decompressGzipBase64,
   handleCompressedStream,
+  decodeStreamFrame,
+  DeflateStreamDecoder,
+  DEFLATE_STREAM_PROTOCOL,
 } from "./messageHandlers";
 export type {
   WebSocketMessage,
   ModuleLogState,
   MessageHandlerContext,
+  SnapshotModule,
 } from "./messageHandlers";
@@ -1,4 +1,4 @@
-import { AnalysisState, ModuleLogs } from "../types";
+import { AnalysisState, Metrics, ModuleLogs } from "../types";
 
 // ==========================================
 // TYPES
@@ -15,6 +15,36 @@ export interface WebSocketMessage {
   status?: string;
   summary?: string;
   encoding?: string;
+  seq?: number;
+  running?: boolean;
+  modules?: Record<string, SnapshotModule>;
+  reports?: Record<string, Metrics>;
+}
+
+/** METRICS data; partial while the tool is still running */
+export type ReportData = Metrics & { partial?: boolean };
+
+/** Changed rows of a module's METRICS report, sent with FINDINGS_DELTA for incremental runs */
+export interface MetricsChanges {
+  total_issues: Metrics["total_issues"];
+  modules: Metrics["modules"];
+  removed: string[];
+}
+
+/** Data of a FINDINGS_DELTA message */
+export interface FindingsDelta {
+  added: unknown[];
+  resolved: string[];
+  total: number;
+  metrics?: MetricsChanges;
+}
+
+/** Module state inside a SNAPSHOT message */
+export interface SnapshotModule {
+  status: string;
+  summary: string | null;
+  metrics: unknown;
+  log: string;
 }
 
 export interface ModuleLogState {
@@ -37,6 +67,16 @@ export interface MessageHandlerContext {
     setOverallStatus: (status: string) => void;
   };
   getCurrentModuleLog: (moduleId: string) => ModuleLogState;
+  /**
+   * Called with the sequence number of every sequenced message (resume position);
+   * reset is set for a SNAPSHOT, whose seq replaces the position (the server may have restarted)
+   */
+  onSequence?: (seq: number, reset?: boolean) => void;
+  /**
+   * Last complete METRICS report per module, kept across runs: FINDINGS_DELTA messages
+   * (sent instead of the full report of an incremental run) are applied to it
+   */
+  reports?: Map<string, Metrics>;
 }
 
 // ==========================================
@@ -191,6 +231,55 @@ export function handleEndMessage(
   };
 }
 
+/**
+ * Module state restored from a SNAPSHOT message
+ */
+export function handleSnapshotModule(
+  module: SnapshotModule,
+): Partial<ModuleLogState> {
+  const status =
+    module.status === "RUNNING" || module.status === "PENDING"
+      ? module.status
+      : mapToModuleStatus(module.status || "");
+  return {
+    status,
+    summary: module.summary ?? undefined,
+    metrics: module.metrics ?? undefined,
+    fullLog: module.log,
+    logs: module.log.split("\n").filter(Boolean).slice(-10),
+  };
+}
+
+/**
+ * Replace all module state with a SNAPSHOT (sent when a reconnect gap is too old to replay)
+ */
+export function applySnapshot(
+  data: WebSocketMessage,
+  state: MessageHandlerContext["state"],
+  reports?: Map<string, Metrics>,
+): void {
+  const modules = Object.entries(data.modules || {});
+  if (!data.running && modules.length === 0) {
+    return; // The server has nothing yet (e.g. it restarted): keep what is shown
+  }
+  state.resetLogs();
+  if (reports) {
+    reports.clear();
+    for (const [moduleId, report] of Object.entries(data.reports || {})) {
+      reports.set(moduleId, report);
+    }
+  }
+  for (const [moduleId, module] of modules) {
+    state.updateModuleLog(moduleId, handleSnapshotModule(module));
+  }
+  state.setIsAnalyzing(Boolean(data.running));
+  if (data.running) {
+    state.setOverallStatus("RUNNING");
+  } else if (data.status) {
+    state.setOverallStatus(mapToOverallStatus(data.status));
+  }
+}
+
 /**
  * Handle METRICS type messages
  */
@@ -200,6 +289,43 @@ export function handleMetricsMessage(
   return { metrics: data.data };
 }
 
+/**
+ * Apply the changed rows of an incremental run to the module's previous report
+ */
+export function applyMetricsChanges(
+  report: Metrics | undefined,
+  changes: MetricsChanges,
+): Metrics {
+  const rows = new Map((report?.modules ?? []).map((row) => [row.file, row]));
+  for (const file of changes.removed) {
+    rows.delete(file);
+  }
+  for (const row of changes.modules) {
+    rows.set(row.file, row);
+  }
+  return {
+    total_issues: changes.total_issues,
+    modules: [...rows.values()].sort((a, b) => (a.file < b.file ? -1 : 1)),
+  };
+}
+
+/**
+ * Handle FINDINGS_DELTA type messages: patch the module's last complete report
+ */
+export function handleFindingsDelta(
+  data: WebSocketMessage,
+  moduleId: string,
+  reports: Map<string, Metrics>,
+): Partial<ModuleLogState> | null {
+  const delta = data.data as unknown as FindingsDelta | undefined;
+  if (!delta?.metrics) {
+    return null; // A full run: its METRICS came as well
+  }
+  const report = applyMetricsChanges(reports.get(moduleId), delta.metrics);
+  reports.set(moduleId, report);
+  return { metrics: report };
+}
+
 // ==========================================
 // DECOMPRESSION HANDLER (Async)
 // ==========================================
@@ -256,6 +382,128 @@ export async function handleCompressedStream(
   }
 }
 
+// ==========================================
+// BINARY STREAM FRAMES (deflate)
+// ==========================================
+
+/** WebSocket subprotocol asking the server for binary deflate STREAM frames */
+export const DEFLATE_STREAM_PROTOCOL = "qg.stream.deflate.v2";
+
+const FRAME_STREAM = 0x01;
+
+/**
+ * Split a binary STREAM frame: type byte, module id length byte, module id,
+ * 4-byte big-endian sequence number, 4-byte big-endian uncompressed length, deflate bytes
+ */
+export function decodeStreamFrame(frame: ArrayBuffer): {
+  moduleId: string;
+  seq: number;
+  rawLength: number;
+  payload: Uint8Array;
+} | null {
+  const bytes = new Uint8Array(frame);
+  if (bytes.length < 2 || bytes[0] !== FRAME_STREAM) {
+    return null;
+  }
+  const end = 2 + bytes[1];
+  const view = new DataView(frame);
+  return {
+    moduleId: new TextDecoder().decode(bytes.subarray(2, end)),
+    seq: view.getUint32(end),
+    rawLength: view.getUint32(end + 4),
+    payload: bytes.slice(end + 8),
+  };
+}
+
+interface InflateStream {
+  writer: WritableStreamDefaultWriter<Uint8Array>;
+  reader: ReadableStreamDefaultReader<Uint8Array>;
+  text: TextDecoder;
+}
+
+/**
+ * Inflates the per-module deflate streams of one connection.
+ * The server keeps one compressor per module for the connection's lifetime,
+ * so each module needs one long-lived decompressor on this side.
+ */
+export class DeflateStreamDecoder {
+  private streams = new Map<string, InflateStream>();
+  private queue: Promise<void> = Promise.resolve();
+  private closed = false;
+
+  constructor(
+    private onText: (moduleId: string, text: string) => void,
+    private onSequence?: (seq: number) => void,
+  ) {}
+
+  /**
+   * Inflate a frame and hand its text to onText. Frames are inflated one at a time in
+   * arrival order; the promise settles once this frame's text has been delivered.
+   */
+  handleFrame(frame: ArrayBuffer): Promise<boolean> {
+    const decoded = decodeStreamFrame(frame);
+    if (!decoded) {
+      return Promise.resolve(false);
+    }
+    this.onSequence?.(decoded.seq);
+    const done = this.queue.then(() =>
+      this.inflate(decoded.moduleId, decoded.payload, decoded.rawLength),
+    );
+    this.queue = done;
+    return done.then(() => true);
+  }
+
+  close(): void {
+    this.closed = true;
+    for (const stream of this.streams.values()) {
+      stream.writer.abort().catch(() => undefined);
+      stream.reader.cancel().catch(() => undefined);
+    }
+    this.streams.clear();
+  }
+
+  private async inflate(
+    moduleId: string,
+    payload: Uint8Array,
+    rawLength: number,
+  ): Promise<void> {
+    if (this.closed) return;
+    const stream = this.streamFor(moduleId);
+    // Write errors also reject the reads below
+    stream.writer.write(payload).catch(() => undefined);
+    try {
+      // A sync-flushed frame inflates to exactly rawLength bytes, so reading stops at its end
+      let text = "";
+      for (let received = 0; received < rawLength; ) {
+        const { done, value } = await stream.reader.read();
+        if (done) throw new Error("Deflate stream ended");
+        received += value.byteLength;
+        text += stream.text.decode(value, { stream: true });
+      }
+      if (text) this.onText(moduleId, text);
+    } catch (e) {
+      if (this.closed) return;
+      console.error("Stream decompression failed", e);
+      this.streams.delete(moduleId);
+      this.onText(moduleId, "[Decompression Error]");
+    }
+  }
+
+  private streamFor(moduleId: string): InflateStream {
+    let stream = this.streams.get(moduleId);
+    if (!stream) {
+      const inflate = new DecompressionStream("deflate-raw");
+      stream = {
+        writer: inflate.writable.getWriter(),
+        reader: inflate.readable.getReader(),
+        text: new TextDecoder(),
+      };
+      this.streams.set(moduleId, stream);
+    }
+    return stream;
+  }
+}
+
 // ==========================================
 // MAIN MESSAGE PROCESSOR
 // ==========================================
@@ -271,6 +519,9 @@ export function processWebSocketMessage(
   try {
     const data: WebSocketMessage = JSON.parse(rawData);
     const { state, getCurrentModuleLog } = context;
+    if (typeof data.seq === "number") {
+      context.onSequence?.(data.seq, data.type === "SNAPSHOT");
+    }
 
     // 1. Global System Logs
     if (isGlobalSystemLog(data)) {
@@ -316,9 +567,24 @@ export function processWebSocketMessage(
           state.updateModuleLog(moduleId, handleEndMessage(data));
           break;
 
-        case "METRICS":
+        case "METRICS": {
+          const metrics = data.data as unknown as ReportData | undefined;
+          if (metrics && !metrics.partial) {
+            context.reports?.set(moduleId, metrics);
+          }
           state.updateModuleLog(moduleId, handleMetricsMessage(data));
           break;
+        }
+
+        case "FINDINGS_DELTA": {
+          const update =
+            context.reports &&
+            handleFindingsDelta(data, moduleId, context.reports);
+          if (update) {
+            state.updateModuleLog(moduleId, update);
+          }
+          break;
+        }
       }
     }
 
@@ -327,6 +593,8 @@ export function processWebSocketMessage(
       state.resetLogs();
       state.setIsAnalyzing(true);
       state.setOverallStatus("RUNNING");
+    } else if (data.type === "SNAPSHOT") {
+      applySnapshot(data, state, context.reports);
     } else if (data.type === "GLOBAL_END") {
       state.setIsAnalyzing(false);
       state.setOverallStatus(mapToOverallStatus(data.status || ""));
@@ -1,9 +1,12 @@
 import { create } from "zustand";
 import { persist } from "zustand/middleware";
-import { AnalysisState, ModuleLogs, OverallStatus } from "../types";
+import { AnalysisState, Metrics, ModuleLogs, OverallStatus } from "../types";
 import {
   processWebSocketMessage,
   createDefaultModuleLog,
+  appendStreamData,
+  DeflateStreamDecoder,
+  DEFLATE_STREAM_PROTOCOL,
   MessageHandlerContext,
 } from "./messageHandlers";
 
@@ -34,6 +37,19 @@ export const useAnalysisStore = create<AnalysisStore>()(
   persist(
     (set, get) => {
       let ws: WebSocket | null = null;
+      let streamDecoder: DeflateStreamDecoder | null = null;
+      // Messages are applied strictly in arrival order: binary frames inflate asynchronously,
+      // and an END or METRICS sent after some output must not overtake it
+      let inbound: Promise<void> = Promise.resolve();
+      // Newest sequence number received; reconnects resume after it instead of starting over.
+      // A SNAPSHOT restarts the count: after a server restart its seq is below ours, and
+      // keeping the old maximum would ask for a snapshot again on every reconnect
+      let lastSeq = 0;
+      const trackSequence = (seq: number, reset = false) => {
+        lastSeq = reset ? seq : Math.max(lastSeq, seq);
+      };
+      // Last complete report per module; incremental runs only send what changed in it
+      const reports = new Map<string, Metrics>();
 
       /**
        * Create message handler context for the current state
@@ -94,18 +110,49 @@ export const useAnalysisStore = create<AnalysisStore>()(
 
         connect: () => {
           if (ws) return;
-          ws = new WebSocket(`${WS_URL}/api/ws/analysis`);
+          // The backend echoes this subprotocol (browsers fail the handshake otherwise)
+          // and then sends STREAM output as binary deflate frames.
+          // deltas=1: incremental runs arrive as FINDINGS_DELTA instead of the full METRICS
+          ws = new WebSocket(
+            `${WS_URL}/api/ws/analysis?since=${lastSeq}&deltas=1`,
+            [DEFLATE_STREAM_PROTOCOL],
+          );
+          ws.binaryType = "arraybuffer";
+          streamDecoder = new DeflateStreamDecoder((moduleId, text) => {
+            const context = createMessageContext();
+            context.state.updateModuleLog(
+              moduleId,
+              appendStreamData(context.getCurrentModuleLog(moduleId), text),
+            );
+          }, trackSequence);
 
           ws.onopen = () => console.log("WebSocket Connected");
 
-          ws.onmessage = (event) => {
+          const decoder = streamDecoder;
+          const handleMessage = async (data: ArrayBuffer | string) => {
+            if (data instanceof ArrayBuffer) {
+              await decoder.handleFrame(data);
+              return;
+            }
             const context = createMessageContext();
-            processWebSocketMessage(event.data, context);
+            processWebSocketMessage(data, {
+              ...context,
+              onSequence: trackSequence,
+              reports,
+            });
+          };
+
+          ws.onmessage = (event) => {
+            inbound = inbound
+              .then(() => handleMessage(event.data))
+              .catch((e) => console.error("Failed to handle message", e));
           };
 
           ws.onclose = (event) => {
             console.log("WebSocket Disconnected", event.code, event.reason);
             ws = null;
+            streamDecoder?.close();
+            streamDecoder = null;
 
             // Auto-reconnect
             setTimeout(() => {
@@ -137,6 +184,8 @@ export const useAnalysisStore = create<AnalysisStore>()(
             ws.onclose = null;
             ws.close();
             ws = null;
+            streamDecoder?.close();
+            streamDecoder = null;
           }
         },
       };
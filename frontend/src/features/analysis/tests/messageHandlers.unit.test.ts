@@ -0,0 +1,36 @@
+import { describe, it, expect } from "vitest";
+import { applyMetricsChanges } from "../model/messageHandlers";
+import { Metrics } from "../types";
+
+const row = (file: string, errors: number): Metrics["modules"][number] => ({
+  file,
+  metrics: { ERROR: errors, WARNING: 0, INFO: 0 },
+  complexity_metrics: { COMPLEXITY: 0, MAX_CCN: 0 },
+});
+
+const totals = (errors: number): Metrics["total_issues"] => ({
+  ERROR: errors,
+  WARNING: 0,
+  INFO: 0,
+  COMPLEXITY: 0,
+});
+
+describe("applyMetricsChanges", () => {
+  it("patches the previous report with the changed rows of a FINDINGS_DELTA", () => {
+    const previous: Metrics = {
+      total_issues: totals(3),
+      modules: [row("a.py", 2), row("b.py", 1)],
+    };
+
+    const report = applyMetricsChanges(previous, {
+      total_issues: totals(4),
+      modules: [row("c.py", 3)],
+      removed: ["a.py"],
+    });
+
+    expect(report).toEqual({
+      total_issues: totals(4),
+      modules: [row("b.py", 1), row("c.py", 3)],
+    });
+  });
+});